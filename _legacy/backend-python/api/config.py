@@ -39,6 +39,20 @@ class Settings(BaseSettings):
     elevenlabs_default_voice_male: str = "pNInz6obpgDQGcFmaJgB"  # Adam
     elevenlabs_default_voice_female: str = "21m00Tcm4TlvDq8ikWAM"  # Rachel
     
+    # Deadline (요청 전체 시간 예산, 초)
+    analyze_deadline_seconds: float = 180.0
+    refine_deadline_seconds: float = 90.0
+    
+    # Job Queue (분석 파이프라인은 별도 워커 프로세스에서 실행)
+    job_db_path: str = "data/jobs.sqlite3"
+    job_event_idle_timeout_seconds: float = 600.0  # 이벤트 없이 SSE를 유지하는 최대 시간
+    
+    # Usage budget (인증 사용자 월 비용 상한 USD, 0이면 제한 없음)
+    user_monthly_budget_usd: float = 0.0
+    
+    # Profiling (관리자 전용, 비어 있으면 비활성화)
+    profile_token: str = ""
+    
     # CORS
     allowed_origins: str = "http://localhost:3000"
     
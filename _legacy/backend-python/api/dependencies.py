@@ -5,13 +5,18 @@ JWT 토큰 검증, Supabase 클라이언트 생성 등
 라우트에서 공통으로 사용하는 의존성들을 정의합니다.
 """
 
-from fastapi import Depends, HTTPException, status, Header
+from fastapi import Depends, HTTPException, Request, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from supabase import create_client, Client
-from typing import Optional
+from typing import Dict, Optional
+import hmac
 import jwt
 
 from .config import get_settings, Settings
+from .jobs import JobQueue
+
+from langgraph.utils.ledger import LEDGER
+from langgraph.utils.profiling import new_profile_id
 
 
 # Bearer 토큰 스키마
@@ -107,6 +112,30 @@ async def get_guest_session(
     return x_guest_session
 
 
+async def get_profile_id(
+    request: Request,
+    x_profile_token: Optional[str] = Header(None, alias="X-Profile-Token"),
+    settings: Settings = Depends(get_settings)
+) -> Optional[str]:
+    """
+    관리자 프로파일링 요청 확인
+    
+    `X-Profile-Token` 헤더 또는 `?profile=` 쿼리가 PROFILE_TOKEN과 일치하면
+    이번 실행 하나의 프로파일 ID를 발급합니다. (응답 헤더 `X-Profile-Id`로 반환)
+    토큰이 틀리거나 PROFILE_TOKEN이 설정되지 않았으면 403 에러를 발생시킵니다.
+    """
+    token = x_profile_token or request.query_params.get("profile")
+    if not token:
+        return None
+    
+    if not settings.profile_token or not hmac.compare_digest(token, settings.profile_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "FORBIDDEN_PROFILE", "message": "Invalid profile token"}
+        )
+    return new_profile_id()
+
+
 class UserContext:
     """
     사용자 컨텍스트 클래스
@@ -161,3 +190,47 @@ async def get_user_context(
     인증 여부에 관계없이 사용자를 식별하고 권한을 확인할 수 있습니다.
     """
     return UserContext(user=user, guest_session=guest_session)
+
+
+async def check_usage_budget(
+    user_context: UserContext = Depends(get_user_context),
+    settings: Settings = Depends(get_settings)
+) -> None:
+    """
+    월 비용 예산 확인 의존성
+    
+    인증 사용자의 이번 달 비용(비용 원장, DB 합계 캐시 + 미저장분)이
+    USER_MONTHLY_BUDGET_USD 이상이면 429 에러를 발생시킵니다.
+    요청마다 DB를 조회하지 않습니다. (langgraph/utils/ledger.py)
+    """
+    budget = settings.user_monthly_budget_usd
+    if budget <= 0 or not user_context.is_authenticated:
+        return
+    
+    spent = await LEDGER.user_month_cost(user_context.user_id)
+    if spent >= budget:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={
+                "code": "BUDGET_EXCEEDED",
+                "message": "Monthly usage budget exceeded. Please try again next month."
+            }
+        )
+
+
+# 경로별 JobQueue 인스턴스 (스키마 생성은 최초 1회만)
+_job_queues: Dict[str, JobQueue] = {}
+
+
+def get_job_queue(
+    settings: Settings = Depends(get_settings)
+) -> JobQueue:
+    """
+    작업 큐 의존성
+    
+    분석 작업을 큐에 넣고 진행 이벤트를 구독할 때 사용합니다.
+    """
+    queue = _job_queues.get(settings.job_db_path)
+    if queue is None:
+        queue = _job_queues[settings.job_db_path] = JobQueue(settings.job_db_path)
+    return queue
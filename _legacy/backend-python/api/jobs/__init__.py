@@ -0,0 +1,44 @@
+"""
+백그라운드 작업 패키지
+
+HTTP 프로세스와 분리된 워커 풀에서 분석 파이프라인을 실행합니다.
+
+- queue: SQLite 기반 영속 작업 큐 (jobs, job_events)
+- lanes: 실행 레인 설정 (quick / deep / preview / speculative)
+- bus: 진행 이벤트 발행/구독 (SSE 중계용)
+- runner: 작업 종류별 실행 로직 (LangGraph 워크플로우)
+- worker: 워커 / 워커 풀 (`python -m api.jobs.worker`)
+"""
+
+from .queue import Job, JobEvent, JobQueue, TERMINAL_EVENTS
+from .lanes import LANES, Lane, get_lane, lane_for_analysis
+from .bus import ProgressBus, to_sse
+from .runner import (
+    categorize_error,
+    run_analysis_job,
+    run_document_extraction_job,
+    run_refine_preview_job,
+    run_speculative_tts_job,
+)
+from .worker import Worker, WorkerPool, create_lane_pools
+
+__all__ = [
+    "Job",
+    "JobEvent",
+    "JobQueue",
+    "TERMINAL_EVENTS",
+    "LANES",
+    "Lane",
+    "get_lane",
+    "lane_for_analysis",
+    "ProgressBus",
+    "to_sse",
+    "categorize_error",
+    "run_analysis_job",
+    "run_refine_preview_job",
+    "run_document_extraction_job",
+    "run_speculative_tts_job",
+    "Worker",
+    "WorkerPool",
+    "create_lane_pools",
+]
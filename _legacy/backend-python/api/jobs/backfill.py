@@ -0,0 +1,85 @@
+"""
+사용자 패턴 요약 백필
+
+`user_pattern_summaries`는 시도가 완료될 때 트리거로 갱신됩니다.
+트리거 도입 전의 시도는 이 명령으로 한 번 채웁니다.
+
+DB 함수 `backfill_pattern_summaries`를 사용자 ID 순으로 배치마다 호출하며,
+배치 안에서는 사용자별 요약을 지우고 완료된 시도를 시간순으로 다시 반영합니다.
+(같은 사용자를 다시 백필해도 결과가 같으므로 중단된 지점부터 재실행해도 됨)
+
+## 실행
+
+```bash
+python -m api.jobs.backfill
+python -m api.jobs.backfill --batch-size 200 --pause 0.5
+
+# 중단된 지점부터 (로그의 마지막 사용자 ID)
+python -m api.jobs.backfill --after 3f1c...
+```
+"""
+
+import argparse
+import os
+import time
+from typing import List, Optional
+
+from supabase import create_client
+
+
+DEFAULT_BATCH_SIZE = 100
+
+
+def backfill_pattern_summaries(
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    after: Optional[str] = None,
+    pause: float = 0.0,
+    client=None,
+) -> int:
+    """
+    모든 사용자의 패턴 요약 재생성
+
+    Args:
+        batch_size: 배치당 사용자 수
+        after: 이 사용자 ID 다음부터 시작
+        pause: 배치 사이 대기 시간 (초, DB 부하 조절)
+        client: Supabase 클라이언트 (기본: 환경변수로 생성)
+
+    Returns:
+        int: 처리한 배치 수
+    """
+    client = client or create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_KEY"))
+
+    batches = 0
+    started = time.perf_counter()
+    while True:
+        response = client.rpc("backfill_pattern_summaries", {
+            "p_after": after,
+            "p_batch_size": batch_size,
+        }).execute()
+        last_user = response.data
+        if not last_user:
+            break
+
+        batches += 1
+        after = last_user
+        print(f"[backfill] batch {batches} done (last user {after}, {time.perf_counter() - started:.1f}s)")
+        if pause:
+            time.sleep(pause)
+
+    print(f"[backfill] finished: {batches} batches in {time.perf_counter() - started:.1f}s")
+    return batches
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backfill user pattern summaries")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="배치당 사용자 수")
+    parser.add_argument("--after", default=None, help="이 사용자 ID 다음부터 시작")
+    parser.add_argument("--pause", type=float, default=0.0, help="배치 사이 대기 시간 (초)")
+    args = parser.parse_args(argv)
+
+    backfill_pattern_summaries(args.batch_size, args.after, args.pause)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+작업 진행 이벤트 버스
+
+워커가 기록한 진행 이벤트(job_events)를 HTTP 프로세스의 SSE 엔드포인트로 전달합니다.
+워커와 HTTP 서버는 서로 다른 프로세스이므로 SQLite 이벤트 테이블을 폴링합니다.
+
+## 재연결
+
+이벤트 ID는 단조 증가하므로 SSE의 `id`로 내려주고,
+클라이언트가 `Last-Event-ID`로 재연결하면 그 이후 이벤트부터 다시 전달합니다.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from .queue import JobEvent, JobQueue
+
+
+# 이벤트 폴링 주기 (초)
+DEFAULT_POLL_INTERVAL = 0.2
+
+
+class ProgressBus:
+    """
+    진행 이벤트 발행/구독
+
+    Args:
+        queue: 이벤트를 저장하는 작업 큐
+        poll_interval: 구독 시 폴링 주기 (초)
+    """
+
+    def __init__(self, queue: JobQueue, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.queue = queue
+        self.poll_interval = poll_interval
+
+    def publish(self, job_id: str, event: str, data: Dict[str, Any]) -> int:
+        """이벤트 발행 (워커에서 호출)"""
+        return self.queue.publish(job_id, event, data)
+
+    async def publish_async(self, job_id: str, event: str, data: Dict[str, Any]) -> int:
+        """이벤트 발행 (이벤트 루프를 막지 않도록 스레드에서 실행)"""
+        return await asyncio.to_thread(self.queue.publish, job_id, event, data)
+
+    async def subscribe(
+        self,
+        job_id: str,
+        after: int = 0,
+        timeout: Optional[float] = None,
+    ) -> AsyncGenerator[JobEvent, None]:
+        """
+        이벤트 구독
+
+        종료 이벤트(complete/error)를 전달하면 구독이 끝납니다.
+
+        Args:
+            job_id: 작업 ID
+            after: 이 ID 이후의 이벤트부터 전달 (재연결용)
+            timeout: 새 이벤트 없이 기다리는 최대 시간 (초, None이면 무제한)
+
+        Yields:
+            JobEvent: 진행 이벤트
+        """
+        last_event_at = time.monotonic()
+
+        while True:
+            events = await asyncio.to_thread(self.queue.events, job_id, after)
+
+            for event in events:
+                after = event.id
+                yield event
+                if event.is_terminal:
+                    return
+
+            if events:
+                last_event_at = time.monotonic()
+            elif timeout is not None and time.monotonic() - last_event_at > timeout:
+                return
+
+            await asyncio.sleep(self.poll_interval)
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[JobEvent]:
+        """
+        작업 종료 이벤트까지 대기
+
+        Returns:
+            JobEvent | None: complete/error 이벤트 (timeout 동안 진행이 없으면 None)
+        """
+        async for event in self.subscribe(job_id, timeout=timeout):
+            if event.is_terminal:
+                return event
+        return None
+
+
+def to_sse(event: JobEvent) -> dict:
+    """JobEvent → sse-starlette 이벤트 dict"""
+    return {
+        "id": str(event.id),
+        "event": event.event,
+        "data": json.dumps(event.data, ensure_ascii=False),
+    }
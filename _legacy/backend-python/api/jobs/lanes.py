@@ -0,0 +1,97 @@
+"""
+작업 실행 레인(Lane) 설정
+
+Quick / Deep / Refine Preview 작업을 서로 다른 레인으로 분리하여
+Deep Mode 요청이 몰려도 Quick Mode와 프리뷰 지연 시간이 늘어나지 않도록 합니다.
+프리뷰 음성 미리 생성(speculative) 작업은 사용자가 기다리지 않는 작업이므로
+전용 워커 없이 preview 레인 워커가 여유 있을 때만 처리합니다.
+
+## 레인별 정책
+
+| 레인 | 우선순위 | 전용 워커 | 전역 동시 실행 상한 | 여유 시 추가 처리 |
+|------|:-------:|:--------:|:-----------------:|----------------|
+| preview | 30 | 1 × 4 | 8 | speculative |
+| quick | 20 | 2 × 2 | 8 | preview |
+| deep | 10 | 1 × 2 | 2 | quick, preview |
+| speculative | 0 | - | 2 | - |
+
+- **우선순위**: 한 워커가 여러 레인을 처리할 때 높은 레인부터 가져갑니다.
+- **전용 워커**: 각 레인은 자신의 워커 프로세스를 가지므로 다른 레인이 점유할 수 없습니다.
+- **전역 상한**: 워커 수와 무관하게 레인 전체에서 동시에 running 상태인 작업 수를 제한합니다.
+  (Deep Mode의 Claude 다회 호출이 제공자 rate limit을 독점하지 않도록)
+- **여유 시 추가 처리**: 느린 레인의 워커가 놀고 있으면 짧은 작업을 대신 처리합니다.
+  반대 방향(빠른 레인 워커가 Deep 작업 처리)은 허용하지 않습니다.
+
+환경변수 `JOB_{LANE}_WORKERS`, `JOB_{LANE}_CONCURRENCY`, `JOB_{LANE}_MAX_RUNNING`으로
+레인별 값을 바꿀 수 있습니다. (예: `JOB_DEEP_WORKERS=2`)
+"""
+
+import os
+from typing import Dict, List, Optional
+
+
+class Lane:
+    """
+    실행 레인 정의
+
+    Args:
+        name: 레인 이름
+        priority: 큐 우선순위 (클수록 먼저 처리)
+        workers: 전용 워커 프로세스 수
+        concurrency: 워커당 동시 작업 수
+        max_running: 레인 전체 동시 실행 상한 (None이면 무제한)
+        overflow: 이 레인의 워커가 여유 있을 때 추가로 처리할 레인
+    """
+
+    def __init__(
+        self,
+        name: str,
+        priority: int,
+        workers: int,
+        concurrency: int,
+        max_running: Optional[int] = None,
+        overflow: Optional[List[str]] = None,
+    ):
+        prefix = f"JOB_{name.upper()}_"
+        self.name = name
+        self.priority = priority
+        self.workers = int(os.getenv(prefix + "WORKERS", workers))
+        self.concurrency = int(os.getenv(prefix + "CONCURRENCY", concurrency))
+        max_running_env = os.getenv(prefix + "MAX_RUNNING")
+        self.max_running = int(max_running_env) if max_running_env else max_running
+        self.overflow = overflow or []
+
+    @property
+    def serves(self) -> List[str]:
+        """이 레인의 워커가 처리하는 레인 목록"""
+        return [self.name, *self.overflow]
+
+    def __repr__(self) -> str:
+        return (
+            f"<Lane {self.name} priority={self.priority} "
+            f"workers={self.workers}x{self.concurrency} max_running={self.max_running}>"
+        )
+
+
+LANES: Dict[str, Lane] = {
+    "preview": Lane("preview", priority=30, workers=1, concurrency=4, max_running=8, overflow=["speculative"]),
+    "quick": Lane("quick", priority=20, workers=2, concurrency=2, max_running=8, overflow=["preview"]),
+    "deep": Lane("deep", priority=10, workers=1, concurrency=2, max_running=2, overflow=["quick", "preview"]),
+    "speculative": Lane("speculative", priority=0, workers=0, concurrency=1, max_running=2),
+}
+
+
+def get_lane(name: str) -> Lane:
+    """레인 조회 (없는 이름이면 KeyError)"""
+    return LANES[name]
+
+
+def lane_for_analysis(mode: str) -> str:
+    """분석 모드 → 레인 이름"""
+    return "deep" if mode == "deep" else "quick"
+
+
+def lane_caps(lanes: Optional[Dict[str, Lane]] = None) -> Dict[str, int]:
+    """레인별 전역 동시 실행 상한 (큐 claim 시 사용)"""
+    lanes = lanes or LANES
+    return {name: lane.max_running for name, lane in lanes.items() if lane.max_running}
@@ -0,0 +1,431 @@
+"""
+SQLite 기반 영속 작업 큐
+
+HTTP 프로세스와 워커 프로세스가 같은 SQLite 파일을 공유하여
+작업(jobs)과 진행 이벤트(job_events)를 주고받습니다.
+
+## 작업 상태 흐름
+
+```
+queued ──claim──▶ running ──complete──▶ completed
+   ▲                 │
+   │                 ├──fail──────────▶ failed
+   └──lease 만료─────┘  (워커가 죽거나 재시작된 경우 다른 워커가 다시 가져감)
+```
+
+## 왜 SQLite인가?
+
+- 별도 인프라(Redis 등) 없이 단일 서버에서 바로 사용 가능
+- 파일 기반이라 서버/워커가 재시작되어도 작업이 사라지지 않음
+- WAL 모드 + BEGIN IMMEDIATE로 여러 프로세스의 동시 claim을 안전하게 처리
+
+## 레인
+
+각 작업은 레인(quick/deep/preview 등)에 속하며, claim 시 처리할 레인과
+레인별 전역 동시 실행 상한을 지정할 수 있습니다. (lanes.py 참고)
+"""
+
+import json
+import os
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+
+# 기본 DB 경로 (환경변수 JOB_DB_PATH로 변경 가능)
+DEFAULT_DB_PATH = os.getenv("JOB_DB_PATH", "data/jobs.sqlite3")
+
+# 워커가 작업을 잡고 있는 기본 시간 (초) - 주기적으로 연장됨
+DEFAULT_LEASE_SECONDS = 60.0
+
+# lease 만료로 재시도되는 최대 횟수 (초과 시 failed 처리)
+MAX_JOB_ATTEMPTS = 3
+
+# 진행 이벤트 중 작업 종료를 뜻하는 이벤트
+TERMINAL_EVENTS = ("complete", "error")
+
+# 레인을 지정하지 않은 작업의 레인
+DEFAULT_LANE = "default"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    lane TEXT NOT NULL DEFAULT 'default',
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_claim
+    ON jobs (status, priority DESC, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_lane_running
+    ON jobs (lane, status);
+
+CREATE TABLE IF NOT EXISTS job_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    event TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_events_job
+    ON job_events (job_id, id);
+"""
+
+
+class Job:
+    """큐에 저장된 작업 한 건"""
+
+    def __init__(self, row: sqlite3.Row):
+        self.id: str = row["id"]
+        self.kind: str = row["kind"]
+        self.lane: str = row["lane"]
+        self.priority: int = row["priority"]
+        self.status: str = row["status"]
+        self.payload: Dict[str, Any] = json.loads(row["payload"])
+        self.result: Optional[Dict[str, Any]] = json.loads(row["result"]) if row["result"] else None
+        self.error: Optional[str] = row["error"]
+        self.attempts: int = row["attempts"]
+        self.lease_owner: Optional[str] = row["lease_owner"]
+        self.created_at: float = row["created_at"]
+        self.updated_at: float = row["updated_at"]
+
+    def __repr__(self) -> str:
+        return f"<Job {self.id} kind={self.kind} lane={self.lane} status={self.status}>"
+
+
+class JobEvent:
+    """작업 진행 이벤트 한 건 (id는 SSE Last-Event-ID로 사용)"""
+
+    def __init__(self, row: sqlite3.Row):
+        self.id: int = row["id"]
+        self.job_id: str = row["job_id"]
+        self.event: str = row["event"]
+        self.data: Dict[str, Any] = json.loads(row["data"])
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.event in TERMINAL_EVENTS
+
+
+class JobQueue:
+    """
+    SQLite 작업 큐
+
+    프로세스 간에 공유되므로 커넥션은 호출마다 새로 엽니다.
+    (sqlite3 커넥션은 프로세스/스레드 간 공유 불가)
+
+    Args:
+        path: SQLite 파일 경로
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._migrate(conn)
+            conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """기존 DB 파일에 추가된 컬럼 반영"""
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        if columns and "lane" not in columns:
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN lane TEXT NOT NULL DEFAULT '{DEFAULT_LANE}'")
+
+    def _connect(self) -> "_ClosingConnection":
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return _ClosingConnection(conn)
+
+    # ============================================
+    # 작업
+    # ============================================
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        priority: int = 0,
+        job_id: Optional[str] = None,
+        lane: str = DEFAULT_LANE,
+    ) -> str:
+        """
+        작업 추가
+
+        Args:
+            kind: 작업 종류 (워커의 핸들러 키, 예: "analyze")
+            payload: 작업 입력 (JSON 직렬화 가능해야 함)
+            priority: 우선순위 (클수록 먼저 처리)
+            job_id: 작업 ID (생략 시 UUID 생성)
+            lane: 실행 레인 (quick/deep/preview 등)
+
+        Returns:
+            str: 작업 ID
+        """
+        job_id = job_id or str(uuid.uuid4())
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, lane, priority, status, payload, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, lane, priority, json.dumps(payload, ensure_ascii=False), now, now),
+            )
+        return job_id
+
+    def claim(
+        self,
+        worker_id: str,
+        kinds: Optional[List[str]] = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        lanes: Optional[List[str]] = None,
+        lane_caps: Optional[Dict[str, int]] = None,
+    ) -> Optional[Job]:
+        """
+        다음 작업 하나를 가져와 lease 설정
+
+        queued 작업과 lease가 만료된 running 작업(죽은 워커의 작업)이 대상입니다.
+        우선순위가 높은 작업, 같은 우선순위면 먼저 들어온 작업부터 가져옵니다.
+
+        Args:
+            worker_id: 워커 식별자
+            kinds: 처리할 작업 종류 (None이면 전체)
+            lease_seconds: lease 기간 (초)
+            lanes: 처리할 레인 (None이면 전체)
+            lane_caps: 레인별 전역 동시 실행 상한 (상한에 도달한 레인은 건너뜀)
+
+        Returns:
+            Job | None: 가져온 작업 (없으면 None)
+        """
+        now = time.time()
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 상한에 도달한 레인 (같은 트랜잭션 안에서 세어야 동시 claim에도 정확함)
+                saturated = set()
+                if lane_caps:
+                    running = dict(conn.execute(
+                        "SELECT lane, COUNT(*) FROM jobs "
+                        "WHERE status = 'running' AND lease_expires_at >= ? GROUP BY lane",
+                        (now,),
+                    ).fetchall())
+                    saturated = {
+                        lane for lane, cap in lane_caps.items() if running.get(lane, 0) >= cap
+                    }
+
+                filters = ""
+                params: List[Any] = [now]
+                if kinds:
+                    filters += f" AND kind IN ({','.join('?' * len(kinds))})"
+                    params.extend(kinds)
+                if lanes is not None:
+                    candidates = [lane for lane in lanes if lane not in saturated]
+                    if not candidates:
+                        conn.execute("COMMIT")
+                        return None
+                    filters += f" AND lane IN ({','.join('?' * len(candidates))})"
+                    params.extend(candidates)
+                elif saturated:
+                    filters += f" AND lane NOT IN ({','.join('?' * len(saturated))})"
+                    params.extend(saturated)
+
+                row = conn.execute(
+                    "SELECT id, attempts FROM jobs "
+                    "WHERE (status = 'queued' OR (status = 'running' AND lease_expires_at < ?)) "
+                    f"{filters} "
+                    "ORDER BY priority DESC, created_at LIMIT 1",
+                    params,
+                ).fetchone()
+
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                if row["attempts"] >= MAX_JOB_ATTEMPTS:
+                    # 반복해서 워커를 죽이는 작업은 더 이상 재시도하지 않음
+                    conn.execute(
+                        "UPDATE jobs SET status = 'failed', error = ?, lease_owner = NULL, "
+                        "updated_at = ? WHERE id = ?",
+                        ("Job abandoned after repeated worker failures", now, row["id"]),
+                    )
+                    self._insert_event(conn, row["id"], "error", {
+                        "code": "JOB_ABANDONED",
+                        "message": "Job abandoned after repeated worker failures",
+                    })
+                    conn.execute("COMMIT")
+                    return self.claim(worker_id, kinds, lease_seconds, lanes, lane_caps)
+
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', lease_owner = ?, lease_expires_at = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (worker_id, now + lease_seconds, now, row["id"]),
+                )
+                job_row = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        return Job(job_row)
+
+    def extend_lease(
+        self,
+        job_id: str,
+        worker_id: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ) -> bool:
+        """
+        lease 연장 (하트비트)
+
+        Returns:
+            bool: 연장 성공 여부 (False면 다른 워커가 작업을 가져간 것)
+        """
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = 'running'",
+                (now + lease_seconds, now, job_id, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        """작업 완료 처리"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'completed', result = ?, lease_owner = NULL, "
+                "updated_at = ? WHERE id = ?",
+                (json.dumps(result, ensure_ascii=False), time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        """작업 실패 처리 (재시도하지 않음)"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, lease_owner = NULL, "
+                "updated_at = ? WHERE id = ?",
+                (error, time.time(), job_id),
+            )
+
+    def release(self, job_id: str, worker_id: str) -> None:
+        """
+        작업 반납 (워커 정상 종료 시)
+
+        lease 만료를 기다리지 않고 바로 다른 워커가 가져갈 수 있도록 합니다.
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', lease_owner = NULL, lease_expires_at = NULL, "
+                "attempts = MAX(attempts - 1, 0), updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = 'running'",
+                (time.time(), job_id, worker_id),
+            )
+
+    def cancel(self, job_id: str, reason: str = "cancelled") -> bool:
+        """
+        대기 중인 작업 취소 (failed 처리)
+
+        Returns:
+            bool: 취소 여부 (False면 이미 워커가 가져갔거나 끝난 작업)
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (reason, time.time(), job_id),
+            )
+            return cursor.rowcount == 1
+
+    def payload_total(self, kind: str, field: str, since: float) -> float:
+        """since 이후 등록된 kind 작업의 payload 숫자 필드 합계 (비용 상한 계산용)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COALESCE(SUM(json_extract(payload, ?)), 0) AS total FROM jobs "
+                "WHERE kind = ? AND created_at >= ?",
+                (f"$.{field}", kind, since),
+            ).fetchone()
+        return row["total"]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """작업 조회"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job(row) if row else None
+
+    def stats(self, lane: Optional[str] = None) -> Dict[str, int]:
+        """상태별 작업 수 (lane 지정 시 해당 레인만)"""
+        with self._connect() as conn:
+            if lane is None:
+                rows = conn.execute(
+                    "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT status, COUNT(*) AS n FROM jobs WHERE lane = ? GROUP BY status",
+                    (lane,),
+                ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    # ============================================
+    # 진행 이벤트
+    # ============================================
+
+    def publish(self, job_id: str, event: str, data: Dict[str, Any]) -> int:
+        """
+        진행 이벤트 기록
+
+        Returns:
+            int: 이벤트 ID (단조 증가)
+        """
+        with self._connect() as conn:
+            return self._insert_event(conn, job_id, event, data)
+
+    def events(self, job_id: str, after: int = 0, limit: int = 100) -> List[JobEvent]:
+        """after 이후의 진행 이벤트 조회"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM job_events WHERE job_id = ? AND id > ? ORDER BY id LIMIT ?",
+                (job_id, after, limit),
+            ).fetchall()
+        return [JobEvent(row) for row in rows]
+
+    @staticmethod
+    def _insert_event(conn: sqlite3.Connection, job_id: str, event: str, data: Dict[str, Any]) -> int:
+        cursor = conn.execute(
+            "INSERT INTO job_events (job_id, event, data, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, event, json.dumps(data, ensure_ascii=False), time.time()),
+        )
+        return cursor.lastrowid
+
+
+class _ClosingConnection:
+    """with 블록 종료 시 커넥션을 닫는 래퍼 (sqlite3 기본 동작은 commit만 수행)"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self._conn
+
+    def __exit__(self, *exc_info) -> None:
+        self._conn.close()
@@ -0,0 +1,370 @@
+"""
+작업 실행기 (워커 프로세스에서 실행)
+
+큐에서 가져온 작업을 실제 LangGraph 워크플로우로 실행하고,
+노드별 진행 상황을 ProgressBus로 발행합니다.
+
+이전에는 이 로직이 /analyze 요청 코루틴 안에서 직접 실행되었습니다.
+이제 HTTP 프로세스는 작업을 큐에 넣고 이벤트를 중계만 합니다.
+
+## 핸들러 규약
+
+```python
+async def handler(job: Job, bus: ProgressBus) -> dict:
+    ...  # 진행 이벤트 발행
+    return result  # 워커가 complete 이벤트로 발행
+```
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, Optional
+
+from ..persistence import attempt_row, get_session_writer
+from ..schemas import AnalyzeResponse
+from .bus import ProgressBus
+from .queue import Job
+
+from langgraph.nodes.context import (
+    extract_document_context,
+    get_document_index,
+    load_project_documents,
+)
+from langgraph.state import SpeechCoachState
+from langgraph.utils.deadline import Deadline, DeadlineExceeded
+from langgraph.utils.resilience import CircuitOpenError
+
+
+# 누적(operator.add) 필드 - 노드 출력이 덮어쓰지 않고 이어 붙음
+_ACCUMULATED_FIELDS = ("messages", "degradations")
+
+
+async def run_analysis_job(
+    job: Job,
+    bus: ProgressBus,
+    graph_factory: Optional[Callable[[], Any]] = None,
+) -> Dict[str, Any]:
+    """
+    스피치 분석 작업 실행
+
+    STT → 분석 → 개선안 생성 → TTS 파이프라인을 실행하며
+    각 단계의 진행 상황을 발행합니다.
+
+    Args:
+        job: 분석 작업 (payload는 /analyze 요청 내용)
+        bus: 진행 이벤트 버스
+        graph_factory: 그래프 생성 함수 (테스트/벤치마크에서 Mock 그래프 주입용)
+
+    Returns:
+        dict: AnalyzeResponse 형식의 결과 (complete 이벤트 데이터)
+    """
+    if graph_factory is None:
+        from langgraph.workflows.speech_coach import create_speech_coach_graph
+        graph_factory = create_speech_coach_graph
+
+    payload = job.payload
+    session_id = payload["session_id"]
+
+    async def progress(step: str, value: int, message: str) -> None:
+        await bus.publish_async(job.id, "progress", format_progress(step, value, message))
+
+    # 요청 전체 시간 예산 (모든 노드가 남은 예산으로 타임아웃 계산)
+    deadline = job_deadline(payload, 180.0)
+
+    try:
+        # 1. STT 단계
+        await progress("stt", 0, "음성 인식을 시작합니다...")
+
+        # LangGraph 워크플로우 생성 및 실행
+        graph = graph_factory()
+
+        # 초기 상태 설정
+        initial_state: SpeechCoachState = {
+            "session_id": session_id,
+            "user_id": payload.get("user_id"),
+            "mode": payload.get("mode", "quick"),
+            "audio_file_path": payload["audio_url"],
+            "voice_type": payload.get("voice_type", "default_male"),
+            "question": payload.get("question"),
+            "project_id": payload.get("project_id"),
+            "transcript": "",
+            "analysis_result": {},
+            "improved_script": "",
+            "improved_audio_url": "",
+            "previous_sessions": [],
+            "messages": [],
+            "degradations": [],
+        }
+
+        # 직접 업로드 경로에서 미리 전사한 결과 (STT 노드가 다시 전사하지 않음)
+        stt = payload.get("stt")
+        if stt:
+            initial_state.update({
+                "transcript": stt.get("transcript", ""),
+                "audio_duration": stt.get("audio_duration"),
+                "word_timestamps": stt.get("word_timestamps"),
+            })
+
+        # 그래프 실행 (스트리밍 모드)
+        config = {"configurable": {"thread_id": session_id, "deadline": deadline}}
+        final_state: Dict[str, Any] = dict(initial_state)
+
+        current_step = "stt"
+        async for event in graph.astream(initial_state, config, stream_mode="updates"):
+            # 노드별 진행 상황 업데이트
+            for node_name, node_output in event.items():
+                merge_node_output(final_state, node_output or {})
+
+                # 노드 이름에 따라 step과 progress 결정
+                if "stt" in node_name:
+                    current_step = "stt"
+                    await progress("stt", 100, "음성 인식 완료")
+                    await progress("analysis", 0, "AI 분석을 시작합니다...")
+
+                elif "analyze" in node_name or "analysis" in node_name:
+                    current_step = "analysis"
+                    await progress("analysis", 50, "스피치 패턴 분석 중...")
+
+                elif "improve" in node_name:
+                    current_step = "improvement"
+                    await progress("analysis", 100, "분석 완료")
+                    await progress("improvement", 0, "개선안 생성 중...")
+
+                elif "reflect" in node_name:
+                    current_step = "reflection"
+                    await progress("improvement", 50, "개선안 품질 검토 중...")
+
+                elif "tts" in node_name:
+                    current_step = "tts"
+                    await progress("improvement", 100, "개선안 생성 완료")
+                    await progress("tts", 0, "음성 생성 중...")
+
+                # 메시지 업데이트가 있으면 함께 전송
+                if node_output and node_output.get("messages"):
+                    await progress(current_step, 50, node_output["messages"][-1])
+
+        await progress("tts", 100, "완료!")
+
+        response_data = AnalyzeResponse(
+            session_id=session_id,
+            transcript=final_state.get("transcript", ""),
+            analysis=final_state.get("analysis_result", {}),
+            improved_script=final_state.get("improved_script", ""),
+            improved_audio_url=final_state.get("improved_audio_url", ""),
+            original_audio_url=payload["audio_url"],
+            refinement_count=0,
+            can_refine=True,
+            degradations=final_state.get("degradations", []),
+        )
+
+        await save_session_to_db(session_id, payload, final_state)
+
+        return response_data.model_dump()
+
+    finally:
+        print(f"[deadline] analyze {session_id}: {deadline.report()}")
+
+
+async def run_refine_preview_job(
+    job: Job,
+    bus: ProgressBus,
+    graph_factory: Optional[Callable[[], Any]] = None,
+) -> Dict[str, Any]:
+    """
+    재요청 Stage 1 (프리뷰) 작업 실행
+
+    TTS 없이 수정된 스크립트만 생성합니다.
+
+    Args:
+        job: 프리뷰 작업 (payload.state는 RefinementState)
+        bus: 진행 이벤트 버스
+        graph_factory: 그래프 생성 함수 (테스트/벤치마크에서 Mock 그래프 주입용)
+
+    Returns:
+        dict: refined_script, changes_summary
+    """
+    if graph_factory is None:
+        from langgraph.workflows.refinement import create_preview_graph
+        graph_factory = create_preview_graph
+
+    payload = job.payload
+    session_id = payload["session_id"]
+    deadline = job_deadline(payload, 90.0)
+
+    try:
+        await bus.publish_async(job.id, "progress", format_progress("refinement", 0, "개선안 수정 중..."))
+
+        graph = graph_factory()
+        config = {"configurable": {"thread_id": session_id, "deadline": deadline}}
+        result = await graph.ainvoke(payload["state"], config)
+
+        return {
+            "refined_script": result.get("refined_script", ""),
+            "changes_summary": result.get("changes_summary", ""),
+        }
+
+    finally:
+        print(f"[deadline] refine preview {session_id}: {deadline.report()}")
+
+
+async def run_document_extraction_job(job: Job, bus: ProgressBus) -> Dict[str, Any]:
+    """
+    문서 추출 워밍업 작업 실행
+
+    문서 업로드 직후 프로젝트 문서의 핵심 정보 추출을 미리 실행해 저장하고, 문서 검색 색인을 만듭니다.
+    이후 Deep Mode 세션은 저장된 결과를 바로 사용합니다. (문서가 그대로면 추출하지 않음)
+
+    Args:
+        job: 워밍업 작업 (payload.project_id)
+        bus: 진행 이벤트 버스
+
+    Returns:
+        dict: project_id, document_count, cached (이미 같은 문서로 추출된 결과가 있었는지)
+    """
+    payload = job.payload
+    project_id = payload["project_id"]
+    deadline = job_deadline(payload, 120.0)
+
+    try:
+        documents = await asyncio.to_thread(load_project_documents, project_id)
+        if not documents:
+            return {"project_id": project_id, "document_count": 0, "cached": False}
+
+        await bus.publish_async(job.id, "progress", format_progress("context", 0, "문서 분석 중..."))
+        _, cached = await extract_document_context(project_id, documents, deadline, record_stats=False)
+        await get_document_index(project_id, documents)
+
+        return {"project_id": project_id, "document_count": len(documents), "cached": cached}
+
+    finally:
+        print(f"[deadline] document extraction {project_id}: {deadline.report()}")
+
+
+async def run_speculative_tts_job(job: Job, bus: ProgressBus) -> Dict[str, Any]:
+    """
+    프리뷰 음성 미리 생성 작업 실행 (api/speculation.py)
+
+    Stage 1 프리뷰 스크립트의 음성을 만들어 스크립트 + 음성 해시 이름으로 저장합니다.
+    Stage 2에서 같은 스크립트를 확정하면 이 결과를 바로 사용합니다.
+
+    Args:
+        job: 미리 생성 작업 (payload.script, voice_type, voice_clone_id)
+        bus: 진행 이벤트 버스
+
+    Returns:
+        dict: audio_url (시간 예산이 부족해 생략되면 빈 문자열), chars
+    """
+    from langgraph.nodes.tts import generate_tts
+
+    payload = job.payload
+    deadline = job_deadline(payload, 120.0)
+
+    try:
+        result = await generate_tts(
+            {
+                # Storage 파일명 (작업 ID의 해시 부분 - 같은 스크립트 / 음성이면 같은 파일)
+                "session_id": f"speculative_{job.id.removeprefix('tts:')}",
+                "improved_script": payload["script"],
+                "voice_type": payload.get("voice_type", "default_male"),
+                "voice_clone_id": payload.get("voice_clone_id"),
+            },
+            {"configurable": {"deadline": deadline}},
+        )
+        return {"audio_url": result.get("improved_audio_url", ""), "chars": payload.get("chars", 0)}
+
+    finally:
+        print(f"[deadline] speculative tts {payload.get('session_id')}: {deadline.report()}")
+
+
+def merge_node_output(state: Dict[str, Any], node_output: Dict[str, Any]) -> None:
+    """노드 출력을 상태에 반영 (누적 필드는 이어 붙임)"""
+    for key, value in node_output.items():
+        if key in _ACCUMULATED_FIELDS:
+            state[key] = list(state.get(key) or []) + list(value or [])
+        else:
+            state[key] = value
+
+
+def job_deadline(payload: Dict[str, Any], default_seconds: float) -> Deadline:
+    """
+    작업의 시간 예산
+
+    요청이 등록한 만료 시각(`deadline_at`)이 있으면 그 시각까지 남은 시간만 사용합니다.
+    (큐 대기와 lease 만료 후 재실행에 예산을 새로 주지 않음)
+    """
+    budget = payload.get("deadline_seconds", default_seconds)
+    if payload.get("deadline_at") is not None:
+        return Deadline.from_expiry(payload["deadline_at"], budget)
+    return Deadline(budget)
+
+
+def format_progress(step: str, progress: int, message: str) -> dict:
+    """progress 이벤트 데이터"""
+    return {
+        "step": step,
+        "progress": progress,
+        "message": message,
+    }
+
+
+def categorize_error(error: Exception) -> str:
+    """에러를 카테고리별 코드로 변환"""
+    # 제공자 장애로 서킷이 열린 경우 (재시도해도 당장은 실패)
+    if isinstance(error, CircuitOpenError):
+        return "UPSTREAM_UNAVAILABLE"
+
+    # 요청 전체 시간 예산 초과
+    if isinstance(error, DeadlineExceeded):
+        return "DEADLINE_EXCEEDED"
+
+    error_str = str(error).lower()
+
+    if "audio" in error_str or "whisper" in error_str:
+        if "too short" in error_str:
+            return "AUDIO_TOO_SHORT"
+        if "too long" in error_str:
+            return "AUDIO_TOO_LONG"
+        if "format" in error_str:
+            return "AUDIO_INVALID_FORMAT"
+        return "AUDIO_PROCESSING_ERROR"
+
+    if "anthropic" in error_str or "claude" in error_str:
+        if "rate" in error_str:
+            return "RATE_LIMIT_CLAUDE"
+        return "ANALYSIS_ERROR"
+
+    if "elevenlabs" in error_str or "tts" in error_str:
+        if "rate" in error_str:
+            return "RATE_LIMIT_TTS"
+        return "TTS_ERROR"
+
+    return "INTERNAL_ERROR"
+
+
+async def save_session_to_db(
+    session_id: str,
+    payload: Dict[str, Any],
+    final_state: dict
+) -> None:
+    """
+    세션 결과를 저장 큐에 넣음 (api/persistence.py)
+
+    실제 저장은 배치로 처리되며, 저장 후 사용자 패턴 캐시를 비웁니다.
+    큐가 가득 차면 빈자리가 날 때까지 기다립니다.
+    """
+    row = attempt_row(session_id, payload, final_state)
+    if row is None:
+        return
+    try:
+        await get_session_writer().put(row)
+    except Exception as e:
+        # 로깅만 하고 사용자에게는 에러 표시 안 함
+        print(f"Failed to save session {session_id}: {e}")
+
+
+# 작업 종류별 기본 핸들러 ("모듈:함수" 형식 - 워커 프로세스에서 import)
+DEFAULT_HANDLERS: Dict[str, str] = {
+    "analyze": "api.jobs.runner:run_analysis_job",
+    "refine_preview": "api.jobs.runner:run_refine_preview_job",
+    "document_extraction": "api.jobs.runner:run_document_extraction_job",
+    "speculative_tts": "api.jobs.runner:run_speculative_tts_job",
+}
@@ -0,0 +1,118 @@
+"""
+모드별 비용 리포트 (오프라인)
+
+비용 원장(`usage_ledger`, langgraph/utils/ledger.py)을 기간별로 모아
+모드(quick / deep / refine / ...)마다 세션 수, 토큰 / 오디오 / TTS 사용량, 비용과 세션당 비용을 출력합니다.
+DB 함수 `usage_report`가 집계하므로 원장 행을 내려받지 않습니다.
+
+## 실행
+
+```bash
+# 이번 달
+python -m api.jobs.usage_report
+
+# 기간 지정 (until은 포함하지 않음)
+python -m api.jobs.usage_report --since 2026-09-01 --until 2026-10-01
+```
+"""
+
+import argparse
+import os
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from supabase import create_client
+
+from langgraph.utils.ledger import month_start
+
+
+COLUMNS = (
+    ("mode", "mode", "{:<20}"),
+    ("sessions", "sessions", "{:>9,}"),
+    ("users", "users", "{:>7,}"),
+    ("input_tokens", "input tok", "{:>13,}"),
+    ("output_tokens", "output tok", "{:>12,}"),
+    ("cache_read_tokens", "cache read", "{:>13,}"),
+    ("cache_creation_tokens", "cache write", "{:>12,}"),
+    ("audio_minutes", "audio min", "{:>10,.1f}"),
+    ("tts_characters", "tts chars", "{:>11,}"),
+    ("cost_usd", "cost $", "{:>10,.2f}"),
+    ("cost_per_session", "$/session", "{:>10,.4f}"),
+)
+
+SUMMED = ("sessions", "users", "input_tokens", "output_tokens", "cache_read_tokens",
+          "cache_creation_tokens", "audio_seconds", "tts_characters", "cost_usd")
+
+
+def usage_report(
+    since: datetime,
+    until: Optional[datetime] = None,
+    client=None,
+) -> List[dict]:
+    """
+    기간 내 모드별 사용량 / 비용
+
+    Args:
+        since: 시작 시각 (포함)
+        until: 끝 시각 (제외, 기본: 지금)
+        client: Supabase 클라이언트 (기본: 환경변수로 생성)
+
+    Returns:
+        list: 모드별 행 (비용 내림차순) - usage_report 컬럼 + audio_minutes, cost_per_session
+    """
+    client = client or create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_KEY"))
+
+    response = client.rpc("usage_report", {
+        "p_since": since.isoformat(),
+        "p_until": (until or datetime.now(timezone.utc)).isoformat(),
+    }).execute()
+
+    rows = []
+    for row in response.data or []:
+        row = {**row, **{key: float(row.get(key) or 0) for key in SUMMED}}
+        row["audio_minutes"] = row["audio_seconds"] / 60
+        row["cost_per_session"] = row["cost_usd"] / row["sessions"] if row["sessions"] else 0.0
+        rows.append(row)
+    return rows
+
+
+def format_report(rows: List[dict]) -> str:
+    """모드별 행 + 합계 표 (users 합계는 모드 사이 중복 포함)"""
+    total = {"mode": "total", **{key: sum(row[key] for row in rows) for key in SUMMED}}
+    total["audio_minutes"] = total["audio_seconds"] / 60
+    total["cost_per_session"] = total["cost_usd"] / total["sessions"] if total["sessions"] else 0.0
+
+    def line(row: dict) -> str:
+        cells = []
+        for key, _, spec in COLUMNS:
+            value = row[key]
+            if spec.endswith(",}") and isinstance(value, float):
+                value = int(value)
+            cells.append(spec.format(value))
+        return " ".join(cells)
+
+    header = " ".join(
+        f"{label:<20}" if key == "mode" else f"{label:>{len(spec.format(0))}}"
+        for key, label, spec in COLUMNS
+    )
+    return "\n".join([header, *(line(row) for row in rows), "-" * len(header), line(total)])
+
+
+def parse_date(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Usage cost report per mode")
+    parser.add_argument("--since", type=parse_date, default=None, help="시작 날짜 (기본: 이번 달 1일)")
+    parser.add_argument("--until", type=parse_date, default=None, help="끝 날짜, 제외 (기본: 지금)")
+    args = parser.parse_args(argv)
+
+    since = args.since or month_start()
+    rows = usage_report(since, args.until)
+    print(f"[usage] {since:%Y-%m-%d} ~ {args.until or datetime.now(timezone.utc):%Y-%m-%d %H:%M} (UTC)")
+    print(format_report(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+"""
+작업 워커 / 워커 풀
+
+큐에서 작업을 가져와 핸들러를 실행하는 워커 프로세스입니다.
+HTTP 서버(uvicorn)와 분리된 프로세스로 실행되므로
+서버를 재시작해도 진행 중인 분석이 끊기지 않습니다.
+
+## 실행
+
+```bash
+# 레인별 전용 워커 풀 실행 (preview / quick / deep, lanes.py 설정)
+python -m api.jobs.worker
+
+# 특정 레인만 실행 (레인별로 다른 서버에 배치할 때)
+python -m api.jobs.worker --lane deep
+
+# 레인 구분 없이 공용 워커 4개 (프로세스당 동시 작업 2개)
+python -m api.jobs.worker --shared --workers 4 --concurrency 2
+```
+
+## 장애 처리
+
+- 워커는 실행 중인 작업의 lease를 주기적으로 연장합니다 (하트비트).
+- 워커가 죽으면 lease가 만료되고, 다른 워커가 작업을 다시 가져갑니다.
+- SIGTERM/SIGINT로 종료하면 진행 중인 작업을 즉시 큐에 반납합니다.
+"""
+
+import argparse
+import asyncio
+import importlib
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from ..persistence import close_session_writer
+from .bus import ProgressBus
+from .lanes import LANES, lane_caps
+from .queue import DEFAULT_DB_PATH, DEFAULT_LEASE_SECONDS, Job, JobQueue
+from .runner import DEFAULT_HANDLERS, categorize_error
+
+from langgraph.utils.ledger import close_usage_ledger, usage_account
+from langgraph.utils.loop_monitor import start_loop_monitor, stop_loop_monitor
+from langgraph.utils.profiling import profile_run
+from langgraph.utils.tracing import close_tracing, start_trace, use_span
+
+
+Handler = Callable[[Job, ProgressBus], Awaitable[dict]]
+
+# 큐가 비어 있을 때 다시 확인하는 주기 (초)
+DEFAULT_POLL_INTERVAL = 0.2
+
+
+def resolve_handler(spec: str) -> Handler:
+    """"모듈:함수" 문자열을 핸들러 함수로 변환"""
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class Worker:
+    """
+    단일 워커 (하나의 이벤트 루프에서 최대 concurrency개 작업 동시 실행)
+
+    Args:
+        queue: 작업 큐
+        handlers: 작업 종류 → 핸들러 ("모듈:함수" 문자열 또는 함수)
+        concurrency: 동시에 실행할 최대 작업 수
+        poll_interval: 큐가 비었을 때 대기 시간 (초)
+        lease_seconds: 작업 lease 기간 (초)
+        lanes: 처리할 레인 (None이면 전체)
+        lane_caps: 레인별 전역 동시 실행 상한
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Optional[Dict[str, object]] = None,
+        concurrency: int = 1,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        lanes: Optional[List[str]] = None,
+        lane_caps: Optional[Dict[str, int]] = None,
+    ):
+        self.queue = queue
+        self.bus = ProgressBus(queue)
+        self.handlers: Dict[str, Handler] = {
+            kind: resolve_handler(h) if isinstance(h, str) else h
+            for kind, h in (handlers or DEFAULT_HANDLERS).items()
+        }
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.lanes = lanes
+        self.lane_caps = lane_caps
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.processed = 0
+        self._running: Dict[str, asyncio.Task] = {}
+        # lease를 잃어 중단한 작업 (다른 워커가 다시 가져감)
+        self._lost: set = set()
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """
+        stop 이벤트가 설정될 때까지 작업 처리
+
+        종료 시 진행 중인 작업은 취소하고 큐에 반납합니다.
+        """
+        stop = stop or asyncio.Event()
+        kinds = list(self.handlers)
+
+        try:
+            while not stop.is_set():
+                if len(self._running) >= self.concurrency:
+                    # 슬롯이 빌 때까지 (또는 종료 요청까지) 대기
+                    stop_wait = asyncio.ensure_future(stop.wait())
+                    await asyncio.wait(
+                        [*self._running.values(), stop_wait],
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    stop_wait.cancel()
+                    continue
+
+                job = await asyncio.to_thread(
+                    self.queue.claim,
+                    self.worker_id,
+                    kinds,
+                    self.lease_seconds,
+                    self.lanes,
+                    self.lane_caps,
+                )
+                if job is None:
+                    try:
+                        await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                task = asyncio.create_task(self._execute(job))
+                self._running[job.id] = task
+                task.add_done_callback(lambda _, job_id=job.id: self._running.pop(job_id, None))
+        finally:
+            await self._shutdown()
+
+    async def _execute(self, job: Job) -> None:
+        """
+        작업 하나 실행 (lease 하트비트 포함)
+
+        요청의 트레이스를 이어 받아 job span을 기록하고,
+        관리자 프로파일링 요청(payload의 "profile")이면 핸들러 실행을 프로파일링합니다.
+        외부 API 사용량은 작업의 세션 / 사용자 / 모드로 비용 원장에 기록합니다.
+        lease를 잃으면 하트비트가 이 작업을 취소하고, 결과를 저장하거나 발행하지 않고 끝냅니다.
+        """
+        heartbeat = asyncio.create_task(self._heartbeat(job, asyncio.current_task()))
+        trace = start_trace(
+            f"job.{job.kind}",
+            traceparent=job.payload.get("traceparent"),
+            job_id=job.id,
+            lane=job.lane,
+            attempt=job.attempts,
+            worker_id=self.worker_id,
+        )
+        trace.record("queue.wait", job.created_at, time.time(), lane=job.lane)
+        payload = job.payload
+        account = usage_account(
+            payload.get("session_id") or job.id,
+            payload.get("user_id") if payload.get("is_authenticated", True) else None,
+            payload.get("mode") or job.kind,
+        )
+        try:
+            with use_span(trace, end_on_exit=True), account:
+                async with profile_run(job.payload.get("profile"), f"job.{job.kind}"):
+                    result = await self.handlers[job.kind](job, self.bus)
+        except asyncio.CancelledError:
+            if job.id in self._lost:
+                # 다른 워커가 실행 중이므로 큐 상태 / 이벤트는 건드리지 않음
+                self._lost.discard(job.id)
+                print(f"[worker {self.worker_id}] lost lease on job {job.id}, stopped")
+                return
+            await asyncio.to_thread(self.queue.release, job.id, self.worker_id)
+            raise
+        except Exception as e:
+            print(f"[worker {self.worker_id}] job {job.id} failed: {e}")
+            await asyncio.to_thread(self.queue.fail, job.id, str(e))
+            await self.bus.publish_async(job.id, "error", {
+                "code": categorize_error(e),
+                "message": str(e),
+            })
+            self.processed += 1
+        else:
+            await asyncio.to_thread(self.queue.complete, job.id, result)
+            await self.bus.publish_async(job.id, "complete", result)
+            self.processed += 1
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job: Job, task: asyncio.Task) -> None:
+        """lease 기간의 1/3마다 연장 (연장에 실패하면 lease를 잃은 것이므로 작업 취소)"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            extended = await asyncio.to_thread(
+                self.queue.extend_lease, job.id, self.worker_id, self.lease_seconds
+            )
+            if not extended:
+                # LLM / TTS 호출과 결과 저장이 두 번 일어나지 않도록 중단
+                self._lost.add(job.id)
+                task.cancel()
+                return
+
+    async def _shutdown(self) -> None:
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# ============================================
+# 워커 풀 (멀티 프로세스)
+# ============================================
+
+def _worker_main(
+    db_path: str,
+    handlers: Dict[str, str],
+    concurrency: int,
+    poll_interval: float,
+    lanes: Optional[List[str]],
+    caps: Optional[Dict[str, int]],
+) -> None:
+    """워커 프로세스 진입점"""
+
+    async def main() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+
+        worker = Worker(
+            JobQueue(db_path),
+            handlers=handlers,
+            concurrency=concurrency,
+            poll_interval=poll_interval,
+            lanes=lanes,
+            lane_caps=caps,
+        )
+        print(f"[worker {worker.worker_id}] started (lanes={lanes or 'all'}, concurrency={concurrency})")
+        start_loop_monitor("worker")
+        await worker.run(stop)
+        await stop_loop_monitor()
+        # 저장 큐에 남은 결과를 모두 저장한 뒤 종료
+        await close_session_writer()
+        await close_usage_ledger()
+        await close_tracing()
+        print(f"[worker {worker.worker_id}] stopped after {worker.processed} jobs")
+
+    asyncio.run(main())
+
+
+class WorkerPool:
+    """
+    워커 프로세스 풀
+
+    Args:
+        workers: 워커 프로세스 수
+        db_path: 작업 큐 SQLite 경로
+        handlers: 작업 종류 → "모듈:함수" (프로세스 간 전달을 위해 문자열만 허용)
+        concurrency: 프로세스당 동시 작업 수
+        poll_interval: 큐 폴링 주기 (초)
+        lanes: 처리할 레인 (None이면 전체)
+        lane_caps: 레인별 전역 동시 실행 상한
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        db_path: str = DEFAULT_DB_PATH,
+        handlers: Optional[Dict[str, str]] = None,
+        concurrency: int = 1,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        lanes: Optional[List[str]] = None,
+        lane_caps: Optional[Dict[str, int]] = None,
+    ):
+        self.workers = workers
+        self.db_path = db_path
+        self.handlers = handlers or DEFAULT_HANDLERS
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lanes = lanes
+        self.lane_caps = lane_caps
+        self.processes: List[multiprocessing.Process] = []
+
+    def start(self) -> None:
+        """워커 프로세스 시작"""
+        # 스키마를 미리 만들어 두어 워커들이 동시에 생성하지 않도록 함
+        JobQueue(self.db_path)
+
+        ctx = multiprocessing.get_context("spawn")
+        for _ in range(self.workers):
+            process = ctx.Process(
+                target=_worker_main,
+                args=(
+                    self.db_path,
+                    self.handlers,
+                    self.concurrency,
+                    self.poll_interval,
+                    self.lanes,
+                    self.lane_caps,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """워커 프로세스 종료 (진행 중 작업은 큐에 반납됨)"""
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+        self.processes = []
+
+    def join(self) -> None:
+        """모든 워커가 종료될 때까지 대기"""
+        for process in self.processes:
+            process.join()
+
+    def __enter__(self) -> "WorkerPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def create_lane_pools(
+    db_path: str = DEFAULT_DB_PATH,
+    handlers: Optional[Dict[str, str]] = None,
+    lane_names: Optional[List[str]] = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> List[WorkerPool]:
+    """
+    레인별 전용 워커 풀 생성
+
+    각 풀은 자신의 레인(+ overflow 레인)만 처리하며,
+    모든 풀이 같은 레인별 전역 상한을 공유합니다.
+    """
+    caps = lane_caps()
+    return [
+        WorkerPool(
+            lane.workers,
+            db_path=db_path,
+            handlers=handlers,
+            concurrency=lane.concurrency,
+            poll_interval=poll_interval,
+            lanes=lane.serves,
+            lane_caps=caps,
+        )
+        for name, lane in LANES.items()
+        if lane.workers > 0 and (not lane_names or name in lane_names)
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Sosoo job worker pool")
+    parser.add_argument("--lane", action="append", choices=list(LANES), help="실행할 레인 (기본: 전체)")
+    parser.add_argument("--shared", action="store_true", help="레인 구분 없이 공용 워커 풀 실행")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("JOB_WORKERS", "2")))
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("JOB_WORKER_CONCURRENCY", "1")))
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL)
+    parser.add_argument(
+        "--handler",
+        action="append",
+        default=[],
+        metavar="KIND=MODULE:FUNC",
+        help="작업 종류별 핸들러 지정 (기본 핸들러 대체)",
+    )
+    args = parser.parse_args(argv)
+
+    handlers = dict(DEFAULT_HANDLERS)
+    for spec in args.handler:
+        kind, _, target = spec.partition("=")
+        handlers[kind] = target
+
+    if args.shared:
+        pools = [WorkerPool(
+            args.workers,
+            db_path=args.db,
+            handlers=handlers,
+            concurrency=args.concurrency,
+            poll_interval=args.poll_interval,
+            lane_caps=lane_caps(),
+        )]
+    else:
+        pools = create_lane_pools(args.db, handlers, args.lane, args.poll_interval)
+
+    def shutdown(signum, frame):
+        for pool in pools:
+            pool.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    for pool in pools:
+        pool.start()
+        print(
+            f"[pool] lanes={pool.lanes or 'all'} "
+            f"workers={pool.workers}x{pool.concurrency} (db={args.db})"
+        )
+    for pool in pools:
+        pool.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+세션 결과 저장 (Write-behind)
+
+분석/재요청 결과를 요청 경로에서 바로 DB에 쓰지 않고 프로세스별 저장 큐(SessionWriter)에 넣습니다.
+백그라운드 flush 태스크가 큐에 쌓인 행을 모아 `write_attempts` RPC 한 번으로 `attempts`에 저장합니다.
+
+## 동작
+
+1. `put`: 크기 제한이 있는 큐에 행 추가. 큐가 가득 차면 빈자리가 날 때까지 기다림 (backpressure)
+   → DB가 느려지면 작업 완료가 늦어질 뿐, 태스크가 무한히 쌓이거나 쓰기가 사라지지 않음
+2. flush: 첫 행이 들어오면 `PERSIST_LINGER_MS` 동안 더 모은 뒤 최대 `PERSIST_BATCH_SIZE`개를 한 번에 저장
+   (같은 시도의 행은 하나로 합침 - 나중 값 우선)
+3. 재시도: 일시적 장애(연결/타임아웃/5xx/직렬화 실패)는 성공할 때까지 백오프 후 재시도
+   영구적 에러는 행별로 다시 저장해 문제 행만 실패 처리 (나머지 행은 저장)
+4. 종료: `close`가 큐에 남은 행을 모두 저장할 때까지 기다림 (`PERSIST_DRAIN_TIMEOUT_SECONDS` 초과 시 포기, 남은 행 수 로그)
+
+## 지표
+
+`metrics()`: 큐 깊이(현재/최대), 저장/실패/재시도 수, 배치 수, flush 지연 시간(p50/p95/max), put 대기 시간(max)
+
+## 사용 예시
+
+```python
+await get_session_writer().put({"id": session_id, "status": "completed", ...})
+
+# 프로세스 종료 시 (워커 / 앱 lifespan)
+await close_session_writer()
+```
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from supabase import create_client
+
+from langgraph.nodes.context import invalidate_user_patterns
+from langgraph.utils.resilience import RetryPolicy, classify_error
+
+
+PERSIST_QUEUE_SIZE = int(os.getenv("PERSIST_QUEUE_SIZE", "1000"))
+PERSIST_BATCH_SIZE = int(os.getenv("PERSIST_BATCH_SIZE", "100"))
+PERSIST_LINGER_MS = float(os.getenv("PERSIST_LINGER_MS", "50"))
+PERSIST_DRAIN_TIMEOUT_SECONDS = float(os.getenv("PERSIST_DRAIN_TIMEOUT_SECONDS", "30"))
+
+# 재시도 백오프 (일시적 장애는 횟수 제한 없이 재시도 - 그동안 큐가 차면 put이 대기)
+PERSIST_RETRY_POLICY = RetryPolicy(base_delay=0.2, max_delay=5.0)
+
+# 재시도 대상 SQLSTATE / PostgREST 에러 코드 접두사
+# (08: 연결, 40001: 직렬화 실패, 40P01: 교착, 53: 자원 부족, 57P: 서버 종료, PGRST0: DB 연결 불가)
+RETRYABLE_DB_CODES = ("08", "40001", "40P01", "53", "57P", "PGRST0")
+
+# 재요청 세션 필드 → attempts 컬럼
+SESSION_FIELDS = {
+    "improved_script": "improved_text",
+    "improved_audio_url": "improved_audio_url",
+    "refinement_count": "refinement_count",
+    "pending_refinement": "pending_refinement",
+}
+
+_STOP = object()
+
+
+def write_attempts(rows: List[dict]) -> int:
+    """시도 행 배치 저장 (동기, 스레드에서 호출 / 저장된 행 수 반환)"""
+
+    supabase = create_client(
+        os.getenv("SUPABASE_URL"),
+        os.getenv("SUPABASE_SERVICE_KEY")
+    )
+
+    return supabase.rpc("write_attempts", {"p_rows": rows}).execute().data or 0
+
+
+def is_retryable(error: BaseException) -> bool:
+    """일시적 장애 여부 (HTTP/SDK 분류 + DB 에러 코드)"""
+    if classify_error(error) == "retryable":
+        return True
+    code = getattr(error, "code", None) or getattr(error, "sqlstate", None)
+    return isinstance(code, str) and code.startswith(RETRYABLE_DB_CODES)
+
+
+def attempt_row(session_id: str, payload: Dict[str, Any], final_state: dict) -> Optional[dict]:
+    """
+    분석 작업 결과 → attempts 행
+
+    Guest 세션은 attempts에 저장하지 않습니다 (None).
+    question_id가 없으면 프론트엔드가 만든 시도 행만 갱신됩니다.
+    """
+    if not payload.get("is_authenticated") or not payload.get("user_id"):
+        return None
+
+    row = {
+        "id": session_id,
+        "user_id": payload["user_id"],
+        "original_text": final_state.get("transcript", ""),
+        "duration_seconds": final_state.get("audio_duration"),
+        "analysis": final_state.get("analysis_result") or {},
+        "improved_text": final_state.get("improved_script", ""),
+        "original_audio_url": payload.get("audio_url"),
+        "improved_audio_url": final_state.get("improved_audio_url") or None,
+        "status": "completed",
+    }
+    if payload.get("question_id"):
+        row["question_id"] = payload["question_id"]
+    return row
+
+
+def session_update_row(session_id: str, updates: Dict[str, Any]) -> dict:
+    """재요청 세션 업데이트 → attempts 부분 갱신 행 (알 수 없는 필드는 제외)"""
+    row = {"id": session_id}
+    for field, column in SESSION_FIELDS.items():
+        if field in updates:
+            row[column] = updates[field]
+    return row
+
+
+def merge_rows(rows: List[dict]) -> List[dict]:
+    """같은 시도의 행을 하나로 합침 (나중 값 우선, 처음 들어온 순서 유지)"""
+    merged: Dict[str, dict] = {}
+    for row in rows:
+        merged.setdefault(row["id"], {}).update(row)
+    return list(merged.values())
+
+
+class SessionWriter:
+    """
+    Write-behind 저장 큐
+
+    Args:
+        write: 배치 저장 함수 (동기, 스레드에서 호출 / 기본: write_attempts RPC)
+        maxsize: 큐 최대 행 수
+        batch_size: 한 번에 저장하는 최대 행 수
+        linger: 첫 행 이후 더 모으는 시간 (초)
+        policy: 재시도 백오프 정책
+        on_written: 저장 성공 후 호출 (저장된 행 목록, 캐시 무효화 등)
+    """
+
+    def __init__(
+        self,
+        write: Callable[[List[dict]], Any] = write_attempts,
+        maxsize: int = PERSIST_QUEUE_SIZE,
+        batch_size: int = PERSIST_BATCH_SIZE,
+        linger: float = PERSIST_LINGER_MS / 1000,
+        policy: RetryPolicy = PERSIST_RETRY_POLICY,
+        on_written: Optional[Callable[[List[dict]], None]] = None,
+    ):
+        self.write = write
+        self.batch_size = batch_size
+        self.linger = linger
+        self.policy = policy
+        self.on_written = on_written
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.closed = False
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            "enqueued": 0,
+            "written": 0,
+            "failed": 0,
+            "retries": 0,
+            "batches": 0,
+            "max_depth": 0,
+            "max_put_wait_ms": 0.0,
+        }
+        self._flush_ms: deque = deque(maxlen=512)
+
+    async def put(self, row: dict) -> None:
+        """
+        저장할 행 추가 (큐가 가득 차면 대기)
+
+        Raises:
+            RuntimeError: close 이후 호출한 경우
+        """
+        if self.closed:
+            raise RuntimeError("SessionWriter is closed")
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+        started = time.perf_counter()
+        await self.queue.put(row)
+        waited_ms = (time.perf_counter() - started) * 1000
+
+        self.stats["enqueued"] += 1
+        self.stats["max_depth"] = max(self.stats["max_depth"], self.queue.qsize())
+        self.stats["max_put_wait_ms"] = max(self.stats["max_put_wait_ms"], waited_ms)
+
+    async def close(self, timeout: float = PERSIST_DRAIN_TIMEOUT_SECONDS) -> None:
+        """남은 행을 모두 저장하고 종료 (timeout 안에 끝나지 않으면 남은 행은 버림)"""
+        if self.closed:
+            return
+        self.closed = True
+        if self._task is None:
+            return
+
+        async def drain() -> None:
+            # DB 장애로 큐가 가득 차 있으면 STOP을 넣는 것부터 막히므로 같은 시간 제한 안에서 처리
+            await self.queue.put(_STOP)
+            await asyncio.shield(self._task)
+
+        try:
+            await asyncio.wait_for(drain(), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            print(f"[persist] drain timed out after {timeout:.0f}s, {self.queue.qsize()} rows not saved")
+        print(f"[persist] closed: {self.metrics()}")
+
+    def metrics(self) -> Dict[str, Any]:
+        """큐 깊이 / 처리 수 / flush 지연 시간 (ms)"""
+        latencies = sorted(self._flush_ms)
+
+        def percentile(p: float) -> float:
+            return round(latencies[min(int(len(latencies) * p), len(latencies) - 1)], 1) if latencies else 0.0
+
+        return {
+            "depth": self.queue.qsize(),
+            **self.stats,
+            "flush_ms_p50": percentile(0.5),
+            "flush_ms_p95": percentile(0.95),
+            "flush_ms_max": round(latencies[-1], 1) if latencies else 0.0,
+        }
+
+    async def _run(self) -> None:
+        """flush 루프 (STOP을 받으면 그 전까지 들어온 행을 저장하고 종료)"""
+        stopping = False
+        while not stopping:
+            first = await self.queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+
+            if self.linger > 0 and self.queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.linger)
+            while len(batch) < self.batch_size and not self.queue.empty():
+                row = self.queue.get_nowait()
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            await self._flush(merge_rows(batch))
+
+    async def _flush(self, rows: List[dict]) -> None:
+        started = time.perf_counter()
+        try:
+            await self._write_with_retry(rows)
+        except Exception as e:
+            # 영구적 에러 → 문제 행만 골라내기 위해 행별로 저장
+            print(f"[persist] batch of {len(rows)} failed ({e}), retrying row by row")
+            written = []
+            for row in rows:
+                try:
+                    await self._write_with_retry([row])
+                    written.append(row)
+                except Exception as row_error:
+                    self.stats["failed"] += 1
+                    print(f"[persist] attempt {row.get('id')} not saved: {row_error}")
+            rows = written
+
+        self._flush_ms.append((time.perf_counter() - started) * 1000)
+        self.stats["batches"] += 1
+        self.stats["written"] += len(rows)
+        if rows and self.on_written:
+            try:
+                self.on_written(rows)
+            except Exception as e:
+                print(f"[persist] on_written hook failed: {e}")
+
+    async def _write_with_retry(self, rows: List[dict]) -> None:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await asyncio.to_thread(self.write, rows)
+                return
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                self.stats["retries"] += 1
+                delay = self.policy.backoff_delay(min(attempt, 10))
+                print(f"[persist] write of {len(rows)} rows failed ({e}), retry in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+
+def invalidate_written_users(rows: List[dict]) -> None:
+    """저장된 시도의 사용자 패턴 캐시 무효화 (DB 요약이 트리거로 갱신되었으므로)"""
+    for user_id in {row.get("user_id") for row in rows}:
+        invalidate_user_patterns(user_id)
+
+
+# SessionWriter의 큐와 태스크는 이벤트 루프에 묶이므로 루프별로 관리
+_writers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, SessionWriter]" = weakref.WeakKeyDictionary()
+
+
+def get_session_writer() -> SessionWriter:
+    """현재 이벤트 루프의 저장 큐 (없으면 생성)"""
+    loop = asyncio.get_running_loop()
+    writer = _writers.get(loop)
+    if writer is None or writer.closed:
+        writer = SessionWriter(on_written=invalidate_written_users)
+        _writers[loop] = writer
+    return writer
+
+
+async def close_session_writer(timeout: float = PERSIST_DRAIN_TIMEOUT_SECONDS) -> None:
+    """현재 이벤트 루프의 저장 큐 종료 (남은 행 저장)"""
+    writer = _writers.pop(asyncio.get_running_loop(), None)
+    if writer is not None:
+        await writer.close(timeout)
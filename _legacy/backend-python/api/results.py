@@ -0,0 +1,242 @@
+"""
+분석 결과 저장소 (GET /analyze/{session_id})
+
+SSE 연결이 끊긴 클라이언트가 파이프라인을 다시 실행하지 않고 완료된 결과를 가져갈 수 있도록
+세 단계로 결과를 찾습니다.
+
+1. 프로세스 LRU: 최근 완료된 결과의 응답 본문(JSON 바이트)과 ETag (한 번만 직렬화)
+2. attempts: 저장 큐가 DB에 저장한 시도 행 (인증 사용자, 재요청 결과가 반영된 최신 값)
+3. 작업 큐: 워커가 남긴 완료 결과 (SQLite, Guest 또는 시도 행이 아직 저장되지 않은 경우)
+
+2, 3단계에서 찾은 결과는 1단계에 채웁니다. 같은 세션을 여러 요청이 동시에 조회하면
+DB 조회는 한 번만 실행하고 결과를 나눠 씁니다.
+
+2, 3단계 조회(`load_attempt`, `find_completed`)와 동시 조회 합치기(`SingleFlight`)는
+재요청 세션 캐시(api/sessions.py)와 같이 씁니다.
+
+## ETag
+
+응답 본문의 해시를 ETag로 보냅니다. 클라이언트가 `If-None-Match`로 같은 값을 보내면
+본문 없이 304를 반환합니다. (폴링 클라이언트의 전송량 / 직렬화 비용 절감)
+
+## 갱신
+
+재요청 Stage 2로 개선안이 바뀌면 `update`로 이 프로세스의 항목에 반영합니다.
+다른 프로세스의 항목은 `RESULT_CACHE_TTL_SECONDS` 후 만료됩니다.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from supabase import create_client
+
+from langgraph.utils.cache import LRUCache
+from langgraph.utils.tracing import span
+
+from .jobs import Job, JobQueue
+from .schemas import AnalyzeResponse, BaseResponse
+
+
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "2048"))
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "600"))
+
+# 최대 재요청 횟수 (refine.py와 동일)
+MAX_REFINEMENTS = 2
+
+# 결과 응답 + 재요청 세션에 필요한 컬럼
+ATTEMPT_COLUMNS = (
+    "id, user_id, original_text, analysis, improved_text, original_audio_url, "
+    "improved_audio_url, refinement_count, pending_refinement, status"
+)
+
+
+class StoredResult:
+    """직렬화된 응답 본문 + ETag + 소유자"""
+
+    __slots__ = ("body", "etag", "owner")
+
+    def __init__(self, data: Dict[str, Any], owner: Optional[str]):
+        self.body: bytes = BaseResponse(success=True, data=data).model_dump_json().encode()
+        self.etag: str = '"' + hashlib.blake2b(self.body, digest_size=16).hexdigest() + '"'
+        self.owner = owner
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """If-None-Match 헤더가 이 결과의 ETag를 포함하는지"""
+        if not if_none_match:
+            return False
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or self.etag in tags
+
+
+def load_attempt(session_id: str, user_id: str) -> Optional[dict]:
+    """완료된 시도 행 조회 (동기, 스레드에서 호출 / 본인 시도만)"""
+
+    supabase = create_client(
+        os.getenv("SUPABASE_URL"),
+        os.getenv("SUPABASE_SERVICE_KEY")
+    )
+
+    response = supabase.table("attempts") \
+        .select(ATTEMPT_COLUMNS) \
+        .eq("id", session_id) \
+        .eq("user_id", user_id) \
+        .eq("status", "completed") \
+        .limit(1) \
+        .execute()
+
+    return response.data[0] if response.data else None
+
+
+async def find_completed(
+    session_id: str,
+    requester: Optional[str],
+    queue: JobQueue,
+    is_authenticated: bool,
+    load_attempt: Callable[[str, str], Optional[dict]] = load_attempt,
+) -> Tuple[Optional[dict], Optional[Job]]:
+    """
+    완료된 분석 조회 (attempts → 작업 큐)
+
+    Args:
+        requester: 요청한 사용자 ID (Guest는 guest 세션 ID)
+        is_authenticated: True면 작업 큐보다 attempts를 먼저 조회
+        load_attempt: attempts 조회 함수 (동기, 스레드에서 호출)
+
+    Returns:
+        (attempts 행, None) / (None, 완료된 analyze 작업) / 없으면 (None, None)
+    """
+    if is_authenticated and requester:
+        try:
+            with span("db.attempts"):
+                row = await asyncio.to_thread(load_attempt, session_id, requester)
+            if row is not None:
+                return row, None
+        except Exception as e:
+            print(f"[results] attempt lookup failed for {session_id}: {e}")
+
+    with span("queue.get"):
+        job = await asyncio.to_thread(queue.get, session_id)
+    if job is not None and job.kind == "analyze" and job.status == "completed" and job.result:
+        return None, job
+    return None, None
+
+
+class SingleFlight:
+    """
+    같은 키의 동시 조회를 한 번만 실행하고 결과를 나눠 씀
+
+    먼저 기다리던 요청이 취소되어도 조회는 계속되어 다른 요청이 결과를 받습니다.
+    """
+
+    def __init__(self):
+        self._loading: Dict[str, asyncio.Task] = {}
+
+    async def run(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.ensure_future(load())
+            self._loading[key] = task
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        return await asyncio.shield(task)
+
+
+def attempt_response(row: dict) -> dict:
+    """attempts 행 → AnalyzeResponse 형식"""
+    refinement_count = row.get("refinement_count") or 0
+    return AnalyzeResponse(
+        session_id=row["id"],
+        transcript=row.get("original_text") or "",
+        analysis=row.get("analysis") or {},
+        improved_script=row.get("improved_text") or "",
+        improved_audio_url=row.get("improved_audio_url") or "",
+        original_audio_url=row.get("original_audio_url") or "",
+        refinement_count=refinement_count,
+        can_refine=refinement_count < MAX_REFINEMENTS,
+    ).model_dump()
+
+
+class ResultStore:
+    """
+    완료된 분석 결과 조회 (프로세스 LRU → attempts → 작업 큐)
+
+    Args:
+        maxsize: 프로세스에 보관하는 결과 수
+        ttl: 보관 시간 (초)
+        load_attempt: attempts 조회 함수 (동기, 스레드에서 호출)
+    """
+
+    def __init__(
+        self,
+        maxsize: int = RESULT_CACHE_SIZE,
+        ttl: float = RESULT_CACHE_TTL_SECONDS,
+        load_attempt=load_attempt,
+    ):
+        self.cache = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.load_attempt = load_attempt
+        self.loads: Dict[str, int] = {"attempts": 0, "queue": 0}
+        self._loading = SingleFlight()
+
+    def put(self, session_id: str, data: Dict[str, Any], owner: Optional[str]) -> StoredResult:
+        """완료된 결과 저장 (응답 본문으로 한 번 직렬화)"""
+        result = StoredResult(data, owner)
+        self.cache.set(session_id, result)
+        return result
+
+    def update(self, session_id: str, fields: Dict[str, Any]) -> None:
+        """보관 중인 결과의 일부 필드 갱신 (재요청 완료 시, 없으면 무시)"""
+        result = self.cache.get(session_id)
+        if result is None or not fields:
+            return
+        data = {**json.loads(result.body)["data"], **fields}
+        if "refinement_count" in fields:
+            data["can_refine"] = fields["refinement_count"] < MAX_REFINEMENTS
+        self.put(session_id, data, result.owner)
+
+    def invalidate(self, session_id: str) -> None:
+        self.cache.invalidate(session_id)
+
+    async def get(
+        self,
+        session_id: str,
+        requester: Optional[str],
+        queue: JobQueue,
+        is_authenticated: bool = False,
+    ) -> Optional[StoredResult]:
+        """
+        결과 조회 (없거나 다른 사용자의 결과면 None)
+
+        Args:
+            requester: 요청한 사용자 ID (Guest는 guest 세션 ID)
+            is_authenticated: True면 작업 큐보다 attempts를 먼저 조회
+        """
+        result = self.cache.get(session_id)
+        if result is None:
+            result = await self._loading.run(
+                session_id, lambda: self._load(session_id, requester, queue, is_authenticated)
+            )
+
+        if result is None or result.owner != requester:
+            return None
+        return result
+
+    async def _load(
+        self,
+        session_id: str,
+        requester: Optional[str],
+        queue: JobQueue,
+        is_authenticated: bool,
+    ) -> Optional[StoredResult]:
+        row, job = await find_completed(session_id, requester, queue, is_authenticated, self.load_attempt)
+        if row is not None:
+            self.loads["attempts"] += 1
+            return self.put(session_id, attempt_response(row), row["user_id"])
+        if job is not None:
+            self.loads["queue"] += 1
+            return self.put(session_id, job.result, job.payload.get("user_id"))
+        return None
+
+
+RESULT_STORE = ResultStore()
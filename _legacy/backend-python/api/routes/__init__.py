@@ -7,9 +7,13 @@ API 라우트 패키지
 from .health import router as health_router
 from .analyze import router as analyze_router
 from .refine import router as refine_router
+from .jobs import router as jobs_router
+from .projects import router as projects_router
 
 __all__ = [
     "health_router",
     "analyze_router",
     "refine_router",
+    "jobs_router",
+    "projects_router",
 ]
@@ -3,44 +3,64 @@
 
 스피치 분석의 메인 엔드포인트입니다.
 SSE(Server-Sent Events)를 사용하여 실시간 진행 상황을 전달합니다.
+
+- `POST /analyze`: Storage에 먼저 올린 오디오 URL로 분석
+- `POST /analyze/upload`: 오디오를 직접 업로드 (Storage 업로드와 Whisper 전사를 동시에 진행)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
 from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 import json
 import asyncio
+import time
 import uuid
 
 from ..schemas import (
     AnalyzeRequest,
-    AnalyzeResponse,
     ProgressEvent,
-    BaseResponse,
 )
-from ..dependencies import UserContext, get_user_context, get_supabase
+from ..dependencies import (
+    UserContext,
+    check_usage_budget,
+    get_job_queue,
+    get_profile_id,
+    get_supabase,
+    get_user_context,
+)
 from ..config import Settings, get_settings
+from ..jobs import JobQueue, ProgressBus, get_lane, lane_for_analysis, to_sse
+from ..jobs.runner import categorize_error, format_progress
+from ..results import RESULT_STORE
+from ..sessions import SESSION_STORE
+from ..uploads import StreamingForm, UploadError, UploadTooLarge, transcribe_upload
 
-# LangGraph 워크플로우 import
-from langgraph.workflows.speech_coach import create_speech_coach_graph
-from langgraph.state import SpeechCoachState
+from langgraph.utils.deadline import Deadline
+from langgraph.utils.ledger import usage_account
+from langgraph.utils.profiling import profile_run
+from langgraph.utils.tracing import Span, current_traceparent, span, start_trace, use_span
 
 router = APIRouter(tags=["Analysis"])
 
 
-@router.post("/analyze")
+@router.post("/analyze", dependencies=[Depends(check_usage_budget)])
 async def analyze_speech(
     request: AnalyzeRequest,
     user_context: UserContext = Depends(get_user_context),
     settings: Settings = Depends(get_settings),
+    queue: JobQueue = Depends(get_job_queue),
+    profile_id: Optional[str] = Depends(get_profile_id),
 ) -> EventSourceResponse:
     """
     스피치 분석 API (SSE 스트리밍)
     
-    오디오 URL을 받아 STT → 분석 → 개선안 생성 → TTS 파이프라인을 실행합니다.
+    오디오 URL을 받아 STT → 분석 → 개선안 생성 → TTS 파이프라인 작업을 큐에 등록합니다.
+    파이프라인은 별도 워커 프로세스(`python -m api.jobs.worker`)에서 실행되며,
     각 단계의 진행 상황을 SSE로 실시간 전송합니다.
     
+    연결이 끊어지면 `GET /jobs/{session_id}/events`로 이어서 구독할 수 있습니다.
+    
     ## SSE 이벤트 타입
     
     - `progress`: 진행 상황 업데이트
@@ -60,201 +80,315 @@ async def analyze_speech(
     
     ## 인증
     
-    - 인증된 사용자: 전체 기능 사용 가능
+    - 인증된 사용자: 전체 기능 사용 가능 (월 비용 예산을 넘으면 429 `BUDGET_EXCEEDED`)
     - Guest: Quick Mode만 사용 가능, Voice Clone 불가
+    
+    ## 프로파일링 (관리자)
+    
+    `X-Profile-Token` 헤더(또는 `?profile=`)를 붙이면 이 요청의 워커 실행만 프로파일링하고
+    결과 위치를 응답 헤더 `X-Profile-Id`로 알려줍니다. (langgraph/utils/profiling.py)
     """
     
-    # Guest 사용자 제한 확인
-    if not user_context.is_authenticated:
-        if request.mode == "deep":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail={
-                    "code": "FORBIDDEN_GUEST_DEEP_MODE",
-                    "message": "Deep Mode requires authentication. Please sign in."
-                }
-            )
-        if request.voice_type == "cloned":
-            # Voice Clone은 인증+동의 필요
-            request.voice_type = "default_male"  # 자동 fallback
+    check_guest_limits(request, user_context)
     
-    # 세션 ID 생성
+    # 세션 ID 생성 (작업 ID로도 사용)
     session_id = str(uuid.uuid4())
     
-    # SSE 이벤트 제너레이터
-    async def event_generator() -> AsyncGenerator[dict, None]:
+    # 요청 트레이스 (SSE 중계가 끝날 때 종료, 워커는 payload의 traceparent로 이어 받음)
+    trace = start_trace("POST /analyze", session_id=session_id, mode=request.mode)
+    with use_span(trace):
+        await enqueue_analysis(queue, session_id, request, user_context, settings, profile_id=profile_id)
+    
+    return EventSourceResponse(
+        relay_job_events(
+            queue, session_id, settings=settings, first_event=True,
+            result_owner=user_context.user_id or user_context.guest_session,
+            voice_type=request.voice_type,
+            trace=trace,
+        ),
+        headers={"X-Profile-Id": profile_id} if profile_id else None,
+    )
+
+
+@router.post("/analyze/upload", dependencies=[Depends(check_usage_budget)])
+async def analyze_upload(
+    http_request: Request,
+    user_context: UserContext = Depends(get_user_context),
+    settings: Settings = Depends(get_settings),
+    queue: JobQueue = Depends(get_job_queue),
+    profile_id: Optional[str] = Depends(get_profile_id),
+) -> EventSourceResponse:
+    """
+    스피치 분석 API - 직접 업로드 (SSE 스트리밍)
+    
+    브라우저 → Storage → 서버 다운로드 → Whisper의 추가 왕복 없이,
+    업로드 본문을 받는 대로 Storage 업로드와 Whisper 전사에 동시에 흘려보냅니다.
+    파일 전체를 메모리에 모으지 않습니다.
+    
+    전사가 끝나면 작업을 큐에 등록하고 `/analyze`와 같은 SSE 이벤트를 전송합니다.
+    (워커는 STT를 건너뛰고 분석부터 실행)
+    
+    ## 요청 (multipart/form-data)
+    
+    - `mode`, `voice_type`, `question`, `project_id`: `/analyze`와 동일 (파일보다 앞에 보낼 것)
+    - `audio`: 녹음 파일 (필수)
+    
+    프로파일링(`X-Profile-Token`)은 `/analyze`와 같고, 업로드 + 전사 구간도 함께 기록합니다.
+    
+    ## 에러 (HTTP)
+    
+    - 400 `INVALID_REQUEST`: multipart 형식 오류, audio 필드 누락, 폼 필드 값 오류
+    - 400 `AUDIO_TOO_SHORT` / `AUDIO_TOO_LONG`: 헤더 또는 전사 결과로 확인한 길이가 범위 밖
+    - 413 `AUDIO_TOO_LARGE`: 파일이 MAX_UPLOAD_BYTES를 넘음 (Storage / Whisper 업로드 중단)
+    - 502 `AUDIO_UPLOAD_FAILED`: Storage 업로드 실패
+    """
+    
+    session_id = str(uuid.uuid4())
+    deadline = Deadline(settings.analyze_deadline_seconds)
+    trace = start_trace("POST /analyze/upload", session_id=session_id)
+    
+    # 업로드 / 전사 / 작업 등록 중 에러가 나면 트레이스도 에러로 종료
+    with use_span(trace):
         try:
-            # 1. STT 단계
-            yield format_progress_event("stt", 0, "음성 인식을 시작합니다...")
-            
-            # LangGraph 워크플로우 생성 및 실행
-            graph = create_speech_coach_graph()
-            
-            # 초기 상태 설정
-            initial_state: SpeechCoachState = {
-                "session_id": session_id,
-                "user_id": user_context.user_id or user_context.guest_session,
-                "mode": request.mode,
-                "audio_file_path": request.audio_url,
-                "voice_type": request.voice_type,
-                "question": request.question,
-                "project_id": request.project_id,
-                "transcript": "",
-                "analysis_result": {},
-                "improved_script": "",
-                "improved_audio_url": "",
-                "previous_sessions": [],
-                "messages": [],
-            }
-            
-            # 그래프 실행 (스트리밍 모드)
-            config = {"configurable": {"thread_id": session_id}}
-            
-            current_step = "stt"
-            async for event in graph.astream(initial_state, config, stream_mode="updates"):
-                # 노드별 진행 상황 업데이트
-                for node_name, node_output in event.items():
-                    
-                    # 노드 이름에 따라 step과 progress 결정
-                    if "stt" in node_name:
-                        current_step = "stt"
-                        yield format_progress_event("stt", 100, "음성 인식 완료")
-                        yield format_progress_event("analysis", 0, "AI 분석을 시작합니다...")
-                    
-                    elif "analyze" in node_name or "analysis" in node_name:
-                        current_step = "analysis"
-                        yield format_progress_event("analysis", 50, "스피치 패턴 분석 중...")
-                    
-                    elif "improve" in node_name:
-                        current_step = "improvement"
-                        yield format_progress_event("analysis", 100, "분석 완료")
-                        yield format_progress_event("improvement", 0, "개선안 생성 중...")
-                    
-                    elif "reflect" in node_name:
-                        current_step = "reflection"
-                        yield format_progress_event("improvement", 50, "개선안 품질 검토 중...")
-                    
-                    elif "tts" in node_name:
-                        current_step = "tts"
-                        yield format_progress_event("improvement", 100, "개선안 생성 완료")
-                        yield format_progress_event("tts", 0, "음성 생성 중...")
-                    
-                    # 메시지 업데이트가 있으면 함께 전송
-                    if "messages" in node_output and node_output["messages"]:
-                        latest_message = node_output["messages"][-1]
-                        yield format_progress_event(
-                            current_step, 
-                            50, 
-                            latest_message
-                        )
-            
-            # 최종 상태 가져오기
-            final_state = graph.get_state(config).values
-            
-            yield format_progress_event("tts", 100, "완료!")
-            
-            # 완료 이벤트 전송
-            response_data = AnalyzeResponse(
-                session_id=session_id,
-                transcript=final_state.get("transcript", ""),
-                analysis=final_state.get("analysis_result", {}),
-                improved_script=final_state.get("improved_script", ""),
-                improved_audio_url=final_state.get("improved_audio_url", ""),
-                original_audio_url=request.audio_url,
-                refinement_count=0,
-                can_refine=True,
+            form = StreamingForm(http_request.headers.get("content-type", ""))
+            chunks = await form.start(http_request.stream())
+        except UploadError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"code": "INVALID_REQUEST", "message": str(e)}
             )
-            
-            yield {
-                "event": "complete",
-                "data": json.dumps(response_data.model_dump(), ensure_ascii=False)
-            }
-            
-            # DB에 세션 저장 (비동기로 처리)
-            asyncio.create_task(
-                save_session_to_db(session_id, user_context, request, final_state)
+        
+        # 파일 앞에 온 필드로 먼저 확인 (업로드 전에 거절)
+        ensure_mode_allowed(form.fields.get("mode", "quick"), user_context)
+        
+        try:
+            # 전사(Whisper) 사용량은 API 서버에서 이 세션으로 기록
+            with usage_account(session_id, user_context.user_id, form.fields.get("mode", "quick")):
+                async with profile_run(profile_id, "analyze.upload"):
+                    upload = await transcribe_upload(
+                        chunks, session_id, form.filename, form.file_content_type, deadline
+                    )
+            # 폼에 audio_url 필드가 와도 업로드한 URL로 덮어씀 (키 중복 TypeError 방지)
+            request = AnalyzeRequest(**{**form.fields, "audio_url": upload.audio_url})
+        except UploadTooLarge as e:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail={"code": "AUDIO_TOO_LARGE", "message": str(e)}
+            )
+        except UploadError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"code": "INVALID_REQUEST", "message": str(e)}
+            )
+        except ValueError as e:
+            # 길이 검증 실패 등 (pydantic ValidationError도 ValueError)
+            code = categorize_error(e)
+            if code in ("AUDIO_PROCESSING_ERROR", "INTERNAL_ERROR"):
+                code = "INVALID_REQUEST"
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"code": code, "message": str(e)}
             )
-            
         except Exception as e:
-            # 에러 이벤트 전송
-            error_code = categorize_error(e)
+            print(f"[upload] {session_id} failed: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail={"code": "AUDIO_UPLOAD_FAILED", "message": "Failed to upload audio. Please retry."}
+            )
+        finally:
+            print(f"[deadline] upload {session_id}: {deadline.report()}")
+        
+        check_guest_limits(request, user_context)
+        trace.set(mode=request.mode)
+        
+        await enqueue_analysis(
+            queue, session_id, request, user_context, settings,
+            stt=upload.stt,
+            # 업로드와 전사에 쓴 시간을 뺀 남은 예산
+            deadline_seconds=max(deadline.remaining(), 1.0),
+            profile_id=profile_id,
+        )
+    
+    return EventSourceResponse(
+        relay_job_events(
+            queue, session_id, settings=settings, first_event=True,
+            result_owner=user_context.user_id or user_context.guest_session,
+            voice_type=request.voice_type,
+            trace=trace,
+        ),
+        headers={"X-Profile-Id": profile_id} if profile_id else None,
+    )
+
+
+def ensure_mode_allowed(mode: str, user_context: UserContext) -> None:
+    """Guest 사용자는 Deep Mode 사용 불가"""
+    if not user_context.is_authenticated and mode == "deep":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "code": "FORBIDDEN_GUEST_DEEP_MODE",
+                "message": "Deep Mode requires authentication. Please sign in."
+            }
+        )
+
+
+def check_guest_limits(request: AnalyzeRequest, user_context: UserContext) -> None:
+    """Guest 사용자 제한 확인 (Deep Mode 거절, Voice Clone은 기본 음성으로 대체)"""
+    ensure_mode_allowed(request.mode, user_context)
+    if not user_context.is_authenticated:
+        if request.voice_type == "cloned":
+            # Voice Clone은 인증+동의 필요
+            request.voice_type = "default_male"  # 자동 fallback
+
+
+async def enqueue_analysis(
+    queue: JobQueue,
+    session_id: str,
+    request: AnalyzeRequest,
+    user_context: UserContext,
+    settings: Settings,
+    stt: Optional[dict] = None,
+    deadline_seconds: Optional[float] = None,
+    profile_id: Optional[str] = None,
+) -> None:
+    """
+    분석 작업을 큐에 등록
+    
+    모드별 레인의 워커 프로세스가 파이프라인을 실행합니다.
+    (Deep Mode 요청이 몰려도 Quick Mode 레인은 영향을 받지 않음)
+    
+    Args:
+        stt: 직접 업로드 경로에서 미리 전사한 결과 (있으면 워커가 STT를 건너뜀)
+        deadline_seconds: 작업 시간 예산 (기본: settings.analyze_deadline_seconds)
+        profile_id: 관리자 프로파일링 ID (있으면 워커가 이 작업을 프로파일링)
+    """
+    budget = deadline_seconds or settings.analyze_deadline_seconds
+    payload = {
+        "session_id": session_id,
+        "user_id": user_context.user_id or user_context.guest_session,
+        "is_authenticated": user_context.is_authenticated,
+        "mode": request.mode,
+        "audio_url": request.audio_url,
+        "voice_type": request.voice_type,
+        "question": request.question,
+        "question_id": request.question_id,
+        "project_id": request.project_id,
+        "deadline_seconds": budget,
+        # 워커는 이 시각까지 남은 시간만 사용 (큐 대기 / 재실행도 같은 예산)
+        "deadline_at": time.time() + budget,
+        "traceparent": current_traceparent(),
+    }
+    if stt:
+        payload["stt"] = stt
+    if profile_id:
+        payload["profile"] = profile_id
+    
+    lane = get_lane(lane_for_analysis(request.mode))
+    with span("queue.enqueue", lane=lane.name):
+        await asyncio.to_thread(
+            queue.enqueue,
+            "analyze",
+            payload,
+            priority=lane.priority,
+            job_id=session_id,
+            lane=lane.name,
+        )
+
+
+async def relay_job_events(
+    queue: JobQueue,
+    job_id: str,
+    settings: Settings,
+    after: int = 0,
+    first_event: bool = False,
+    result_owner: Optional[str] = None,
+    voice_type: Optional[str] = None,
+    trace: Optional[Span] = None,
+) -> AsyncGenerator[dict, None]:
+    """
+    작업 진행 이벤트를 SSE로 중계
+    
+    워커가 발행한 이벤트를 그대로 전달하고, complete/error 이벤트에서 종료합니다.
+    
+    Args:
+        result_owner: 분석 작업이면 결과 소유자 (complete 결과를 결과 저장소 / 재요청 세션 캐시에 채움)
+        voice_type: 분석 요청의 음성 타입 (재요청 세션에 보관)
+        trace: 요청 트레이스 (중계가 끝나면 종료)
+    """
+    outcome = None
+    try:
+        if first_event:
+            # 워커가 작업을 가져가기 전에도 연결이 살아 있음을 알림
+            yield format_progress_event("stt", 0, "분석 대기 중...")
+        
+        bus = ProgressBus(queue)
+        terminated = False
+        async for event in bus.subscribe(
+            job_id,
+            after=after,
+            timeout=settings.job_event_idle_timeout_seconds,
+        ):
+            terminated = event.is_terminal
+            if terminated:
+                outcome = event.event
+            if result_owner is not None and event.event == "complete":
+                RESULT_STORE.put(job_id, event.data, result_owner)
+                SESSION_STORE.put_result(job_id, event.data, result_owner, voice_type)
+            yield to_sse(event)
+        
+        if not terminated:
+            outcome = "timeout"
             yield {
                 "event": "error",
                 "data": json.dumps({
-                    "code": error_code,
-                    "message": str(e)
+                    "code": "JOB_TIMEOUT",
+                    "message": "No progress from worker. Please retry later."
                 }, ensure_ascii=False)
             }
-    
-    return EventSourceResponse(event_generator())
+    finally:
+        if trace is not None:
+            # 클라이언트가 먼저 끊은 경우 outcome은 None
+            trace.set(outcome=outcome or "disconnected")
+            trace.end()
 
 
 def format_progress_event(step: str, progress: int, message: str) -> dict:
     """SSE progress 이벤트 포맷"""
     return {
         "event": "progress",
-        "data": json.dumps({
-            "step": step,
-            "progress": progress,
-            "message": message
-        }, ensure_ascii=False)
+        "data": json.dumps(format_progress(step, progress, message), ensure_ascii=False)
     }
 
 
-def categorize_error(error: Exception) -> str:
-    """에러를 카테고리별 코드로 변환"""
-    error_str = str(error).lower()
-    
-    if "audio" in error_str or "whisper" in error_str:
-        if "too short" in error_str:
-            return "AUDIO_TOO_SHORT"
-        if "format" in error_str:
-            return "AUDIO_INVALID_FORMAT"
-        return "AUDIO_PROCESSING_ERROR"
-    
-    if "anthropic" in error_str or "claude" in error_str:
-        if "rate" in error_str:
-            return "RATE_LIMIT_CLAUDE"
-        return "ANALYSIS_ERROR"
-    
-    if "elevenlabs" in error_str or "tts" in error_str:
-        if "rate" in error_str:
-            return "RATE_LIMIT_TTS"
-        return "TTS_ERROR"
-    
-    return "INTERNAL_ERROR"
-
-
-async def save_session_to_db(
-    session_id: str,
-    user_context: UserContext,
-    request: AnalyzeRequest,
-    final_state: dict
-) -> None:
-    """세션 결과를 DB에 저장 (백그라운드 태스크)"""
-    try:
-        # TODO: Supabase에 세션 저장
-        # supabase.table("sessions").insert({...}).execute()
-        pass
-    except Exception as e:
-        # 로깅만 하고 사용자에게는 에러 표시 안 함
-        print(f"Failed to save session {session_id}: {e}")
-
-
 @router.get("/analyze/{session_id}")
 async def get_analysis_result(
     session_id: str,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     user_context: UserContext = Depends(get_user_context),
-) -> BaseResponse:
+    queue: JobQueue = Depends(get_job_queue),
+) -> Response:
     """
     분석 결과 조회
     
     SSE 연결이 끊어진 경우 결과를 다시 조회할 때 사용합니다.
-    """
-    # TODO: DB에서 세션 조회
-    # result = supabase.table("sessions").select("*").eq("session_id", session_id).execute()
+    프로세스 캐시 → 작업 큐 → 저장된 시도 순으로 찾습니다 (api/results.py).
     
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail={"code": "NOT_FOUND_SESSION", "message": "Session not found"}
+    응답에 `ETag`가 있으며, 같은 값을 `If-None-Match`로 보내면 본문 없이 304를 반환합니다.
+    본인(또는 같은 Guest 세션)의 결과만 조회할 수 있습니다.
+    """
+    result = await RESULT_STORE.get(
+        session_id,
+        user_context.user_id or user_context.guest_session,
+        queue,
+        is_authenticated=user_context.is_authenticated,
     )
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "NOT_FOUND_SESSION", "message": "Session not found"}
+        )
+    
+    headers = {"ETag": result.etag, "Cache-Control": "private, no-cache"}
+    if result.matches(if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=result.body, media_type="application/json", headers=headers)
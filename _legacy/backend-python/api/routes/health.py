@@ -3,12 +3,16 @@ Health Check 라우트
 
 서버 상태와 외부 서비스 연결 상태를 확인합니다.
 모니터링 시스템이나 로드밸런서에서 주기적으로 호출합니다.
+Prometheus는 `/metrics`에서 노드별 실행 시간 / 사용량 메트릭을 수집합니다.
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from datetime import datetime
+import asyncio
 import httpx
 
+from langgraph.utils.metrics import render_metrics
+
 from ..schemas import HealthResponse, BaseResponse
 from ..config import Settings, get_settings
 
@@ -116,3 +120,14 @@ async def ping():
     로드밸런서의 빠른 health check에 적합합니다.
     """
     return {"status": "pong", "timestamp": datetime.utcnow().isoformat()}
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """
+    Prometheus 메트릭 (노드별 실행 시간, 재시도, 토큰 / 오디오 길이 / 문자 수)
+    
+    멀티 프로세스 모드에서는 워커 프로세스의 집계 파일을 함께 읽습니다.
+    """
+    body, content_type = await asyncio.to_thread(render_metrics)
+    return Response(content=body, media_type=content_type)
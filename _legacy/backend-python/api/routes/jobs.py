@@ -0,0 +1,86 @@
+"""
+작업(Job) API 라우트
+
+워커 프로세스에서 실행 중인 작업의 상태 조회와 진행 이벤트 재구독을 제공합니다.
+작업을 등록한 사용자(또는 같은 Guest 세션)만 조회할 수 있습니다.
+"""
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from sse_starlette.sse import EventSourceResponse
+from typing import Optional
+import asyncio
+
+from ..schemas import BaseResponse
+from ..dependencies import UserContext, get_job_queue, get_user_context
+from ..config import Settings, get_settings
+from ..jobs import Job, JobQueue
+from .analyze import relay_job_events
+
+router = APIRouter(tags=["Jobs"])
+
+
+async def get_owned_job(queue: JobQueue, job_id: str, user_context: UserContext) -> Job:
+    """
+    본인 작업 조회 (없거나 다른 사용자의 작업이면 404)
+
+    작업 ID는 세션 ID와 같아 추측할 수 있으므로, GET /analyze/{session_id}와 같은 기준으로
+    작업 payload의 user_id가 요청자와 같은 경우에만 반환합니다.
+    """
+    requester = user_context.user_id or user_context.guest_session
+    job = await asyncio.to_thread(queue.get, job_id)
+    if job is None or not requester or job.payload.get("user_id") != requester:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "NOT_FOUND_JOB", "message": "Job not found"}
+        )
+    return job
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(
+    job_id: str,
+    user_context: UserContext = Depends(get_user_context),
+    queue: JobQueue = Depends(get_job_queue),
+) -> BaseResponse:
+    """
+    작업 상태 조회
+    
+    queued / running / completed / failed 중 하나와 시도 횟수를 반환합니다.
+    """
+    job = await get_owned_job(queue, job_id, user_context)
+    
+    return BaseResponse(success=True, data={
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "error": job.error,
+    })
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    after: int = Query(0, ge=0, description="이 이벤트 ID 이후부터 전달"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    user_context: UserContext = Depends(get_user_context),
+    settings: Settings = Depends(get_settings),
+    queue: JobQueue = Depends(get_job_queue),
+) -> EventSourceResponse:
+    """
+    작업 진행 이벤트 (SSE)
+    
+    SSE 연결이 끊어진 경우 재연결에 사용합니다.
+    브라우저 EventSource는 `Last-Event-ID` 헤더를 자동으로 보내므로
+    놓친 이벤트부터 이어서 받을 수 있습니다.
+    """
+    job = await get_owned_job(queue, job_id, user_context)
+    
+    if last_event_id and last_event_id.isdigit():
+        after = max(after, int(last_event_id))
+    
+    return EventSourceResponse(relay_job_events(
+        queue, job_id, settings=settings, after=after,
+        result_owner=job.payload.get("user_id") if job.kind == "analyze" else None,
+        voice_type=job.payload.get("voice_type"),
+    ))
@@ -0,0 +1,63 @@
+"""
+프로젝트 API 라우트
+
+프로젝트 문서 업로드 이후의 후처리를 담당합니다.
+
+## 문서 분석 워밍업
+
+프론트엔드는 문서를 Storage / `project_documents`에 저장한 직후 `/projects/{id}/context/warm`을
+호출합니다. 문서 핵심 정보 추출(Claude)과 문서 검색 색인 생성을 워커에서 미리 실행해 두므로,
+사용자가 Deep Mode 세션을 시작할 때는 저장된 결과를 바로 사용합니다.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from supabase import Client
+import asyncio
+
+from ..schemas import BaseResponse
+from ..dependencies import get_job_queue, get_supabase, require_auth
+from ..jobs import JobQueue, get_lane
+
+router = APIRouter(tags=["Projects"])
+
+# 워밍업 작업 우선순위 (같은 레인의 Deep Mode 분석보다 나중에 처리)
+WARMUP_PRIORITY = 0
+
+
+@router.post("/projects/{project_id}/context/warm", status_code=status.HTTP_202_ACCEPTED)
+async def warm_project_context(
+    project_id: str,
+    user: dict = Depends(require_auth),
+    supabase: Client = Depends(get_supabase),
+    queue: JobQueue = Depends(get_job_queue),
+) -> BaseResponse:
+    """
+    문서 분석 워밍업 작업 등록
+
+    문서가 이전 추출 때와 같으면 워커는 Claude를 호출하지 않고 바로 끝납니다.
+    """
+    response = await asyncio.to_thread(
+        lambda: supabase.table("projects")
+        .select("id")
+        .eq("id", project_id)
+        .eq("user_id", user["user_id"])
+        .limit(1)
+        .execute()
+    )
+    if not response.data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "NOT_FOUND_PROJECT", "message": "Project not found"}
+        )
+
+    # Deep Mode 레인 (Claude 동시 호출 상한을 Deep Mode 분석과 함께 적용)
+    lane = get_lane("deep")
+    job_id = await asyncio.to_thread(
+        queue.enqueue,
+        "document_extraction",
+        {"project_id": project_id, "user_id": user["user_id"]},
+        priority=WARMUP_PRIORITY,
+        lane=lane.name,
+    )
+
+    return BaseResponse(success=True, data={"job_id": job_id})
@@ -8,13 +8,17 @@
 
 1단계 (LOOP 2): 방향 확인 - TTS 없이 텍스트만 미리보기
 2단계 (LOOP 3): 최종 생성 - TTS 포함, 이후 재요청 불가
+
+`SPECULATIVE_TTS_ENABLED=1`이면 1단계 응답 직후 프리뷰 음성을 워커에서 미리 만들어 두고,
+2단계에서 프리뷰를 그대로 확정하면 만들어 둔 음성을 바로 반환합니다. (api/speculation.py)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sse_starlette.sse import EventSourceResponse
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 import json
 import asyncio
+import time
 
 from ..schemas import (
     RefineRequest,
@@ -22,20 +26,32 @@ from ..schemas import (
     RefineFinalResponse,
     BaseResponse,
 )
-from ..dependencies import UserContext, get_user_context
+from ..dependencies import UserContext, check_usage_budget, get_user_context, get_job_queue, get_profile_id
 from ..config import Settings, get_settings
+from ..jobs import JobQueue, ProgressBus, get_lane
+from ..persistence import get_session_writer, session_update_row
+from ..results import RESULT_STORE
+from ..sessions import SESSION_STORE
+from ..speculation import SPECULATIVE_TTS
 
 # LangGraph 워크플로우 import
-from langgraph.workflows.refinement import create_refinement_graph
+from langgraph.workflows.refinement import create_refinement_graph, same_intent
+from langgraph.utils.deadline import Deadline, DeadlineExceeded
+from langgraph.utils.ledger import usage_account
+from langgraph.utils.profiling import profile_run
+from langgraph.utils.tracing import Span, current_traceparent, span, start_trace, use_span
 
 router = APIRouter(tags=["Refinement"])
 
 
-@router.post("/refine")
+@router.post("/refine", dependencies=[Depends(check_usage_budget)])
 async def refine_improvement(
     request: RefineRequest,
+    http_response: Response,
     user_context: UserContext = Depends(get_user_context),
     settings: Settings = Depends(get_settings),
+    queue: JobQueue = Depends(get_job_queue),
+    profile_id: Optional[str] = Depends(get_profile_id),
 ) -> BaseResponse:
     """
     개선안 재생성 요청
@@ -50,8 +66,8 @@ async def refine_improvement(
     - 사용자가 OK하면 Stage 2로 진행
     
     ### Stage 2: 최종 생성
-    - TTS 포함 전체 재생성
-    - 비용: Claude + ElevenLabs
+    - TTS 포함 전체 재생성 (Stage 1과 같은 의도면 프리뷰 스크립트를 그대로 사용)
+    - 비용: Claude + ElevenLabs (프리뷰 재사용 시 ElevenLabs만)
     - 이후 추가 재요청 불가 (can_refine=False)
     
     ## 제한 사항
@@ -59,72 +75,124 @@ async def refine_improvement(
     - 총 재요청 횟수: 최대 2회 (Stage 1 → Stage 2)
     - Session 만료: 24시간
     - Guest 사용자: Stage 1만 가능 (TTS 없음)
-    """
-    
-    # 세션 검증 및 기존 상태 로드
-    session_data = await load_session(request.session_id)
-    
-    if not session_data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={
-                "code": "NOT_FOUND_SESSION",
-                "message": "Session not found or expired"
-            }
-        )
+    - 월 비용 예산을 넘은 사용자: 429 `BUDGET_EXCEEDED`
     
-    # 재요청 가능 여부 확인
-    current_refinement_count = session_data.get("refinement_count", 0)
+    ## 프로파일링 (관리자)
     
-    if current_refinement_count >= 2:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "code": "REFINE_LIMIT_EXCEEDED",
-                "message": "Maximum refinement attempts (2) exceeded"
-            }
-        )
+    `X-Profile-Token` 헤더(또는 `?profile=`)를 붙이면 Stage 1은 워커의 프리뷰 작업,
+    Stage 2는 그래프 실행을 프로파일링하고 응답 헤더 `X-Profile-Id`로 알려줍니다.
+    """
     
-    # Guest 사용자 Stage 2 제한
-    if not user_context.is_authenticated and request.stage == 2:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail={
-                "code": "FORBIDDEN_GUEST_STAGE2",
-                "message": "Guest users can only preview. Please sign in for full TTS."
-            }
-        )
+    # 요청 트레이스 (Stage 2는 SSE 스트림이 끝날 때 종료)
+    trace = start_trace("POST /refine", session_id=request.session_id, stage=request.stage)
     
-    # Stage에 따른 처리
-    if request.stage == 1:
-        return await handle_stage1_preview(request, session_data)
-    else:
-        return await handle_stage2_final(request, session_data, user_context)
+    with use_span(trace):
+        # 세션 검증 및 기존 상태 로드
+        session_data = await load_session(request.session_id, user_context, queue)
+        
+        if not session_data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={
+                    "code": "NOT_FOUND_SESSION",
+                    "message": "Session not found or expired"
+                }
+            )
+        
+        # 재요청 가능 여부 확인
+        current_refinement_count = session_data.get("refinement_count", 0)
+        
+        if current_refinement_count >= 2:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "code": "REFINE_LIMIT_EXCEEDED",
+                    "message": "Maximum refinement attempts (2) exceeded"
+                }
+            )
+        
+        # Guest 사용자 Stage 2 제한
+        if not user_context.is_authenticated and request.stage == 2:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={
+                    "code": "FORBIDDEN_GUEST_STAGE2",
+                    "message": "Guest users can only preview. Please sign in for full TTS."
+                }
+            )
+        
+        # Stage에 따른 처리
+        if request.stage == 1:
+            response = await handle_stage1_preview(
+                request, session_data, user_context, settings, queue, profile_id=profile_id
+            )
+            if profile_id:
+                http_response.headers["X-Profile-Id"] = profile_id
+            trace.end()
+            return response
+        else:
+            return await handle_stage2_final(
+                request, session_data, user_context, settings, queue, trace=trace, profile_id=profile_id
+            )
 
 
 async def handle_stage1_preview(
     request: RefineRequest,
-    session_data: dict
+    session_data: dict,
+    user_context: UserContext,
+    settings: Settings,
+    queue: JobQueue,
+    profile_id: Optional[str] = None,
 ) -> BaseResponse:
     """
     Stage 1: 방향 프리뷰
     
     TTS 없이 수정된 스크립트만 생성하여 빠르게 피드백을 받습니다.
     Claude API만 사용하므로 비용이 적게 듭니다.
-    """
     
-    # Refinement 그래프 실행 (preview 모드)
-    graph = create_refinement_graph(include_tts=False)
+    프리뷰는 사용자가 응답을 기다리는 짧은 작업이므로
+    가장 높은 우선순위의 preview 레인에서 실행합니다.
+    미리 생성이 켜져 있으면 인증 사용자의 프리뷰 음성 생성 작업을 낮은 우선순위로 등록합니다.
+    """
     
     # 기존 상태에 사용자 의도 추가
-    refinement_state = {
-        **session_data,
-        "user_intent": request.user_intent,
-        "refinement_stage": 1,
+    refinement_state = build_refinement_state(session_data, request.user_intent, stage=1)
+    
+    # preview 레인에 작업 등록 후 완료까지 대기
+    lane = get_lane("preview")
+    payload = {
+        "session_id": request.session_id,
+        "user_id": user_context.user_id,
+        "state": refinement_state,
+        "deadline_seconds": settings.refine_deadline_seconds,
+        "deadline_at": time.time() + settings.refine_deadline_seconds,
+        "traceparent": current_traceparent(),
     }
+    if profile_id:
+        payload["profile"] = profile_id
+    job_id = await asyncio.to_thread(
+        queue.enqueue,
+        "refine_preview",
+        payload,
+        priority=lane.priority,
+        lane=lane.name,
+    )
+    
+    with span("queue.await_result", job_id=job_id):
+        outcome = await ProgressBus(queue).wait(job_id, timeout=settings.refine_deadline_seconds)
+    if outcome is None or outcome.event == "error":
+        error = outcome.data if outcome else {
+            "code": "JOB_TIMEOUT",
+            "message": "No progress from worker. Please retry later."
+        }
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT
+            if error.get("code") in ("JOB_TIMEOUT", "DEADLINE_EXCEEDED")
+            else status.HTTP_502_BAD_GATEWAY,
+            detail=error,
+        )
     
-    config = {"configurable": {"thread_id": request.session_id}}
-    result = await graph.ainvoke(refinement_state, config)
+    result = outcome.data
     
     # 응답 생성
     response_data = RefinePreviewResponse(
@@ -142,6 +210,19 @@ async def handle_stage1_preview(
         }
     })
     
+    # 확정 전에 프리뷰 음성 미리 생성 (실패해도 프리뷰 응답에는 영향 없음)
+    try:
+        await SPECULATIVE_TTS.schedule(
+            queue,
+            request.session_id,
+            result.get("refined_script", ""),
+            session_data.get("voice_type", "default_male"),
+            session_data.get("voice_clone_id"),
+            user_context.user_id,
+        )
+    except Exception as e:
+        print(f"[speculation] failed to schedule {request.session_id}: {e}")
+    
     return BaseResponse(success=True, data=response_data.model_dump())
 
 
@@ -149,46 +230,89 @@ async def handle_stage2_final(
     request: RefineRequest,
     session_data: dict,
     user_context: UserContext,
+    settings: Settings,
+    queue: Optional[JobQueue] = None,
+    trace: Optional[Span] = None,
+    profile_id: Optional[str] = None,
 ) -> EventSourceResponse:
     """
     Stage 2: 최종 생성
     
     TTS를 포함한 최종 결과를 생성합니다.
     SSE로 진행 상황을 스트리밍합니다.
+    Stage 1과 같은 의도면 저장된 프리뷰 스크립트로 TTS만 실행하고,
+    의도가 바뀌었으면 스크립트를 다시 생성합니다.
+    프리뷰를 그대로 확정했고 미리 만든 음성이 있으면 그래프를 실행하지 않고 바로 반환합니다.
+    시간 예산이 부족하면 TTS를 생략하고 스크립트만 반환합니다.
+    
+    trace(요청 트레이스)는 스트림이 끝날 때 종료합니다.
+    profile_id가 있으면 그래프 실행을 프로파일링합니다.
     """
     
+    deadline = Deadline(settings.refine_deadline_seconds)
+    trace = trace or start_trace("POST /refine", session_id=request.session_id, stage=2)
+    
     async def event_generator() -> AsyncGenerator[dict, None]:
         try:
+            # Stage 1 프리뷰와 의도가 같으면 프리뷰 스크립트로 바로 TTS (Claude 재호출 없음)
+            pending = session_data.get("pending_refinement") or {}
+            reuse_preview = bool(pending.get("preview_script")) and same_intent(
+                pending.get("user_intent"), request.user_intent
+            )
+            trace.set(reuse_preview=reuse_preview)
+            
             # 진행 상황 전송
             yield format_sse_event("progress", {
                 "step": "refinement",
                 "progress": 0,
-                "message": "개선안 수정 중..."
+                "message": "확인한 프리뷰로 음성 생성 중..." if reuse_preview else "개선안 수정 중..."
             })
             
-            # Refinement 그래프 실행 (full 모드 - TTS 포함)
-            graph = create_refinement_graph(include_tts=True)
-            
-            # pending_refinement가 있으면 사용, 없으면 새로 처리
-            pending = session_data.get("pending_refinement", {})
-            user_intent = pending.get("user_intent") or request.user_intent
-            
             refinement_state = {
-                **session_data,
-                "user_intent": user_intent,
-                "refinement_stage": 2,
-                "voice_type": session_data.get("voice_type", "default_male"),
+                **build_refinement_state(session_data, request.user_intent, stage=2),
+                "preview_script": pending.get("preview_script"),
+                "preview_intent": pending.get("user_intent"),
             }
             
-            config = {"configurable": {"thread_id": request.session_id}}
+            config = {"configurable": {"thread_id": request.session_id, "deadline": deadline}}
             
-            yield format_sse_event("progress", {
-                "step": "refinement",
-                "progress": 50,
-                "message": "스크립트 수정 완료, 음성 생성 중..."
-            })
+            # 미리 만든 프리뷰 음성 (실행 중이면 남은 예산의 절반까지 대기 - 나머지는 직접 생성용)
+            speculative_audio_url = None
+            if queue is not None and pending.get("preview_script"):
+                voice = (refinement_state["voice_type"], session_data.get("voice_clone_id"))
+                try:
+                    with use_span(trace, end_on_error=False), span("speculation.claim", reuse=reuse_preview):
+                        if reuse_preview:
+                            speculative_audio_url = await SPECULATIVE_TTS.claim(
+                                queue, pending["preview_script"], *voice, timeout=deadline.remaining() / 2
+                            )
+                        else:
+                            await SPECULATIVE_TTS.discard(queue, pending["preview_script"], *voice)
+                except Exception as e:
+                    print(f"[speculation] lookup failed for {request.session_id}: {e}")
+            
+            if not reuse_preview:
+                yield format_sse_event("progress", {
+                    "step": "refinement",
+                    "progress": 50,
+                    "message": "스크립트 수정 완료, 음성 생성 중..."
+                })
             
-            result = await graph.ainvoke(refinement_state, config)
+            if speculative_audio_url:
+                trace.set(speculative_hit=True)
+                result = {
+                    "refined_script": pending["preview_script"],
+                    "refined_audio_url": speculative_audio_url,
+                }
+            else:
+                # Refinement 그래프 실행 (full 모드 - TTS 포함)
+                graph = create_refinement_graph(include_tts=True)
+                # yield 사이에 걸치지 않도록 그래프 실행 동안만 현재 span으로 설정
+                with use_span(trace, end_on_error=False), usage_account(
+                    request.session_id, user_context.user_id, "refine"
+                ):
+                    async with profile_run(profile_id, "refine.stage2"):
+                        result = await graph.ainvoke(refinement_state, config)
             
             yield format_sse_event("progress", {
                 "step": "tts",
@@ -203,25 +327,47 @@ async def handle_stage2_final(
                 improved_audio_url=result.get("refined_audio_url", ""),
                 stage=2,
                 can_refine=False,  # 더 이상 재요청 불가
+                degradations=result.get("degradations", []),
             )
             
             yield format_sse_event("complete", response_data.model_dump())
             
             # 세션 상태 업데이트 (refinement_count 증가)
-            asyncio.create_task(update_session(request.session_id, {
+            await update_session(request.session_id, {
                 "refinement_count": session_data.get("refinement_count", 0) + 1,
                 "improved_script": result.get("refined_script", ""),
                 "improved_audio_url": result.get("refined_audio_url", ""),
                 "pending_refinement": None,  # 클리어
-            }))
+            })
             
         except Exception as e:
+            trace.end(error=e)
             yield format_sse_event("error", {
-                "code": "REFINE_ERROR",
+                "code": "DEADLINE_EXCEEDED" if isinstance(e, DeadlineExceeded) else "REFINE_ERROR",
                 "message": str(e)
             })
+        
+        finally:
+            trace.end()
+            print(f"[deadline] refine final {request.session_id}: {deadline.report()}")
     
-    return EventSourceResponse(event_generator())
+    return EventSourceResponse(
+        event_generator(),
+        headers={"X-Profile-Id": profile_id} if profile_id else None,
+    )
+
+
+def build_refinement_state(session_data: dict, user_intent: str, stage: int) -> dict:
+    """세션 데이터 → RefinementState (현재 개선안 / 원래 분석 + 사용자 의도)"""
+    return {
+        **session_data,
+        "original_transcript": session_data.get("transcript", ""),
+        "original_analysis": session_data.get("analysis_result", {}),
+        "current_script": session_data.get("improved_script", ""),
+        "user_intent": user_intent,
+        "refinement_stage": stage,
+        "voice_type": session_data.get("voice_type", "default_male"),
+    }
 
 
 def format_sse_event(event_type: str, data: dict) -> dict:
@@ -232,34 +378,38 @@ def format_sse_event(event_type: str, data: dict) -> dict:
     }
 
 
-async def load_session(session_id: str) -> dict | None:
+async def load_session(session_id: str, user_context: UserContext, queue: JobQueue) -> dict | None:
     """
     세션 데이터 로드
-    
-    TODO: Supabase에서 세션 조회
-    현재는 임시 구현
+
+    분석이 끝난 세션은 이 프로세스의 세션 캐시에서 바로 가져오고,
+    없으면 attempts → 작업 큐 순서로 조회합니다 (api/sessions.py).
+    다른 사용자의 세션이면 None을 반환합니다.
     """
-    # 임시: 메모리 또는 Redis에서 로드
-    # 실제 구현에서는 Supabase 조회
-    
-    # supabase.table("sessions").select("*").eq("session_id", session_id).execute()
-    
-    # 임시 반환 (테스트용)
-    return {
-        "session_id": session_id,
-        "transcript": "테스트 트랜스크립트",
-        "analysis_result": {},
-        "improved_script": "테스트 개선안",
-        "refinement_count": 0,
-        "voice_type": "default_male",
-    }
+    return await SESSION_STORE.get(
+        session_id,
+        user_context.user_id or user_context.guest_session,
+        queue,
+        is_authenticated=user_context.is_authenticated,
+    )
 
 
 async def update_session(session_id: str, updates: dict) -> None:
     """
     세션 데이터 업데이트
-    
-    TODO: Supabase에 세션 업데이트
+
+    세션 캐시에 바로 반영하고 (다음 재요청은 DB 조회 없음),
+    attempts 행의 해당 필드만 갱신하도록 저장 큐에 넣습니다 (api/persistence.py).
     """
-    # supabase.table("sessions").update(updates).eq("session_id", session_id).execute()
-    pass
+    SESSION_STORE.update(session_id, updates)
+
+    # 이 프로세스에 보관한 분석 결과에도 바뀐 개선안 반영
+    RESULT_STORE.update(session_id, {
+        field: updates[field]
+        for field in ("improved_script", "improved_audio_url", "refinement_count")
+        if field in updates
+    })
+    try:
+        await get_session_writer().put(session_update_row(session_id, updates))
+    except Exception as e:
+        print(f"Failed to update session {session_id}: {e}")
@@ -46,6 +46,11 @@ class AnalyzeRequest(BaseModel):
         description="연습 중인 질문 (있으면 더 맥락 있는 분석 가능)"
     )
     
+    question_id: Optional[str] = Field(
+        None,
+        description="질문 ID (있으면 분석 결과를 attempts에 새 시도로 저장)"
+    )
+    
     @validator("audio_url")
     def validate_audio_url(cls, v):
         """오디오 URL 유효성 검증"""
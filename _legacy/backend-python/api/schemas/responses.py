@@ -60,6 +60,16 @@ class AnalysisMetrics(BaseModel):
     filler_percentage: float = Field(..., description="필러워드 비율 (%)")
     total_words: int = Field(..., description="총 단어 수")
     duration_seconds: float = Field(..., description="오디오 길이 (초)")
+    pause_count: int = Field(0, description="멈춤 횟수 (0.25초 이상)")
+    long_pause_count: int = Field(0, description="긴 멈춤 횟수 (2초 이상)")
+    total_pause_seconds: float = Field(0.0, description="멈춤 총 길이 (초)")
+    mean_pause_seconds: float = Field(0.0, description="평균 멈춤 길이 (초)")
+    longest_pause_seconds: float = Field(0.0, description="가장 긴 멈춤 (초)")
+    pace_variability: float = Field(0.0, description="10초 윈도우 WPM 표준편차")
+    rush_count: int = Field(0, description="빨라진 구간 수 (190 WPM 초과 3초 이상)")
+    rush_seconds: float = Field(0.0, description="빨라진 구간 총 길이 (초)")
+    stall_count: int = Field(0, description="늘어진 구간 수 (90 WPM 미만 3초 이상)")
+    stall_seconds: float = Field(0.0, description="늘어진 구간 총 길이 (초)")
 
 
 class ImprovementSuggestion(BaseModel):
@@ -100,6 +110,10 @@ class AnalyzeResponse(BaseModel):
     original_audio_url: str = Field(..., description="원본 오디오 URL")
     refinement_count: int = Field(0, description="재요청 횟수 (최대 2)")
     can_refine: bool = Field(True, description="추가 재요청 가능 여부")
+    degradations: List[str] = Field(
+        default_factory=list,
+        description="시간 예산 부족으로 생략된 단계 (skip_react, skip_reflection, skip_tts)"
+    )
 
 
 # ============================================
@@ -160,6 +174,7 @@ class RefineFinalResponse(BaseModel):
     improved_audio_url: str
     stage: Literal[2] = 2
     can_refine: bool = False
+    degradations: List[str] = Field(default_factory=list)
 
 
 # ============================================
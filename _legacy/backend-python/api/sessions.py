@@ -0,0 +1,178 @@
+"""
+재요청 세션 캐시
+
+재요청(Stage 1 / Stage 2)은 요청마다 세션(원본 답변, 분석, 현재 개선안, 재요청 횟수, 프리뷰)을 읽고 씁니다.
+분석이 끝난 세션을 이 프로세스에 보관해 두고 재요청은 DB 조회 없이 바로 사용합니다.
+
+## 조회 순서
+
+1. 프로세스 캐시: 분석 완료 이벤트를 중계할 때, 재요청 결과를 쓸 때 채움
+2. attempts: 저장 큐가 DB에 저장한 시도 행 (인증 사용자)
+3. 작업 큐: 워커가 남긴 분석 결과 (Guest 또는 시도 행이 아직 저장되지 않은 경우)
+
+2, 3단계에서 찾은 세션은 1단계에 채웁니다. 다른 사용자의 세션은 찾지 못한 것으로 처리합니다.
+2, 3단계 조회와 동시 조회 합치기는 결과 저장소(api/results.py)와 같은 함수를 씁니다.
+
+## 쓰기 (write-through)
+
+`update`는 캐시 항목에 바로 반영하고, 호출 측(refine.update_session)이 같은 변경을
+저장 큐(api/persistence.py)에 넣어 attempts에 저장합니다.
+다른 프로세스의 쓰기는 `SESSION_CACHE_TTL_SECONDS` 후 만료되어 다시 조회됩니다.
+
+## 크기 제한
+
+항목별 크기(JSON 직렬화 바이트)를 기록하고, 합계가 `SESSION_CACHE_MAX_BYTES`를 넘으면
+오래 쓰지 않은 세션부터 제거합니다. (분석 결과 / 스크립트 길이가 세션마다 크게 다름)
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+from langgraph.utils.cache import LRUCache
+
+from .jobs import JobQueue
+from .results import SingleFlight, find_completed, load_attempt
+
+
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "4096"))
+SESSION_CACHE_MAX_BYTES = int(os.getenv("SESSION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+SESSION_CACHE_TTL_SECONDS = float(os.getenv("SESSION_CACHE_TTL_SECONDS", "1800"))
+
+
+def session_from_attempt(row: dict) -> dict:
+    """attempts 행 → 재요청 세션 (attempts에는 음성 타입이 없으므로 기본 음성)"""
+    return {
+        "session_id": row["id"],
+        "owner": row["user_id"],
+        "transcript": row.get("original_text") or "",
+        "analysis_result": row.get("analysis") or {},
+        "improved_script": row.get("improved_text") or "",
+        "improved_audio_url": row.get("improved_audio_url") or "",
+        "refinement_count": row.get("refinement_count") or 0,
+        "voice_type": "default_male",
+        "pending_refinement": row.get("pending_refinement"),
+    }
+
+
+def session_from_result(result: Dict[str, Any], owner: Optional[str], voice_type: Optional[str] = None) -> dict:
+    """분석 결과(AnalyzeResponse) → 재요청 세션"""
+    return {
+        "session_id": result["session_id"],
+        "owner": owner,
+        "transcript": result.get("transcript", ""),
+        "analysis_result": result.get("analysis") or {},
+        "improved_script": result.get("improved_script", ""),
+        "improved_audio_url": result.get("improved_audio_url", ""),
+        "refinement_count": result.get("refinement_count", 0),
+        "voice_type": voice_type or "default_male",
+        "pending_refinement": None,
+    }
+
+
+def session_size(session: dict) -> int:
+    """캐시 항목 크기 (JSON 바이트)"""
+    return len(json.dumps(session, ensure_ascii=False, default=str).encode())
+
+
+class SessionStore:
+    """
+    재요청 세션 조회 / 갱신 (프로세스 캐시 → attempts → 작업 큐)
+
+    Args:
+        maxsize: 프로세스에 보관하는 세션 수
+        maxbytes: 보관하는 세션 크기 합계 상한 (바이트)
+        ttl: 보관 시간 (초)
+        load_attempt: attempts 조회 함수 (동기, 스레드에서 호출)
+    """
+
+    def __init__(
+        self,
+        maxsize: int = SESSION_CACHE_SIZE,
+        maxbytes: int = SESSION_CACHE_MAX_BYTES,
+        ttl: float = SESSION_CACHE_TTL_SECONDS,
+        load_attempt=load_attempt,
+    ):
+        self.cache = LRUCache(maxsize=maxsize, ttl=ttl, maxbytes=maxbytes, sizeof=session_size)
+        self.load_attempt = load_attempt
+        self.loads: Dict[str, int] = {"attempts": 0, "queue": 0}
+        self._loading = SingleFlight()
+
+    def put(self, session_id: str, session: dict) -> dict:
+        self.cache.set(session_id, session)
+        return session
+
+    def put_result(
+        self,
+        session_id: str,
+        result: Dict[str, Any],
+        owner: Optional[str],
+        voice_type: Optional[str] = None,
+    ) -> None:
+        """분석 완료 결과로 세션 채움 (분석 이벤트 중계 시)"""
+        self.put(session_id, session_from_result(result, owner, voice_type))
+
+    def update(self, session_id: str, updates: Dict[str, Any]) -> None:
+        """보관 중인 세션의 일부 필드 갱신 (재요청 쓰기 시, 없으면 무시)"""
+        session = self.cache.get(session_id)
+        if session is None or not updates:
+            return
+        self.put(session_id, {**session, **updates})
+
+    def invalidate(self, session_id: str) -> None:
+        self.cache.invalidate(session_id)
+
+    async def get(
+        self,
+        session_id: str,
+        requester: Optional[str],
+        queue: JobQueue,
+        is_authenticated: bool = False,
+    ) -> Optional[dict]:
+        """
+        세션 조회 (없거나 다른 사용자의 세션이면 None)
+
+        Args:
+            requester: 요청한 사용자 ID (Guest는 guest 세션 ID)
+            is_authenticated: True면 작업 큐보다 attempts를 먼저 조회
+        """
+        session = self.cache.get(session_id)
+        if session is None:
+            session = await self._loading.run(
+                session_id, lambda: self._load(session_id, requester, queue, is_authenticated)
+            )
+
+        if session is None or session["owner"] != requester:
+            return None
+        return dict(session)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.cache),
+            "bytes": self.cache.bytes,
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+            "loads": dict(self.loads),
+        }
+
+    async def _load(
+        self,
+        session_id: str,
+        requester: Optional[str],
+        queue: JobQueue,
+        is_authenticated: bool,
+    ) -> Optional[dict]:
+        row, job = await find_completed(session_id, requester, queue, is_authenticated, self.load_attempt)
+        if row is not None:
+            self.loads["attempts"] += 1
+            return self.put(session_id, session_from_attempt(row))
+        if job is not None:
+            self.loads["queue"] += 1
+            return self.put(
+                session_id,
+                session_from_result(job.result, job.payload.get("user_id"), job.payload.get("voice_type")),
+            )
+        return None
+
+
+SESSION_STORE = SessionStore()
@@ -0,0 +1,222 @@
+"""
+재요청 프리뷰 음성 미리 생성 (Speculative TTS)
+
+Stage 1 프리뷰를 본 사용자는 대부분 그대로 확정하지만, 지금은 확정(Stage 2) 요청이 와야 TTS를 시작합니다.
+`SPECULATIVE_TTS_ENABLED=1`이면 Stage 1 응답 직후 프리뷰 스크립트의 음성을 워커에서 미리 만들고,
+Stage 2에서 확정한 스크립트 / 음성이 같으면 만들어 둔 음성을 바로 반환합니다.
+
+## 동작
+
+1. `schedule` (Stage 1): 인증 사용자만, 비용 상한 안에서 `speculative_tts` 작업을 speculative 레인에 등록
+   (preview 레인 워커가 프리뷰 작업을 모두 처리한 뒤 실행, 동시 실행 상한 별도 - lanes.py)
+   작업 ID는 스크립트 + 음성의 해시 → 같은 스크립트 / 음성은 한 번만 생성
+2. `claim` (Stage 2, 프리뷰를 그대로 확정한 경우)
+   - 완료: 만들어 둔 음성 URL 사용 (ElevenLabs 호출 없음)
+   - 실행 중: 남은 예산 안에서 완료를 기다림 (새로 만드는 것보다 빠름)
+   - 대기 중: 작업을 취소하고 바로 생성 (낮은 우선순위 작업이 끝나길 기다리지 않음)
+3. `discard` (Stage 2, 의도가 바뀐 경우): 대기 중이면 취소, 이미 만들었으면 낭비로 집계
+
+## 비용 상한
+
+- `SPECULATIVE_TTS_MAX_CHARS`: 이보다 긴 스크립트는 미리 만들지 않음
+- `SPECULATIVE_TTS_DAILY_CHARS`: 최근 24시간 동안 등록한 미리 생성 문자 수 합계 상한 (작업 큐 기준, 전체 프로세스 공유)
+
+## 지표
+
+`metrics()`: 등록 / 건너뜀(사유별) 수, 적중 / 실패 수와 적중률, 미리 생성 / 적중 / 취소 / 낭비 문자 수 (프로세스별)
+낭비 문자 수 = 미리 생성한 문자 수 - 적중 - 취소 (확정하지 않고 떠난 세션 포함)
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+from langgraph.nodes.tts import resolve_voice_id
+from langgraph.utils.tracing import current_traceparent
+
+from .jobs import JobQueue, ProgressBus, get_lane
+
+
+SPECULATIVE_TTS_ENABLED = os.getenv("SPECULATIVE_TTS_ENABLED", "0") == "1"
+SPECULATIVE_TTS_MAX_CHARS = int(os.getenv("SPECULATIVE_TTS_MAX_CHARS", "3000"))
+SPECULATIVE_TTS_DAILY_CHARS = int(os.getenv("SPECULATIVE_TTS_DAILY_CHARS", "200000"))
+
+# 미리 생성 작업의 데드라인 (초)
+SPECULATIVE_TTS_DEADLINE_SECONDS = 120.0
+
+SPECULATIVE_TTS_KIND = "speculative_tts"
+
+
+def speculation_key(script: str, voice_id: str) -> str:
+    """스크립트 + 음성 → 미리 생성 키 (작업 ID / Storage 파일명에 사용)"""
+    return hashlib.blake2b(f"{voice_id}\n{script}".encode(), digest_size=16).hexdigest()
+
+
+def speculation_job_id(script: str, voice_type: str, voice_clone_id: Optional[str] = None) -> str:
+    return f"tts:{speculation_key(script, resolve_voice_id(voice_type, voice_clone_id))}"
+
+
+class SpeculativeTTS:
+    """
+    프리뷰 음성 미리 생성 / 확정 시 재사용
+
+    Args:
+        enabled: 사용 여부 (기본: SPECULATIVE_TTS_ENABLED)
+        max_chars: 미리 생성하는 스크립트 최대 길이
+        daily_chars: 최근 24시간 미리 생성 문자 수 상한
+    """
+
+    def __init__(
+        self,
+        enabled: bool = SPECULATIVE_TTS_ENABLED,
+        max_chars: int = SPECULATIVE_TTS_MAX_CHARS,
+        daily_chars: int = SPECULATIVE_TTS_DAILY_CHARS,
+    ):
+        self.enabled = enabled
+        self.max_chars = max_chars
+        self.daily_chars = daily_chars
+        self.counts: Dict[str, int] = {
+            "scheduled": 0,
+            "hits": 0,
+            "misses": 0,
+            "speculated_chars": 0,
+            "hit_chars": 0,
+            "cancelled_chars": 0,
+        }
+        self.skipped: Dict[str, int] = {"guest": 0, "too_long": 0, "budget": 0, "duplicate": 0}
+
+    async def schedule(
+        self,
+        queue: JobQueue,
+        session_id: str,
+        script: str,
+        voice_type: str,
+        voice_clone_id: Optional[str],
+        user_id: Optional[str],
+    ) -> Optional[str]:
+        """
+        프리뷰 스크립트 음성 미리 생성 작업 등록 (Stage 1 응답 직후)
+
+        Returns:
+            str | None: 작업 ID (사용 안 함 / 상한 초과 / 이미 등록된 경우 None)
+        """
+        if not self.enabled or not script:
+            return None
+        if not user_id:
+            self.skipped["guest"] += 1
+            return None
+        if len(script) > self.max_chars:
+            self.skipped["too_long"] += 1
+            return None
+
+        used = await asyncio.to_thread(
+            queue.payload_total, SPECULATIVE_TTS_KIND, "chars", time.time() - 86400
+        )
+        if used + len(script) > self.daily_chars:
+            self.skipped["budget"] += 1
+            print(f"[speculation] daily budget reached ({used:.0f}/{self.daily_chars} chars)")
+            return None
+
+        lane = get_lane("speculative")
+        job_id = speculation_job_id(script, voice_type, voice_clone_id)
+        try:
+            await asyncio.to_thread(
+                queue.enqueue,
+                SPECULATIVE_TTS_KIND,
+                {
+                    "session_id": session_id,
+                    "user_id": user_id,
+                    "script": script,
+                    "voice_type": voice_type,
+                    "voice_clone_id": voice_clone_id,
+                    "chars": len(script),
+                    "deadline_seconds": SPECULATIVE_TTS_DEADLINE_SECONDS,
+                    "traceparent": current_traceparent(),
+                },
+                priority=lane.priority,
+                job_id=job_id,
+                lane=lane.name,
+            )
+        except sqlite3.IntegrityError:
+            self.skipped["duplicate"] += 1
+            return None
+
+        self.counts["scheduled"] += 1
+        self.counts["speculated_chars"] += len(script)
+        return job_id
+
+    async def claim(
+        self,
+        queue: JobQueue,
+        script: str,
+        voice_type: str,
+        voice_clone_id: Optional[str],
+        timeout: float,
+    ) -> Optional[str]:
+        """
+        확정한 스크립트의 미리 만든 음성 URL (Stage 2)
+
+        Args:
+            timeout: 실행 중인 작업을 기다리는 최대 시간 (초)
+
+        Returns:
+            str | None: 음성 URL (없으면 None → 호출 측에서 바로 생성)
+        """
+        if not self.enabled or not script:
+            return None
+
+        job_id = speculation_job_id(script, voice_type, voice_clone_id)
+        job = await asyncio.to_thread(queue.get, job_id)
+
+        if job is not None and job.status == "queued":
+            if await asyncio.to_thread(queue.cancel, job_id, "superseded by stage 2"):
+                self.counts["cancelled_chars"] += job.payload.get("chars", 0)
+                job = None
+            else:
+                job = await asyncio.to_thread(queue.get, job_id)
+
+        if job is not None and job.status == "running" and timeout > 0:
+            try:
+                await asyncio.wait_for(ProgressBus(queue).wait(job_id), timeout)
+            except asyncio.TimeoutError:
+                pass
+            job = await asyncio.to_thread(queue.get, job_id)
+
+        audio_url = (job.result or {}).get("audio_url") if job is not None and job.status == "completed" else None
+        if audio_url:
+            self.counts["hits"] += 1
+            self.counts["hit_chars"] += len(script)
+        else:
+            self.counts["misses"] += 1
+        print(f"[speculation] {'hit' if audio_url else 'miss'} {job_id}: {self.metrics()}")
+        return audio_url
+
+    async def discard(
+        self,
+        queue: JobQueue,
+        script: str,
+        voice_type: str,
+        voice_clone_id: Optional[str],
+    ) -> None:
+        """확정하지 않은 프리뷰의 미리 생성 작업 취소 (대기 중인 경우만, Stage 2에서 의도가 바뀐 경우)"""
+        if not self.enabled or not script:
+            return
+        job_id = speculation_job_id(script, voice_type, voice_clone_id)
+        if await asyncio.to_thread(queue.cancel, job_id, "preview not confirmed"):
+            self.counts["cancelled_chars"] += len(script)
+
+    def metrics(self) -> Dict[str, Any]:
+        counts = self.counts
+        confirmed = counts["hits"] + counts["misses"]
+        return {
+            **counts,
+            "skipped": dict(self.skipped),
+            "hit_rate": counts["hits"] / confirmed if confirmed else 0.0,
+            "wasted_chars": counts["speculated_chars"] - counts["hit_chars"] - counts["cancelled_chars"],
+        }
+
+
+SPECULATIVE_TTS = SpeculativeTTS()
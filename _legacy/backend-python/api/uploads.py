@@ -0,0 +1,468 @@
+"""
+직접 업로드 (multipart 스트리밍) 처리
+
+기존 경로는 브라우저 → Supabase Storage → 서버(download_audio) → Whisper 순서로
+같은 파일이 한 번 더 왕복합니다. 직접 업로드 경로는 요청 본문을 받는 대로
+Storage 업로드와 Whisper 업로드에 동시에 흘려보냅니다(tee).
+
+## 메모리
+
+본문 전체를 모으지 않고, 분기별 큐에 최대 `UPLOAD_QUEUE_CHUNKS`개 청크만 보관합니다.
+느린 쪽(Storage 또는 Whisper)이 큐를 비울 때까지 요청 본문 읽기가 멈추므로(backpressure)
+서버 메모리 사용량은 파일 크기와 무관합니다.
+
+## 크기 제한
+
+MediaRecorder WebM은 헤더에 길이가 없어 앞부분 길이 검증을 통과하므로,
+tee 앞에서 받은 바이트를 세어 `MAX_UPLOAD_BYTES`(기본: Whisper 한도)를 넘으면
+Storage / Whisper 업로드를 함께 중단합니다. (`UploadTooLarge` → 413)
+
+## 흐름
+
+```
+요청 본문 ─ StreamingForm (multipart 파싱) ─ 앞 64KB 헤더 프로브 (길이 검증)
+                                             └ 크기 제한 ─ tee_stream ┬ stream_to_storage → 공개 URL
+                                                                      └ transcribe_stream → 전사 결과
+```
+
+Whisper 호출이 실패해도 Storage 업로드가 끝났으면 URL 경로(워커가 다운로드 후 전사)로 이어갑니다.
+"""
+
+import asyncio
+import os
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+from multipart.multipart import MultipartParser, parse_options_header
+
+from langgraph.nodes.stt import guess_extension_from_content_type, transcribe_stream
+from langgraph.utils.audio import WHISPER_MAX_BYTES, ensure_audio_duration
+from langgraph.utils.audio_probe import PROBE_HEAD_BYTES, probe_duration
+from langgraph.utils.deadline import CALL_TIMEOUTS, Deadline, remaining_timeout
+from langgraph.utils.resilience import RetryPolicy, UpstreamHTTPError, call_with_retry
+
+
+# tee 분기별로 보관하는 최대 청크 수 (ASGI 본문 청크는 보통 64KB 이하)
+UPLOAD_QUEUE_CHUNKS = int(os.getenv("UPLOAD_QUEUE_CHUNKS", "8"))
+
+# 업로드 파일 최대 크기 (Storage 업로드도 이 안에서만 진행)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(WHISPER_MAX_BYTES)))
+
+# 텍스트 필드 최대 크기 (질문 텍스트 등)
+MAX_FIELD_BYTES = 64 * 1024
+
+# 업로드 오디오 버킷 / 경로 접두사
+UPLOAD_BUCKET = "audio"
+UPLOAD_PREFIX = "uploads"
+
+# 스트리밍 본문은 다시 보낼 수 없으므로 재시도 없이 1회만 시도
+_STREAM_POLICY = RetryPolicy(max_attempts=1)
+
+_END = object()
+
+
+class UploadError(ValueError):
+    """직접 업로드 요청 자체가 잘못된 경우 (multipart 형식, 필드 누락 등)"""
+
+
+class UploadTooLarge(UploadError):
+    """업로드 파일이 MAX_UPLOAD_BYTES를 넘은 경우"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Audio file exceeds {max_bytes // (1024 * 1024)}MB")
+        self.max_bytes = max_bytes
+
+
+# ============================================
+# multipart 스트리밍 파싱
+# ============================================
+
+class StreamingForm:
+    """
+    multipart/form-data 본문을 스트리밍으로 파싱
+
+    파일 필드(file_field)는 청크 단위로 흘려보내고, 나머지 텍스트 필드만 모읍니다.
+    텍스트 필드는 파일보다 앞에 보내는 것을 권장합니다 (뒤에 있으면 본문을 다 읽은 뒤에 채워짐).
+
+    ```python
+    form = StreamingForm(request.headers["content-type"])
+    chunks = await form.start(request.stream())  # 파일 파트 헤더까지 읽음
+    form.filename, form.fields  # 파일 앞에 온 필드는 이 시점에 채워져 있음
+    async for chunk in chunks:
+        ...
+    ```
+    """
+
+    def __init__(self, content_type: str, file_field: str = "audio"):
+        mime, params = parse_options_header(content_type or "")
+        boundary = params.get(b"boundary")
+        if mime != b"multipart/form-data" or not boundary:
+            raise UploadError("Expected multipart/form-data with a boundary")
+
+        self.file_field = file_field
+        self.fields: Dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self.file_content_type: Optional[str] = None
+        self.received_file = False
+
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: Dict[bytes, bytes] = {}
+        self._name: Optional[str] = None
+        self._value = bytearray()
+        self._pending: List[bytes] = []
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+        })
+
+    async def stream(self, body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """요청 본문을 읽으며 파일 필드 데이터만 반환"""
+        async for data in body:
+            self._parser.write(data)
+            pending, self._pending = self._pending, []
+            for chunk in pending:
+                yield chunk
+        self._parser.finalize()
+        if not self.received_file:
+            raise UploadError(f"Missing file field '{self.file_field}'")
+
+    async def start(self, body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """
+        파일 데이터의 첫 청크까지 읽고 나머지 스트림 반환
+
+        반환 시점에는 filename, file_content_type과 파일 앞의 텍스트 필드가 채워져 있습니다.
+
+        Raises:
+            UploadError: 파일 필드가 없는 경우
+        """
+        _, _, chunks = await read_head(self.stream(body), 1)
+        return chunks
+
+    @property
+    def _is_file(self) -> bool:
+        return self._name == self.file_field
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+        self._name = None
+        self._value = bytearray()
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = options.get(b"name", b"").decode()
+        if self._is_file:
+            self.received_file = True
+            self.filename = options.get(b"filename", b"").decode() or None
+            self.file_content_type = self._headers.get(b"content-type", b"").decode() or None
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._is_file:
+            self._pending.append(data[start:end])
+        else:
+            self._value += data[start:end]
+            if len(self._value) > MAX_FIELD_BYTES:
+                raise UploadError(f"Field '{self._name}' is too large")
+
+    def _on_part_end(self) -> None:
+        if self._name and not self._is_file:
+            self.fields[self._name] = self._value.decode()
+
+
+# ============================================
+# tee (한 스트림을 여러 소비자에게)
+# ============================================
+
+class _TeeBranch:
+    """tee 분기 (소비자가 중간에 포기하면 남은 데이터를 버려 다른 분기를 막지 않음)"""
+
+    def __init__(self, max_chunks: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_chunks)
+        self.closed = False
+        self.pump: Optional[asyncio.Task] = None
+
+    def __aiter__(self) -> "_TeeBranch":
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self.closed:
+            raise StopAsyncIteration
+        item = await self.queue.get()
+        if item is _END:
+            await self.aclose()
+            raise StopAsyncIteration
+        if isinstance(item, BaseException):
+            await self.aclose()
+            raise item
+        return item
+
+    async def aclose(self) -> None:
+        self.closed = True
+        # 펌프가 put에서 기다리고 있으면 풀어줌
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+def tee_stream(
+    source: AsyncIterator[bytes],
+    consumers: int = 2,
+    max_chunks: int = UPLOAD_QUEUE_CHUNKS,
+) -> List[AsyncIterator[bytes]]:
+    """
+    비동기 스트림을 여러 소비자에게 복제
+
+    분기별 큐가 가득 차면 원본 읽기를 멈추므로, 메모리에는
+    분기당 최대 max_chunks개의 청크만 남습니다. 원본에서 난 예외는 모든 분기로 전달됩니다.
+
+    소비자가 중간에 그만두면 반드시 분기 스트림을 `aclose()`해야 다른 분기가 멈추지 않습니다.
+
+    Args:
+        source: 원본 스트림
+        consumers: 분기 수
+        max_chunks: 분기별 최대 보관 청크 수
+
+    Returns:
+        List[AsyncIterator[bytes]]: 분기별 스트림
+    """
+    branches = [_TeeBranch(max_chunks) for _ in range(consumers)]
+
+    async def pump() -> None:
+        try:
+            async for chunk in source:
+                for branch in branches:
+                    if not branch.closed:
+                        await branch.queue.put(chunk)
+                if all(branch.closed for branch in branches):
+                    return
+            item = _END
+        except Exception as e:
+            item = e
+        for branch in branches:
+            if not branch.closed:
+                await branch.queue.put(item)
+
+    task = asyncio.ensure_future(pump())
+    for branch in branches:
+        branch.pump = task
+    return branches
+
+
+class _ByteLimit:
+    """스트림 바이트 수 제한 (넘으면 UploadTooLarge, 실패 원인 확인용으로 exceeded 기록)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.received = 0
+        self.exceeded = False
+
+    async def wrap(self, source: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        async for chunk in source:
+            self.received += len(chunk)
+            if self.received > self.max_bytes:
+                self.exceeded = True
+                raise UploadTooLarge(self.max_bytes)
+            yield chunk
+
+
+async def read_head(source: AsyncIterator[bytes], size: int) -> Tuple[bytes, bool, AsyncIterator[bytes]]:
+    """
+    스트림 앞부분을 size 바이트 이상 읽기
+
+    Returns:
+        Tuple: (앞부분, 스트림이 끝났는지, 앞부분을 포함한 전체 스트림)
+    """
+    iterator = source.__aiter__()
+    head = bytearray()
+    exhausted = False
+    while len(head) < size:
+        try:
+            head += await iterator.__anext__()
+        except StopAsyncIteration:
+            exhausted = True
+            break
+
+    async def replay() -> AsyncIterator[bytes]:
+        if head:
+            yield bytes(head)
+        if not exhausted:
+            async for chunk in iterator:
+                yield chunk
+
+    return bytes(head), exhausted, replay()
+
+
+# ============================================
+# Storage 스트리밍 업로드
+# ============================================
+
+async def stream_to_storage(
+    chunks: AsyncIterator[bytes],
+    object_path: str,
+    content_type: str,
+    deadline: Optional[Deadline] = None,
+) -> str:
+    """
+    Supabase Storage REST API로 스트리밍 업로드
+
+    Returns:
+        str: 업로드된 파일의 공개 URL
+    """
+    supabase_url = os.getenv("SUPABASE_URL", "").rstrip("/")
+    supabase_key = os.getenv("SUPABASE_SERVICE_KEY")
+    if not supabase_url or not supabase_key:
+        raise ValueError("Supabase configuration missing")
+
+    async def upload() -> None:
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                f"{supabase_url}/storage/v1/object/{UPLOAD_BUCKET}/{object_path}",
+                headers={
+                    "Authorization": f"Bearer {supabase_key}",
+                    "apikey": supabase_key,
+                    "Content-Type": content_type,
+                    "x-upsert": "true",
+                },
+                content=chunks,
+                timeout=remaining_timeout(deadline, CALL_TIMEOUTS["download"], "upload"),
+            )
+        if response.status_code not in (200, 201):
+            raise UpstreamHTTPError(
+                f"Failed to upload audio: HTTP {response.status_code}",
+                status_code=response.status_code,
+                headers=response.headers,
+            )
+
+    await call_with_retry("storage", upload, policy=_STREAM_POLICY, deadline=deadline)
+    return f"{supabase_url}/storage/v1/object/public/{UPLOAD_BUCKET}/{object_path}"
+
+
+# ============================================
+# 업로드 + 전사
+# ============================================
+
+class UploadResult:
+    """
+    직접 업로드 결과
+
+    Attributes:
+        audio_url: Storage 공개 URL
+        stt: 전사 결과 (Whisper 실패 시 None → 워커가 URL로 다시 전사)
+        stt_error: Whisper 실패 사유
+    """
+
+    def __init__(self, audio_url: str, stt: Optional[dict], stt_error: Optional[str] = None):
+        self.audio_url = audio_url
+        self.stt = stt
+        self.stt_error = stt_error
+
+
+def _is_invalid_audio(error: Optional[BaseException]) -> bool:
+    """전사 실패가 오디오 길이/내용 문제인지 (업스트림 HTTP 에러는 URL 경로로 다시 시도)"""
+    return isinstance(error, ValueError) and not isinstance(error, UpstreamHTTPError)
+
+
+async def transcribe_upload(
+    chunks: AsyncIterator[bytes],
+    session_id: str,
+    filename: Optional[str] = None,
+    content_type: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+) -> UploadResult:
+    """
+    업로드 스트림을 Storage와 Whisper에 동시에 전송
+
+    Storage 업로드가 실패하거나 전사 결과가 범위 밖이면 다른 쪽 업로드를 바로 중단합니다.
+
+    Args:
+        chunks: 오디오 데이터 스트림 (StreamingForm.stream)
+        session_id: 세션 ID (Storage 파일명)
+        filename: 원본 파일명 (확장자 판별용)
+        content_type: 오디오 Content-Type
+        deadline: 요청 데드라인
+        max_bytes: 파일 최대 크기 (넘으면 두 업로드 모두 중단)
+
+    Returns:
+        UploadResult: Storage URL과 전사 결과
+
+    Raises:
+        UploadTooLarge: 파일이 max_bytes를 넘은 경우
+        ValueError: 헤더로 확인한 길이가 범위 밖이거나 전사 결과가 범위 밖인 경우
+        Exception: Storage 업로드 실패 (원본을 보관할 수 없으면 분석 불가)
+    """
+    content_type = content_type or "audio/webm"
+    extension = os.path.splitext(filename or "")[1].lower() or guess_extension_from_content_type(content_type)
+
+    # 앞부분 헤더로 길이 확인 (범위 밖이면 Storage/Whisper로 보내기 전에 거절)
+    head, exhausted, source = await read_head(chunks, PROBE_HEAD_BYTES)
+    _, duration = probe_duration(head, total_size=len(head) if exhausted else None)
+    ensure_audio_duration(duration)
+
+    # 원본 에러는 모든 분기로 전달되므로 Storage / Whisper 업로드가 함께 중단됨
+    limit = _ByteLimit(max_bytes)
+    to_storage, to_whisper = tee_stream(limit.wrap(source), 2)
+    object_path = f"{UPLOAD_PREFIX}/{session_id}{extension}"
+
+    async def consume(branch: AsyncIterator[bytes], operation):
+        # 한쪽이 실패해 읽기를 멈춰도 분기를 닫아 다른 쪽 업로드가 계속되도록 함
+        try:
+            return await operation
+        finally:
+            await branch.aclose()
+
+    storage_task = asyncio.ensure_future(
+        consume(to_storage, stream_to_storage(to_storage, object_path, content_type, deadline))
+    )
+    stt_task = asyncio.ensure_future(
+        consume(to_whisper, transcribe_stream(to_whisper, f"{session_id}{extension}", content_type, deadline))
+    )
+
+    try:
+        await asyncio.wait({storage_task, stt_task}, return_when=asyncio.FIRST_EXCEPTION)
+        if storage_task.done() and storage_task.exception() is not None:
+            # 원본을 보관할 수 없으면 전사 결과도 쓸 수 없으므로 Whisper 업로드 중단
+            stt_task.cancel()
+        elif stt_task.done() and _is_invalid_audio(stt_task.exception()):
+            # 길이/내용 문제로 거절할 업로드는 Storage에 보관할 필요 없음
+            storage_task.cancel()
+        await asyncio.wait({storage_task, stt_task})
+    finally:
+        # 요청이 취소되면 두 업로드도 함께 중단
+        storage_task.cancel()
+        stt_task.cancel()
+
+    storage_error = None if storage_task.cancelled() else storage_task.exception()
+    stt_error = None if stt_task.cancelled() else stt_task.exception()
+
+    if limit.exceeded:
+        # 각 분기는 HTTP 클라이언트를 거치며 다른 에러로 감싸질 수 있으므로 원인으로 판단
+        raise UploadTooLarge(max_bytes)
+
+    if _is_invalid_audio(stt_error):
+        # 다시 전사해도 같은 결과
+        raise stt_error
+
+    if storage_error is not None:
+        raise storage_error
+
+    if stt_error is not None:
+        print(f"[upload] streaming STT failed for {session_id}, falling back to URL: {stt_error}")
+        return UploadResult(storage_task.result(), None, str(stt_error))
+
+    return UploadResult(storage_task.result(), stt_task.result())
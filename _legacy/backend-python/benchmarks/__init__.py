@@ -0,0 +1,10 @@
+"""
+성능 벤치마크 스크립트
+
+실제 외부 API 대신 Mock 노드와 로컬 Stand-in 서버를 사용하여
+동시성 · 처리량 · 지연 시간을 측정합니다.
+
+```bash
+python -m benchmarks.job_throughput
+```
+"""
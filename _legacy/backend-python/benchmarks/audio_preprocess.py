@@ -0,0 +1,128 @@
+"""
+Whisper 업로드 전처리 벤치마크
+
+브라우저 녹음과 같은 형식(스테레오 48kHz 16bit WAV)의 1~5분 녹음을
+모노 16kHz 저비트레이트로 변환했을 때 업로드 크기와 Whisper 호출 시간을 비교합니다.
+
+- 변환 시간: 프로세스 풀 경유 실제 측정
+- 업로드 시간: `--uplink-mbps` 대역폭 기준 추정 (기본 10Mbps, 모바일/가정용 상향 대역)
+- `--live`: OPENAI_API_KEY가 있으면 실제 Whisper 호출 시간 측정 (과금 주의)
+
+합성 톤 대신 실제 녹음을 쓰려면 `--file recording.wav`를 지정합니다.
+
+## 실행
+
+```bash
+python -m benchmarks.audio_preprocess
+python -m benchmarks.audio_preprocess --minutes 1 3 5 --uplink-mbps 5
+python -m benchmarks.audio_preprocess --file sample.webm --live
+```
+"""
+
+import argparse
+import asyncio
+import io
+import math
+import os
+import struct
+import tempfile
+import time
+import wave
+from typing import List, Optional, Tuple
+
+from langgraph.utils.audio import preprocess_audio, shutdown_preprocess_executor
+
+
+def make_recording(seconds: int, sample_rate: int = 48000, channels: int = 2) -> bytes:
+    """음성 대역 톤을 음절 단위로 끊은 모의 녹음 (WAV)"""
+    one_second = []
+    for i in range(sample_rate):
+        t = i / sample_rate
+        envelope = max(0.0, math.sin(2 * math.pi * 4 * t))  # 초당 4음절
+        value = envelope * (
+            6000 * math.sin(2 * math.pi * 180 * t) + 2000 * math.sin(2 * math.pi * 1200 * t)
+        )
+        for _ in range(channels):
+            one_second.append(int(value))
+    chunk = struct.pack(f"<{len(one_second)}h", *one_second)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(chunk * seconds)
+    return buffer.getvalue()
+
+
+def upload_seconds(size: int, uplink_mbps: float) -> float:
+    return size * 8 / (uplink_mbps * 1_000_000)
+
+
+async def whisper_seconds(data: bytes, extension: str) -> Optional[float]:
+    """실제 Whisper 호출 시간 (--live)"""
+    from openai import AsyncOpenAI
+
+    with tempfile.NamedTemporaryFile(suffix=extension, delete=False) as tmp:
+        tmp.write(data)
+        path = tmp.name
+    try:
+        client = AsyncOpenAI()
+        started = time.perf_counter()
+        with open(path, "rb") as audio_file:
+            await client.audio.transcriptions.create(
+                model="whisper-1", file=audio_file, language="ko"
+            )
+        return time.perf_counter() - started
+    finally:
+        os.unlink(path)
+
+
+async def run(args: argparse.Namespace) -> None:
+    samples: List[Tuple[str, bytes, str]] = []
+    if args.file:
+        with open(args.file, "rb") as f:
+            samples.append((os.path.basename(args.file), f.read(), os.path.splitext(args.file)[1].lower()))
+    else:
+        for minutes in args.minutes:
+            samples.append((f"{minutes}min wav", make_recording(minutes * 60), ".wav"))
+
+    live = args.live and os.getenv("OPENAI_API_KEY")
+    print(f"uplink={args.uplink_mbps}Mbps live_whisper={'yes' if live else 'no'}")
+    print(
+        f"{'sample':>12} {'original':>10} {'processed':>10} {'fmt':>6} "
+        f"{'convert':>8} {'upload before':>14} {'upload after':>13} {'total saved':>12}"
+    )
+
+    try:
+        for name, data, extension in samples:
+            result = await preprocess_audio(data, extension, min_bytes=0)
+            before = upload_seconds(result.original_size, args.uplink_mbps)
+            after = upload_seconds(result.size, args.uplink_mbps) + result.elapsed
+
+            if live:
+                before = await whisper_seconds(data, extension)
+                after = await whisper_seconds(result.data, result.extension) + result.elapsed
+
+            print(
+                f"{name:>12} {result.original_size / 1e6:>8.2f}MB {result.size / 1e6:>8.2f}MB "
+                f"{result.extension:>6} {result.elapsed:>7.2f}s {before:>13.2f}s {after:>12.2f}s "
+                f"{before - after:>11.2f}s"
+            )
+            if not result.applied:
+                print(f"{'':>12} (original kept: {result.reason})")
+    finally:
+        shutdown_preprocess_executor()
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Whisper upload pre-processing benchmark")
+    parser.add_argument("--minutes", type=int, nargs="+", default=[1, 3, 5])
+    parser.add_argument("--uplink-mbps", type=float, default=10.0)
+    parser.add_argument("--file", help="합성 녹음 대신 사용할 오디오 파일")
+    parser.add_argument("--live", action="store_true", help="실제 Whisper 호출 (OPENAI_API_KEY 필요)")
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
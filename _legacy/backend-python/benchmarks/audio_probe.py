@@ -0,0 +1,116 @@
+"""
+오디오 길이 프로브 벤치마크 (다운로드 전 거절)
+
+너무 짧거나 긴 녹음을 거절하기까지 읽는 바이트 수와 소요 시간을 비교합니다.
+
+- before: 전체 다운로드 → Whisper 호출 → 응답의 duration으로 거절
+- after : Range 요청으로 앞/뒤 64KB만 읽고 헤더에서 길이 계산 → 거절
+
+로컬 Stand-in 스토리지 서버로 실제 HTTP 요청 시간을 측정하고,
+네트워크 전송 시간(`--downlink-mbps`)과 Whisper 처리 시간(`--whisper-seconds-per-minute`)은
+모델 값으로 더합니다. Whisper 비용이 빠지는 것이 가장 큰 차이입니다.
+
+## 실행
+
+```bash
+python -m benchmarks.audio_probe
+python -m benchmarks.audio_probe --downlink-mbps 20 --repeat 20
+```
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Callable, List, Tuple
+
+import httpx
+
+from langgraph.utils.audio_probe import probe_audio_bytes, probe_audio_url
+from tests.audio_samples import make_mp3, make_mp4, make_ogg_opus, make_wav, make_webm
+from tests.stand_in_server import StandInServer
+
+
+# (이름, 파일 생성 함수) - 거절 대상: 3초(너무 짧음), 7분(너무 김)
+SAMPLES: List[Tuple[str, Callable[[], bytes]]] = [
+    ("wav 3s", lambda: make_wav(3.0)),
+    ("webm 3s", lambda: make_webm(3.0, with_duration=False)),
+    ("mp3 7min", lambda: make_mp3(420.0)),
+    ("m4a 7min", lambda: make_mp4(420.0, payload_bytes=420 * 16_000)),
+    ("ogg 7min", lambda: make_ogg_opus(420.0)),
+    ("webm 7min", lambda: make_webm(420.0, with_duration=False)),
+    ("wav 7min", lambda: make_wav(420.0, sample_rate=16000, channels=1)),
+]
+
+
+async def measure(url: str, repeat: int) -> Tuple[float, float, int, int, float]:
+    """(before 측정 시간, after 측정 시간, before 바이트, after 바이트, 길이)"""
+    before_times, after_times = [], []
+    before_bytes = after_bytes = 0
+    duration = None
+
+    async with httpx.AsyncClient() as client:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = await client.get(url)
+            probe_audio_bytes(response.content)
+            before_times.append(time.perf_counter() - started)
+            before_bytes = len(response.content)
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        probe = await probe_audio_url(url)
+        after_times.append(time.perf_counter() - started)
+        after_bytes = probe.bytes_read
+        duration = probe.duration
+
+    return (
+        statistics.median(before_times),
+        statistics.median(after_times),
+        before_bytes,
+        after_bytes,
+        duration,
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    def transfer(size: int) -> float:
+        return size * 8 / (args.downlink_mbps * 1_000_000)
+
+    print(
+        f"downlink={args.downlink_mbps}Mbps whisper={args.whisper_seconds_per_minute}s/min "
+        f"(before = download + Whisper, after = Range probe)"
+    )
+    print(
+        f"{'sample':>10} {'duration':>9} {'bytes before':>13} {'bytes after':>12} "
+        f"{'reject before':>14} {'reject after':>13}"
+    )
+
+    async with StandInServer() as server:
+        for name, factory in SAMPLES:
+            path = "/" + name.replace(" ", "-")
+            server.serve_bytes(path, factory())
+            local_before, local_after, before_bytes, after_bytes, duration = await measure(
+                server.url(path), args.repeat
+            )
+
+            whisper = duration / 60 * args.whisper_seconds_per_minute
+            before = local_before + transfer(before_bytes) + whisper
+            after = local_after + transfer(after_bytes)
+            print(
+                f"{name:>10} {duration:>8.1f}s {before_bytes / 1e6:>11.2f}MB {after_bytes / 1e3:>10.1f}KB "
+                f"{before:>13.3f}s {after * 1000:>11.1f}ms"
+            )
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Audio duration probe benchmark")
+    parser.add_argument("--downlink-mbps", type=float, default=50.0)
+    parser.add_argument("--whisper-seconds-per-minute", type=float, default=3.0,
+                        help="오디오 1분당 Whisper 처리 시간 (모델 값)")
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+음성 구간 검출(VAD) 벤치마크
+
+5분 분량 연습 녹음(스테레오 48kHz WAV)을 한 코어에서
+디코딩(모노 16kHz 변환) → 프레임 에너지 VAD → 앞/뒤 무음 제거까지 처리하는 시간을 측정합니다.
+실시간 대비 배율(real-time factor)이 1보다 훨씬 작아야 합니다.
+
+모의 녹음은 녹음 시작 전/후 무음, 문장 사이 멈춤(0.4~3초), 배경 잡음을 포함합니다.
+
+## 실행
+
+```bash
+python -m benchmarks.audio_vad
+python -m benchmarks.audio_vad --minutes 5 --repeat 5 --lead 4 --tail 6
+```
+"""
+
+import argparse
+import io
+import statistics
+import time
+import wave
+from typing import List
+
+import numpy as np
+
+from langgraph.utils.audio import (
+    TARGET_SAMPLE_RATE,
+    apply_voice_activity,
+    decode_pcm,
+    detect_voice_activity,
+)
+
+
+def make_practice_recording(
+    minutes: float,
+    lead: float,
+    tail: float,
+    sample_rate: int = 48000,
+    seed: int = 0,
+) -> bytes:
+    """문장 단위 말소리 + 멈춤으로 된 스테레오 WAV"""
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * sample_rate)
+    signal = rng.normal(0, 40, total)
+
+    position = int(lead * sample_rate)
+    end = total - int(tail * sample_rate)
+    while position < end:
+        sentence = int(rng.uniform(2.0, 8.0) * sample_rate)
+        sentence = min(sentence, end - position)
+        t = np.arange(sentence) / sample_rate
+        envelope = 0.4 + 0.6 * np.abs(np.sin(2 * np.pi * rng.uniform(2.5, 4.5) * t))
+        signal[position:position + sentence] += 7000 * envelope * np.sin(2 * np.pi * rng.uniform(120, 240) * t)
+        position += sentence + int(rng.choice([0.4, 0.7, 1.2, 3.0], p=[0.4, 0.3, 0.2, 0.1]) * sample_rate)
+
+    mono = np.clip(signal, -32768, 32767).astype("<i2")
+    stereo = np.repeat(mono, 2)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(stereo.tobytes())
+    return buffer.getvalue()
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="NumPy VAD benchmark")
+    parser.add_argument("--minutes", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--lead", type=float, default=3.0, help="녹음 시작 전 무음 (초)")
+    parser.add_argument("--tail", type=float, default=5.0, help="녹음 끝 무음 (초)")
+    args = parser.parse_args(argv)
+
+    data = make_practice_recording(args.minutes, args.lead, args.tail)
+    audio_seconds = args.minutes * 60
+
+    decode_times, vad_times, trim_times = [], [], []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        samples = decode_pcm(data, ".wav")
+        decoded = time.perf_counter()
+        activity = detect_voice_activity(samples, TARGET_SAMPLE_RATE)
+        detected = time.perf_counter()
+        trimmed, trimmed_seconds, _ = apply_voice_activity(samples, activity)
+        finished = time.perf_counter()
+
+        decode_times.append(decoded - started)
+        vad_times.append(detected - decoded)
+        trim_times.append(finished - detected)
+
+    decode_time = statistics.median(decode_times)
+    vad_time = statistics.median(vad_times)
+    trim_time = statistics.median(trim_times)
+    total = decode_time + vad_time + trim_time
+
+    print(f"input: {args.minutes:g} min stereo 48kHz WAV ({len(data) / 1e6:.1f} MB), repeat={args.repeat}")
+    print(f"  decode (mono 16kHz) : {decode_time * 1000:8.1f} ms")
+    print(f"  VAD (frame energy)  : {vad_time * 1000:8.1f} ms")
+    print(f"  trim                : {trim_time * 1000:8.1f} ms")
+    print(f"  total               : {total * 1000:8.1f} ms  (real-time factor {total / audio_seconds:.4f})")
+    print(f"  trimmed silence     : {trimmed_seconds:.1f} s of {audio_seconds:.0f} s")
+    print(f"  pauses              : {activity.pause_stats()}")
+
+
+if __name__ == "__main__":
+    main()
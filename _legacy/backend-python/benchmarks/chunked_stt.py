@@ -0,0 +1,129 @@
+"""
+분할 전사(Chunked STT) 벤치마크
+
+로컬 Whisper Stand-in(지연 시간이 오디오 길이에 비례)을 상대로 STT 노드 전체
+(프로브 → 다운로드 → 전처리 → Whisper → 이어 붙이기)의 처리 시간을 비교합니다.
+
+- single    : 녹음 전체를 한 번에 업로드 (분할 도입 전)
+- sequential: 무음 경계로 나눈 조각을 하나씩 전사 (동시 호출 1)
+- parallel  : 같은 조각을 동시에 전사 (OPENAI_MAX_CONCURRENCY)
+
+Stand-in은 업로드된 WAV 헤더로 길이를 계산해 `base + rtf × 길이`만큼 대기한 뒤
+5초 간격 세그먼트가 담긴 verbose_json을 반환합니다.
+
+## 실행
+
+```bash
+python -m benchmarks.chunked_stt
+python -m benchmarks.chunked_stt --minutes 2 5 10 --concurrency 4 --rtf 0.03
+```
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import weakref
+from typing import List
+
+from benchmarks.audio_vad import make_practice_recording
+from langgraph.nodes.stt import speech_to_text
+from langgraph.utils import audio, resilience
+from langgraph.utils.audio_probe import probe_audio_bytes
+from tests.stand_in_server import StandInRequest, StandInResponse, StandInServer
+
+
+def whisper_stand_in(base: float, rtf: float):
+    """업로드 길이에 비례해 응답이 늦어지는 Whisper 흉내"""
+
+    async def handler(request: StandInRequest) -> StandInResponse:
+        start = request.body.find(b"RIFF")
+        duration = probe_audio_bytes(request.body[start:]).duration or 0.0
+        await asyncio.sleep(base + rtf * duration)
+
+        segments = []
+        position = 0.0
+        while position < duration:
+            end = min(position + 5.0, duration)
+            segments.append({
+                "id": len(segments),
+                "start": position,
+                "end": end,
+                "text": f" 구간 {len(segments)} 에서 말한 내용입니다.",
+            })
+            position = end
+        body = {
+            "task": "transcribe",
+            "language": "korean",
+            "duration": duration,
+            "text": "".join(s["text"] for s in segments),
+            "segments": segments,
+        }
+        return StandInResponse(200, body=json.dumps(body).encode(), headers={"content-type": "application/json"})
+
+    return handler
+
+
+async def run_scenario(server: StandInServer, path: str, name: str, concurrency: int) -> dict:
+    """시나리오별 설정을 적용하고 STT 노드 한 번 실행"""
+    # 워커 프로세스가 fork 시점의 설정을 쓰도록 풀을 새로 만듦
+    audio.shutdown_preprocess_executor()
+    audio.STT_CHUNK_THRESHOLD_SECONDS = float("inf") if name == "single" else 120.0
+    resilience.PROVIDER_CONCURRENCY["openai"] = 1 if name == "sequential" else concurrency
+    resilience._provider_semaphores = weakref.WeakKeyDictionary()
+
+    calls_before = server.hits("/v1/audio/transcriptions")
+    started = time.perf_counter()
+    result = await speech_to_text({"audio_file_path": server.url(path)})
+    elapsed = time.perf_counter() - started
+
+    return {
+        "elapsed": elapsed,
+        "calls": server.hits("/v1/audio/transcriptions") - calls_before,
+        "chars": len(result["transcript"]),
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with StandInServer() as server:
+        server.handle("/v1/audio/transcriptions", whisper_stand_in(args.base, args.rtf))
+        os.environ["OPENAI_BASE_URL"] = server.url("/v1")
+        os.environ.setdefault("OPENAI_API_KEY", "bench")
+        audio.MAX_AUDIO_SECONDS = max(args.minutes) * 60 + 60
+
+        print(
+            f"Whisper stand-in: {args.base}s + {args.rtf} x audio seconds, "
+            f"chunk {audio.STT_CHUNK_SECONDS:g}s, concurrency {args.concurrency}"
+        )
+        print(f"{'audio':>7} {'scenario':>11} {'calls':>6} {'wall':>8} {'speedup':>8}")
+
+        for minutes in args.minutes:
+            path = f"/audio/practice-{minutes:g}min.wav"
+            server.serve_bytes(path, make_practice_recording(minutes, lead=2.0, tail=3.0, sample_rate=16000))
+
+            baseline = None
+            for name in ("single", "sequential", "parallel"):
+                result = await run_scenario(server, path, name, args.concurrency)
+                baseline = baseline or result["elapsed"]
+                print(
+                    f"{minutes:>5g}m {name:>11} {result['calls']:>6} "
+                    f"{result['elapsed']:>7.2f}s {baseline / result['elapsed']:>7.2f}x"
+                )
+
+    audio.shutdown_preprocess_executor()
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Chunked STT benchmark")
+    parser.add_argument("--minutes", type=float, nargs="+", default=[3.0, 5.0, 10.0])
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--base", type=float, default=0.4, help="Whisper 고정 지연 (초)")
+    parser.add_argument("--rtf", type=float, default=0.02, help="오디오 1초당 Whisper 처리 시간 (초)")
+    args = parser.parse_args(argv)
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+직접 업로드(Direct Upload) 벤치마크
+
+10MB 녹음 한 건을 두 경로로 처리할 때 클라이언트 업로드 시작부터 전사 완료까지의
+지연 시간과 API 서버의 최대 메모리(tracemalloc peak)를 비교합니다.
+
+- url   : 브라우저 → Storage 업로드 → `/analyze` → 서버가 다운로드 → 전처리 → Whisper
+- upload: 브라우저 → `/analyze/upload` → Storage / Whisper로 동시에 스트리밍 (transcribe_upload)
+
+Storage와 Whisper Stand-in은 별도 프로세스에서 실행하므로 API 서버 메모리에 포함되지 않습니다.
+(전처리 프로세스 풀도 별도 프로세스이지만, 풀로 넘기는 데이터 복사는 포함)
+클라이언트 업로드는 `--uplink` 대역폭으로 제한하고, Whisper Stand-in은 본문을 다 받은 뒤
+`base + rtf × 길이`만큼 대기합니다.
+
+## 실행
+
+```bash
+python -m benchmarks.direct_upload
+python -m benchmarks.direct_upload --megabytes 10 --uplink 20 --rtf 0.02
+```
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+import tracemalloc
+from typing import AsyncIterator, List
+
+import httpx
+
+from api.uploads import transcribe_upload
+from benchmarks.audio_vad import make_practice_recording
+from langgraph.nodes.stt import speech_to_text
+from langgraph.utils import audio
+from langgraph.utils.audio_probe import probe_audio_bytes
+from tests.stand_in_server import StandInRequest, StandInResponse, StandInServer
+
+
+# ASGI 서버가 요청 본문을 넘겨주는 청크 크기
+BODY_CHUNK_BYTES = 64 * 1024
+
+SESSIONS = ("url-path", "upload-path")
+
+
+def run_upstream(ready: multiprocessing.Queue, base: float, rtf: float, storage_latency: float) -> None:
+    """Storage + Whisper Stand-in (자식 프로세스)"""
+
+    async def serve() -> None:
+        stored = {}
+
+        def storage(name: str):
+            async def upload(request: StandInRequest) -> StandInResponse:
+                stored[name] = request.body
+                return StandInResponse(200, body=b"{}")
+
+            async def download(request: StandInRequest) -> StandInResponse:
+                return StandInResponse(200, body=stored.get(name, b""), delay=storage_latency)
+
+            return upload, download
+
+        async def whisper(request: StandInRequest) -> StandInResponse:
+            start = request.body.find(b"RIFF")
+            duration = probe_audio_bytes(request.body[start:]).duration or 0.0
+            await asyncio.sleep(base + rtf * duration)
+            body = {"text": "업로드 벤치마크 전사 결과입니다.", "duration": duration, "segments": []}
+            return StandInResponse(200, body=json.dumps(body).encode(), headers={"content-type": "application/json"})
+
+        async with StandInServer() as server:
+            for session in SESSIONS:
+                upload, download = storage(session)
+                server.handle(f"/storage/v1/object/audio/uploads/{session}.wav", upload)
+                server.handle(f"/storage/v1/object/public/audio/uploads/{session}.wav", download)
+            server.handle("/v1/audio/transcriptions", whisper)
+            ready.put(server.port)
+            await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+async def throttled(data: bytes, uplink_bytes_per_second: float) -> AsyncIterator[bytes]:
+    """대역폭이 제한된 클라이언트 업로드 흉내"""
+    view = memoryview(data)
+    started = time.perf_counter()
+    for offset in range(0, len(data), BODY_CHUNK_BYTES):
+        chunk = bytes(view[offset:offset + BODY_CHUNK_BYTES])
+        sent_at = started + (offset + len(chunk)) / uplink_bytes_per_second
+        await asyncio.sleep(max(sent_at - time.perf_counter(), 0.0))
+        yield chunk
+
+
+async def url_path(base_url: str, data: bytes, uplink: float) -> dict:
+    """Storage에 먼저 올린 뒤 API 서버가 URL로 전사"""
+    started = time.perf_counter()
+    async with httpx.AsyncClient() as client:
+        await client.post(
+            f"{base_url}/storage/v1/object/audio/uploads/url-path.wav",
+            content=throttled(data, uplink),
+            headers={"Content-Type": "audio/wav"},
+            timeout=None,
+        )
+    uploaded = time.perf_counter()
+
+    # 여기부터 API 서버 처리
+    tracemalloc.start()
+    result = await speech_to_text({"audio_file_path": f"{base_url}/storage/v1/object/public/audio/uploads/url-path.wav"})
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "upload": uploaded - started,
+        "total": time.perf_counter() - started,
+        "peak": peak,
+        "transcribed": bool(result.get("transcript")),
+    }
+
+
+async def upload_path(data: bytes, uplink: float) -> dict:
+    """요청 본문을 Storage와 Whisper에 동시에 스트리밍"""
+    started = time.perf_counter()
+    tracemalloc.start()
+    result = await transcribe_upload(throttled(data, uplink), "upload-path", "answer.wav", "audio/wav")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "upload": None,
+        "total": time.perf_counter() - started,
+        "peak": peak,
+        "transcribed": bool(result.stt),
+    }
+
+
+async def run(args: argparse.Namespace, port: int) -> None:
+    base_url = f"http://127.0.0.1:{port}"
+    os.environ["SUPABASE_URL"] = base_url
+    os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench")
+    os.environ["OPENAI_BASE_URL"] = f"{base_url}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+    # 스테레오 48kHz 16bit = 초당 192KB
+    minutes = args.megabytes * 2 ** 20 / (48000 * 2 * 2) / 60
+    data = make_practice_recording(minutes, lead=1.0, tail=1.0)
+    uplink = args.uplink * 1_000_000 / 8
+
+    print(
+        f"{len(data) / 2 ** 20:.1f}MB WAV ({minutes * 60:.0f}s), uplink {args.uplink:g}Mbit/s, "
+        f"Whisper {args.base}s + {args.rtf} x audio seconds"
+    )
+    print(f"{'path':>7} {'client upload':>14} {'end-to-end':>11} {'server peak':>12}")
+
+    for name, scenario in (("url", lambda: url_path(base_url, data, uplink)), ("upload", lambda: upload_path(data, uplink))):
+        result = await scenario()
+        if not result["transcribed"]:
+            print(f"{name:>7} transcription failed")
+            continue
+        upload = f"{result['upload']:>13.2f}s" if result["upload"] is not None else f"{'(streamed)':>14}"
+        print(f"{name:>7} {upload} {result['total']:>10.2f}s {result['peak'] / 2 ** 20:>10.1f}MB")
+
+    audio.shutdown_preprocess_executor()
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Direct upload benchmark")
+    parser.add_argument("--megabytes", type=float, default=10.0)
+    parser.add_argument("--uplink", type=float, default=20.0, help="클라이언트 업로드 대역폭 (Mbit/s)")
+    parser.add_argument("--base", type=float, default=0.4, help="Whisper 고정 지연 (초)")
+    parser.add_argument("--rtf", type=float, default=0.02, help="오디오 1초당 Whisper 처리 시간 (초)")
+    parser.add_argument("--storage-latency", type=float, default=0.1, help="Storage 다운로드 첫 바이트 지연 (초)")
+    args = parser.parse_args(argv)
+
+    ready: multiprocessing.Queue = multiprocessing.Queue()
+    upstream = multiprocessing.Process(
+        target=run_upstream, args=(ready, args.base, args.rtf, args.storage_latency), daemon=True
+    )
+    upstream.start()
+    try:
+        asyncio.run(run(args, ready.get(timeout=10)))
+    finally:
+        upstream.terminate()
+        upstream.join()
+
+
+if __name__ == "__main__":
+    main()
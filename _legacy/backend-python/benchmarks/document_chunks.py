@@ -0,0 +1,169 @@
+"""
+문서 분할 추출 벤치마크
+
+5천~10만 자 문서 세트에서 문서 분석 추출의 지연 시간과 커버리지를 비교합니다.
+
+- truncate : 모든 문서를 이어 붙여 앞 10,000자만 한 번에 추출 (도입 전)
+- chunked  : 조각별 동시 추출 후 합치기 (run_document_extraction)
+- rechunked: 문서 끝에 문단 하나를 추가한 뒤 다시 추출 (조각 캐시로 바뀐 조각만 호출)
+
+합성 문서에는 약 1,000자마다 성과 표식(`[FACT-001]` 등)을 심습니다.
+커버리지는 추출 요청에 실제로 포함된 표식의 비율입니다.
+
+Claude Stand-in(/v1/messages)은 프롬프트에서 찾은 표식마다 성과 항목을 하나씩 돌려주며,
+`base + 입력 1,000자당 --input-rate + 응답 항목당 --item-rate`초 후에 응답합니다.
+(응답 길이가 지연 시간을 좌우하는 LLM 특성을 단순화한 모델)
+
+## 실행
+
+```bash
+python -m benchmarks.document_chunks
+python -m benchmarks.document_chunks --sizes 5000 20000 100000 --concurrency 8
+```
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import re
+import time
+import weakref
+from typing import List
+
+from langgraph.nodes import context
+from langgraph.utils import resilience
+from langgraph.utils.documents import DOCUMENT_CHUNK_CHARS
+from tests.stand_in_server import StandInRequest, StandInResponse, StandInServer
+
+
+FACT = re.compile(r"\[FACT-\d+\]")
+TRUNCATE_CHARS = 10000
+FILLER = "대용량 트래픽 환경에서 운영 안정성을 높이기 위해 모니터링과 장애 대응 체계를 정비했습니다. "
+
+
+def make_documents(total_chars: int) -> List[dict]:
+    """이력서(최대 4천 자) + 포트폴리오(나머지), 약 1,000자마다 성과 표식"""
+    def document(document_type: str, chars: int, first_fact: int) -> dict:
+        paragraphs = []
+        length = 0
+        fact = first_fact
+        while length < chars:
+            paragraph = f"[FACT-{fact:03d}] 프로젝트 {fact}: 처리량을 {fact % 9 + 2}배 개선했습니다. " + FILLER * 11
+            paragraphs.append(paragraph)
+            length += len(paragraph) + 2
+            fact += 1
+        return {"document_type": document_type, "extracted_text": "\n\n".join(paragraphs)}
+
+    resume_chars = min(4000, total_chars)
+    resume = document("resume", resume_chars, 1)
+    documents = [resume]
+    if total_chars > resume_chars:
+        first = len(FACT.findall(resume["extracted_text"])) + 1
+        documents.append(document("portfolio", total_chars - resume_chars, first))
+    return documents
+
+
+def claude_stand_in(base: float, input_rate: float, item_rate: float, seen: set):
+    """프롬프트의 표식 수만큼 성과를 돌려주는 Claude 흉내"""
+
+    async def handler(request: StandInRequest) -> StandInResponse:
+        prompt = json.loads(request.body)["messages"][0]["content"]
+        facts = FACT.findall(prompt)
+        seen.update(facts)
+        await asyncio.sleep(base + input_rate * len(prompt) / 1000 + item_rate * len(facts))
+
+        extraction = {
+            "skills": ["Kafka", "Redis"],
+            "key_achievements": [{"project": fact, "achievement": "처리량 개선", "numbers": "2배"} for fact in facts],
+            "differentiators": [],
+            "expected_questions": [f"{fact} 프로젝트에서 맡은 역할은?" for fact in facts[:3]],
+        }
+        body = {
+            "id": "msg_bench",
+            "type": "message",
+            "role": "assistant",
+            "model": context.EXTRACTION_MODEL,
+            "content": [{"type": "text", "text": json.dumps(extraction, ensure_ascii=False)}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": len(prompt) // 2, "output_tokens": 40 * len(facts)},
+        }
+        return StandInResponse(200, body=json.dumps(body).encode(), headers={"content-type": "application/json"})
+
+    return handler
+
+
+async def run_truncated(documents: List[dict]) -> None:
+    """도입 전 방식: 이어 붙인 문서의 앞 10,000자로 한 번 추출"""
+    from anthropic import AsyncAnthropic
+
+    content = context.combine_documents(documents)[:TRUNCATE_CHARS]
+    await AsyncAnthropic().messages.create(
+        model=context.EXTRACTION_MODEL,
+        max_tokens=1500,
+        messages=[{"role": "user", "content": context.EXTRACTION_PROMPT.format(label="all", content=content)}],
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    seen = set()
+    resilience.PROVIDER_CONCURRENCY["anthropic"] = args.concurrency
+    resilience._provider_semaphores = weakref.WeakKeyDictionary()
+
+    async with StandInServer() as server:
+        server.handle("/v1/messages", claude_stand_in(args.base, args.input_rate, args.item_rate, seen))
+        os.environ["ANTHROPIC_BASE_URL"] = server.url("").rstrip("/")
+        os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+
+        print(
+            f"Claude stand-in: {args.base}s + {args.input_rate}s/1k chars + {args.item_rate}s/item, "
+            f"chunk {DOCUMENT_CHUNK_CHARS} chars, concurrency {args.concurrency}"
+        )
+        print(f"{'chars':>7} {'facts':>6} {'scenario':>10} {'calls':>6} {'latency':>8} {'coverage':>9}")
+
+        for size in args.sizes:
+            documents = make_documents(size)
+            facts = set(FACT.findall(context.combine_documents(documents)))
+            context.CHUNK_CACHE.clear()
+
+            scenarios = (
+                ("truncate", lambda: run_truncated(documents)),
+                ("chunked", lambda: context.run_document_extraction(documents)),
+                ("rechunked", lambda: context.run_document_extraction(edited)),
+            )
+            edited = [*documents[:-1], {
+                **documents[-1],
+                "extracted_text": documents[-1]["extracted_text"] + "\n\n추가 경력: 사내 기술 세미나 진행",
+            }]
+
+            for name, scenario in scenarios:
+                seen.clear()
+                calls_before = server.hits("/v1/messages")
+                started = time.perf_counter()
+                await scenario()
+                elapsed = time.perf_counter() - started
+                # 바뀐 조각만 요청하므로 재추출의 커버리지는 의미 없음
+                coverage = f"{len(seen & facts) / len(facts):.0%}" if name != "rechunked" else "-"
+                print(
+                    f"{size:>7} {len(facts):>6} {name:>10} {server.hits('/v1/messages') - calls_before:>6} "
+                    f"{elapsed:>7.2f}s {coverage:>9}"
+                )
+                # 호출마다 만든 Anthropic 클라이언트를 측정 밖에서 정리
+                gc.collect()
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Chunked document extraction benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 20000, 50000, 100000], help="문서 세트 전체 문자 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="Claude 동시 호출 상한 (ANTHROPIC_MAX_CONCURRENCY)")
+    parser.add_argument("--base", type=float, default=0.5, help="Claude 고정 지연 (초)")
+    parser.add_argument("--input-rate", type=float, default=0.05, help="입력 1,000자당 지연 (초)")
+    parser.add_argument("--item-rate", type=float, default=0.15, help="응답 항목당 지연 (초)")
+    args = parser.parse_args(argv)
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
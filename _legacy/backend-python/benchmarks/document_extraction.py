@@ -0,0 +1,194 @@
+"""
+문서 추출 결과 재사용 벤치마크
+
+Deep Mode 세션이 여러 프로젝트에 흩어져 들어오고 가끔 문서가 바뀌는 상황에서
+문서 분석 노드(analyze_uploaded_context)의 Claude 호출 수, 캐시 적중률, 세션당 지연 시간을 비교합니다.
+
+- no-cache: 세션마다 추출 (도입 전)
+- cache   : 문서 해시가 같으면 저장된 결과 사용 (프로젝트 첫 세션 / 문서 변경 직후에만 추출)
+- warm    : cache + 문서 업로드/변경 직후 워밍업 작업이 미리 추출
+
+Claude는 `--claude-seconds`만큼 대기하는 로컬 Stand-in(/v1/messages)이고,
+Supabase(project_documents / project_context_extractions)는 조회마다 `--db-ms`만큼 대기하는 메모리 저장소입니다.
+세션은 순서대로 실행하며, 워밍업 작업은 다음 세션 전에 끝난다고 가정합니다.
+
+## 실행
+
+```bash
+python -m benchmarks.document_extraction
+python -m benchmarks.document_extraction --projects 20 --sessions 100 --edit-rate 0.05 --claude-seconds 2
+```
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import statistics
+import time
+from typing import List
+
+from langgraph.nodes import context
+from tests.stand_in_server import StandInResponse, StandInServer
+
+
+SCENARIOS = ("no-cache", "cache", "warm")
+
+RESUME = "결제 서버 응답 시간을 40% 줄였고, Redis 캐시와 Kafka 기반 정산 파이프라인을 설계했습니다. " * 40
+
+
+class MemorySupabase:
+    """analyze_uploaded_context가 쓰는 테이블만 흉내 내는 메모리 저장소"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.tables = {"project_documents": [], "project_context_extractions": []}
+
+    def table(self, name: str) -> "MemoryQuery":
+        return MemoryQuery(self, name)
+
+
+class MemoryQuery:
+    def __init__(self, db: MemorySupabase, name: str):
+        self.db = db
+        self.name = name
+        self.filters = []
+        self.row = None
+        self.key = None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, count):
+        return self
+
+    def upsert(self, row, on_conflict):
+        self.row, self.key = row, on_conflict
+        return self
+
+    def execute(self):
+        time.sleep(self.db.latency)
+        rows = self.db.tables[self.name]
+        if self.row is not None:
+            rows[:] = [r for r in rows if r[self.key] != self.row[self.key]] + [dict(self.row)]
+            data = [self.row]
+        else:
+            data = [r for r in rows if all(r.get(c) == v for c, v in self.filters)]
+        return type("Response", (), {"data": data})()
+
+
+def make_workload(projects: int, sessions: int, edit_rate: float, seed: int) -> List[tuple]:
+    """(project_id, 세션 직전 문서 변경 여부) 목록"""
+    rng = random.Random(seed)
+    return [(f"project-{rng.randrange(projects)}", rng.random() < edit_rate) for _ in range(sessions)]
+
+
+def put_documents(db: MemorySupabase, project_id: str, revision: int) -> None:
+    """프로젝트 문서 교체 (이력서 + 포트폴리오)"""
+    rows = db.tables["project_documents"]
+    rows[:] = [r for r in rows if r["project_id"] != project_id]
+    rows.append({"project_id": project_id, "document_type": "resume", "extracted_text": f"{RESUME} rev {revision}"})
+    rows.append({"project_id": project_id, "document_type": "portfolio", "extracted_text": RESUME[:2000]})
+
+
+async def run_scenario(name: str, workload: List[tuple], server: StandInServer, db_latency: float) -> dict:
+    db = MemorySupabase(db_latency)
+    context.create_client = lambda *args: db
+    context.EXTRACTION_STATS.update(hits=0, misses=0, saved_ms=0.0)
+    stored_lookup = context.load_stored_extraction
+    if name == "no-cache":
+        context.load_stored_extraction = lambda *args: None
+
+    revisions = {}
+    latencies = []
+    calls_before = server.hits("/v1/messages")
+    try:
+        for project_id, edited in workload:
+            if project_id not in revisions or edited:
+                revisions[project_id] = revisions.get(project_id, -1) + 1
+                put_documents(db, project_id, revisions[project_id])
+                if name == "warm":
+                    documents = context.load_project_documents(project_id)
+                    await context.extract_document_context(project_id, documents, record_stats=False)
+
+            started = time.perf_counter()
+            await context.analyze_uploaded_context({"project_id": project_id})
+            latencies.append(time.perf_counter() - started)
+            # 호출마다 만든 Anthropic 클라이언트를 세션 사이에 정리 (측정 중 GC로 연결이 닫히지 않도록)
+            gc.collect()
+    finally:
+        context.load_stored_extraction = stored_lookup
+
+    return {
+        "calls": server.hits("/v1/messages") - calls_before,
+        "hit_rate": context.extraction_hit_rate(),
+        "mean": statistics.mean(latencies),
+        "p50": statistics.median(latencies),
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    body = {
+        "id": "msg_bench",
+        "type": "message",
+        "role": "assistant",
+        "model": context.EXTRACTION_MODEL,
+        "content": [{"type": "text", "text": json.dumps({"skills": ["Redis", "Kafka"]})}],
+        "stop_reason": "end_turn",
+        "usage": {"input_tokens": 3000, "output_tokens": 1500},
+    }
+
+    async def claude(request):
+        return StandInResponse(
+            200,
+            body=json.dumps(body).encode(),
+            headers={"content-type": "application/json"},
+            delay=args.claude_seconds,
+        )
+
+    async with StandInServer() as server:
+        server.handle("/v1/messages", claude)
+        os.environ["ANTHROPIC_BASE_URL"] = server.url("").rstrip("/")
+        os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+
+        workload = make_workload(args.projects, args.sessions, args.edit_rate, args.seed)
+        print(
+            f"{args.sessions} sessions over {args.projects} projects, edit rate {args.edit_rate:.0%}, "
+            f"Claude stand-in {args.claude_seconds}s, DB {args.db_ms}ms per query"
+        )
+        print(f"{'scenario':>9} {'claude calls':>13} {'hit rate':>9} {'mean':>8} {'p50':>8} {'saved/session':>14}")
+
+        baseline = None
+        for name in SCENARIOS:
+            result = await run_scenario(name, workload, server, args.db_ms / 1000)
+            baseline = baseline or result["mean"]
+            print(
+                f"{name:>9} {result['calls']:>13} {result['hit_rate']:>8.0%} "
+                f"{result['mean']:>7.2f}s {result['p50']:>7.2f}s {baseline - result['mean']:>13.2f}s"
+            )
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Document extraction cache benchmark")
+    parser.add_argument("--projects", type=int, default=10)
+    parser.add_argument("--sessions", type=int, default=60, help="Deep Mode 세션 수")
+    parser.add_argument("--edit-rate", type=float, default=0.05, help="세션 직전에 문서가 바뀌는 비율")
+    parser.add_argument("--claude-seconds", type=float, default=1.0, help="Claude 추출 응답 시간 (초)")
+    parser.add_argument("--db-ms", type=float, default=15.0, help="Supabase 조회 1회 지연 (ms)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
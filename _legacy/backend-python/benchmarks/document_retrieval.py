@@ -0,0 +1,244 @@
+"""
+문서 구간 검색 (BM25) 벤치마크
+
+1. 색인: 구간 1천~5만 개의 색인 생성 / 저장 / 읽기 / 질의 시간
+2. 프롬프트: 문서 세트(2만~10만 자)에서 분석 + 개선 프롬프트의 입력 토큰과
+   첫 토큰까지의 시간(TTFT)을 비교합니다.
+   - wholesale: 문서 전체를 프롬프트에 넣음 (도입 전)
+   - top-k    : 질문 + 답변으로 검색한 구간 `RETRIEVAL_TOP_K`개만 넣음 (retrieve_document_passages)
+
+합성 문서는 무작위 한국어 어휘로 만들고, 질문/답변과 관련된 문단 하나를 심습니다.
+토큰 수는 한글 1자 ≈ 1토큰, 그 외 4자 ≈ 1토큰으로 어림합니다.
+
+Claude Stand-in(/v1/messages)은 `base + 입력 1,000토큰당 --prefill-rate`초 후에 응답합니다.
+(첫 토큰까지의 시간이 입력 길이에 비례하는 prefill 특성을 단순화한 모델, 생성 시간은 두 방식이 같으므로 제외)
+TTFT는 분석 + 개선 두 호출의 합입니다.
+
+## 실행
+
+```bash
+python -m benchmarks.document_retrieval
+python -m benchmarks.document_retrieval --passages 1000 50000 --doc-chars 20000 100000 --prefill-rate 0.1
+```
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import re
+import statistics
+import tempfile
+import time
+from typing import List
+
+from langgraph.nodes import context
+from langgraph.nodes.analysis import analyze_content
+from langgraph.nodes.improvement import generate_improved_script
+from langgraph.utils import retrieval
+from langgraph.utils.retrieval import RETRIEVAL_TOP_K, BM25Index
+from tests.stand_in_server import StandInRequest, StandInResponse, StandInServer
+
+
+QUESTION = "가장 큰 성능 개선 경험을 말해주세요"
+TRANSCRIPT = (
+    "결제 서버 응답이 느려서 Redis 캐시를 도입했고, 그 결과 응답 시간을 40% 줄였습니다. "
+    "캐시 무효화 규칙을 정하느라 팀과 여러 번 논의했습니다."
+)
+RELEVANT = "결제 서버 응답 지연 문제를 Redis 캐시 도입으로 해결해 응답 시간을 40% 단축했습니다."
+
+ANALYSIS = {
+    "scores": {"logic_structure": "B+", "content_specificity": "B"},
+    "suggestions": [{"priority": 1, "category": "structure", "suggestion": "결과를 먼저 말하세요", "impact": "전달력"}],
+    "structure_analysis": "STAR 구조 대부분 포함",
+}
+
+_HANGUL = re.compile(r"[가-힣]")
+
+
+def estimate_tokens(text: str) -> int:
+    """입력 토큰 어림값 (한글 1자 ≈ 1토큰, 그 외 4자 ≈ 1토큰)"""
+    hangul = len(_HANGUL.findall(text))
+    return hangul + (len(text) - hangul) // 4
+
+
+def make_vocabulary(rng: random.Random, size: int = 8000) -> List[str]:
+    """2~4음절 무작위 한국어 단어 + 조사"""
+    syllables = [chr(0xAC00 + i) for i in range(0, 11172, 7)]
+    particles = ["", "을", "를", "이", "가", "은", "는", "에서", "으로"]
+    return [
+        "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) + rng.choice(particles)
+        for _ in range(size)
+    ]
+
+
+def make_text(rng: random.Random, vocabulary: List[str], chars: int) -> str:
+    """문단(약 300자) 단위 무작위 텍스트"""
+    paragraphs = []
+    length = 0
+    while length < chars:
+        paragraph = " ".join(rng.choice(vocabulary) for _ in range(70)) + "."
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(paragraphs)
+
+
+def make_documents(rng: random.Random, vocabulary: List[str], total_chars: int) -> List[dict]:
+    """이력서(최대 4천 자) + 포트폴리오(나머지), 포트폴리오 중간에 관련 문단"""
+    resume = make_text(rng, vocabulary, min(4000, total_chars))
+    portfolio = make_text(rng, vocabulary, max(total_chars - 4000, 0)).split("\n\n")
+    portfolio.insert(len(portfolio) // 2, RELEVANT)
+    return [
+        {"document_type": "resume", "extracted_text": resume},
+        {"document_type": "portfolio", "extracted_text": "\n\n".join(portfolio)},
+    ]
+
+
+def bench_index(args: argparse.Namespace, vocabulary: List[str], rng: random.Random) -> None:
+    print(f"{'passages':>9} {'build':>9} {'save':>8} {'load':>8} {'query p50':>10} {'query p95':>10}")
+    queries = [QUESTION + " " + " ".join(rng.choice(vocabulary) for _ in range(60)) for _ in range(args.queries)]
+
+    for count in args.passages:
+        passages = [
+            {"document_type": "portfolio", "text": " ".join(rng.choice(vocabulary) for _ in range(retrieval.PASSAGE_CHARS // 5))}
+            for _ in range(count)
+        ]
+
+        started = time.perf_counter()
+        index = BM25Index.build(passages)
+        build = time.perf_counter() - started
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench")
+            started = time.perf_counter()
+            index.save(path)
+            save = time.perf_counter() - started
+            started = time.perf_counter()
+            BM25Index.load(path)
+            load = time.perf_counter() - started
+
+        latencies = []
+        for query in queries:
+            started = time.perf_counter()
+            index.search(query, RETRIEVAL_TOP_K)
+            latencies.append((time.perf_counter() - started) * 1000)
+        latencies.sort()
+
+        print(
+            f"{count:>9} {build:>8.2f}s {save * 1000:>6.0f}ms {load * 1000:>6.0f}ms "
+            f"{statistics.median(latencies):>8.2f}ms {latencies[int(len(latencies) * 0.95) - 1]:>8.2f}ms"
+        )
+
+
+def claude_stand_in(base: float, prefill_rate: float, prompt_tokens: list):
+    """입력 길이에 비례해 늦게 응답하는 Claude 흉내"""
+
+    async def handler(request: StandInRequest) -> StandInResponse:
+        payload = json.loads(request.body)
+        tokens = estimate_tokens(payload.get("system", "") + payload["messages"][0]["content"])
+        prompt_tokens.append(tokens)
+        await asyncio.sleep(base + prefill_rate * tokens / 1000)
+
+        body = {
+            "id": "msg_bench",
+            "type": "message",
+            "role": "assistant",
+            "model": "claude-sonnet-4-20250514",
+            "content": [{"type": "text", "text": json.dumps(ANALYSIS, ensure_ascii=False)}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": tokens, "output_tokens": 300},
+        }
+        return StandInResponse(200, body=json.dumps(body).encode(), headers={"content-type": "application/json"})
+
+    return handler
+
+
+async def bench_prompts(args: argparse.Namespace, vocabulary: List[str], rng: random.Random) -> None:
+    prompt_tokens = []
+
+    async with StandInServer() as server:
+        server.handle("/v1/messages", claude_stand_in(args.base, args.prefill_rate, prompt_tokens))
+        os.environ["ANTHROPIC_BASE_URL"] = server.url("").rstrip("/")
+        os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+
+        print(
+            f"\nClaude stand-in: {args.base}s + {args.prefill_rate}s/1k input tokens, top-k {RETRIEVAL_TOP_K}, "
+            f"passage {retrieval.PASSAGE_CHARS} chars"
+        )
+        print(f"{'doc chars':>9} {'scenario':>10} {'tokens':>8} {'retrieve':>9} {'TTFT':>7} {'relevant':>9}")
+
+        with tempfile.TemporaryDirectory() as directory:
+            retrieval.DOCUMENT_INDEX_DIR = directory
+
+            for size in args.doc_chars:
+                documents = make_documents(rng, vocabulary, size)
+                project_id = f"bench-{size}"
+                context.create_client = lambda *args: _documents_client(documents)
+                context.INDEX_CACHE.clear()
+                state = {
+                    "mode": "deep",
+                    "project_id": project_id,
+                    "question": QUESTION,
+                    "transcript": TRANSCRIPT,
+                    "audio_duration": 30,
+                }
+                # 첫 세션의 색인 생성은 워밍업 작업이 미리 처리 (세션 지연에서 제외)
+                await context.get_document_index(project_id, documents)
+
+                for name in ("wholesale", "top-k"):
+                    started = time.perf_counter()
+                    if name == "wholesale":
+                        passages = [context.combine_documents(documents)]
+                    else:
+                        passages = (await context.retrieve_document_passages(state))["document_passages"]
+                    retrieve = time.perf_counter() - started
+
+                    prompt_tokens.clear()
+                    started = time.perf_counter()
+                    session = {**state, "document_passages": passages}
+                    session.update(await analyze_content(session))
+                    await generate_improved_script(session)
+                    ttft = time.perf_counter() - started
+
+                    relevant = "yes" if any(RELEVANT in p for p in passages) else "no"
+                    print(
+                        f"{size:>9} {name:>10} {sum(prompt_tokens):>8} {retrieve * 1000:>7.1f}ms "
+                        f"{ttft:>6.2f}s {relevant:>9}"
+                    )
+                    # 호출마다 만든 Anthropic 클라이언트를 측정 밖에서 정리
+                    gc.collect()
+
+
+def _documents_client(documents: List[dict]):
+    """load_project_documents만 흉내 내는 Supabase 대역"""
+
+    class Query:
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: self
+
+        def execute(self):
+            return type("Response", (), {"data": documents})()
+
+    return type("Client", (), {"table": lambda self, name: Query()})()
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="BM25 document retrieval benchmark")
+    parser.add_argument("--passages", type=int, nargs="+", default=[1000, 5000, 10000, 50000], help="색인 구간 수")
+    parser.add_argument("--queries", type=int, default=50, help="색인 크기별 질의 수")
+    parser.add_argument("--doc-chars", type=int, nargs="+", default=[20000, 50000, 100000], help="문서 세트 전체 문자 수")
+    parser.add_argument("--base", type=float, default=0.3, help="Claude 고정 지연 (초)")
+    parser.add_argument("--prefill-rate", type=float, default=0.05, help="입력 1,000토큰당 첫 토큰 지연 (초)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng)
+    bench_index(args, vocabulary, rng)
+    asyncio.run(bench_prompts(args, vocabulary, rng))
+
+
+if __name__ == "__main__":
+    main()
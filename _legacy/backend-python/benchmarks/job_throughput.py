@@ -0,0 +1,160 @@
+"""
+작업 큐 처리량 벤치마크
+
+워커 프로세스 수에 따라 분당 처리 세션 수가 어떻게 늘어나는지 측정합니다.
+
+Mock 노드는 즉시 반환하므로, 각 노드에 외부 API 대기 시간(기본 50ms)을 더해
+실제 파이프라인처럼 I/O 대기가 대부분인 작업을 흉내 냅니다.
+
+## 실행
+
+```bash
+python -m benchmarks.job_throughput
+python -m benchmarks.job_throughput --workers 1 2 4 8 --sessions 64 --node-latency 0.1
+```
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from functools import partial
+from typing import List, Optional
+
+from langgraph.graph import StateGraph, START, END
+
+from api.jobs import JobQueue, WorkerPool
+from api.jobs.runner import run_analysis_job
+from langgraph.state import SpeechCoachState
+
+
+# 노드당 모의 외부 API 대기 시간 (초) - 워커 프로세스에서도 읽도록 환경변수 사용
+NODE_LATENCY_ENV = "BENCH_NODE_LATENCY"
+
+
+def _with_latency(node, latency: float):
+    async def wrapped(state):
+        await asyncio.sleep(latency)
+        return await node(state)
+    return wrapped
+
+
+def create_latency_mock_graph(latency: Optional[float] = None):
+    """노드마다 모의 대기 시간이 있는 Mock 그래프 (latency 생략 시 환경변수 값)"""
+    from langgraph.nodes import (
+        load_progressive_context_mock,
+        speech_to_text_mock,
+        analyze_content_mock,
+        generate_improved_script_mock,
+        reflect_on_improvement_mock,
+        generate_tts_mock,
+    )
+
+    if latency is None:
+        latency = float(os.getenv(NODE_LATENCY_ENV, "0.05"))
+    nodes = [
+        ("load_context", load_progressive_context_mock),
+        ("stt", speech_to_text_mock),
+        ("analyze", analyze_content_mock),
+        ("improve", generate_improved_script_mock),
+        ("reflect", reflect_on_improvement_mock),
+        ("tts", generate_tts_mock),
+    ]
+
+    graph = StateGraph(SpeechCoachState)
+    previous = START
+    for name, node in nodes:
+        graph.add_node(name, _with_latency(node, latency))
+        graph.add_edge(previous, name)
+        previous = name
+    graph.add_edge(previous, END)
+
+    return graph.compile()
+
+
+# 워커 프로세스에서 "benchmarks.job_throughput:mock_analysis_job"으로 import
+mock_analysis_job = partial(run_analysis_job, graph_factory=create_latency_mock_graph)
+
+
+def measure(workers: int, sessions: int, concurrency: int) -> float:
+    """
+    워커 수별 처리 시간 측정
+
+    Returns:
+        float: 분당 처리 세션 수
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "jobs.sqlite3")
+        queue = JobQueue(db_path)
+
+        pool = WorkerPool(
+            workers,
+            db_path=db_path,
+            handlers={"analyze": "benchmarks.job_throughput:mock_analysis_job"},
+            concurrency=concurrency,
+            poll_interval=0.01,
+        )
+        pool.start()
+
+        try:
+            # 워커 기동(spawn) 시간은 측정에서 제외: 워밍업 작업이 처리될 때까지 대기
+            for i in range(workers):
+                queue.enqueue("analyze", _payload(f"warmup-{i}"))
+            _wait_until_done(queue, timeout=120)
+
+            started = time.monotonic()
+            for i in range(sessions):
+                queue.enqueue("analyze", _payload(f"bench-{i}"))
+            _wait_until_done(queue, timeout=600)
+            elapsed = time.monotonic() - started
+        finally:
+            pool.stop()
+
+        failed = queue.stats().get("failed", 0)
+        if failed:
+            raise RuntimeError(f"{failed} jobs failed during benchmark")
+
+    return sessions / elapsed * 60
+
+
+def _payload(session_id: str) -> dict:
+    return {
+        "session_id": session_id,
+        "audio_url": "https://example.com/audio.webm",
+        "deadline_seconds": 600,
+    }
+
+
+def _wait_until_done(queue: JobQueue, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stats = queue.stats()
+        if not stats.get("queued") and not stats.get("running"):
+            return
+        time.sleep(0.05)
+    raise TimeoutError(f"Jobs not finished within {timeout}s: {queue.stats()}")
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Job queue throughput benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--node-latency", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    os.environ[NODE_LATENCY_ENV] = str(args.node_latency)
+
+    print(f"sessions={args.sessions} concurrency={args.concurrency} node_latency={args.node_latency}s")
+    print(f"{'workers':>8} {'sessions/min':>14} {'speedup':>8}")
+
+    baseline = None
+    for workers in args.workers:
+        rate = measure(workers, args.sessions, args.concurrency)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>14.1f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
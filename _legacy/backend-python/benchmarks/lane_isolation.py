@@ -0,0 +1,172 @@
+"""
+Quick / Deep 레인 격리 벤치마크
+
+Deep Mode 작업이 한꺼번에 몰린 상태에서 Quick Mode 작업이 꾸준히 들어올 때,
+Quick Mode 지연 시간(p50/p95)을 두 가지 구성으로 비교합니다.
+
+- shared: 워커 4개가 모든 작업을 FIFO로 처리 (레인 도입 전)
+- lanes : 같은 워커 4개를 quick 전용 2개 + deep 전용 2개로 분리
+          (deep 워커는 여유 있을 때 quick도 처리, deep 전역 상한 2)
+
+Mock 노드에 모의 대기 시간을 더해 Deep(ReAct · 문서 분석)이 Quick보다
+훨씬 오래 걸리는 상황을 흉내 냅니다.
+
+## 실행
+
+```bash
+python -m benchmarks.lane_isolation
+python -m benchmarks.lane_isolation --deep-jobs 16 --quick-jobs 60 --deep-latency 0.8
+```
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+from api.jobs import JobQueue, ProgressBus, WorkerPool
+from api.jobs.runner import run_analysis_job
+from benchmarks.job_throughput import create_latency_mock_graph
+
+
+QUICK_LATENCY_ENV = "BENCH_QUICK_NODE_LATENCY"
+DEEP_LATENCY_ENV = "BENCH_DEEP_NODE_LATENCY"
+
+
+async def mode_aware_mock_job(job, bus: ProgressBus) -> dict:
+    """모드에 따라 노드 대기 시간이 다른 Mock 분석 작업"""
+    env = DEEP_LATENCY_ENV if job.payload.get("mode") == "deep" else QUICK_LATENCY_ENV
+    latency = float(os.getenv(env, "0.03"))
+    return await run_analysis_job(
+        job, bus, graph_factory=lambda: create_latency_mock_graph(latency)
+    )
+
+
+HANDLERS = {"analyze": "benchmarks.lane_isolation:mode_aware_mock_job"}
+
+
+def run_scenario(name: str, args: argparse.Namespace) -> Dict[str, float]:
+    """
+    시나리오 실행 후 Quick Mode 지연 시간 통계 반환
+
+    Returns:
+        dict: p50, p95, max (초), deep_done (측정 종료 시점 완료된 deep 작업 수)
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "jobs.sqlite3")
+        queue = JobQueue(db_path)
+
+        if name == "shared":
+            pools = [WorkerPool(4, db_path, HANDLERS, concurrency=1, poll_interval=0.01)]
+            lanes = {"quick": ("default", 0), "deep": ("default", 0)}
+        else:
+            caps = {"deep": 2}
+            pools = [
+                WorkerPool(2, db_path, HANDLERS, concurrency=1, poll_interval=0.01,
+                           lanes=["quick"], lane_caps=caps),
+                WorkerPool(2, db_path, HANDLERS, concurrency=1, poll_interval=0.01,
+                           lanes=["deep", "quick"], lane_caps=caps),
+            ]
+            lanes = {"quick": ("quick", 20), "deep": ("deep", 10)}
+
+        for pool in pools:
+            pool.start()
+
+        try:
+            # 워커 기동 대기 (spawn 시간 제외)
+            for i in range(4):
+                _enqueue(queue, f"warmup-{i}", "quick", lanes)
+            _wait_until_done(queue, timeout=120)
+
+            # 1) Deep Mode 버스트
+            for i in range(args.deep_jobs):
+                _enqueue(queue, f"deep-{i}", "deep", lanes)
+
+            # 2) Quick Mode 요청이 일정 간격으로 도착
+            quick_ids = []
+            for i in range(args.quick_jobs):
+                quick_ids.append(_enqueue(queue, f"quick-{i}", "quick", lanes))
+                time.sleep(args.quick_interval)
+
+            _wait_until_done(queue, timeout=600, job_ids=quick_ids)
+            latencies = [
+                job.updated_at - job.created_at
+                for job in (queue.get(job_id) for job_id in quick_ids)
+            ]
+            deep_done = sum(
+                1 for i in range(args.deep_jobs)
+                if queue.get(f"deep-{i}").status == "completed"
+            )
+        finally:
+            for pool in pools:
+                pool.stop()
+
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "max": latencies[-1],
+        "deep_done": deep_done,
+    }
+
+
+def _enqueue(queue: JobQueue, session_id: str, mode: str, lanes: dict) -> str:
+    lane, priority = lanes[mode]
+    return queue.enqueue(
+        "analyze",
+        {
+            "session_id": session_id,
+            "mode": mode,
+            "audio_url": "https://example.com/audio.webm",
+            "deadline_seconds": 600,
+        },
+        priority=priority,
+        job_id=session_id,
+        lane=lane,
+    )
+
+
+def _wait_until_done(queue: JobQueue, timeout: float, job_ids: List[str] = None) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if job_ids is not None:
+            if all(queue.get(job_id).status in ("completed", "failed") for job_id in job_ids):
+                return
+        else:
+            stats = queue.stats()
+            if not stats.get("queued") and not stats.get("running"):
+                return
+        time.sleep(0.05)
+    raise TimeoutError(f"Jobs not finished within {timeout}s: {queue.stats()}")
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Quick/Deep lane isolation benchmark")
+    parser.add_argument("--deep-jobs", type=int, default=12)
+    parser.add_argument("--quick-jobs", type=int, default=40)
+    parser.add_argument("--quick-interval", type=float, default=0.1)
+    parser.add_argument("--quick-latency", type=float, default=0.03)
+    parser.add_argument("--deep-latency", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    os.environ[QUICK_LATENCY_ENV] = str(args.quick_latency)
+    os.environ[DEEP_LATENCY_ENV] = str(args.deep_latency)
+
+    print(
+        f"deep_jobs={args.deep_jobs} (node {args.deep_latency}s) "
+        f"quick_jobs={args.quick_jobs} every {args.quick_interval}s (node {args.quick_latency}s)"
+    )
+    print(f"{'scenario':>10} {'quick p50':>10} {'quick p95':>10} {'quick max':>10} {'deep done':>10}")
+
+    for name in ("shared", "lanes"):
+        result = run_scenario(name, args)
+        print(
+            f"{name:>10} {result['p50']:>9.2f}s {result['p95']:>9.2f}s "
+            f"{result['max']:>9.2f}s {result['deep_done']:>6}/{args.deep_jobs}"
+        )
+
+
+if __name__ == "__main__":
+    main()
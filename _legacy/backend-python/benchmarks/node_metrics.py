@@ -0,0 +1,150 @@
+"""
+노드 메트릭 래퍼 오버헤드 벤치마크
+
+`instrument_node`(실행 시간 Histogram + 현재 노드 컨텍스트 + 트레이스 span / 프로파일 확인)가 노드 호출마다 더하는 시간을 잽니다.
+트레이스는 샘플링되지 않고 프로파일링 대상이 아닌 경우(기본)입니다.
+노드는 바로 반환하는 빈 함수이므로 측정값이 곧 래퍼 비용입니다. (목표: 노드당 50µs 미만)
+
+- call : 노드 함수 직접 호출 (bare vs 래퍼 vs 래퍼 + Claude usage 토큰 3종 기록)
+- graph: 빈 노드 6개를 잇는 컴파일된 그래프 실행 (bare vs 래퍼 배치를 번갈아 실행, 노드당 시간)
+
+`memory`는 프로세스 메모리 집계(기본), `multiprocess`는 `PROMETHEUS_MULTIPROC_DIR`를 설정한
+별도 프로세스에서 mmap 파일에 집계합니다. (워커 + API 서버 배포 구성)
+
+## 실행
+
+```bash
+python -m benchmarks.node_metrics
+python -m benchmarks.node_metrics --calls 200000 --graph-runs 10000
+```
+"""
+
+import argparse
+import asyncio
+import gc
+import multiprocessing
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import List, Tuple, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+
+GRAPH_NODES = 6
+BATCHES = 10
+GRAPH_BATCH_RUNS = 100
+
+USAGE = SimpleNamespace(input_tokens=1200, output_tokens=400, cache_read_input_tokens=3000)
+
+
+class BenchState(TypedDict):
+    value: int
+
+
+async def empty_node(state: BenchState) -> dict:
+    return {}
+
+
+def build_graph(wrap) -> object:
+    graph = StateGraph(BenchState)
+    names = [f"node_{index}" for index in range(GRAPH_NODES)]
+    for name in names:
+        graph.add_node(name, wrap(name, empty_node))
+    graph.add_edge(START, names[0])
+    for current, following in zip(names, names[1:]):
+        graph.add_edge(current, following)
+    graph.add_edge(names[-1], END)
+    return graph.compile()
+
+
+async def per_call_us(node, calls: int) -> float:
+    """배치별 호출당 평균(µs)의 최솟값 (스케줄링 / GC 잡음 제외)"""
+    results = []
+    for _ in range(BATCHES):
+        started = time.perf_counter()
+        for _ in range(calls // BATCHES):
+            await node({"value": 0})
+        results.append((time.perf_counter() - started) / (calls // BATCHES) * 1e6)
+    return min(results)
+
+
+async def per_node_us(bare, wrapped, runs: int) -> Tuple[float, float]:
+    """
+    그래프 실행당 노드 하나의 시간(µs)
+
+    그래프 실행은 할당이 많아 GC / 스케줄링 잡음이 래퍼 비용보다 크므로,
+    작은 배치(GRAPH_BATCH_RUNS회)를 bare / 래퍼 번갈아 실행하고 배치마다 GC 후 최솟값을 비교합니다.
+    """
+    results = {"bare": [], "wrapped": []}
+    for _ in range(max(runs // GRAPH_BATCH_RUNS, 1)):
+        for name, graph in (("bare", bare), ("wrapped", wrapped)):
+            gc.collect()
+            started = time.perf_counter()
+            for _ in range(GRAPH_BATCH_RUNS):
+                await graph.ainvoke({"value": 0})
+            results[name].append((time.perf_counter() - started) / GRAPH_BATCH_RUNS / GRAPH_NODES * 1e6)
+    return min(results["bare"]), min(results["wrapped"])
+
+
+async def measure(args: argparse.Namespace, mode: str) -> None:
+    from langgraph.utils.metrics import instrument_node, record_anthropic_usage
+
+    async def usage_node(state: BenchState) -> dict:
+        record_anthropic_usage(SimpleNamespace(usage=USAGE))
+        return {}
+
+    async def bare_usage_node(state: BenchState) -> dict:
+        return {}
+
+    bare = await per_call_us(empty_node, args.calls)
+    wrapped = await per_call_us(instrument_node("bench", "empty", empty_node), args.calls)
+    usage_bare = await per_call_us(bare_usage_node, args.calls)
+    usage = await per_call_us(instrument_node("bench", "usage", usage_node), args.calls)
+
+    graph_bare, graph_wrapped = await per_node_us(
+        build_graph(lambda name, fn: fn),
+        build_graph(lambda name, fn: instrument_node("bench_graph", name, fn)),
+        args.graph_runs,
+    )
+
+    print(
+        f"{mode:>12} {'call':>6} {bare:>9.2f}µs {wrapped:>9.2f}µs {wrapped - bare:>9.2f}µs"
+        f" {usage - usage_bare:>14.2f}µs"
+    )
+    print(
+        f"{mode:>12} {'graph':>6} {graph_bare:>9.2f}µs {graph_wrapped:>9.2f}µs"
+        f" {graph_wrapped - graph_bare:>9.2f}µs {'-':>16}"
+    )
+
+
+def run_mode(args: argparse.Namespace, mode: str) -> None:
+    asyncio.run(measure(args, mode))
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Node metrics wrapper overhead benchmark")
+    parser.add_argument("--calls", type=int, default=100_000, help="직접 호출 횟수")
+    parser.add_argument("--graph-runs", type=int, default=4_000, help="그래프 실행 횟수 (bare / 래퍼 각각)")
+    args = parser.parse_args(argv)
+
+    print(f"{args.calls} calls, {args.graph_runs} graph runs ({GRAPH_NODES} nodes), best batch")
+    print(f"{'registry':>12} {'':>6} {'bare':>11} {'wrapped':>11} {'overhead':>11} {'+usage overhead':>16}")
+
+    # 멀티 프로세스 모드는 prometheus_client import 시점에 결정되므로 새 프로세스에서 측정
+    context = multiprocessing.get_context("spawn")
+    for mode in ("memory", "multiprocess"):
+        with tempfile.TemporaryDirectory() as directory:
+            if mode == "multiprocess":
+                os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+            try:
+                process = context.Process(target=run_mode, args=(args, mode))
+                process.start()
+                process.join()
+            finally:
+                os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+구간별 말 속도(Pace Timeline) 벤치마크
+
+길이별 모의 트랜스크립트(단어 타임스탬프)에 대해 analyze_pace_timeline 처리 시간을
+단어마다 윈도우를 세는 순수 Python 구현과 비교합니다.
+1시간 분량도 수 밀리초 안에 끝나야 합니다.
+
+모의 트랜스크립트는 적정 속도(150 WPM) 구간 사이에 빨라진 구간(230 WPM),
+늘어진 구간(70 WPM), 2~4초 멈춤을 섞어 만듭니다.
+
+## 실행
+
+```bash
+python -m benchmarks.pace_timeline
+python -m benchmarks.pace_timeline --minutes 1 10 60 --repeat 20
+```
+"""
+
+import argparse
+import statistics
+import time
+from typing import List
+
+import numpy as np
+
+from langgraph.tools.pace_timeline import (
+    PACE_STEP_SECONDS,
+    PACE_WINDOW_SECONDS,
+    RUSH_WPM,
+    STALL_WPM,
+    analyze_pace_timeline,
+)
+
+
+def make_words(minutes: float, seed: int = 0) -> List[dict]:
+    """속도가 바뀌는 모의 단어 타임스탬프"""
+    rng = np.random.default_rng(seed)
+    words = []
+    position = 0.0
+    end = minutes * 60
+    while position < end:
+        wpm = rng.choice([150, 230, 70], p=[0.7, 0.15, 0.15])
+        for _ in range(int(rng.uniform(10, 40) * wpm / 60)):
+            interval = 60.0 / wpm * rng.uniform(0.8, 1.2)
+            words.append({"word": "단어", "start": position, "end": position + interval * 0.8})
+            position += interval
+        if rng.random() < 0.2:
+            position += rng.uniform(2.0, 4.0)
+    return words
+
+
+def naive_timeline(words: List[dict], duration: float) -> dict:
+    """비교용 순수 Python 구현 (윈도우마다 단어를 다시 셈)"""
+    starts = sorted(w["start"] for w in words)
+    wpm = []
+    t = 0.0
+    while t <= duration - PACE_WINDOW_SECONDS:
+        count = sum(1 for s in starts if t <= s < t + PACE_WINDOW_SECONDS)
+        wpm.append(count * 60.0 / PACE_WINDOW_SECONDS)
+        t += PACE_STEP_SECONDS
+    return {
+        "rush_windows": sum(1 for v in wpm if v > RUSH_WPM),
+        "stall_windows": sum(1 for v in wpm if v < STALL_WPM),
+    }
+
+
+def measure(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pace timeline benchmark")
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1.0, 5.0, 60.0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--naive-max-minutes", type=float, default=10.0, help="순수 Python 구현은 이 길이까지만 측정")
+    args = parser.parse_args(argv)
+
+    print(f"window {PACE_WINDOW_SECONDS:g}s / step {PACE_STEP_SECONDS:g}s, repeat={args.repeat}")
+    print(f"{'audio':>7} {'words':>7} {'numpy':>10} {'python':>10} {'rush':>5} {'stall':>6}")
+
+    for minutes in args.minutes:
+        words = make_words(minutes)
+        duration = words[-1]["end"]
+
+        vectorized = measure(lambda: analyze_pace_timeline(words, duration), args.repeat)
+        result = analyze_pace_timeline(words, duration)
+
+        if minutes <= args.naive_max_minutes:
+            naive = f"{measure(lambda: naive_timeline(words, duration), max(args.repeat // 5, 1)) * 1000:>8.1f}ms"
+        else:
+            naive = f"{'-':>10}"
+
+        print(
+            f"{minutes:>5g}m {len(words):>7} {vectorized * 1000:>8.2f}ms {naive} "
+            f"{result['rush_count']:>5} {result['stall_count']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+재요청 세션 캐시 벤치마크
+
+분석이 끝난 세션에 재요청 Stage 1 → Stage 2를 보낼 때 라우트(`refine_improvement`) 지연 시간을 비교합니다.
+세션 조회 / 저장 비용만 보기 위해 Claude / TTS는 바로 끝나는 stand-in으로 바꿉니다.
+(Stage 1은 워커 완료 이벤트를 바로 반환, Stage 2는 그래프가 바로 결과 반환)
+
+- db   : 세션 캐시 없음 - 요청마다 attempts 조회 (`--db-latency`ms)
+- cache: 분석 완료 이벤트 중계 시 세션 캐시에 채움 → 재요청은 캐시 조회, 쓰기는 캐시 + 저장 큐
+
+세션 쓰기는 두 경우 모두 저장 큐에 넣고 백그라운드에서 저장합니다 (api/persistence.py).
+
+## 실행
+
+```bash
+python -m benchmarks.refine_session
+python -m benchmarks.refine_session --sessions 500 --concurrency 50 --db-latency 60
+```
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from typing import List
+
+from api.config import Settings
+from api.dependencies import UserContext
+from api.jobs import JobQueue
+from api.persistence import SessionWriter
+from api.routes import refine
+from api.schemas import RefineRequest
+from api.sessions import SessionStore
+
+
+INTENT = "좀 더 자신감 있는 톤으로 바꿔주세요. 숫자를 더 강조하고 싶어요."
+SCRIPT = "결론부터 말씀드리면 결제 응답 시간을 40% 줄였습니다. " * 10
+
+ANALYSIS = {
+    "suggestions": [
+        {"priority": i + 1, "category": "structure", "suggestion": "결론을 먼저 말하세요. " * 4}
+        for i in range(4)
+    ],
+    "structure_analysis": "상황과 과제 설명은 충분하지만 행동과 결과가 짧습니다. " * 8,
+}
+
+
+def analysis_result(session_id: str) -> dict:
+    return {
+        "session_id": session_id,
+        "transcript": "저는 결제 서버의 응답 시간을 줄이는 작업을 했습니다. " * 8,
+        "analysis": ANALYSIS,
+        "improved_script": SCRIPT,
+        "improved_audio_url": f"https://bench.local/{session_id}-improved.mp3",
+        "original_audio_url": f"https://bench.local/{session_id}.webm",
+        "refinement_count": 0,
+        "can_refine": True,
+        "degradations": [],
+    }
+
+
+class InstantBus:
+    """워커가 프리뷰를 바로 끝낸 것처럼 complete 이벤트 반환"""
+
+    class Event:
+        event = "complete"
+        data = {"refined_script": SCRIPT, "changes_summary": "톤 변경"}
+
+    def __init__(self, queue):
+        pass
+
+    async def wait(self, job_id, timeout=None):
+        return self.Event()
+
+
+class InstantGraph:
+    async def ainvoke(self, state, config=None):
+        return {"refined_script": state["preview_script"] or SCRIPT, "refined_audio_url": "https://bench.local/r.mp3"}
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+async def run(args: argparse.Namespace, mode: str, settings: Settings) -> None:
+    attempts = {}
+    loads = []
+
+    def load_attempt(session_id: str, user_id: str) -> dict:
+        loads.append(session_id)
+        time.sleep(args.db_latency / 1000)
+        return attempts.get(session_id)
+
+    def write(rows: List[dict]) -> int:
+        time.sleep(args.db_latency / 1000)
+        for row in rows:
+            attempts.setdefault(row["id"], {}).update(row)
+        return len(rows)
+
+    # 캐시 없음 = 크기 상한 0 (모든 항목을 저장하지 않음)
+    store = SessionStore(maxbytes=0 if mode == "db" else 64 * 1024 * 1024, load_attempt=load_attempt)
+    writer = SessionWriter(write=write)
+    refine.SESSION_STORE = store
+    refine.get_session_writer = lambda: writer
+
+    with tempfile.TemporaryDirectory() as directory:
+        queue = JobQueue(f"{directory}/jobs.sqlite3")
+        sessions = [f"session-{index}" for index in range(args.sessions)]
+        for session_id in sessions:
+            result = analysis_result(session_id)
+            # 분석 워커가 저장한 시도 행 + 분석 완료 이벤트 중계 시 캐시 채움
+            attempts[session_id] = {
+                "id": session_id,
+                "user_id": "user-bench",
+                "original_text": result["transcript"],
+                "analysis": ANALYSIS,
+                "improved_text": SCRIPT,
+                "improved_audio_url": result["improved_audio_url"],
+                "refinement_count": 0,
+                "pending_refinement": None,
+                "status": "completed",
+            }
+            store.put_result(session_id, result, "user-bench", "default_male")
+
+        user = UserContext(user={"user_id": "user-bench"})
+        latencies = {1: [], 2: []}
+        limit = asyncio.Semaphore(args.concurrency)
+
+        async def refine_session(session_id: str) -> None:
+            async with limit:
+                for stage in (1, 2):
+                    request = RefineRequest(session_id=session_id, user_intent=INTENT, stage=stage)
+                    started = time.perf_counter()
+                    response = await refine.refine_improvement(request, user, settings, queue)
+                    if stage == 2:
+                        async for event in response.body_iterator:
+                            if event["event"] == "error":
+                                raise RuntimeError(event["data"])
+                    latencies[stage].append((time.perf_counter() - started) * 1000)
+
+        await asyncio.gather(*(refine_session(session_id) for session_id in sessions))
+        await writer.close()
+
+    print(
+        f"{mode:>6} "
+        f"{statistics.median(latencies[1]):>7.1f}ms {percentile(latencies[1], 0.95):>7.1f}ms "
+        f"{statistics.median(latencies[2]):>7.1f}ms {percentile(latencies[2], 0.95):>7.1f}ms "
+        f"{len(loads):>9} {store.cache.bytes / max(len(store.cache), 1) / 1024:>9.1f}KB"
+    )
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Refinement session cache benchmark")
+    parser.add_argument("--sessions", type=int, default=200, help="재요청하는 세션 수")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시에 재요청하는 세션 수")
+    parser.add_argument("--db-latency", type=float, default=30, help="attempts 조회 / 저장 지연 (ms)")
+    args = parser.parse_args(argv)
+
+    settings = Settings(
+        supabase_url="http://bench.local",
+        supabase_service_key="bench",
+        openai_api_key="bench",
+        anthropic_api_key="bench",
+        elevenlabs_api_key="bench",
+    )
+    refine.ProgressBus = InstantBus
+    refine.create_refinement_graph = lambda include_tts=True: InstantGraph()
+
+    print(f"{args.sessions} sessions, concurrency {args.concurrency}, attempts +{args.db_latency:.0f}ms")
+    print(f"{'mode':>6} {'s1 p50':>9} {'s1 p95':>9} {'s2 p50':>9} {'s2 p95':>9} {'db loads':>9} {'entry':>11}")
+    for mode in ("db", "cache"):
+        asyncio.run(run(args, mode, settings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+재요청 Stage 2 지연 시간 벤치마크
+
+Stage 1에서 프리뷰를 확인한 뒤 같은 의도로 Stage 2를 요청할 때, 요청부터 complete 이벤트까지의 시간과
+Claude / ElevenLabs 호출 수를 비교합니다. (`handle_stage2_final`의 SSE 생성기를 직접 실행)
+
+- regenerate    : 프리뷰를 쓰지 않고 Claude로 스크립트를 다시 생성한 뒤 TTS (도입 전)
+- reuse preview : 같은 의도면 저장된 프리뷰 스크립트로 바로 TTS (현재 방식)
+- changed intent: 의도가 바뀐 경우 (현재 방식도 다시 생성)
+- speculative   : 프리뷰 재사용 + Stage 1 직후 미리 만든 음성 사용 (`SPECULATIVE_TTS_ENABLED=1`)
+                  미리 생성은 사용자가 프리뷰를 읽는 동안 끝났다고 보고 측정 전에 실행합니다.
+                  (tts calls에 포함, Stage 2 지연 시간에는 포함되지 않음)
+
+Claude / ElevenLabs / Storage는 별도 프로세스의 stand-in 서버가 `--claude` / `--tts` / `--storage`초 후에 응답합니다.
+
+## 실행
+
+```bash
+python -m benchmarks.refine_stage2
+python -m benchmarks.refine_stage2 --runs 20 --claude 6 --tts 3
+```
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+import httpx
+
+from api.config import Settings
+from api.dependencies import UserContext
+from api.jobs import JobQueue, runner
+from api.routes import refine
+from api.schemas import RefineRequest
+from api.speculation import SpeculativeTTS, speculation_job_id
+from langgraph.nodes import tts
+from tests.stand_in_server import StandInRequest, StandInResponse, StandInServer
+
+
+INTENT = "좀 더 자신감 있는 톤으로 바꿔주세요. 숫자를 더 강조하고 싶어요."
+PREVIEW = "결론부터 말씀드리면 결제 응답 시간을 40% 줄였습니다. " * 10
+
+REFINED = f"## 변경 사항\n톤을 더 단정하게 바꿨습니다.\n\n## 수정된 스크립트\n{PREVIEW}"
+
+TTS_PATH = f"/text-to-speech/{tts.DEFAULT_VOICES['default_male']}"
+
+# (이름, Stage 1 프리뷰, Stage 2 의도, 음성 미리 생성)
+SCENARIOS = (
+    ("regenerate", None, INTENT, False),
+    ("reuse preview", {"user_intent": INTENT, "preview_script": PREVIEW}, INTENT, False),
+    ("changed intent", {"user_intent": INTENT, "preview_script": PREVIEW}, "숫자보다 경험 위주로 다시 써 주세요.", False),
+    ("speculative", {"user_intent": INTENT, "preview_script": PREVIEW}, INTENT, True),
+)
+
+# 미리 생성 음성의 Storage 파일명 (run_speculative_tts_job 참고)
+SPECULATIVE_FILE = f"speculative_{speculation_job_id(PREVIEW, 'default_male').removeprefix('tts:')}"
+
+
+def session_ids(scenario: str, runs: int) -> List[str]:
+    return [f"bench-{scenario.replace(' ', '-')}-{run}" for run in range(runs)]
+
+
+def session_data(session_id: str, pending: dict = None) -> dict:
+    return {
+        "session_id": session_id,
+        "transcript": "저는 결제 서버의 응답 시간을 줄이는 작업을 했습니다. " * 8,
+        "analysis_result": {"suggestions": [{"suggestion": "결론을 먼저 말하세요"}]},
+        "improved_script": "저는 결제 서버 응답 시간을 40% 줄였습니다. " * 10,
+        "refinement_count": 1,
+        "voice_type": "default_male",
+        "pending_refinement": pending,
+    }
+
+
+async def speculate(queue: JobQueue, session_id: str) -> None:
+    """Stage 1 직후 미리 생성 작업 등록 + 워커 대신 실행"""
+    await refine.SPECULATIVE_TTS.schedule(queue, session_id, PREVIEW, "default_male", None, "bench")
+    job = queue.claim("bench", lanes=["speculative"])
+    queue.complete(job.id, await runner.run_speculative_tts_job(job, None))
+
+
+async def run_stage2(request: RefineRequest, data: dict, settings: Settings, queue: JobQueue = None) -> float:
+    """요청부터 complete 이벤트까지 (초)"""
+    started = time.perf_counter()
+    response = await refine.handle_stage2_final(
+        request, data, UserContext(user={"user_id": "bench"}), settings, queue
+    )
+    async for event in response.body_iterator:
+        if event["event"] == "error":
+            raise RuntimeError(event["data"])
+        if event["event"] == "complete":
+            return time.perf_counter() - started
+    raise RuntimeError("no complete event")
+
+
+def run_upstream(ready: multiprocessing.Queue, args: argparse.Namespace, sessions: List[str]) -> None:
+    """Claude + ElevenLabs + Storage Stand-in (자식 프로세스, Storage 업로드는 동기 클라이언트라 분리)"""
+
+    async def serve() -> None:
+        async def claude(request: StandInRequest) -> StandInResponse:
+            body = {
+                "id": "msg_bench",
+                "type": "message",
+                "role": "assistant",
+                "model": "claude-sonnet-4-20250514",
+                "content": [{"type": "text", "text": REFINED}],
+                "stop_reason": "end_turn",
+                "usage": {"input_tokens": 800, "output_tokens": 400},
+            }
+            return StandInResponse(
+                200, body=json.dumps(body).encode(), headers={"content-type": "application/json"}, delay=args.claude
+            )
+
+        async def elevenlabs(request: StandInRequest) -> StandInResponse:
+            return StandInResponse(200, body=b"\xff\xfb" * 4096, headers={"content-type": "audio/mpeg"}, delay=args.tts)
+
+        async def storage(request: StandInRequest) -> StandInResponse:
+            return StandInResponse(200, body=b'{"Key": "audio/improved/bench.mp3"}', delay=args.storage)
+
+        async with StandInServer() as server:
+            async def hits(request: StandInRequest) -> StandInResponse:
+                counts = {"claude": server.hits("/v1/messages"), "tts": server.hits(TTS_PATH)}
+                return StandInResponse(200, body=json.dumps(counts).encode(), headers={"content-type": "application/json"})
+
+            server.handle("/v1/messages", claude)
+            server.handle(TTS_PATH, elevenlabs)
+            server.handle("/hits", hits)
+            for session_id in sessions:
+                server.handle(f"/storage/v1/object/audio/improved/{session_id}_improved.mp3", storage)
+            ready.put(server.port)
+            await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+async def bench(args: argparse.Namespace, base_url: str) -> None:
+    os.environ["ANTHROPIC_BASE_URL"] = base_url
+    os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+    os.environ["ELEVENLABS_API_KEY"] = "bench"
+    os.environ["SUPABASE_URL"] = base_url
+    os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench")
+    tts.ELEVENLABS_API_URL = base_url
+
+    settings = Settings(
+        supabase_url=base_url,
+        supabase_service_key="bench",
+        openai_api_key="bench",
+        anthropic_api_key="bench",
+        elevenlabs_api_key="bench",
+    )
+
+    # 세션 저장은 측정 대상이 아님
+    async def update_session(session_id: str, updates: dict) -> None:
+        return None
+
+    refine.update_session = update_session
+    refine.SPECULATIVE_TTS = SpeculativeTTS(enabled=True)
+
+    async def hits() -> dict:
+        async with httpx.AsyncClient() as client:
+            return (await client.get(f"{base_url}/hits")).json()
+
+    print(f"Claude {args.claude}s, TTS {args.tts}s, Storage {args.storage}s, {args.runs} runs per scenario")
+    print(f"{'scenario':>15} {'p50':>8} {'p95':>8} {'claude calls':>13} {'tts calls':>10}")
+
+    for name, pending, intent, speculative in SCENARIOS:
+        latencies = []
+        before = await hits()
+        for session_id in session_ids(name, args.runs):
+            request = RefineRequest(session_id=session_id, user_intent=intent, stage=2)
+            with tempfile.TemporaryDirectory() as directory:
+                # 미리 생성하지 않는 시나리오는 큐 없이 실행 (미리 생성 조회 없음)
+                queue = JobQueue(f"{directory}/jobs.sqlite3") if speculative else None
+                if speculative:
+                    await speculate(queue, session_id)
+                latencies.append(await run_stage2(request, session_data(session_id, pending), settings, queue))
+            # 호출마다 만든 SDK 클라이언트를 측정 밖에서 정리
+            gc.collect()
+        after = await hits()
+
+        latencies.sort()
+        print(
+            f"{name:>15} {statistics.median(latencies):>7.3f}s "
+            f"{latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]:>7.3f}s "
+            f"{after['claude'] - before['claude']:>13} {after['tts'] - before['tts']:>10}"
+        )
+
+    metrics = refine.SPECULATIVE_TTS.metrics()
+    print(
+        f"speculation: hit rate {metrics['hit_rate']:.0%} ({metrics['hits']}/{metrics['hits'] + metrics['misses']}), "
+        f"speculated {metrics['speculated_chars']} chars, wasted {metrics['wasted_chars']} chars"
+    )
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Refinement stage 2 latency benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="시나리오별 실행 수")
+    parser.add_argument("--claude", type=float, default=4.0, help="Claude 스크립트 수정 응답 시간 (초)")
+    parser.add_argument("--tts", type=float, default=2.0, help="ElevenLabs TTS 응답 시간 (초)")
+    parser.add_argument("--storage", type=float, default=0.1, help="Storage 업로드 응답 시간 (초)")
+    args = parser.parse_args(argv)
+
+    sessions = [session_id for name, *_ in SCENARIOS for session_id in session_ids(name, args.runs)]
+    sessions.append(SPECULATIVE_FILE)
+    ready: multiprocessing.Queue = multiprocessing.Queue()
+    upstream = multiprocessing.Process(target=run_upstream, args=(ready, args, sessions), daemon=True)
+    upstream.start()
+    try:
+        asyncio.run(bench(args, f"http://127.0.0.1:{ready.get(timeout=10)}"))
+    finally:
+        upstream.terminate()
+        upstream.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+분석 결과 조회 (GET /analyze/{session_id}) 벤치마크
+
+완료된 세션 결과를 여러 클라이언트가 동시에 폴링할 때 조회 한 번의 지연 시간과 처리량을 비교합니다.
+라우트 함수(`get_analysis_result`)를 직접 호출하므로 HTTP 서버 비용은 제외됩니다.
+
+- queue     : 매번 작업 큐(SQLite) 조회 + 응답 직렬화 (도입 전)
+- store     : 결과 저장소의 프로세스 LRU에서 직렬화된 본문 반환 (200, 캐시를 채운 뒤 측정)
+- store+etag: 이전 응답의 ETag를 If-None-Match로 보냄 (304, 본문 없음)
+
+이어서 캐시가 비어 있는 세션을 같은 시점에 여러 클라이언트가 조회할 때
+attempts 조회(`--attempt-latency`ms 지연) 횟수와 지연 시간을 측정합니다.
+
+## 실행
+
+```bash
+python -m benchmarks.result_lookup
+python -m benchmarks.result_lookup --sessions 500 --pollers 10 100 500 --polls 20
+```
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from typing import List
+
+from api.dependencies import UserContext
+from api.jobs import JobQueue
+from api.results import ResultStore
+from api.routes import analyze
+from api.schemas import BaseResponse
+from fastapi import Response
+
+
+ANALYSIS = {
+    "scores": {
+        "logic_structure": "B+",
+        "filler_words": "A",
+        "speaking_pace": "B",
+        "confidence_tone": "B",
+        "content_specificity": "C+",
+    },
+    "metrics": {
+        "words_per_minute": 142,
+        "filler_count": 3,
+        "filler_percentage": 1.8,
+        "total_words": 168,
+        "duration_seconds": 71.0,
+    },
+    "suggestions": [
+        {
+            "priority": i + 1,
+            "category": "structure",
+            "suggestion": "결론을 먼저 말하고 근거를 두세 가지로 정리해 보세요. " * 3,
+            "impact": "면접관이 핵심을 빠르게 파악할 수 있습니다. " * 2,
+        }
+        for i in range(4)
+    ],
+    "structure_analysis": "상황과 과제 설명은 충분하지만 행동과 결과가 짧습니다. " * 8,
+}
+
+
+def make_result(session_id: str) -> dict:
+    return {
+        "session_id": session_id,
+        "transcript": "저는 결제 서버의 응답 시간을 40% 줄이는 작업을 주도했습니다. " * 8,
+        "analysis": ANALYSIS,
+        "improved_script": "결론부터 말씀드리면 응답 시간을 40% 줄였습니다. " * 12,
+        "improved_audio_url": f"https://bench.local/{session_id}-improved.mp3",
+        "original_audio_url": f"https://bench.local/{session_id}.webm",
+        "refinement_count": 0,
+        "can_refine": True,
+        "degradations": [],
+    }
+
+
+async def lookup_queue(session_id: str, queue: JobQueue) -> Response:
+    """도입 전: 작업 큐 조회 + BaseResponse 직렬화"""
+    job = await asyncio.to_thread(queue.get, session_id)
+    body = BaseResponse(success=True, data=job.result).model_dump_json().encode()
+    return Response(content=body, media_type="application/json")
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+async def poll(args, sessions: List[str], queue: JobQueue, pollers: int, mode: str) -> tuple:
+    user = UserContext(guest_session="guest-bench")
+    latencies, sent = [], 0
+
+    async def client(index: int) -> None:
+        nonlocal sent
+        session_id = sessions[index % len(sessions)]
+        etag = None
+        for _ in range(args.polls):
+            started = time.perf_counter()
+            if mode == "queue":
+                response = await lookup_queue(session_id, queue)
+            else:
+                response = await analyze.get_analysis_result(
+                    session_id, etag if mode == "store+etag" else None, user, queue
+                )
+                etag = response.headers.get("etag")
+            latencies.append((time.perf_counter() - started) * 1000)
+            sent += len(response.body)
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(pollers)))
+    elapsed = time.perf_counter() - started
+    return latencies, sent, elapsed
+
+
+async def bench_polling(args, queue: JobQueue, sessions: List[str]) -> None:
+    print(f"{args.sessions} completed sessions, {args.polls} polls per client")
+    print(f"{'pollers':>8} {'path':>11} {'p50':>8} {'p95':>8} {'lookups/s':>10} {'bytes/poll':>11}")
+    for pollers in args.pollers:
+        for mode in ("queue", "store", "store+etag"):
+            analyze.RESULT_STORE = ResultStore(load_attempt=lambda *a: None)
+            if mode != "queue":
+                # 완료 이벤트 중계 시점에 채워지는 상태 (첫 조회 비용은 아래 cold 측정)
+                for session_id in sessions:
+                    await analyze.RESULT_STORE.get(session_id, "guest-bench", queue)
+            latencies, sent, elapsed = await poll(args, sessions, queue, pollers, mode)
+            print(
+                f"{pollers:>8} {mode:>11} {statistics.median(latencies):>6.3f}ms "
+                f"{percentile(latencies, 0.95):>6.3f}ms {len(latencies) / elapsed:>10.0f} "
+                f"{sent / len(latencies):>11.0f}"
+            )
+
+
+async def bench_cold(args, queue: JobQueue) -> None:
+    """캐시가 빈 세션 하나를 동시에 조회 (인증 사용자, attempts 조회 지연)"""
+    loads = []
+
+    def load_attempt(session_id: str, user_id: str) -> dict:
+        loads.append(session_id)
+        time.sleep(args.attempt_latency / 1000)
+        result = make_result(session_id)
+        return {
+            "id": session_id,
+            "user_id": user_id,
+            "original_text": result["transcript"],
+            "analysis": ANALYSIS,
+            "improved_text": result["improved_script"],
+            "original_audio_url": result["original_audio_url"],
+            "improved_audio_url": result["improved_audio_url"],
+            "refinement_count": 0,
+            "status": "completed",
+        }
+
+    user = UserContext(user={"user_id": "user-bench"})
+    print(f"\ncold lookup of one session (attempts +{args.attempt_latency:.0f}ms)")
+    print(f"{'pollers':>8} {'attempt loads':>14} {'p50':>9} {'max':>9}")
+    for pollers in args.pollers:
+        analyze.RESULT_STORE = ResultStore(load_attempt=load_attempt)
+        loads.clear()
+        latencies = []
+
+        async def client() -> None:
+            started = time.perf_counter()
+            await analyze.get_analysis_result("cold-session", None, user, queue)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        await asyncio.gather(*(client() for _ in range(pollers)))
+        print(
+            f"{pollers:>8} {len(loads):>14} {statistics.median(latencies):>7.1f}ms {max(latencies):>7.1f}ms"
+        )
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Analysis result lookup benchmark")
+    parser.add_argument("--sessions", type=int, default=200, help="완료된 세션 수")
+    parser.add_argument("--pollers", type=int, nargs="+", default=[10, 100, 500], help="동시 폴링 클라이언트 수")
+    parser.add_argument("--polls", type=int, default=20, help="클라이언트당 조회 수")
+    parser.add_argument("--attempt-latency", type=float, default=30, help="attempts 조회 지연 (ms)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        queue = JobQueue(f"{directory}/jobs.sqlite3")
+        sessions = []
+        for index in range(args.sessions):
+            session_id = f"session-{index}"
+            queue.enqueue("analyze", {"session_id": session_id, "user_id": "guest-bench"}, job_id=session_id)
+            queue.complete(queue.claim("bench").id, make_result(session_id))
+            sessions.append(session_id)
+
+        asyncio.run(bench_polling(args, queue, sessions))
+        asyncio.run(bench_cold(args, queue))
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,9 @@ from .context import (
     analyze_uploaded_context,
     load_progressive_context_mock,
     build_progressive_context_prompt,
+    invalidate_user_patterns,
+    extract_document_context,
+    retrieve_document_passages,
 )
 from .moderation import (
     check_moderation,
@@ -64,6 +67,9 @@ __all__ = [
     "analyze_uploaded_context",
     "load_progressive_context_mock",
     "build_progressive_context_prompt",
+    "invalidate_user_patterns",
+    "extract_document_context",
+    "retrieve_document_passages",
     
     # Moderation
     "check_moderation",
@@ -15,24 +15,33 @@ Reasoning + Action의 줄임말로, AI가 바로 답을 내놓는 대신
 
 1. 구조/논리성: STAR 구조 준수 여부
 2. 필러워드: "어...", "음...", "그..." 등의 비율
-3. 말 속도: WPM (Words Per Minute)
+3. 말 속도: WPM (Words Per Minute) + 구간별 WPM (빨라진/늘어진 구간)
 4. 자신감/톤: 어조의 확신 정도
 5. 구체성: 숫자, 사례 등 구체적 표현
 """
 
-from typing import Any, List
+from typing import Any, List, Optional
 from anthropic import AsyncAnthropic
+from langchain_core.runnables import RunnableConfig
 
 from ..state import SpeechCoachState, AnalysisResult
 from ..tools import (
     analyze_pace,
+    analyze_pace_timeline,
     analyze_fillers,
     analyze_star_structure,
 )
-from ..utils.prompts import ANALYSIS_SYSTEM_PROMPT, build_analysis_prompt
+from ..utils.prompts import (
+    ANALYSIS_SYSTEM_PROMPT,
+    build_analysis_prompt,
+    format_document_passages,
+    format_pace_timeline,
+)
+from ..utils.deadline import CALL_TIMEOUTS, get_deadline, remaining_timeout, should_degrade
+from ..utils.resilience import call_with_retry
 
 
-async def analyze_content(state: SpeechCoachState) -> dict:
+async def analyze_content(state: SpeechCoachState, config: Optional[RunnableConfig] = None) -> dict:
     """
     스피치 분석 노드 (기본 버전)
     
@@ -44,8 +53,11 @@ async def analyze_content(state: SpeechCoachState) -> dict:
         state: 현재 워크플로우 상태
             - transcript: STT 변환된 텍스트
             - audio_duration: 오디오 길이 (초)
+            - voice_activity: 멈춤 통계 (STT 전처리 결과, 선택)
+            - word_timestamps: 단어 타임스탬프 (구간별 말 속도 분석용, 선택)
             - previous_sessions: 이전 세션 기록 (Progressive Context)
             - user_patterns: 유저 패턴 분석 결과
+        config: 그래프 config (데드라인 전달용)
     
     Returns:
         dict: 업데이트할 상태 필드
@@ -58,8 +70,11 @@ async def analyze_content(state: SpeechCoachState) -> dict:
     
     # 도구를 사용하여 객관적 지표 먼저 수집
     pace_result = analyze_pace(transcript, duration)
+    timeline_result = analyze_pace_timeline(state.get("word_timestamps") or [], duration)
     filler_result = analyze_fillers(transcript)
     structure_result = analyze_star_structure(transcript)
+    # 오디오 VAD 통계가 없으면 (디코딩 불가 형식) 단어 사이 간격으로 대체
+    pause_result = state.get("voice_activity") or timeline_result.get("pauses") or {}
     
     # Progressive Context가 있으면 프롬프트에 추가
     user_patterns = state.get("user_patterns")
@@ -73,23 +88,30 @@ async def analyze_content(state: SpeechCoachState) -> dict:
         structure_data=structure_result,
         user_patterns=user_patterns,
         previous_sessions=previous_sessions,
+        pause_data=pause_result,
+        pace_timeline=timeline_result,
+        document_passages=state.get("document_passages"),
     )
     
     # Claude API 호출
-    client = AsyncAnthropic()
+    client = AsyncAnthropic(max_retries=0)
+    deadline = get_deadline(config)
     
-    response = await client.messages.create(
+    response = await call_with_retry("anthropic", lambda: client.messages.create(
         model="claude-sonnet-4-20250514",
         max_tokens=2000,
         system=ANALYSIS_SYSTEM_PROMPT,
         messages=[
             {"role": "user", "content": prompt}
-        ]
-    )
+        ],
+        timeout=remaining_timeout(deadline, CALL_TIMEOUTS["claude"], "analyze"),
+    ), deadline=deadline)
     
     # 응답 파싱
     analysis_text = response.content[0].text
-    analysis_result = parse_analysis_response(analysis_text, pace_result, filler_result)
+    analysis_result = parse_analysis_response(
+        analysis_text, pace_result, filler_result, pause_result, timeline_result
+    )
     
     return {
         "analysis_result": analysis_result,
@@ -97,7 +119,7 @@ async def analyze_content(state: SpeechCoachState) -> dict:
     }
 
 
-async def analyze_content_react(state: SpeechCoachState) -> dict:
+async def analyze_content_react(state: SpeechCoachState, config: Optional[RunnableConfig] = None) -> dict:
     """
     스피치 분석 노드 (ReAct 버전)
     
@@ -108,15 +130,30 @@ async def analyze_content_react(state: SpeechCoachState) -> dict:
     API 호출이 여러 번 발생할 수 있어 비용이 높습니다.
     Growth 단계에서 사용을 권장합니다.
     
+    남은 데드라인 예산이 부족하면 기본 분석(analyze_content)으로 대체합니다.
+    
     Args:
         state: 현재 워크플로우 상태
+        config: 그래프 config (데드라인 전달용)
     
     Returns:
         dict: 업데이트할 상태 필드
     """
     
+    # 예산 부족 시 ReAct 생략 → 단일 호출 분석으로 대체
+    if should_degrade(config, "react"):
+        result = await analyze_content(state, config)
+        result["degradations"] = ["skip_react"]
+        result["messages"] = ["시간 예산 부족 - 기본 분석으로 대체"]
+        return result
+    
     transcript = state["transcript"]
     duration = state.get("audio_duration", 60)
+    deadline = get_deadline(config)
+    
+    # 구간별 말 속도는 단어 타임스탬프가 필요해 도구 대신 미리 계산해서 전달
+    timeline_result = analyze_pace_timeline(state.get("word_timestamps") or [], duration)
+    pause_result = state.get("voice_activity") or timeline_result.get("pauses")
     
     # 도구 정의 (Claude Tools 형식)
     tools = [
@@ -186,23 +223,28 @@ async def analyze_content_react(state: SpeechCoachState) -> dict:
 """
     
     # Claude API 호출 (도구 사용 가능)
-    client = AsyncAnthropic()
+    client = AsyncAnthropic(max_retries=0)
     
     messages = [
-        {"role": "user", "content": f"다음 면접 답변을 분석해주세요.\n\n{transcript}\n\n오디오 길이: {duration}초"}
+        {"role": "user", "content": (
+            f"다음 면접 답변을 분석해주세요.\n\n{transcript}\n\n오디오 길이: {duration}초"
+            f"{format_pace_timeline(timeline_result)}"
+            f"{format_document_passages(state.get('document_passages'))}"
+        )}
     ]
     
     # 도구 호출 루프 (최대 5회)
     tool_results = {}
     
     for iteration in range(5):
-        response = await client.messages.create(
+        response = await call_with_retry("anthropic", lambda: client.messages.create(
             model="claude-sonnet-4-20250514",
             max_tokens=2000,
             system=react_system_prompt,
             tools=tools,
             messages=messages,
-        )
+            timeout=remaining_timeout(deadline, CALL_TIMEOUTS["claude"], "analyze"),
+        ), deadline=deadline)
         
         # 도구 호출이 있는지 확인
         tool_calls = [block for block in response.content if block.type == "tool_use"]
@@ -252,7 +294,9 @@ async def analyze_content_react(state: SpeechCoachState) -> dict:
     analysis_result = parse_analysis_response(
         final_text, 
         tool_results.get("analyze_pace", {}),
-        tool_results.get("analyze_fillers", {})
+        tool_results.get("analyze_fillers", {}),
+        pause_result,
+        timeline_result,
     )
     
     return {
@@ -264,13 +308,17 @@ async def analyze_content_react(state: SpeechCoachState) -> dict:
 def parse_analysis_response(
     response_text: str,
     pace_data: dict,
-    filler_data: dict
+    filler_data: dict,
+    pause_data: Optional[dict] = None,
+    pace_timeline: Optional[dict] = None,
 ) -> AnalysisResult:
     """
     Claude 응답을 AnalysisResult 형식으로 파싱
     
     JSON 형식의 응답을 파싱하되, JSON이 아닌 경우
     텍스트에서 정보를 추출합니다.
+    멈춤 지표는 오디오 VAD 결과(pause_data)에서,
+    구간별 속도 지표는 단어 타임스탬프 분석 결과(pace_timeline)에서 가져옵니다.
     """
     import json
     import re
@@ -289,6 +337,8 @@ def parse_analysis_response(
                 "filler_percentage": filler_data.get("filler_percentage", 0),
                 "total_words": pace_data.get("word_count", 0),
                 "duration_seconds": pace_data.get("duration_seconds", 0),
+                **pause_metrics(pause_data),
+                **pace_timeline_metrics(pace_timeline),
             }
             
             return {
@@ -311,6 +361,8 @@ def parse_analysis_response(
             "filler_percentage": filler_data.get("filler_percentage", 0),
             "total_words": pace_data.get("word_count", 0),
             "duration_seconds": 0,
+            **pause_metrics(pause_data),
+            **pace_timeline_metrics(pace_timeline),
         },
         "suggestions": [],
         "structure_analysis": response_text[:500],  # 앞부분만
@@ -318,6 +370,30 @@ def parse_analysis_response(
     }
 
 
+def pause_metrics(pause_data: Optional[dict]) -> dict:
+    """멈춤 지표 (VAD 결과가 없으면 0)"""
+    pause_data = pause_data or {}
+    return {
+        "pause_count": pause_data.get("pause_count", 0),
+        "long_pause_count": pause_data.get("long_pause_count", 0),
+        "total_pause_seconds": pause_data.get("total_pause_seconds", 0.0),
+        "mean_pause_seconds": pause_data.get("mean_pause_seconds", 0.0),
+        "longest_pause_seconds": pause_data.get("longest_pause_seconds", 0.0),
+    }
+
+
+def pace_timeline_metrics(pace_timeline: Optional[dict]) -> dict:
+    """구간별 속도 지표 (단어 타임스탬프가 없으면 0)"""
+    pace_timeline = pace_timeline or {}
+    return {
+        "pace_variability": pace_timeline.get("pace_variability", 0.0),
+        "rush_count": pace_timeline.get("rush_count", 0),
+        "rush_seconds": pace_timeline.get("rush_seconds", 0.0),
+        "stall_count": pace_timeline.get("stall_count", 0),
+        "stall_seconds": pace_timeline.get("stall_seconds", 0.0),
+    }
+
+
 def default_scores() -> dict:
     """기본 점수 반환"""
     return {
@@ -351,6 +427,16 @@ async def analyze_content_mock(state: SpeechCoachState) -> dict:
                 "filler_percentage": 4.2,
                 "total_words": 120,
                 "duration_seconds": 45,
+                "pause_count": 6,
+                "long_pause_count": 1,
+                "total_pause_seconds": 7.8,
+                "mean_pause_seconds": 1.3,
+                "longest_pause_seconds": 2.4,
+                "pace_variability": 38.5,
+                "rush_count": 1,
+                "rush_seconds": 9.0,
+                "stall_count": 0,
+                "stall_seconds": 0.0,
             },
             "suggestions": [
                 {
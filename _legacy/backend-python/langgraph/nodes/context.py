@@ -16,14 +16,110 @@ AI가 답변을 생성할 때 관련 정보를 먼저 검색(Retrieve)해서 참
 2. **Document Context**: Deep Mode에서 이력서, 포트폴리오 등을 참조하여
    "이력서에 Redis 경험이 있는데, 답변에서 더 구체적으로 설명하면 좋겠어요"
    같은 맥락 있는 피드백 제공
+
+## Progressive Context 집계 위치
+
+시도가 완료되면 DB 트리거가 사용자별(전체 + 프로젝트별) 요약 `user_pattern_summaries`를
+갱신합니다 (카테고리별 감쇠 횟수, 등급 지수 가중 평균, 최신 시도). 노드는 요약 한 행만 읽고,
+프로세스 내 LRU 캐시(`PATTERN_CACHE`)에 보관합니다. 분석 작업이 끝나면 해당 사용자 항목을 무효화합니다.
+
+요약이 아직 없으면(백필 전) DB 함수 `get_progressive_context`로 최근 시도를 집계합니다.
+(`extract_user_patterns`는 그 함수와 같은 규칙의 Python 구현)
+
+## Document Context 재사용
+
+이력서/포트폴리오는 거의 바뀌지 않으므로 Claude 추출 결과를 `project_context_extractions`에
+프로젝트별로 저장하고, 문서 내용 해시가 같으면 같은 프로젝트의 다음 세션에서 재사용합니다.
+문서 업로드 직후 워밍업 작업(`document_extraction`)이 미리 추출해 둡니다.
+
+추출은 문서를 조각으로 나눠 조각별로 동시에 실행한 뒤 합칩니다 (utils/documents.py).
+앞 10,000자만 보내던 방식과 달리 긴 포트폴리오도 전체가 반영됩니다.
+
+## 문서 구간 검색 (BM25)
+
+분석/개선 프롬프트에는 문서 전체 대신 연습 질문과 답변에 관련된 구간 몇 개
+(`RETRIEVAL_TOP_K`)만 넣습니다 (`retrieve_document_passages`, utils/retrieval.py).
+색인은 프로젝트 문서 내용별로 한 번 만들어 로컬 디스크(`DOCUMENT_INDEX_DIR`)와
+프로세스 내 LRU(`INDEX_CACHE`)에 보관합니다. 워밍업 작업도 색인을 미리 만듭니다.
 """
 
+import asyncio
+import hashlib
+import json
 import os
-from typing import Optional, List
+import time
+from typing import Optional, List, Tuple
 from supabase import create_client
+from langchain_core.runnables import RunnableConfig
 from collections import Counter
 
 from ..state import SpeechCoachState, UserPatterns
+from ..utils.cache import LRUCache
+from ..utils.deadline import CALL_TIMEOUTS, Deadline, get_deadline, remaining_timeout
+from ..utils.documents import DocumentChunk, extract_chunks, merge_extractions, parse_extraction, split_documents
+from ..utils.resilience import call_with_retry, provider_slot
+from ..utils.retrieval import RETRIEVAL_TOP_K, BM25Index, corpus_digest, format_passage, load_or_build_index
+from ..utils.tracing import traced
+
+
+# Progressive Context에 사용하는 최근 시도 수 (요약이 없을 때)
+PROGRESSIVE_CONTEXT_LIMIT = 5
+
+# 요약의 카테고리 감쇠 횟수가 이 값 이상이면 반복 개선점
+# (시도마다 0.8배로 줄어듦 → 최근 4회 안에 2번 이상 등장한 수준)
+RECURRING_MIN_WEIGHT = 1.5
+
+# 최신 등급 - 이전 평균이 이 값을 넘으면 improving / declining
+TREND_THRESHOLD = 0.3
+
+# 사용자 패턴 캐시 ((user_id, project_id) → Progressive Context)
+PATTERN_CACHE = LRUCache(
+    maxsize=int(os.getenv("PATTERN_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("PATTERN_CACHE_TTL_SECONDS", "300")),
+)
+
+# 문서 추출 모델 / 결과 형식 버전
+# (프롬프트나 모델을 바꾸면 EXTRACTION_VERSION을 올려 저장된 결과를 무효화)
+EXTRACTION_MODEL = "claude-sonnet-4-20250514"
+EXTRACTION_VERSION = 2
+
+# 문서 조각별 추출 결과 캐시 (조각 내용 해시 → 추출 결과, 내용 기준이라 만료 없음)
+CHUNK_CACHE = LRUCache(maxsize=int(os.getenv("DOCUMENT_CHUNK_CACHE_SIZE", "512")))
+
+# 문서 검색 색인 캐시 ((project_id, 문서 해시) → BM25Index, 내용 기준이라 만료 없음)
+INDEX_CACHE = LRUCache(maxsize=int(os.getenv("DOCUMENT_INDEX_CACHE_SIZE", "32")))
+
+EXTRACTION_PROMPT = """다음은 지원자 문서의 일부입니다 ({label}).
+이 부분에서 면접/발표에 활용할 수 있는 핵심 정보를 추출해주세요.
+
+문서 내용:
+{content}
+
+추출할 정보:
+1. 주요 기술 스택/역량
+2. 핵심 프로젝트와 구체적 성과 (숫자 포함)
+3. 차별화 포인트
+4. 예상되는 면접 질문 3-5개
+
+이 부분에 없는 정보는 빈 배열로 두세요. JSON 형식으로만 응답해주세요:
+{{
+    "skills": ["스킬1", "스킬2", ...],
+    "key_achievements": [
+        {{"project": "프로젝트명", "achievement": "성과", "numbers": "수치"}},
+        ...
+    ],
+    "differentiators": ["차별점1", ...],
+    "expected_questions": ["질문1", ...]
+}}
+"""
+
+# 문서 추출 결과 재사용 통계 (프로세스 단위, 워밍업 작업 제외)
+EXTRACTION_STATS = {"hits": 0, "misses": 0, "saved_ms": 0.0}
+
+SUMMARY_COLUMNS = (
+    "session_count, category_weights, latest_grade, grade_ewma, graded_count, "
+    "last_attempt_id, last_scores, last_categories, last_session_at"
+)
 
 
 async def load_progressive_context(state: SpeechCoachState) -> dict:
@@ -33,9 +129,9 @@ async def load_progressive_context(state: SpeechCoachState) -> dict:
     유저의 과거 세션 기록을 불러와서 분석에 활용합니다.
     이 정보가 있으면 AI가 연속성 있는 코칭을 제공할 수 있습니다.
     
-    ## 로드하는 정보
+    ## 로드하는 정보 (사용자 요약 한 행, 캐시 우선)
     
-    - 최근 5개 세션의 분석 결과
+    - 최근 세션의 점수 등급 / 개선 제안 카테고리 / 시각
     - 반복되는 문제점 패턴
     - 개선 추세 (점수 변화)
     
@@ -45,7 +141,8 @@ async def load_progressive_context(state: SpeechCoachState) -> dict:
     
     Returns:
         dict: 업데이트할 상태 필드
-            - previous_sessions: 이전 세션 기록 리스트
+            - previous_sessions: 이전 세션 요약 리스트
+              [{"session_id", "scores", "suggestion_categories", "created_at"}, ...]
             - user_patterns: 유저 패턴 분석 결과
             - messages: 진행 메시지
     """
@@ -66,36 +163,21 @@ async def load_progressive_context(state: SpeechCoachState) -> dict:
             "messages": ["게스트 모드 - 히스토리 없음"]
         }
     
-    # Supabase에서 과거 세션 조회
-    try:
-        supabase = create_client(
-            os.getenv("SUPABASE_URL"),
-            os.getenv("SUPABASE_SERVICE_KEY")
-        )
-        
-        # 최근 5개 세션 조회 (같은 프로젝트 내에서)
-        project_id = state.get("project_id")
-        
-        query = supabase.table("sessions") \
-            .select("session_id, analysis_result, improved_script, created_at") \
-            .eq("user_id", user_id) \
-            .order("created_at", desc=True) \
-            .limit(5)
-        
-        # 프로젝트가 지정되어 있으면 필터링
-        if project_id:
-            query = query.eq("project_id", project_id)
-        
-        response = query.execute()
-        previous_sessions = response.data or []
-        
-    except Exception as e:
-        # DB 조회 실패 시 빈 리스트로 진행
-        print(f"Failed to load progressive context: {e}")
-        previous_sessions = []
+    # 같은 프로젝트 내 요약 (프로젝트 미지정 시 전체)
+    key = (user_id, state.get("project_id"))
+    context = PATTERN_CACHE.get(key)
+    
+    if context is None:
+        try:
+            context = await asyncio.to_thread(fetch_progressive_context, *key)
+            PATTERN_CACHE.set(key, context)
+        except Exception as e:
+            # DB 조회 실패 시 빈 컨텍스트로 진행 (캐시하지 않음)
+            print(f"Failed to load progressive context: {e}")
+            context = {}
     
-    # 패턴 분석
-    user_patterns = extract_user_patterns(previous_sessions)
+    previous_sessions = context.get("sessions") or []
+    user_patterns = patterns_from_context(context)
     
     # 메시지 생성
     if user_patterns["is_new_user"]:
@@ -110,11 +192,115 @@ async def load_progressive_context(state: SpeechCoachState) -> dict:
     }
 
 
+@traced("db.progressive_context")
+def fetch_progressive_context(user_id: str, project_id: Optional[str]) -> dict:
+    """
+    Supabase에서 Progressive Context 조회 (동기, 스레드에서 호출)
+    
+    사용자 요약 한 행을 읽고, 요약이 없으면 최근 시도를 집계하는 RPC로 대신합니다.
+    
+    Returns:
+        dict: `get_progressive_context`와 같은 형식
+    """
+    
+    supabase = create_client(
+        os.getenv("SUPABASE_URL"),
+        os.getenv("SUPABASE_SERVICE_KEY")
+    )
+    
+    query = supabase.table("user_pattern_summaries") \
+        .select(SUMMARY_COLUMNS) \
+        .eq("user_id", user_id)
+    query = query.eq("project_id", project_id) if project_id else query.is_("project_id", "null")
+    rows = query.limit(1).execute().data
+    if rows:
+        return context_from_summary(rows[0])
+    
+    response = supabase.rpc("get_progressive_context", {
+        "p_user_id": user_id,
+        "p_project_id": project_id,
+        "p_limit": PROGRESSIVE_CONTEXT_LIMIT,
+    }).execute()
+    return response.data or {}
+
+
+def context_from_summary(summary: dict) -> dict:
+    """
+    `user_pattern_summaries` 행을 `get_progressive_context` 형식으로 변환
+    
+    - 반복 개선점: 감쇠 횟수 RECURRING_MIN_WEIGHT 이상, 큰 순 최대 5개
+    - 개선 추세: 최신 등급 - 이전 시도 지수 가중 평균 (±TREND_THRESHOLD)
+    """
+    
+    weights = summary.get("category_weights") or {}
+    recurring = sorted(
+        (category for category, weight in weights.items() if weight >= RECURRING_MIN_WEIGHT),
+        key=lambda category: (-weights[category], category),
+    )[:5]
+    
+    latest, previous = summary.get("latest_grade"), summary.get("grade_ewma")
+    if latest is None or previous is None:
+        trend = "unknown"
+    elif latest - previous > TREND_THRESHOLD:
+        trend = "improving"
+    elif latest - previous < -TREND_THRESHOLD:
+        trend = "declining"
+    else:
+        trend = "stable"
+    
+    sessions = []
+    if summary.get("last_session_at"):
+        sessions.append({
+            "session_id": summary.get("last_attempt_id"),
+            "scores": summary.get("last_scores"),
+            "suggestion_categories": summary.get("last_categories") or [],
+            "created_at": summary["last_session_at"],
+        })
+    
+    return {
+        "sessions": sessions,
+        "session_count": summary.get("session_count", 0),
+        "recurring_issues": recurring,
+        "improvement_trend": trend,
+        "last_session_date": summary.get("last_session_at"),
+    }
+
+
+def invalidate_user_patterns(user_id: Optional[str]) -> None:
+    """사용자의 패턴 캐시 무효화 (새 시도가 저장되는 시점에 호출)"""
+    if user_id:
+        PATTERN_CACHE.invalidate_where(lambda key: key[0] == user_id)
+
+
+def patterns_from_context(context: dict) -> UserPatterns:
+    """
+    `get_progressive_context` 결과를 UserPatterns로 변환
+    
+    Args:
+        context: RPC 결과 (sessions, session_count, recurring_issues, improvement_trend, last_session_date)
+    
+    Returns:
+        UserPatterns: 유저 패턴 (세션이 없으면 신규 유저)
+    """
+    
+    if not context.get("session_count"):
+        return extract_user_patterns([])
+    
+    return {
+        "is_new_user": False,
+        "session_count": context["session_count"],
+        "recurring_issues": context.get("recurring_issues") or [],
+        "improvement_trend": context.get("improvement_trend") or "unknown",
+        "last_session_date": context.get("last_session_date"),
+    }
+
+
 def extract_user_patterns(sessions: List[dict]) -> UserPatterns:
     """
     과거 세션에서 유저 패턴 추출
     
     반복되는 문제점, 개선 추세 등을 분석합니다.
+    DB 함수 `get_progressive_context`가 같은 규칙을 SQL로 계산합니다.
     
     Args:
         sessions: 과거 세션 기록 리스트
@@ -218,17 +404,21 @@ def analyze_improvement_trend(scores_history: List[dict]) -> str:
         return "stable"
 
 
-async def analyze_uploaded_context(state: SpeechCoachState) -> dict:
+async def analyze_uploaded_context(state: SpeechCoachState, config: Optional[RunnableConfig] = None) -> dict:
     """
     업로드된 문서 분석 노드 (Deep Mode)
     
     이력서, 포트폴리오 등 업로드된 문서를 분석하여
     면접 질문 생성과 맥락 있는 피드백에 활용합니다.
     
+    추출 결과는 프로젝트별로 저장되며, 문서가 바뀌지 않았으면 Claude를 다시 호출하지 않습니다.
+    (extract_document_context 참고)
+    
     Args:
         state: 현재 워크플로우 상태
             - project_id: 프로젝트 ID
             - context_documents: 문서 URL 리스트 (또는 None)
+        config: 그래프 config (데드라인 전달용)
     
     Returns:
         dict: 업데이트할 상태 필드
@@ -246,18 +436,7 @@ async def analyze_uploaded_context(state: SpeechCoachState) -> dict:
     
     # 프로젝트의 컨텍스트 문서 조회
     try:
-        supabase = create_client(
-            os.getenv("SUPABASE_URL"),
-            os.getenv("SUPABASE_SERVICE_KEY")
-        )
-        
-        response = supabase.table("project_documents") \
-            .select("document_url, document_type, extracted_text") \
-            .eq("project_id", project_id) \
-            .execute()
-        
-        documents = response.data or []
-        
+        documents = await asyncio.to_thread(load_project_documents, project_id)
     except Exception as e:
         print(f"Failed to load project documents: {e}")
         return {
@@ -271,7 +450,101 @@ async def analyze_uploaded_context(state: SpeechCoachState) -> dict:
             "messages": ["업로드된 문서 없음"]
         }
     
-    # 문서 내용 결합
+    context_analysis, cached = await extract_document_context(project_id, documents, get_deadline(config))
+    
+    return {
+        "context_analysis": context_analysis,
+        "context_documents": [d.get("extracted_text", "") for d in documents],
+        "messages": [f"문서 {len(documents)}개 분석 완료" + (" (저장된 결과 사용)" if cached else "")]
+    }
+
+
+async def retrieve_document_passages(state: SpeechCoachState, config: Optional[RunnableConfig] = None) -> dict:
+    """
+    문서 구간 검색 노드 (Deep Mode)
+    
+    연습 질문과 답변(transcript)으로 프로젝트 문서의 BM25 색인을 검색해
+    관련 구간만 분석/개선 프롬프트에 넘깁니다. 검색 실패는 분석을 막지 않습니다.
+    
+    Args:
+        state: 현재 워크플로우 상태
+            - mode: deep일 때만 검색
+            - project_id: 프로젝트 ID
+            - question: 연습 중인 질문 (선택)
+            - transcript: STT 결과
+        config: 그래프 config (사용하지 않음, 노드 시그니처 통일)
+    
+    Returns:
+        dict: 업데이트할 상태 필드
+            - document_passages: 관련 구간 ([문서 타입] 내용)
+            - messages: 진행 메시지
+    """
+    
+    project_id = state.get("project_id")
+    query = " ".join(filter(None, [state.get("question"), state.get("transcript")]))
+    
+    if state.get("mode") != "deep" or not project_id or not query:
+        return {"document_passages": None}
+    
+    try:
+        documents = await asyncio.to_thread(load_project_documents, project_id)
+        if not documents:
+            return {
+                "document_passages": None,
+                "messages": ["업로드된 문서 없음"]
+            }
+        index = await get_document_index(project_id, documents)
+        hits = index.search(query, RETRIEVAL_TOP_K)
+    except Exception as e:
+        print(f"Failed to retrieve document passages: {e}")
+        return {
+            "document_passages": None,
+            "messages": ["문서 검색 실패"]
+        }
+    
+    return {
+        "document_passages": [format_passage(index.passages[i]) for i, _ in hits],
+        "messages": [f"문서 구간 {len(hits)}개 검색 (전체 {len(index)}개)"]
+    }
+
+
+async def get_document_index(project_id: str, documents: List[dict]) -> BM25Index:
+    """프로젝트 문서 색인 (프로세스 캐시 → 로컬 파일 → 새로 생성 순)"""
+    
+    digest = corpus_digest(documents)
+    index = INDEX_CACHE.get((project_id, digest))
+    if index is None:
+        started = time.perf_counter()
+        index, stored = await asyncio.to_thread(load_or_build_index, project_id, documents, digest)
+        print(
+            f"[retrieval] project {project_id}: {'loaded' if stored else 'built'} index of "
+            f"{len(index)} passages in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+        INDEX_CACHE.set((project_id, digest), index)
+    return index
+
+
+@traced("db.project_documents")
+def load_project_documents(project_id: str) -> List[dict]:
+    """프로젝트 문서 조회 (동기, 스레드에서 호출 / 업로드 순서)"""
+    
+    supabase = create_client(
+        os.getenv("SUPABASE_URL"),
+        os.getenv("SUPABASE_SERVICE_KEY")
+    )
+    
+    response = supabase.table("project_documents") \
+        .select("document_type, extracted_text") \
+        .eq("project_id", project_id) \
+        .order("created_at") \
+        .execute()
+    
+    return response.data or []
+
+
+def combine_documents(documents: List[dict]) -> str:
+    """문서 내용 결합 (추출 프롬프트에 들어가는 형태)"""
+    
     document_contents = []
     for doc in documents:
         text = doc.get("extracted_text", "")
@@ -279,51 +552,161 @@ async def analyze_uploaded_context(state: SpeechCoachState) -> dict:
         if text:
             document_contents.append(f"[{doc_type}]\n{text}")
     
-    combined_content = "\n\n---\n\n".join(document_contents)
+    return "\n\n---\n\n".join(document_contents)
+
+
+def documents_hash(combined_content: str) -> str:
+    """추출 결과 캐시 키 (모델/버전 + 결합된 문서 내용의 SHA-256)"""
     
-    # Claude로 핵심 정보 추출
-    from anthropic import AsyncAnthropic
+    key = f"{EXTRACTION_MODEL}:{EXTRACTION_VERSION}\n{combined_content}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+async def extract_document_context(
+    project_id: str,
+    documents: List[dict],
+    deadline: Optional[Deadline] = None,
+    record_stats: bool = True,
+) -> Tuple[str, bool]:
+    """
+    프로젝트 문서에서 핵심 정보 추출 (저장된 결과 우선)
+    
+    `project_context_extractions`의 해시가 현재 문서와 같으면 저장된 결과를 그대로 쓰고,
+    다르거나 없으면 Claude로 추출한 뒤 저장합니다. 저장소 조회/저장 실패는 추출을 막지 않습니다.
+    
+    Args:
+        project_id: 프로젝트 ID
+        documents: 프로젝트 문서 (load_project_documents 결과)
+        deadline: 요청 전체 시간 예산
+        record_stats: 적중 통계(EXTRACTION_STATS)에 반영할지 (워밍업 작업은 제외)
+    
+    Returns:
+        Tuple[str, bool]: (추출 결과, 저장된 결과 사용 여부)
+    """
     
-    client = AsyncAnthropic()
+    combined_content = combine_documents(documents)
+    digest = documents_hash(combined_content)
     
-    extraction_prompt = f"""다음 문서들에서 면접/발표에 활용할 수 있는 핵심 정보를 추출해주세요.
+    started = time.perf_counter()
+    try:
+        stored = await asyncio.to_thread(load_stored_extraction, project_id, digest)
+    except Exception as e:
+        print(f"Failed to load stored extraction: {e}")
+        stored = None
+    lookup_ms = (time.perf_counter() - started) * 1000
+    
+    if stored:
+        if record_stats:
+            saved_ms = max((stored.get("extraction_ms") or 0) - lookup_ms, 0)
+            EXTRACTION_STATS["hits"] += 1
+            EXTRACTION_STATS["saved_ms"] += saved_ms
+            print(
+                f"[extraction] project {project_id}: stored result ({lookup_ms:.0f}ms, "
+                f"saved ~{saved_ms / 1000:.1f}s, hit rate {extraction_hit_rate():.0%})"
+            )
+        return stored["extraction"], True
+    
+    if record_stats:
+        EXTRACTION_STATS["misses"] += 1
+    
+    started = time.perf_counter()
+    extraction = await run_document_extraction(documents, deadline)
+    extraction_ms = (time.perf_counter() - started) * 1000
+    print(f"[extraction] project {project_id}: extracted {len(documents)} documents in {extraction_ms / 1000:.1f}s")
+    
+    try:
+        await asyncio.to_thread(save_extraction, project_id, digest, extraction, len(documents), extraction_ms)
+    except Exception as e:
+        print(f"Failed to save extraction: {e}")
+    
+    return extraction, False
 
-문서 내용:
-{combined_content[:10000]}  # 토큰 제한
 
-추출할 정보:
-1. 주요 기술 스택/역량
-2. 핵심 프로젝트와 구체적 성과 (숫자 포함)
-3. 차별화 포인트
-4. 예상되는 면접 질문 3-5개
+@traced("db.load_extraction")
+def load_stored_extraction(project_id: str, digest: str) -> Optional[dict]:
+    """해시가 같은 저장된 추출 결과 조회 (동기, 스레드에서 호출)"""
+    
+    supabase = create_client(
+        os.getenv("SUPABASE_URL"),
+        os.getenv("SUPABASE_SERVICE_KEY")
+    )
+    
+    rows = supabase.table("project_context_extractions") \
+        .select("extraction, extraction_ms") \
+        .eq("project_id", project_id) \
+        .eq("documents_hash", digest) \
+        .limit(1) \
+        .execute().data
+    
+    return rows[0] if rows else None
 
-JSON 형식으로 응답해주세요:
-{{
-    "skills": ["스킬1", "스킬2", ...],
-    "key_achievements": [
-        {{"project": "프로젝트명", "achievement": "성과", "numbers": "수치"}},
-        ...
-    ],
-    "differentiators": ["차별점1", ...],
-    "expected_questions": ["질문1", ...]
-}}
-"""
+
+@traced("db.save_extraction")
+def save_extraction(project_id: str, digest: str, extraction: str, document_count: int, extraction_ms: float) -> None:
+    """추출 결과 저장 (프로젝트당 한 행, 이전 해시의 결과는 덮어씀)"""
     
-    response = await client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=1500,
-        messages=[
-            {"role": "user", "content": extraction_prompt}
-        ]
+    supabase = create_client(
+        os.getenv("SUPABASE_URL"),
+        os.getenv("SUPABASE_SERVICE_KEY")
     )
     
-    context_analysis = response.content[0].text
+    supabase.table("project_context_extractions").upsert({
+        "project_id": project_id,
+        "documents_hash": digest,
+        "document_count": document_count,
+        "extraction": extraction,
+        "extraction_ms": int(extraction_ms),
+    }, on_conflict="project_id").execute()
+
+
+def extraction_hit_rate() -> float:
+    """이 프로세스의 문서 추출 캐시 적중률"""
+    total = EXTRACTION_STATS["hits"] + EXTRACTION_STATS["misses"]
+    return EXTRACTION_STATS["hits"] / total if total else 0.0
+
+
+async def run_document_extraction(documents: List[dict], deadline: Optional[Deadline] = None) -> str:
+    """
+    Claude로 핵심 정보 추출 (조각별 동시 추출 후 합치기)
     
-    return {
-        "context_analysis": context_analysis,
-        "context_documents": [d.get("extracted_text", "") for d in documents],
-        "messages": [f"문서 {len(documents)}개 분석 완료"]
-    }
+    문서를 DOCUMENT_CHUNK_CHARS 단위 조각으로 나눠 조각마다 같은 형식으로 추출하고,
+    merge_extractions로 합칩니다. 조각 결과는 내용 해시로 CHUNK_CACHE에 보관하므로
+    문서 일부만 바뀌면 바뀐 조각만 다시 추출합니다.
+    
+    Returns:
+        str: 추출 결과 JSON (skills, key_achievements, differentiators, expected_questions)
+    """
+    
+    from anthropic import AsyncAnthropic
+    
+    client = AsyncAnthropic(max_retries=0)
+    salt = f"{EXTRACTION_MODEL}:{EXTRACTION_VERSION}"
+    
+    async def extract(chunk: DocumentChunk) -> dict:
+        digest = chunk.digest(salt)
+        cached = CHUNK_CACHE.get(digest)
+        if cached is not None:
+            return cached
+        
+        prompt = EXTRACTION_PROMPT.format(label=chunk.label, content=chunk.text)
+        async with provider_slot("anthropic"):
+            response = await call_with_retry("anthropic", lambda: client.messages.create(
+                model=EXTRACTION_MODEL,
+                max_tokens=1500,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                timeout=remaining_timeout(deadline, CALL_TIMEOUTS["claude"], "context"),
+            ), deadline=deadline)
+        
+        partial = parse_extraction(response.content[0].text)
+        CHUNK_CACHE.set(digest, partial)
+        return partial
+    
+    chunks = split_documents(documents)
+    partials = await extract_chunks(chunks, extract)
+    
+    return json.dumps(merge_extractions(partials), ensure_ascii=False)
 
 
 def build_progressive_context_prompt(
@@ -359,8 +742,7 @@ def build_progressive_context_prompt(
     # 가장 최근 세션 피드백 요약
     if previous_sessions:
         last_session = previous_sessions[0]
-        last_analysis = last_session.get("analysis_result", {})
-        last_scores = last_analysis.get("scores", {})
+        last_scores = last_session.get("scores") or (last_session.get("analysis_result") or {}).get("scores", {})
         
         if last_scores:
             scores_str = ", ".join(f"{k}: {v}" for k, v in last_scores.items())
@@ -384,10 +766,8 @@ async def load_progressive_context_mock(state: SpeechCoachState) -> dict:
         "previous_sessions": [
             {
                 "session_id": "prev_001",
-                "analysis_result": {
-                    "scores": {"pace": "C", "filler": "C+"},
-                    "suggestions": [{"category": "pace"}, {"category": "filler"}]
-                },
+                "scores": {"pace": "C", "filler": "C+"},
+                "suggestion_categories": ["pace", "filler"],
                 "created_at": "2024-01-30T10:00:00Z"
             }
         ],
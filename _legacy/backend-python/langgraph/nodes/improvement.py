@@ -16,8 +16,9 @@ AI도 첫 번째 출력을 검토하고 개선하면 품질이 올라갑니다.
 3. (필요시) 수정된 최종 개선안 반환
 """
 
-from typing import Any
+from typing import Any, Optional
 from anthropic import AsyncAnthropic
+from langchain_core.runnables import RunnableConfig
 import json
 import re
 
@@ -28,9 +29,11 @@ from ..utils.prompts import (
     build_improvement_prompt,
     build_reflection_prompt,
 )
+from ..utils.deadline import CALL_TIMEOUTS, get_deadline, remaining_timeout, should_degrade
+from ..utils.resilience import call_with_retry
 
 
-async def generate_improved_script(state: SpeechCoachState) -> dict:
+async def generate_improved_script(state: SpeechCoachState, config: Optional[RunnableConfig] = None) -> dict:
     """
     개선 스크립트 생성 노드 (1차)
     
@@ -49,6 +52,7 @@ async def generate_improved_script(state: SpeechCoachState) -> dict:
             - transcript: 원본 텍스트
             - analysis_result: 분석 결과
             - question: 연습 중인 질문 (선택)
+        config: 그래프 config (데드라인 전달용)
     
     Returns:
         dict: 업데이트할 상태 필드
@@ -65,19 +69,22 @@ async def generate_improved_script(state: SpeechCoachState) -> dict:
         transcript=transcript,
         analysis=analysis,
         question=question,
+        document_passages=state.get("document_passages"),
     )
     
     # Claude API 호출
-    client = AsyncAnthropic()
+    client = AsyncAnthropic(max_retries=0)
+    deadline = get_deadline(config)
     
-    response = await client.messages.create(
+    response = await call_with_retry("anthropic", lambda: client.messages.create(
         model="claude-sonnet-4-20250514",
         max_tokens=2000,
         system=IMPROVEMENT_SYSTEM_PROMPT,
         messages=[
             {"role": "user", "content": prompt}
-        ]
-    )
+        ],
+        timeout=remaining_timeout(deadline, CALL_TIMEOUTS["claude"], "improve"),
+    ), deadline=deadline)
     
     improved_script = response.content[0].text
     
@@ -90,7 +97,7 @@ async def generate_improved_script(state: SpeechCoachState) -> dict:
     }
 
 
-async def reflect_on_improvement(state: SpeechCoachState) -> dict:
+async def reflect_on_improvement(state: SpeechCoachState, config: Optional[RunnableConfig] = None) -> dict:
     """
     Reflection 노드: 생성된 개선안을 자기 검토
     
@@ -102,12 +109,14 @@ async def reflect_on_improvement(state: SpeechCoachState) -> dict:
     4. 실제로 따라 말할 수 있는 자연스러운 문장인가?
     
     문제가 발견되면 수정된 버전을 반환합니다.
+    남은 데드라인 예산이 부족하면 검토를 생략하고 1차 개선안을 그대로 사용합니다.
     
     Args:
         state: 현재 워크플로우 상태
             - transcript: 원본 텍스트
             - improved_script_draft: 1차 개선안
             - analysis_result: 분석 결과
+        config: 그래프 config (데드라인 전달용)
     
     Returns:
         dict: 업데이트할 상태 필드
@@ -120,6 +129,15 @@ async def reflect_on_improvement(state: SpeechCoachState) -> dict:
     draft = state["improved_script_draft"]
     analysis = state["analysis_result"]
     
+    # 예산 부족 시 Reflection 생략
+    if should_degrade(config, "reflection"):
+        return {
+            "improved_script": draft,
+            "reflection_notes": [],
+            "degradations": ["skip_reflection"],
+            "messages": ["시간 예산 부족 - 품질 검토 생략"]
+        }
+    
     # Reflection 프롬프트 구성
     prompt = build_reflection_prompt(
         original=transcript,
@@ -128,16 +146,18 @@ async def reflect_on_improvement(state: SpeechCoachState) -> dict:
     )
     
     # Claude API 호출
-    client = AsyncAnthropic()
+    client = AsyncAnthropic(max_retries=0)
+    deadline = get_deadline(config)
     
-    response = await client.messages.create(
+    response = await call_with_retry("anthropic", lambda: client.messages.create(
         model="claude-sonnet-4-20250514",
         max_tokens=2000,
         system=REFLECTION_SYSTEM_PROMPT,
         messages=[
             {"role": "user", "content": prompt}
-        ]
-    )
+        ],
+        timeout=remaining_timeout(deadline, CALL_TIMEOUTS["claude"], "reflect"),
+    ), deadline=deadline)
     
     reflection_text = response.content[0].text
     
@@ -236,7 +256,7 @@ def parse_reflection_response(response_text: str) -> dict:
     }
 
 
-async def generate_refined_script(state: SpeechCoachState) -> dict:
+async def generate_refined_script(state: SpeechCoachState, config: Optional[RunnableConfig] = None) -> dict:
     """
     재요청(Refinement) 시 개선안 재생성
     
@@ -248,6 +268,7 @@ async def generate_refined_script(state: SpeechCoachState) -> dict:
             - improved_script: 현재 개선안
             - user_intent: 사용자가 원하는 수정 방향
             - analysis_result: 원래 분석 결과
+        config: 그래프 config (데드라인 전달용)
     
     Returns:
         dict: 업데이트할 상태 필드
@@ -277,16 +298,18 @@ async def generate_refined_script(state: SpeechCoachState) -> dict:
 (전체 스크립트)
 """
     
-    client = AsyncAnthropic()
+    client = AsyncAnthropic(max_retries=0)
+    deadline = get_deadline(config)
     
-    response = await client.messages.create(
+    response = await call_with_retry("anthropic", lambda: client.messages.create(
         model="claude-sonnet-4-20250514",
         max_tokens=2000,
         system="당신은 스피치 코치입니다. 사용자의 의도를 반영하여 개선안을 수정합니다.",
         messages=[
             {"role": "user", "content": prompt}
-        ]
-    )
+        ],
+        timeout=remaining_timeout(deadline, CALL_TIMEOUTS["claude"], "refine"),
+    ), deadline=deadline)
     
     response_text = response.content[0].text
     
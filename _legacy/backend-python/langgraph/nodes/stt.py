@@ -5,13 +5,16 @@ OpenAI Whisper API를 사용하여 오디오를 텍스트로 변환합니다.
 이 노드는 워크플로우의 첫 번째 단계로, 사용자의 음성을 분석 가능한 텍스트로 바꿉니다.
 
 ## 처리 흐름
-1. 오디오 파일 URL에서 파일 다운로드
-2. 파일 형식 검증 및 필요시 변환
-3. Whisper API 호출
-4. 트랜스크립트 반환
+1. 헤더 프로브 (Range 요청으로 앞/뒤 몇 KB만 읽어 길이 확인 → 범위 밖이면 다운로드 전 거절)
+2. 오디오 파일 다운로드, 형식 검증 및 전처리 (모노 16kHz 저비트레이트로 변환, 업로드 크기 감소)
+3. Whisper API 호출 (긴 녹음은 무음 경계에서 나눈 조각을 동시에 전사한 뒤 이어 붙임)
+4. 트랜스크립트 + 단어 타임스탬프 반환 (구간별 말 속도 분석용)
+
+직접 업로드(`POST /analyze/upload`)는 업로드 본문을 `transcribe_stream`으로 Whisper에 바로 흘려보내고,
+작업에는 전사 결과를 담아 등록합니다. 이 경우 노드는 다시 전사하지 않습니다.
 
 ## 에러 처리
-- 오디오가 너무 짧은 경우 (5초 미만)
+- 오디오가 너무 짧거나 긴 경우 (5초 미만, AUDIO_MAX_SECONDS 초과) - Whisper 호출 전에 거절
 - 지원하지 않는 형식
 - API 에러
 """
@@ -19,17 +22,32 @@ OpenAI Whisper API를 사용하여 오디오를 텍스트로 변환합니다.
 import httpx
 import tempfile
 import os
-from typing import Any
+import uuid
+from typing import Any, AsyncIterator, Optional
 from openai import AsyncOpenAI
+from langchain_core.runnables import RunnableConfig
 
 from ..state import SpeechCoachState
+from ..utils.audio import PreprocessedAudio, ensure_audio_duration, preprocess_audio
+from ..utils.audio_probe import AudioProbe, probe_audio_bytes, probe_audio_url
+from ..utils.deadline import CALL_TIMEOUTS, Deadline, DeadlineExceeded, get_deadline, remaining_timeout
+from ..utils.metrics import record_audio_seconds
+from ..utils.resilience import RetryPolicy, call_with_retry, provider_slot, UpstreamHTTPError
+from ..utils.transcription import response_to_dict, stitch_transcripts, transcribe_chunks
+from ..tools.pace_timeline import words_from_segments
 
 
 # Whisper가 지원하는 파일 형식
 SUPPORTED_FORMATS = {".mp3", ".mp4", ".mpeg", ".mpga", ".m4a", ".wav", ".webm"}
 
+# 단어/세그먼트 타임스탬프 요청 (verbose_json에서만 지원)
+TIMESTAMP_GRANULARITIES = ["word", "segment"]
+
+# 스트리밍 본문은 다시 보낼 수 없으므로 재시도 없이 1회만 시도 (서킷 브레이커는 적용)
+STREAM_POLICY = RetryPolicy(max_attempts=1)
+
 
-async def speech_to_text(state: SpeechCoachState) -> dict:
+async def speech_to_text(state: SpeechCoachState, config: Optional[RunnableConfig] = None) -> dict:
     """
     Whisper STT 노드
     
@@ -38,60 +56,112 @@ async def speech_to_text(state: SpeechCoachState) -> dict:
     Args:
         state: 현재 워크플로우 상태
             - audio_file_path: 오디오 파일 URL
+        config: 그래프 config (configurable.deadline이 있으면 남은 예산으로 타임아웃 계산)
     
     Returns:
         dict: 업데이트할 상태 필드
             - transcript: 변환된 텍스트
             - audio_duration: 오디오 길이 (초)
+            - voice_activity: 멈춤 통계 (디코딩 가능한 경우)
             - messages: 진행 메시지
     
     Raises:
-        ValueError: 오디오가 너무 짧거나 형식이 잘못된 경우
+        ValueError: 오디오가 너무 짧거나 길거나 형식이 잘못된 경우
     """
     
+    # 직접 업로드 경로에서 이미 전사한 경우
+    if state.get("transcript"):
+        return {"messages": ["음성 인식 완료 (업로드 중 전사)"]}
+    
     audio_url = state["audio_file_path"]
+    deadline = get_deadline(config)
+    
+    # 1. 헤더 프로브 - 길이가 범위 밖이면 다운로드/Whisper 호출 전에 거절
+    probe = await probe_remote_audio(audio_url, deadline)
+    if probe is not None:
+        ensure_audio_duration(probe.duration)
     
-    # 1. 오디오 파일 다운로드
-    audio_data, file_extension = await download_audio(audio_url)
+    # 2. 오디오 파일 다운로드 (서버가 Range를 무시해 프로브에서 전체를 받았으면 재사용)
+    if probe is not None and probe.data is not None:
+        audio_data = probe.data
+        file_extension = resolve_extension(audio_url, probe.content_type)
+    else:
+        audio_data, file_extension = await download_audio(audio_url, deadline)
     
-    # 2. 파일 형식 검증
+    # 원격 프로브로 길이를 못 구했으면 받은 데이터의 헤더로 다시 확인
+    if probe is None or probe.duration is None:
+        ensure_audio_duration(probe_audio_bytes(audio_data).duration)
+    
+    # 파일 형식 검증
     if file_extension.lower() not in SUPPORTED_FORMATS:
         raise ValueError(f"Unsupported audio format: {file_extension}. Supported: {SUPPORTED_FORMATS}")
     
-    # 3. 임시 파일로 저장 (Whisper API는 파일 객체 필요)
-    with tempfile.NamedTemporaryFile(suffix=file_extension, delete=False) as tmp_file:
-        tmp_file.write(audio_data)
+    # 3. 전처리 (프로세스 풀에서 변환 + 무음 제거, 실패 시 원본 사용)
+    processed = await preprocess_audio(audio_data, file_extension.lower())
+    if processed.applied:
+        print(
+            f"[stt] preprocessed {processed.original_size}B -> {processed.size}B "
+            f"({processed.extension}, trimmed {processed.trimmed_seconds:.1f}s, "
+            f"collapsed {processed.collapsed_seconds:.1f}s, "
+            f"{len(processed.chunks or [])} chunks, {processed.elapsed:.2f}s)"
+        )
+    
+    client = AsyncOpenAI(max_retries=0)  # 환경변수에서 API 키 자동 로드
+    
+    if processed.chunks:
+        # 4'. 분할 전사 - 조각을 동시에 전사 (동시 호출 수는 provider_slot이 제한)
+        async def transcribe_chunk(chunk):
+            async def call():
+                async with provider_slot("openai"):
+                    return await client.audio.transcriptions.create(
+                        model="whisper-1",
+                        file=(f"chunk{chunk.index}{chunk.extension}", chunk.data),
+                        language="ko",
+                        response_format="verbose_json",
+                        timestamp_granularities=TIMESTAMP_GRANULARITIES,
+                        timeout=remaining_timeout(deadline, CALL_TIMEOUTS["stt"], "stt"),
+                    )
+            return await call_with_retry("openai", call, deadline=deadline)
+        
+        responses = await transcribe_chunks(processed.chunks, transcribe_chunk)
+        stitched = stitch_transcripts(processed.chunks, responses)
+        return build_stt_result(
+            stitched.text,
+            stitched.duration,
+            processed,
+            stitched.words or words_from_segments(stitched.segments),
+        )
+    
+    # 4. 임시 파일로 저장 (Whisper API는 파일 객체 필요)
+    with tempfile.NamedTemporaryFile(suffix=processed.extension, delete=False) as tmp_file:
+        tmp_file.write(processed.data)
         tmp_path = tmp_file.name
     
     try:
-        # 4. Whisper API 호출
-        client = AsyncOpenAI()  # 환경변수에서 API 키 자동 로드
+        # 5. Whisper API 호출
+        async def transcribe():
+            # 재시도마다 파일을 다시 열어 처음부터 업로드
+            async with provider_slot("openai"):
+                with open(tmp_path, "rb") as audio_file:
+                    # verbose_json으로 호출하면 duration도 받을 수 있음
+                    return await client.audio.transcriptions.create(
+                        model="whisper-1",
+                        file=audio_file,
+                        language="ko",  # 한국어 지정 (정확도 향상)
+                        response_format="verbose_json",  # duration 포함
+                        timestamp_granularities=TIMESTAMP_GRANULARITIES,
+                        timeout=remaining_timeout(deadline, CALL_TIMEOUTS["stt"], "stt"),
+                    )
         
-        with open(tmp_path, "rb") as audio_file:
-            # verbose_json으로 호출하면 duration도 받을 수 있음
-            response = await client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                language="ko",  # 한국어 지정 (정확도 향상)
-                response_format="verbose_json",  # duration 포함
-            )
-        
-        transcript = response.text
-        duration = getattr(response, 'duration', None)
-        
-        # 5. 오디오 길이 검증 (최소 5초)
-        if duration and duration < 5:
-            raise ValueError(f"Audio is too short ({duration:.1f}s). Minimum 5 seconds required.")
+        response = await call_with_retry("openai", transcribe, deadline=deadline)
         
-        # 6. 트랜스크립트 비어있으면 에러
-        if not transcript or not transcript.strip():
-            raise ValueError("Could not transcribe audio. Please check audio quality and try again.")
-        
-        return {
-            "transcript": transcript.strip(),
-            "audio_duration": duration,
-            "messages": [f"음성 인식 완료: {len(transcript)}자"]
-        }
+        data = response_to_dict(response)
+        return build_stt_result(
+            data.get("text", ""),
+            data.get("duration"),
+            processed,
+            extract_word_timestamps(data),
+        )
         
     finally:
         # 임시 파일 정리
@@ -99,7 +169,134 @@ async def speech_to_text(state: SpeechCoachState) -> dict:
             os.unlink(tmp_path)
 
 
-async def download_audio(url: str) -> tuple[bytes, str]:
+def build_stt_result(
+    transcript: str,
+    duration: Optional[float],
+    processed: Optional[PreprocessedAudio] = None,
+    words: Optional[list] = None,
+) -> dict:
+    """
+    Whisper 결과 검증 후 상태 업데이트 생성
+    
+    단어 타임스탬프는 업로드한 오디오(앞/뒤 무음 제거 후) 기준 시각입니다.
+    
+    Raises:
+        ValueError: 길이가 범위 밖이거나 트랜스크립트가 비어있는 경우
+    """
+    
+    # 6. 오디오 길이 검증 (헤더에 길이 정보가 없던 경우 대비)
+    # Whisper 길이는 무음을 줄인 길이이므로 잘라낸 만큼 더해 녹음 원본 길이로 확인
+    removed = 0.0
+    if duration and processed is not None and processed.applied:
+        removed = processed.trimmed_seconds + processed.collapsed_seconds
+    ensure_audio_duration(duration + removed if duration else duration)
+    
+    # Whisper가 전사한 길이 (중간 무음을 줄였으면 줄인 길이 기준)
+    record_audio_seconds(duration)
+    
+    # 중간 무음을 줄였으면 말하기 길이(WPM 계산용)에 다시 더함
+    if duration and processed is not None and processed.applied:
+        duration += processed.collapsed_seconds
+    
+    # 7. 트랜스크립트 비어있으면 에러
+    if not transcript or not transcript.strip():
+        raise ValueError("Could not transcribe audio. Please check audio quality and try again.")
+    
+    return {
+        "transcript": transcript.strip(),
+        "audio_duration": duration,
+        "voice_activity": processed.voice_activity if processed is not None else None,
+        "word_timestamps": words or None,
+        "messages": [f"음성 인식 완료: {len(transcript)}자"]
+    }
+
+
+async def transcribe_stream(
+    chunks: AsyncIterator[bytes],
+    filename: str,
+    content_type: str,
+    deadline: Optional[Deadline] = None,
+) -> dict:
+    """
+    오디오 청크를 받는 대로 Whisper에 업로드 (전체 파일을 메모리에 모으지 않음)
+    
+    multipart 본문을 직접 만들어 chunked 전송합니다.
+    (OpenAI SDK는 파일 객체/바이트만 받으므로 httpx로 호출)
+    
+    Args:
+        chunks: 오디오 데이터 청크
+        filename: 업로드 파일명 (확장자로 형식 판별)
+        content_type: 오디오 Content-Type
+        deadline: 요청 데드라인
+    
+    Returns:
+        dict: build_stt_result 결과 (transcript, audio_duration, word_timestamps 등)
+    
+    Raises:
+        ValueError: 길이가 범위 밖이거나 전사 실패
+        UpstreamHTTPError: Whisper API 에러
+    """
+    
+    boundary = uuid.uuid4().hex
+    fields = [
+        ("model", "whisper-1"),
+        ("language", "ko"),
+        ("response_format", "verbose_json"),
+        *[("timestamp_granularities[]", g) for g in TIMESTAMP_GRANULARITIES],
+    ]
+    
+    async def body() -> AsyncIterator[bytes]:
+        for name, value in fields:
+            yield (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+                f"{value}\r\n"
+            ).encode()
+        yield (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        async for chunk in chunks:
+            yield chunk
+        yield f"\r\n--{boundary}--\r\n".encode()
+    
+    base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+    
+    async def call() -> dict:
+        async with provider_slot("openai"), httpx.AsyncClient() as client:
+            response = await client.post(
+                f"{base_url}/audio/transcriptions",
+                headers={
+                    "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY', '')}",
+                    "Content-Type": f"multipart/form-data; boundary={boundary}",
+                },
+                content=body(),
+                timeout=remaining_timeout(deadline, CALL_TIMEOUTS["stt"], "stt"),
+            )
+        if response.status_code != 200:
+            raise UpstreamHTTPError(
+                f"Whisper API error: HTTP {response.status_code}",
+                status_code=response.status_code,
+                headers=response.headers,
+            )
+        return response.json()
+    
+    data = await call_with_retry("openai", call, policy=STREAM_POLICY, deadline=deadline)
+    return build_stt_result(data.get("text", ""), data.get("duration"), None, extract_word_timestamps(data))
+
+
+def extract_word_timestamps(data: dict) -> list:
+    """verbose_json 응답에서 단어 타임스탬프 추출 (없으면 세그먼트로 근사)"""
+    
+    words = [
+        {"word": w.get("word", ""), "start": w.get("start", 0.0), "end": w.get("end", 0.0)}
+        for w in (data.get("words") or [])
+    ]
+    return words or words_from_segments(data.get("segments") or [])
+
+
+async def download_audio(url: str, deadline: Optional[Deadline] = None) -> tuple[bytes, str]:
     """
     오디오 파일 다운로드
     
@@ -107,6 +304,7 @@ async def download_audio(url: str) -> tuple[bytes, str]:
     
     Args:
         url: 오디오 파일 URL
+        deadline: 요청 데드라인 (있으면 남은 예산으로 타임아웃 계산)
     
     Returns:
         tuple: (파일 데이터, 확장자)
@@ -115,24 +313,65 @@ async def download_audio(url: str) -> tuple[bytes, str]:
         ValueError: 다운로드 실패
     """
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, follow_redirects=True, timeout=30.0)
+    async def fetch() -> httpx.Response:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(
+                url,
+                follow_redirects=True,
+                timeout=remaining_timeout(deadline, CALL_TIMEOUTS["download"], "download"),
+            )
         
         if response.status_code != 200:
-            raise ValueError(f"Failed to download audio: HTTP {response.status_code}")
-        
-        # URL에서 확장자 추출
-        # 예: https://xxx.supabase.co/storage/v1/object/public/audio/recording.webm
-        from urllib.parse import urlparse
-        path = urlparse(url).path
-        _, ext = os.path.splitext(path)
-        
-        # 확장자가 없으면 Content-Type에서 추론
-        if not ext:
-            content_type = response.headers.get("content-type", "")
-            ext = guess_extension_from_content_type(content_type)
-        
-        return response.content, ext
+            raise UpstreamHTTPError(
+                f"Failed to download audio: HTTP {response.status_code}",
+                status_code=response.status_code,
+                headers=response.headers,
+            )
+        return response
+    
+    response = await call_with_retry("storage", fetch, deadline=deadline)
+    
+    ext = resolve_extension(url, response.headers.get("content-type", ""))
+    
+    return response.content, ext
+
+
+async def probe_remote_audio(url: str, deadline: Optional[Deadline] = None) -> Optional[AudioProbe]:
+    """
+    다운로드 전 헤더 프로브
+    
+    프로브는 최적화일 뿐이므로 실패해도 에러를 던지지 않고 None을 반환합니다.
+    (데드라인 초과는 다운로드도 불가능하므로 그대로 전파)
+    """
+    
+    try:
+        probe = await probe_audio_url(url, deadline)
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        print(f"[stt] audio probe failed, falling back to full download: {e}")
+        return None
+    
+    print(f"[stt] probe {probe}")
+    return probe
+
+
+def resolve_extension(url: str, content_type: str) -> str:
+    """
+    파일 확장자 결정
+    
+    URL에서 확장자를 추출하고, 없으면 Content-Type에서 추론합니다.
+    예: https://xxx.supabase.co/storage/v1/object/public/audio/recording.webm
+    """
+    
+    from urllib.parse import urlparse
+    path = urlparse(url).path
+    _, ext = os.path.splitext(path)
+    
+    if not ext:
+        ext = guess_extension_from_content_type(content_type)
+    
+    return ext
 
 
 def guess_extension_from_content_type(content_type: str) -> str:
@@ -177,5 +416,12 @@ async def speech_to_text_mock(state: SpeechCoachState) -> dict:
 음... 가장 큰 성과라고 하면, 작년에 레거시 시스템 마이그레이션 프로젝트를 
 리드했었는데요, 그... 다운타임 없이 성공적으로 전환을 완료했습니다.""",
         "audio_duration": 45.0,
+        "voice_activity": {
+            "pause_count": 6,
+            "long_pause_count": 1,
+            "total_pause_seconds": 7.8,
+            "mean_pause_seconds": 1.3,
+            "longest_pause_seconds": 2.4,
+        },
         "messages": ["[MOCK] 음성 인식 완료"]
     }
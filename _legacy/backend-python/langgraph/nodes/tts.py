@@ -19,8 +19,19 @@ ElevenLabs는 문자당 과금되므로, 긴 스크립트는 비용이 높습니
 import httpx
 import os
 from typing import Optional
+from langchain_core.runnables import RunnableConfig
 
 from ..state import SpeechCoachState
+from ..utils.deadline import (
+    CALL_TIMEOUTS,
+    Deadline,
+    get_deadline,
+    remaining_timeout,
+    should_degrade,
+)
+from ..utils.metrics import record_tts_characters
+from ..utils.tracing import KIND_CLIENT, traced
+from ..utils.resilience import call_with_retry, raise_for_upstream_status
 
 
 # 기본 음성 ID (ElevenLabs에서 제공하는 음성)
@@ -33,12 +44,13 @@ DEFAULT_VOICES = {
 ELEVENLABS_API_URL = "https://api.elevenlabs.io/v1"
 
 
-async def generate_tts(state: SpeechCoachState) -> dict:
+async def generate_tts(state: SpeechCoachState, config: Optional[RunnableConfig] = None) -> dict:
     """
     TTS 생성 노드
     
     개선된 스크립트를 ElevenLabs API를 통해 음성으로 변환합니다.
     생성된 오디오는 Supabase Storage에 업로드되고 URL이 반환됩니다.
+    남은 데드라인 예산이 부족하면 TTS를 생략하고 텍스트 결과만 반환합니다.
     
     Args:
         state: 현재 워크플로우 상태
@@ -46,6 +58,7 @@ async def generate_tts(state: SpeechCoachState) -> dict:
             - voice_type: 음성 타입 (default_male/default_female/cloned)
             - voice_clone_id: Voice Clone ID (cloned 타입일 때)
             - session_id: 세션 ID (파일명에 사용)
+        config: 그래프 config (데드라인 전달용)
     
     Returns:
         dict: 업데이트할 상태 필드
@@ -61,44 +74,53 @@ async def generate_tts(state: SpeechCoachState) -> dict:
     voice_clone_id = state.get("voice_clone_id")
     session_id = state["session_id"]
     
+    # 예산 부족 시 TTS 생략 (텍스트 개선안은 이미 완성됨)
+    if should_degrade(config, "tts"):
+        return {
+            "improved_audio_url": "",
+            "degradations": ["skip_tts"],
+            "messages": ["시간 예산 부족 - 음성 생성 생략"]
+        }
+    
+    deadline = get_deadline(config)
+    
     # 음성 ID 결정
-    if voice_type == "cloned" and voice_clone_id:
-        voice_id = voice_clone_id
-    else:
-        # Clone이 없거나 기본 음성 선택 시
-        voice_id = DEFAULT_VOICES.get(voice_type, DEFAULT_VOICES["default_male"])
+    voice_id = resolve_voice_id(voice_type, voice_clone_id)
     
     # ElevenLabs API 호출
     api_key = os.getenv("ELEVENLABS_API_KEY")
     if not api_key:
         raise ValueError("ELEVENLABS_API_KEY not configured")
     
-    async with httpx.AsyncClient() as client:
-        # TTS 요청
-        response = await client.post(
-            f"{ELEVENLABS_API_URL}/text-to-speech/{voice_id}",
-            headers={
-                "xi-api-key": api_key,
-                "Content-Type": "application/json",
-            },
-            json={
-                "text": script,
-                "model_id": "eleven_multilingual_v2",  # 다국어 모델 (한국어 지원)
-                "voice_settings": {
-                    "stability": 0.5,           # 음성 안정성
-                    "similarity_boost": 0.75,   # 원본 음성 유사도
-                    "style": 0.0,               # 스타일 강도
-                    "use_speaker_boost": True,  # 화자 특성 강화
-                }
-            },
-            timeout=60.0,  # TTS는 시간이 걸릴 수 있음
-        )
-        
-        if response.status_code != 200:
-            error_detail = response.text
-            raise ValueError(f"ElevenLabs TTS failed: {response.status_code} - {error_detail}")
-        
-        audio_data = response.content
+    async def request_tts() -> bytes:
+        async with httpx.AsyncClient() as client:
+            # TTS 요청
+            response = await client.post(
+                f"{ELEVENLABS_API_URL}/text-to-speech/{voice_id}",
+                headers={
+                    "xi-api-key": api_key,
+                    "Content-Type": "application/json",
+                },
+                json={
+                    "text": script,
+                    "model_id": "eleven_multilingual_v2",  # 다국어 모델 (한국어 지원)
+                    "voice_settings": {
+                        "stability": 0.5,           # 음성 안정성
+                        "similarity_boost": 0.75,   # 원본 음성 유사도
+                        "style": 0.0,               # 스타일 강도
+                        "use_speaker_boost": True,  # 화자 특성 강화
+                    }
+                },
+                # TTS는 시간이 걸릴 수 있음
+                timeout=remaining_timeout(deadline, CALL_TIMEOUTS["tts"], "tts"),
+            )
+            
+            raise_for_upstream_status(response, "ElevenLabs TTS failed")
+            
+            return response.content
+    
+    audio_data = await call_with_retry("elevenlabs", request_tts, deadline=deadline)
+    record_tts_characters(len(script))
     
     # Supabase Storage에 업로드
     audio_url = await upload_to_storage(
@@ -112,6 +134,14 @@ async def generate_tts(state: SpeechCoachState) -> dict:
     }
 
 
+def resolve_voice_id(voice_type: str, voice_clone_id: Optional[str] = None) -> str:
+    """음성 타입 → ElevenLabs Voice ID (Clone이 없거나 기본 음성 선택 시 기본 음성)"""
+    if voice_type == "cloned" and voice_clone_id:
+        return voice_clone_id
+    return DEFAULT_VOICES.get(voice_type, DEFAULT_VOICES["default_male"])
+
+
+@traced("storage.upload", KIND_CLIENT)
 async def upload_to_storage(audio_data: bytes, filename: str) -> str:
     """
     오디오 파일을 Supabase Storage에 업로드
@@ -154,6 +184,7 @@ async def create_voice_clone(
     sample_audio_urls: list[str],
     voice_name: str,
     user_id: str,
+    deadline: Optional[Deadline] = None,
 ) -> dict:
     """
     Voice Clone 생성
@@ -165,6 +196,7 @@ async def create_voice_clone(
         sample_audio_urls: 샘플 오디오 URL 목록 (최소 1개)
         voice_name: 클론 음성 이름
         user_id: 사용자 ID
+        deadline: 요청 데드라인 (있으면 남은 예산으로 타임아웃 계산)
     
     Returns:
         dict: Voice Clone 정보
@@ -181,36 +213,45 @@ async def create_voice_clone(
     sample_files = []
     async with httpx.AsyncClient() as client:
         for i, url in enumerate(sample_audio_urls):
-            response = await client.get(url, timeout=30.0)
-            if response.status_code == 200:
-                sample_files.append((f"sample_{i}.mp3", response.content))
+            try:
+                response = await call_with_retry(
+                    "storage",
+                    lambda: _get_ok(client, url, deadline),
+                    deadline=deadline,
+                )
+            except ValueError:
+                continue
+            sample_files.append((f"sample_{i}.mp3", response.content))
     
     if not sample_files:
         raise ValueError("No valid sample audio files")
     
     # ElevenLabs Voice Clone API 호출
-    async with httpx.AsyncClient() as client:
-        # multipart/form-data 요청
-        files = [
-            ("files", (name, data, "audio/mpeg"))
-            for name, data in sample_files
-        ]
-        
-        response = await client.post(
-            f"{ELEVENLABS_API_URL}/voices/add",
-            headers={"xi-api-key": api_key},
-            data={
-                "name": f"{voice_name}_{user_id[:8]}",  # 고유한 이름
-                "description": f"Voice clone for user {user_id}",
-            },
-            files=files,
-            timeout=120.0,  # Clone 생성은 시간이 걸림
-        )
-        
-        if response.status_code != 200:
-            raise ValueError(f"Voice clone creation failed: {response.text}")
-        
-        result = response.json()
+    async def request_clone() -> dict:
+        async with httpx.AsyncClient() as client:
+            # multipart/form-data 요청
+            files = [
+                ("files", (name, data, "audio/mpeg"))
+                for name, data in sample_files
+            ]
+            
+            response = await client.post(
+                f"{ELEVENLABS_API_URL}/voices/add",
+                headers={"xi-api-key": api_key},
+                data={
+                    "name": f"{voice_name}_{user_id[:8]}",  # 고유한 이름
+                    "description": f"Voice clone for user {user_id}",
+                },
+                files=files,
+                # Clone 생성은 시간이 걸림
+                timeout=remaining_timeout(deadline, CALL_TIMEOUTS["voice_clone"], "voice_clone"),
+            )
+            
+            raise_for_upstream_status(response, "Voice clone creation failed")
+            
+            return response.json()
+    
+    result = await call_with_retry("elevenlabs", request_clone, deadline=deadline)
     
     return {
         "voice_id": result["voice_id"],
@@ -236,14 +277,36 @@ async def delete_voice_clone(voice_id: str) -> bool:
     if not api_key:
         return False
     
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(
-            f"{ELEVENLABS_API_URL}/voices/{voice_id}",
-            headers={"xi-api-key": api_key},
-            timeout=30.0,
-        )
-        
-        return response.status_code == 200
+    async def request_delete() -> httpx.Response:
+        async with httpx.AsyncClient() as client:
+            response = await client.delete(
+                f"{ELEVENLABS_API_URL}/voices/{voice_id}",
+                headers={"xi-api-key": api_key},
+                timeout=30.0,
+            )
+        raise_for_upstream_status(response, "Voice clone deletion failed")
+        return response
+    
+    try:
+        await call_with_retry("elevenlabs", request_delete)
+    except Exception:
+        return False
+    
+    return True
+
+
+async def _get_ok(
+    client: httpx.AsyncClient,
+    url: str,
+    deadline: Optional[Deadline] = None,
+) -> httpx.Response:
+    """GET 요청 후 200이 아니면 UpstreamHTTPError 발생"""
+    response = await client.get(
+        url,
+        timeout=remaining_timeout(deadline, CALL_TIMEOUTS["download"], "download"),
+    )
+    raise_for_upstream_status(response, f"Failed to download {url}")
+    return response
 
 
 # ============================================
@@ -36,6 +36,16 @@ class AnalysisMetrics(TypedDict):
     filler_percentage: float      # 필러워드 비율 (%)
     total_words: int              # 총 단어 수
     duration_seconds: float       # 오디오 길이 (초)
+    pause_count: int              # 멈춤 횟수 (0.25초 이상)
+    long_pause_count: int         # 긴 멈춤 횟수 (2초 이상)
+    total_pause_seconds: float    # 멈춤 총 길이 (초)
+    mean_pause_seconds: float     # 평균 멈춤 길이 (초)
+    longest_pause_seconds: float  # 가장 긴 멈춤 (초)
+    pace_variability: float       # 10초 윈도우 WPM 표준편차
+    rush_count: int               # 빨라진 구간 수 (190 WPM 초과 3초 이상)
+    rush_seconds: float           # 빨라진 구간 총 길이 (초)
+    stall_count: int              # 늘어진 구간 수 (90 WPM 미만 3초 이상)
+    stall_seconds: float          # 늘어진 구간 총 길이 (초)
 
 
 class AnalysisResult(TypedDict):
@@ -89,7 +99,7 @@ class SpeechCoachState(TypedDict):
     - improved_audio_url: TTS 생성된 오디오 URL
     
     ### Progressive Context
-    - previous_sessions: 이전 세션 기록
+    - previous_sessions: 이전 세션 요약 (점수 등급, 개선 제안 카테고리, 시각)
     - user_patterns: 유저 패턴 분석
     - context_documents: 업로드된 문서 내용
     
@@ -99,6 +109,7 @@ class SpeechCoachState(TypedDict):
     
     ### 메시지 (UI 업데이트용)
     - messages: 진행 상황 메시지 (누적)
+    - degradations: 시간 예산 부족으로 생략된 단계 (누적)
     
     ### 재요청 관련
     - refinement_count: 재요청 횟수
@@ -113,6 +124,8 @@ class SpeechCoachState(TypedDict):
     # ===== 입력 데이터 =====
     audio_file_path: str
     audio_duration: Optional[float]  # 오디오 길이 (초)
+    voice_activity: Optional[dict]  # STT 전처리에서 계산한 멈춤 통계
+    word_timestamps: Optional[List[dict]]  # Whisper 단어 타임스탬프 [{"word", "start", "end"}]
     question: Optional[str]
     project_id: Optional[str]
     
@@ -132,6 +145,7 @@ class SpeechCoachState(TypedDict):
     user_patterns: Optional[UserPatterns]
     context_documents: Optional[List[str]]  # Deep Mode: 문서 내용
     context_analysis: Optional[str]  # Deep Mode: 문서 분석 결과
+    document_passages: Optional[List[str]]  # Deep Mode: 질문/답변과 관련된 문서 구간 (BM25)
     
     # ===== 음성 설정 =====
     voice_type: Literal["default_male", "default_female", "cloned"]
@@ -141,6 +155,10 @@ class SpeechCoachState(TypedDict):
     # Annotated[List, operator.add]는 각 노드의 반환값이 기존 리스트에 추가됨
     messages: Annotated[List[str], operator.add]
     
+    # ===== 데드라인 (누적) =====
+    # 예산 부족으로 생략된 단계 (예: skip_react, skip_reflection, skip_tts)
+    degradations: Annotated[List[str], operator.add]
+    
     # ===== 재요청 관련 =====
     refinement_count: int
     user_intent: Optional[str]
@@ -163,6 +181,10 @@ class RefinementState(TypedDict):
     user_intent: str
     refinement_stage: Literal[1, 2]  # 1=프리뷰, 2=최종
     
+    # Stage 1 프리뷰 (Stage 2에서 의도가 같으면 재사용)
+    preview_script: Optional[str]
+    preview_intent: Optional[str]
+    
     # 재요청 출력
     refined_script: str
     changes_summary: str
@@ -174,6 +196,9 @@ class RefinementState(TypedDict):
     
     # 메시지
     messages: Annotated[List[str], operator.add]
+    
+    # 예산 부족으로 생략된 단계
+    degradations: Annotated[List[str], operator.add]
 
 
 # ============================================
@@ -213,6 +238,8 @@ def create_initial_state(
         # 입력
         audio_file_path=audio_url,
         audio_duration=None,
+        voice_activity=None,
+        word_timestamps=None,
         question=kwargs.get("question"),
         project_id=kwargs.get("project_id"),
         
@@ -232,6 +259,7 @@ def create_initial_state(
         user_patterns=None,
         context_documents=None,
         context_analysis=None,
+        document_passages=None,
         
         # 음성
         voice_type=voice_type,
@@ -239,6 +267,7 @@ def create_initial_state(
         
         # 메시지
         messages=[],
+        degradations=[],
         
         # 재요청
         refinement_count=0,
@@ -9,6 +9,10 @@ from .pace_analysis import (
     analyze_pace,
     get_pace_score,
 )
+from .pace_timeline import (
+    analyze_pace_timeline,
+    words_from_segments,
+)
 from .filler_analysis import (
     analyze_fillers,
     get_filler_score,
@@ -21,6 +25,8 @@ from .structure_analysis import (
 __all__ = [
     "analyze_pace",
     "get_pace_score",
+    "analyze_pace_timeline",
+    "words_from_segments",
     "analyze_fillers",
     "get_filler_score",
     "analyze_star_structure",
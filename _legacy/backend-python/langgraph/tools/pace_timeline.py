@@ -0,0 +1,202 @@
+"""
+구간별 말 속도(Pace Timeline) 분석 도구
+
+`analyze_pace`의 전체 평균 WPM은 "앞부분은 몰아서 말하고 뒷부분에서 막히는" 답변도
+적정 속도로 보이게 만듭니다. 이 도구는 Whisper 단어 타임스탬프로
+슬라이딩 윈도우 WPM을 계산해 빨라진 구간(rush), 늘어진 구간(stall),
+단어 사이 긴 멈춤을 찾아냅니다.
+
+## 계산 방식 (NumPy 벡터 연산)
+
+1. 단어 시작 시각을 정렬된 배열로 만들고
+2. 윈도우 시작 시각 격자(step 간격)에 대해 `searchsorted` 두 번으로 윈도우별 단어 수를 구함
+3. 기준 WPM을 넘는/밑도는 윈도우의 연속 구간을 한 번에 추출
+4. 단어 사이 간격(다음 시작 - 이전 끝)으로 멈춤 통계 계산
+
+Python 루프 없이 처리하므로 1시간 분량(약 1만 단어)도 수 밀리초 안에 끝납니다.
+
+## 기준
+
+- 윈도우 10초, 1초 간격
+- rush: 윈도우 WPM 190 초과가 3초 이상 지속
+- stall: 윈도우 WPM 90 미만이 3초 이상 지속 (멈춤 포함)
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# 슬라이딩 윈도우 길이 / 간격 (초)
+PACE_WINDOW_SECONDS = 10.0
+PACE_STEP_SECONDS = 1.0
+
+# 구간 판정 기준 (analyze_pace 적정 범위 120-170 WPM보다 여유 있게)
+RUSH_WPM = 190
+STALL_WPM = 90
+MIN_EVENT_SECONDS = 3.0
+
+# 단어 사이 멈춤 기준 (초)
+MIN_PAUSE_SECONDS = 0.25
+LONG_PAUSE_SECONDS = 2.0
+
+# 프롬프트/응답에 포함할 구간 최대 개수 (긴 것부터)
+MAX_REPORTED_INTERVALS = 5
+
+
+def words_from_segments(segments: Sequence[dict]) -> List[dict]:
+    """
+    세그먼트 타임스탬프만 있을 때 단어 타임스탬프 근사
+
+    세그먼트 안의 단어를 글자 수 비율로 시간을 나눠 배치합니다.
+    """
+    words = []
+    for segment in segments or []:
+        tokens = str(segment.get("text", "")).split()
+        if not tokens:
+            continue
+        start = float(segment.get("start", 0.0))
+        end = float(segment.get("end", start))
+        lengths = np.array([len(t) for t in tokens], dtype=np.float64)
+        bounds = start + (end - start) * np.concatenate([[0.0], np.cumsum(lengths) / lengths.sum()])
+        for token, word_start, word_end in zip(tokens, bounds[:-1], bounds[1:]):
+            words.append({"word": token, "start": round(float(word_start), 3), "end": round(float(word_end), 3)})
+    return words
+
+
+def word_times(words: Sequence[dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """단어 타임스탬프 목록을 (시작, 끝) 배열로 변환 (시작 시각 기준 정렬)"""
+    count = len(words)
+    starts = np.fromiter((float(w.get("start", 0.0)) for w in words), dtype=np.float64, count=count)
+    ends = np.fromiter((float(w.get("end", w.get("start", 0.0))) for w in words), dtype=np.float64, count=count)
+    order = np.argsort(starts, kind="stable")
+    return starts[order], np.maximum(ends[order], starts[order])
+
+
+def rolling_wpm(
+    starts: np.ndarray,
+    total_seconds: float,
+    window_seconds: float = PACE_WINDOW_SECONDS,
+    step_seconds: float = PACE_STEP_SECONDS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    슬라이딩 윈도우 WPM
+
+    Args:
+        starts: 정렬된 단어 시작 시각 배열
+        total_seconds: 전체 길이 (초)
+        window_seconds: 윈도우 길이
+        step_seconds: 윈도우 간격
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (윈도우 시작 시각, 윈도우 WPM)
+    """
+    window_seconds = min(window_seconds, max(total_seconds, step_seconds))
+    last = max(total_seconds - window_seconds, 0.0)
+    grid = np.arange(0.0, last + step_seconds / 2, step_seconds)
+    counts = np.searchsorted(starts, grid + window_seconds, side="left") - np.searchsorted(starts, grid, side="left")
+    return grid, counts * (60.0 / window_seconds)
+
+
+def _intervals(
+    mask: np.ndarray,
+    grid: np.ndarray,
+    wpm: np.ndarray,
+    window_seconds: float,
+    step_seconds: float,
+    min_seconds: float,
+) -> List[Dict[str, float]]:
+    """연속된 True 윈도우를 구간으로 변환 (구간 길이 = 윈도우 수 × 간격 + 윈도우 - 간격)"""
+    padded = np.concatenate([[False], mask, [False]])
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    first, stop = edges[0::2], edges[1::2]
+    if len(first) == 0:
+        return []
+
+    starts = grid[first]
+    ends = grid[stop - 1] + window_seconds
+    keep = (stop - first) * step_seconds >= min_seconds
+    sums = np.concatenate([[0.0], np.cumsum(wpm)])
+    means = (sums[stop] - sums[first]) / (stop - first)
+
+    return [
+        {"start": round(float(s), 1), "end": round(float(e), 1), "wpm": int(round(float(m)))}
+        for s, e, m in zip(starts[keep], ends[keep], means[keep])
+    ]
+
+
+def _longest(intervals: List[Dict[str, float]]) -> List[Dict[str, float]]:
+    ranked = sorted(intervals, key=lambda i: i["end"] - i["start"], reverse=True)[:MAX_REPORTED_INTERVALS]
+    return sorted(ranked, key=lambda i: i["start"])
+
+
+def _total_seconds(intervals: List[Dict[str, float]]) -> float:
+    return round(sum(i["end"] - i["start"] for i in intervals), 1)
+
+
+def analyze_pace_timeline(
+    words: Sequence[dict],
+    duration_seconds: Optional[float] = None,
+    window_seconds: float = PACE_WINDOW_SECONDS,
+    step_seconds: float = PACE_STEP_SECONDS,
+) -> Dict[str, Any]:
+    """
+    구간별 말 속도 분석
+
+    Args:
+        words: 단어 타임스탬프 목록 [{"word", "start", "end"}, ...]
+        duration_seconds: 오디오 길이 (없으면 마지막 단어 끝 시각)
+        window_seconds: 윈도우 길이
+        step_seconds: 윈도우 간격
+
+    Returns:
+        dict: 분석 결과
+            - wpm_p10 / wpm_median / wpm_p90: 윈도우 WPM 분포
+            - pace_variability: 윈도우 WPM 표준편차
+            - rush_intervals / stall_intervals: 빠른/느린 구간 (긴 순 최대 5개, 시간순)
+            - rush_count / stall_count, rush_seconds / stall_seconds: 전체 구간 수/길이
+            - pauses: 단어 사이 멈춤 통계 (VAD 통계와 같은 키)
+            - long_pauses: 긴 멈춤 구간 (긴 순 최대 5개)
+    """
+    starts, ends = word_times(words)
+    if len(starts) == 0:
+        return {}
+
+    total = float(duration_seconds or ends[-1])
+    total = max(total, float(ends[-1]))
+    grid, wpm = rolling_wpm(starts, total, window_seconds, step_seconds)
+    window = min(window_seconds, max(total, step_seconds))
+
+    rush = _intervals(wpm > RUSH_WPM, grid, wpm, window, step_seconds, MIN_EVENT_SECONDS)
+    stall = _intervals(wpm < STALL_WPM, grid, wpm, window, step_seconds, MIN_EVENT_SECONDS)
+
+    gaps = starts[1:] - ends[:-1]
+    pause_mask = gaps >= MIN_PAUSE_SECONDS
+    pause_lengths = gaps[pause_mask]
+    long_mask = gaps >= LONG_PAUSE_SECONDS
+    long_pauses = [
+        {"start": round(float(s), 1), "end": round(float(e), 1)}
+        for s, e in zip(ends[:-1][long_mask], starts[1:][long_mask])
+    ]
+
+    p10, median, p90 = np.percentile(wpm, [10, 50, 90])
+    return {
+        "wpm_p10": int(round(p10)),
+        "wpm_median": int(round(median)),
+        "wpm_p90": int(round(p90)),
+        "pace_variability": round(float(wpm.std()), 1),
+        "rush_intervals": _longest(rush),
+        "stall_intervals": _longest(stall),
+        "rush_count": len(rush),
+        "stall_count": len(stall),
+        "rush_seconds": _total_seconds(rush),
+        "stall_seconds": _total_seconds(stall),
+        "pauses": {
+            "pause_count": int(pause_mask.sum()),
+            "long_pause_count": int(long_mask.sum()),
+            "total_pause_seconds": round(float(pause_lengths.sum()), 1),
+            "mean_pause_seconds": round(float(pause_lengths.mean()), 2) if len(pause_lengths) else 0.0,
+            "longest_pause_seconds": round(float(pause_lengths.max()), 1) if len(pause_lengths) else 0.0,
+        },
+        "long_pauses": _longest(long_pauses),
+    }
@@ -16,6 +16,43 @@ from .audio import (
     cleanup_temp_file,
     validate_audio_duration,
     format_duration,
+    preprocess_audio,
+    PreprocessedAudio,
+    AudioChunk,
+)
+from .resilience import (
+    RetryPolicy,
+    CircuitBreaker,
+    CircuitOpenError,
+    UpstreamHTTPError,
+    call_with_retry,
+    hedged,
+    classify_error,
+    provider_slot,
+)
+from .transcription import (
+    TranscriptionResult,
+    stitch_transcripts,
+    transcribe_chunks,
+)
+from .documents import (
+    DocumentChunk,
+    extract_chunks,
+    merge_extractions,
+    split_documents,
+)
+from .retrieval import (
+    BM25Index,
+    load_or_build_index,
+    tokenize,
+)
+from .cache import LRUCache
+from .deadline import (
+    Deadline,
+    DeadlineExceeded,
+    get_deadline,
+    remaining_timeout,
+    should_degrade,
 )
 
 __all__ = [
@@ -33,4 +70,43 @@ __all__ = [
     "cleanup_temp_file",
     "validate_audio_duration",
     "format_duration",
+    "preprocess_audio",
+    "PreprocessedAudio",
+    "AudioChunk",
+    
+    # Resilience
+    "RetryPolicy",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "UpstreamHTTPError",
+    "call_with_retry",
+    "hedged",
+    "classify_error",
+    "provider_slot",
+    
+    # Transcription
+    "TranscriptionResult",
+    "stitch_transcripts",
+    "transcribe_chunks",
+    
+    # Documents
+    "DocumentChunk",
+    "extract_chunks",
+    "merge_extractions",
+    "split_documents",
+    
+    # Retrieval
+    "BM25Index",
+    "load_or_build_index",
+    "tokenize",
+    
+    # Cache
+    "LRUCache",
+    
+    # Deadline
+    "Deadline",
+    "DeadlineExceeded",
+    "get_deadline",
+    "remaining_timeout",
+    "should_degrade",
 ]
@@ -2,14 +2,48 @@
 오디오 처리 유틸리티
 
 오디오 파일의 다운로드, 포맷 변환, 메타데이터 추출 등을 처리합니다.
+
+## 전처리 (Whisper 업로드 전)
+
+브라우저 녹음은 보통 스테레오 48kHz WAV 또는 고비트레이트 WebM입니다.
+Whisper는 16kHz 모노로 다시 샘플링해서 인식하므로, 업로드 전에
+모노 16kHz 저비트레이트(Opus/MP3)로 변환해도 인식 품질은 같고 업로드 크기만 줄어듭니다.
+
+- 변환은 CPU 작업이므로 프로세스 풀에서 실행합니다 (이벤트 루프 블로킹 방지).
+- 변환 결과가 원본보다 작을 때만 사용합니다.
+- ffmpeg가 없거나 디코딩에 실패하면 원본을 그대로 업로드합니다.
+
+## 음성 구간 검출 (VAD)
+
+디코딩한 PCM의 프레임 에너지(NumPy 벡터 연산)로 말하는 구간과 멈춤을 찾습니다.
+
+- 앞/뒤 무음을 잘라 Whisper 업로드·과금 길이를 줄입니다 (`AUDIO_VAD_TRIM`).
+- 선택적으로 긴 중간 무음을 지정 길이로 줄입니다 (`AUDIO_VAD_COLLAPSE_SECONDS`).
+- 멈춤 횟수/길이 통계를 분석 지표(AnalysisMetrics)로 전달합니다.
+
+## 긴 녹음 분할
+
+`STT_CHUNK_THRESHOLD_SECONDS`보다 길거나 인코딩 결과가 Whisper 업로드 한도(25MB)를 넘으면
+무음 구간에서 잘라 앞뒤가 조금씩 겹치는 조각(AudioChunk)으로 나눕니다.
+조각 전사와 이어 붙이기는 `transcription.py`에서 처리합니다.
 """
 
+import asyncio
 import httpx
+import io
 import tempfile
 import os
-from typing import Optional, Tuple
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
 from urllib.parse import urlparse
 
+import numpy as np
+
+from .audio_probe import PROBE_HEAD_BYTES, PROBE_TAIL_BYTES, probe_duration
+from .resilience import call_with_retry, UpstreamHTTPError
+
 
 # 지원하는 오디오 포맷
 SUPPORTED_FORMATS = {
@@ -22,6 +56,10 @@ SUPPORTED_FORMATS = {
     ".flac": "audio/flac",
 }
 
+# 분석 가능한 녹음 길이 (프론트엔드 녹음 상한 300초 + 인코더 패딩 여유)
+MIN_AUDIO_SECONDS = 5.0
+MAX_AUDIO_SECONDS = float(os.getenv("AUDIO_MAX_SECONDS", "305"))
+
 
 async def download_audio(url: str, timeout: float = 30.0) -> Tuple[bytes, str]:
     """
@@ -38,24 +76,32 @@ async def download_audio(url: str, timeout: float = 30.0) -> Tuple[bytes, str]:
         ValueError: 다운로드 실패 또는 지원하지 않는 포맷
     """
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, follow_redirects=True, timeout=timeout)
+    async def fetch() -> httpx.Response:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url, follow_redirects=True, timeout=timeout)
         
         if response.status_code != 200:
-            raise ValueError(f"Failed to download audio: HTTP {response.status_code}")
-        
-        # 확장자 추출
-        extension = get_extension_from_url(url)
-        
-        if not extension:
-            # URL에서 추출 실패 시 Content-Type에서 추론
-            content_type = response.headers.get("content-type", "")
-            extension = get_extension_from_content_type(content_type)
-        
-        if extension not in SUPPORTED_FORMATS:
-            raise ValueError(f"Unsupported audio format: {extension}")
-        
-        return response.content, extension
+            raise UpstreamHTTPError(
+                f"Failed to download audio: HTTP {response.status_code}",
+                status_code=response.status_code,
+                headers=response.headers,
+            )
+        return response
+    
+    response = await call_with_retry("storage", fetch)
+    
+    # 확장자 추출
+    extension = get_extension_from_url(url)
+    
+    if not extension:
+        # URL에서 추출 실패 시 Content-Type에서 추론
+        content_type = response.headers.get("content-type", "")
+        extension = get_extension_from_content_type(content_type)
+    
+    if extension not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported audio format: {extension}")
+    
+    return response.content, extension
 
 
 def get_extension_from_url(url: str) -> Optional[str]:
@@ -122,19 +168,23 @@ def cleanup_temp_file(path: str) -> None:
 
 def get_audio_duration_estimate(data: bytes, extension: str) -> Optional[float]:
     """
-    오디오 길이 추정 (간단한 방법)
+    오디오 길이 계산
     
-    정확한 길이는 ffprobe 같은 도구가 필요하지만,
-    대략적인 추정을 위한 간단한 계산입니다.
+    컨테이너 헤더를 파싱해 정확한 길이를 구하고 (audio_probe),
+    헤더에 길이 정보가 없는 경우에만 파일 크기와 평균 비트레이트로 추정합니다.
     
     Args:
         data: 오디오 데이터
         extension: 파일 확장자
     
     Returns:
-        Optional[float]: 추정 길이 (초), 계산 불가 시 None
+        Optional[float]: 길이 (초), 계산 불가 시 None
     """
     
+    _, duration = probe_duration(data[:PROBE_HEAD_BYTES], data[-PROBE_TAIL_BYTES:], len(data))
+    if duration is not None:
+        return round(duration, 1)
+    
     # 평균 비트레이트 기반 추정 (매우 대략적)
     bitrate_estimates = {
         ".mp3": 128000,   # 128 kbps
@@ -155,13 +205,18 @@ def get_audio_duration_estimate(data: bytes, extension: str) -> Optional[float]:
     return round(duration, 1)
 
 
-def validate_audio_duration(duration: Optional[float], min_seconds: float = 5.0) -> bool:
+def validate_audio_duration(
+    duration: Optional[float],
+    min_seconds: float = MIN_AUDIO_SECONDS,
+    max_seconds: Optional[float] = None,
+) -> bool:
     """
     오디오 길이 유효성 검증
     
     Args:
         duration: 오디오 길이 (초)
         min_seconds: 최소 길이 (기본 5초)
+        max_seconds: 최대 길이 (None이면 제한 없음)
     
     Returns:
         bool: 유효 여부
@@ -170,9 +225,32 @@ def validate_audio_duration(duration: Optional[float], min_seconds: float = 5.0)
     if duration is None:
         return True  # 길이를 모르면 일단 통과
     
+    if max_seconds is not None and duration > max_seconds:
+        return False
+    
     return duration >= min_seconds
 
 
+def ensure_audio_duration(duration: Optional[float]) -> None:
+    """
+    오디오 길이가 허용 범위(MIN_AUDIO_SECONDS ~ MAX_AUDIO_SECONDS)인지 확인
+    
+    Raises:
+        ValueError: 너무 짧거나 긴 경우 (길이를 모르면 통과)
+    """
+    
+    if duration is None:
+        return
+    if duration < MIN_AUDIO_SECONDS:
+        raise ValueError(
+            f"Audio is too short ({duration:.1f}s). Minimum {MIN_AUDIO_SECONDS:.0f} seconds required."
+        )
+    if duration > MAX_AUDIO_SECONDS:
+        raise ValueError(
+            f"Audio is too long ({duration:.1f}s). Maximum {MAX_AUDIO_SECONDS:.0f} seconds allowed."
+        )
+
+
 def format_duration(seconds: float) -> str:
     """
     초를 사람이 읽기 쉬운 형식으로 변환
@@ -191,3 +269,625 @@ def format_duration(seconds: float) -> str:
         return f"{minutes}분 {remaining_seconds}초"
     else:
         return f"{remaining_seconds}초"
+
+
+# ============================================
+# Whisper 업로드 전처리
+# ============================================
+
+# Whisper 내부 처리 포맷과 동일 (더 높여도 인식 품질 향상 없음)
+TARGET_SAMPLE_RATE = 16000
+TARGET_CHANNELS = 1
+
+# 인코딩 후보 (앞에서부터 시도, 성공하고 Whisper 한도 안이면 바로 사용)
+# (확장자, pydub export format, codec, bitrate)
+ENCODING_CANDIDATES: List[Tuple[str, str, Optional[str], Optional[str]]] = [
+    (".webm", "webm", "libopus", "24k"),
+    (".mp3", "mp3", None, "32k"),
+    # ffmpeg 없이도 가능한 마지막 수단 (WAV 입력만 디코딩 가능)
+    (".wav", "wav", None, None),
+]
+
+# 이보다 작은 파일은 재인코딩 이득이 작음 (멈춤 통계만 계산)
+PREPROCESS_MIN_BYTES = int(os.getenv("AUDIO_PREPROCESS_MIN_BYTES", str(256 * 1024)))
+PREPROCESS_WORKERS = int(os.getenv("AUDIO_PREPROCESS_WORKERS", "2"))
+
+_preprocess_executor: Optional[ProcessPoolExecutor] = None
+
+
+class PreprocessedAudio:
+    """
+    전처리 결과
+
+    Attributes:
+        data: 업로드할 오디오 데이터
+        extension: 업로드할 파일 확장자
+        original_size: 원본 크기 (bytes)
+        elapsed: 변환 소요 시간 (초)
+        applied: 변환 결과를 사용했는지 여부 (False면 원본 그대로)
+        reason: 원본을 사용한 이유 (applied=False일 때)
+        voice_activity: 멈춤 통계 (VoiceActivity.pause_stats, 디코딩 실패 시 None)
+        trimmed_seconds: 앞/뒤에서 잘라낸 무음 길이 (초)
+        collapsed_seconds: 중간 무음을 줄여 제거한 길이 (초)
+        chunks: 긴 녹음을 나눈 조각 (있으면 data 대신 조각별로 전사)
+    """
+
+    def __init__(
+        self,
+        data: bytes,
+        extension: str,
+        original_size: int,
+        elapsed: float = 0.0,
+        applied: bool = False,
+        reason: str = "",
+        voice_activity: Optional[dict] = None,
+        trimmed_seconds: float = 0.0,
+        collapsed_seconds: float = 0.0,
+        chunks: Optional[List["AudioChunk"]] = None,
+    ):
+        self.data = data
+        self.extension = extension
+        self.original_size = original_size
+        self.elapsed = elapsed
+        self.applied = applied
+        self.reason = reason
+        self.voice_activity = voice_activity
+        self.trimmed_seconds = trimmed_seconds
+        self.collapsed_seconds = collapsed_seconds
+        self.chunks = chunks
+
+    @property
+    def size(self) -> int:
+        """업로드 크기 (분할한 경우 조각 합계)"""
+        if self.chunks:
+            return sum(len(chunk.data) for chunk in self.chunks)
+        return len(self.data)
+
+    @property
+    def ratio(self) -> float:
+        """원본 대비 크기 비율 (0.1이면 90% 감소)"""
+        return self.size / self.original_size if self.original_size else 1.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<PreprocessedAudio {self.extension} {self.original_size}B -> {self.size}B "
+            f"applied={self.applied} chunks={len(self.chunks or [])} elapsed={self.elapsed:.2f}s>"
+        )
+
+
+def preprocess_audio_sync(data: bytes, extension: str, reencode: bool = True) -> PreprocessedAudio:
+    """
+    오디오를 모노 16kHz 저비트레이트로 변환 (동기, 프로세스 풀에서 실행)
+
+    디코딩한 PCM으로 음성 구간을 검출해 앞/뒤 무음을 자르고 멈춤 통계를 계산합니다.
+
+    Args:
+        data: 원본 오디오 데이터
+        extension: 원본 확장자 (.wav, .webm 등)
+        reencode: False면 멈춤 통계만 계산하고 원본을 그대로 사용
+
+    Returns:
+        PreprocessedAudio: 변환 결과 (원본보다 작지 않으면 원본 그대로)
+    """
+    started = time.perf_counter()
+    original = PreprocessedAudio(data, extension, len(data))
+
+    try:
+        samples = decode_pcm(data, extension)
+    except Exception as e:
+        original.reason = f"decode failed: {e}"
+        original.elapsed = time.perf_counter() - started
+        return original
+
+    activity = detect_voice_activity(samples, TARGET_SAMPLE_RATE)
+    original.voice_activity = activity.pause_stats()
+
+    if not reencode:
+        original.reason = "small file"
+        original.elapsed = time.perf_counter() - started
+        return original
+
+    trimmed_seconds = collapsed_seconds = 0.0
+    if activity.has_speech:
+        samples, trimmed_seconds, collapsed_seconds = apply_voice_activity(
+            samples,
+            activity,
+            trim=VAD_TRIM,
+            collapse_over=VAD_COLLAPSE_SECONDS or None,
+        )
+
+    # 긴 녹음은 통째로 인코딩하지 않고 바로 분할
+    chunks = None
+    best = None
+    if len(samples) / TARGET_SAMPLE_RATE > STT_CHUNK_THRESHOLD_SECONDS:
+        chunks = split_into_chunks(samples, chunk_seconds=STT_CHUNK_SECONDS)
+    else:
+        best = encode_samples(samples)
+        if best is not None and len(best[0]) > WHISPER_MAX_BYTES:
+            chunks = split_into_chunks(samples, chunk_seconds=STT_CHUNK_SECONDS)
+
+    elapsed = time.perf_counter() - started
+    if chunks:
+        return PreprocessedAudio(
+            data,
+            extension,
+            len(data),
+            elapsed=elapsed,
+            applied=True,
+            voice_activity=original.voice_activity,
+            trimmed_seconds=trimmed_seconds,
+            collapsed_seconds=collapsed_seconds,
+            chunks=chunks,
+        )
+
+    if best is None or len(best[0]) >= len(data):
+        original.reason = "no smaller encoding"
+        original.elapsed = elapsed
+        return original
+
+    return PreprocessedAudio(
+        best[0],
+        best[1],
+        len(data),
+        elapsed=elapsed,
+        applied=True,
+        voice_activity=original.voice_activity,
+        trimmed_seconds=trimmed_seconds,
+        collapsed_seconds=collapsed_seconds,
+    )
+
+
+def encode_samples(samples: np.ndarray) -> Optional[Tuple[bytes, str]]:
+    """
+    모노 16kHz PCM을 후보 포맷 순서대로 인코딩
+
+    압축 포맷이 성공하고 WHISPER_MAX_BYTES 안이면 뒤 후보는 인코딩하지 않습니다. (요청 경로 CPU 절약)
+    모두 한도를 넘으면 그중 가장 작은 결과를, 압축 포맷이 모두 실패하면(ffmpeg 없음) WAV를 반환합니다.
+
+    Returns:
+        Optional[Tuple[bytes, str]]: (인코딩 데이터, 확장자), 모든 후보 실패 시 None
+    """
+    from pydub import AudioSegment
+
+    segment = AudioSegment(
+        samples.tobytes(),
+        frame_rate=TARGET_SAMPLE_RATE,
+        sample_width=2,
+        channels=TARGET_CHANNELS,
+    )
+
+    smallest: Optional[Tuple[bytes, str]] = None
+    for candidate_ext, fmt, codec, bitrate in ENCODING_CANDIDATES:
+        if fmt == "wav" and smallest is not None:
+            # 압축 결과가 한도를 넘었다면 WAV는 더 크므로 인코딩하지 않음 (호출 측이 분할)
+            break
+        try:
+            buffer = io.BytesIO()
+            segment.export(buffer, format=fmt, codec=codec, bitrate=bitrate)
+        except Exception:
+            # ffmpeg 미설치 또는 코덱 미지원 → 다음 후보
+            continue
+        encoded = buffer.getvalue()
+        if fmt != "wav" and len(encoded) <= WHISPER_MAX_BYTES:
+            return encoded, candidate_ext
+        if smallest is None or len(encoded) < len(smallest[0]):
+            smallest = (encoded, candidate_ext)
+    return smallest
+
+
+def _get_preprocess_executor() -> ProcessPoolExecutor:
+    global _preprocess_executor
+    if _preprocess_executor is None:
+        _preprocess_executor = ProcessPoolExecutor(max_workers=PREPROCESS_WORKERS)
+    return _preprocess_executor
+
+
+def shutdown_preprocess_executor() -> None:
+    """전처리 프로세스 풀 종료 (서버/워커 종료 시)"""
+    global _preprocess_executor
+    if _preprocess_executor is not None:
+        _preprocess_executor.shutdown(wait=False, cancel_futures=True)
+        _preprocess_executor = None
+
+
+async def preprocess_audio(
+    data: bytes,
+    extension: str,
+    min_bytes: Optional[int] = None,
+) -> PreprocessedAudio:
+    """
+    Whisper 업로드 전 오디오 전처리 (프로세스 풀에서 실행)
+
+    `AUDIO_PREPROCESS=0` 이면 변환하지 않습니다.
+    변환 중 에러가 나도 예외를 던지지 않고 원본을 반환합니다.
+
+    Args:
+        data: 원본 오디오 데이터
+        extension: 원본 확장자
+        min_bytes: 이보다 작으면 재인코딩 생략 (기본 AUDIO_PREPROCESS_MIN_BYTES)
+
+    Returns:
+        PreprocessedAudio: 업로드할 오디오
+    """
+    min_bytes = PREPROCESS_MIN_BYTES if min_bytes is None else min_bytes
+
+    if os.getenv("AUDIO_PREPROCESS", "1") == "0":
+        return PreprocessedAudio(data, extension, len(data), reason="disabled")
+
+    # 작은 파일은 재인코딩 없이 멈춤 통계만 계산
+    reencode = len(data) >= min_bytes
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            _get_preprocess_executor(), preprocess_audio_sync, data, extension, reencode
+        )
+    except BrokenProcessPool as e:
+        # 워커 프로세스가 죽은 풀은 재사용 불가 → 다음 요청에서 새로 생성
+        shutdown_preprocess_executor()
+        print(f"[audio] preprocess pool broken, uploading original: {e}")
+        return PreprocessedAudio(data, extension, len(data), reason="executor broken")
+    except Exception as e:
+        print(f"[audio] preprocess failed, uploading original: {e}")
+        return PreprocessedAudio(data, extension, len(data), reason=f"executor error: {e}")
+
+
+# ============================================
+# 음성 구간 검출 (VAD) / 멈춤 통계
+# ============================================
+
+VAD_FRAME_MS = 30
+# 말소리 사이의 짧은 끊김(파열음, 숨)은 멈춤으로 보지 않음
+VAD_MIN_PAUSE_SECONDS = 0.25
+# 이보다 짧은 소리(클릭, 잡음)는 말소리로 보지 않음
+VAD_MIN_SPEECH_SECONDS = 0.09
+# 청중이 "길다"고 느끼는 멈춤
+VAD_LONG_PAUSE_SECONDS = 2.0
+# 잘라낸 경계 앞뒤로 남겨 둘 여유 (첫 음절이 잘리지 않도록)
+VAD_PADDING_SECONDS = 0.2
+# 노이즈 바닥 대비 임계값 여유 (dB) 및 절대 하한 (dBFS)
+VAD_MIN_MARGIN_DB = 6.0
+VAD_MAX_MARGIN_DB = 12.0
+VAD_FLOOR_DB = -60.0
+
+VAD_TRIM = os.getenv("AUDIO_VAD_TRIM", "1") != "0"
+# 0이면 중간 무음을 줄이지 않음 (예: 2.0 → 2초보다 긴 멈춤을 2초로)
+VAD_COLLAPSE_SECONDS = float(os.getenv("AUDIO_VAD_COLLAPSE_SECONDS", "0"))
+
+
+def decode_pcm(data: bytes, extension: str, sample_rate: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """
+    오디오를 모노 16bit PCM으로 디코딩
+
+    Args:
+        data: 오디오 데이터
+        extension: 파일 확장자
+        sample_rate: 출력 샘플레이트
+
+    Returns:
+        np.ndarray: int16 샘플 배열
+
+    Raises:
+        Exception: 디코딩 실패 (ffmpeg 미설치 시 WAV 외 포맷)
+    """
+    from pydub import AudioSegment
+
+    segment = AudioSegment.from_file(io.BytesIO(data), format=extension.lstrip("."))
+    segment = segment.set_channels(1).set_frame_rate(sample_rate).set_sample_width(2)
+    return np.frombuffer(segment.raw_data, dtype="<i2")
+
+
+def frame_energies(samples: np.ndarray, sample_rate: int, frame_ms: int = VAD_FRAME_MS) -> np.ndarray:
+    """프레임별 RMS 에너지 (dBFS)"""
+    frame_length = sample_rate * frame_ms // 1000
+    count = len(samples) // frame_length
+    if count == 0:
+        return np.empty(0, dtype=np.float32)
+
+    frames = samples[:count * frame_length].reshape(count, frame_length).astype(np.float32) / 32768.0
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame_length)
+    return 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """연속 구간 (시작, 끝, 값)"""
+    changes = np.flatnonzero(np.diff(mask.astype(np.int8))) + 1
+    starts = np.concatenate(([0], changes))
+    ends = np.concatenate((changes, [len(mask)]))
+    return starts, ends, mask[starts]
+
+
+class VoiceActivity:
+    """
+    음성 구간 검출 결과
+
+    Attributes:
+        speech: 프레임별 말소리 여부 (bool 배열)
+        frame_length: 프레임당 샘플 수
+        frame_seconds: 프레임 길이 (초)
+        threshold_db: 사용한 에너지 임계값 (dBFS)
+        total_seconds: 전체 길이 (초)
+    """
+
+    def __init__(
+        self,
+        speech: np.ndarray,
+        frame_length: int,
+        frame_seconds: float,
+        threshold_db: float,
+        total_seconds: float,
+    ):
+        self.speech = speech
+        self.frame_length = frame_length
+        self.frame_seconds = frame_seconds
+        self.threshold_db = threshold_db
+        self.total_seconds = total_seconds
+
+        starts, ends, values = _runs(speech) if len(speech) else (np.empty(0, int),) * 3
+        self._starts, self._ends, self._values = starts, ends, values
+
+    @property
+    def has_speech(self) -> bool:
+        return bool(self.speech.any())
+
+    @property
+    def speech_bounds(self) -> Tuple[int, int]:
+        """첫 말소리 프레임, 마지막 말소리 프레임 + 1"""
+        indices = np.flatnonzero(self.speech)
+        return int(indices[0]), int(indices[-1]) + 1
+
+    def pauses(self) -> np.ndarray:
+        """말소리 사이 멈춤 구간 (프레임 시작, 끝) - 앞/뒤 무음 제외"""
+        internal = ~self._values.astype(bool)
+        if len(internal):
+            internal[0] = internal[-1] = False
+        return np.stack([self._starts[internal], self._ends[internal]], axis=1)
+
+    def pause_stats(self) -> dict:
+        """
+        멈춤 통계 (AnalysisMetrics에 포함)
+
+        Returns:
+            dict: pause_count, long_pause_count, total_pause_seconds,
+                  mean_pause_seconds, longest_pause_seconds
+        """
+        pauses = self.pauses()
+        lengths = (pauses[:, 1] - pauses[:, 0]) * self.frame_seconds if len(pauses) else np.empty(0)
+        return {
+            "pause_count": int(len(lengths)),
+            "long_pause_count": int((lengths >= VAD_LONG_PAUSE_SECONDS).sum()),
+            "total_pause_seconds": round(float(lengths.sum()), 2),
+            "mean_pause_seconds": round(float(lengths.mean()), 2) if len(lengths) else 0.0,
+            "longest_pause_seconds": round(float(lengths.max()), 2) if len(lengths) else 0.0,
+        }
+
+
+def detect_voice_activity(
+    samples: np.ndarray,
+    sample_rate: int,
+    frame_ms: int = VAD_FRAME_MS,
+) -> VoiceActivity:
+    """
+    에너지 기반 음성 구간 검출
+
+    노이즈 바닥(하위 10% 프레임)과 말소리 크기(상위 5% 프레임)의 차이로
+    임계값을 정하므로 녹음 볼륨/환경 소음이 달라도 동작합니다.
+
+    Args:
+        samples: int16 PCM 샘플
+        sample_rate: 샘플레이트
+        frame_ms: 프레임 길이 (ms)
+
+    Returns:
+        VoiceActivity: 프레임별 말소리 여부와 멈춤 정보
+    """
+    frame_length = sample_rate * frame_ms // 1000
+    frame_seconds = frame_length / sample_rate
+    energies = frame_energies(samples, sample_rate, frame_ms)
+    total_seconds = len(samples) / sample_rate
+    if len(energies) == 0:
+        return VoiceActivity(np.zeros(0, dtype=bool), frame_length, frame_seconds, VAD_FLOOR_DB, total_seconds)
+
+    noise, peak = np.percentile(energies, [10, 95])
+    margin = np.clip((peak - noise) / 2, VAD_MIN_MARGIN_DB, VAD_MAX_MARGIN_DB)
+    threshold = max(float(noise + margin), VAD_FLOOR_DB)
+    speech = energies > threshold
+
+    # 1) 너무 짧은 소리 제거
+    starts, ends, values = _runs(speech)
+    lengths = ends - starts
+    values = values & (lengths * frame_seconds >= VAD_MIN_SPEECH_SECONDS)
+    speech = np.repeat(values, lengths)
+
+    # 2) 말소리 사이의 짧은 끊김 메우기 (앞/뒤 무음은 유지)
+    starts, ends, values = _runs(speech)
+    lengths = ends - starts
+    short_gap = ~values & (lengths * frame_seconds < VAD_MIN_PAUSE_SECONDS)
+    short_gap[0] = short_gap[-1] = False
+    values = values | short_gap
+    speech = np.repeat(values, lengths)
+
+    return VoiceActivity(speech, frame_length, frame_seconds, threshold, total_seconds)
+
+
+def apply_voice_activity(
+    samples: np.ndarray,
+    activity: VoiceActivity,
+    trim: bool = True,
+    collapse_over: Optional[float] = None,
+    padding: float = VAD_PADDING_SECONDS,
+) -> Tuple[np.ndarray, float, float]:
+    """
+    앞/뒤 무음 제거, 긴 중간 무음 축소
+
+    Args:
+        samples: int16 PCM 샘플
+        activity: detect_voice_activity 결과
+        trim: 앞/뒤 무음 제거 여부
+        collapse_over: 이보다 긴 멈춤을 이 길이로 줄임 (None이면 유지)
+        padding: 잘라낸 경계 앞뒤 여유 (초)
+
+    Returns:
+        Tuple[np.ndarray, float, float]: (샘플, 앞/뒤 제거 길이, 중간 축소 길이)
+    """
+    frames = len(activity.speech)
+    if frames == 0 or not activity.has_speech:
+        return samples, 0.0, 0.0
+
+    keep = np.ones(frames, dtype=bool)
+
+    if trim:
+        pad = int(padding / activity.frame_seconds)
+        first, last = activity.speech_bounds
+        keep[:max(first - pad, 0)] = False
+        keep[min(last + pad, frames):] = False
+
+    collapsed_frames = 0
+    if collapse_over:
+        limit = int(collapse_over / activity.frame_seconds)
+        for start, end in activity.pauses():
+            excess = (end - start) - limit
+            if excess > 0:
+                # 멈춤 앞뒤는 남기고 가운데를 제거
+                cut = start + limit // 2
+                keep[cut:cut + excess] = False
+                collapsed_frames += excess
+
+    # 마지막 프레임 뒤의 남는 샘플은 마지막 프레임과 같이 처리
+    sample_keep = np.repeat(keep, activity.frame_length)
+    remainder = len(samples) - len(sample_keep)
+    if remainder > 0:
+        sample_keep = np.concatenate((sample_keep, np.full(remainder, keep[-1])))
+
+    collapsed_seconds = collapsed_frames * activity.frame_seconds
+    removed_seconds = (len(samples) - int(sample_keep.sum())) / len(samples) * activity.total_seconds
+    trimmed_seconds = max(removed_seconds - collapsed_seconds, 0.0)
+    return samples[sample_keep], round(trimmed_seconds, 2), round(collapsed_seconds, 2)
+
+
+# ============================================
+# 긴 녹음 분할 (Chunked STT)
+# ============================================
+
+# Whisper 업로드 한도 25MB (multipart 오버헤드 여유)
+WHISPER_MAX_BYTES = 24 * 1024 * 1024
+# 이보다 긴 녹음은 나눠서 동시에 전사 (Whisper 지연 시간은 길이에 비례)
+STT_CHUNK_THRESHOLD_SECONDS = float(os.getenv("STT_CHUNK_THRESHOLD_SECONDS", "120"))
+STT_CHUNK_SECONDS = float(os.getenv("STT_CHUNK_SECONDS", "60"))
+# 경계에서 잘린 단어를 양쪽 조각이 모두 듣도록 겹치는 길이
+STT_CHUNK_OVERLAP_SECONDS = 1.0
+# 목표 경계 앞쪽에서 자를 무음 구간을 찾는 범위
+STT_CUT_SEARCH_SECONDS = 10.0
+
+
+class AudioChunk:
+    """
+    분할 전사용 오디오 조각
+
+    시간은 모두 업로드 오디오(무음 제거 후) 기준 초 단위입니다.
+
+    Attributes:
+        index: 조각 순서
+        data: 인코딩된 오디오
+        extension: 파일 확장자
+        start / end: 조각에 담긴 구간 (겹침 포함)
+        keep_start / keep_end: 이 조각이 책임지는 구간 (겹침 제외, 조각끼리 맞닿음)
+    """
+
+    def __init__(
+        self,
+        index: int,
+        data: bytes,
+        extension: str,
+        start: float,
+        end: float,
+        keep_start: float,
+        keep_end: float,
+    ):
+        self.index = index
+        self.data = data
+        self.extension = extension
+        self.start = start
+        self.end = end
+        self.keep_start = keep_start
+        self.keep_end = keep_end
+
+    def __repr__(self) -> str:
+        return (
+            f"<AudioChunk #{self.index} {self.keep_start:.1f}-{self.keep_end:.1f}s "
+            f"(upload {self.start:.1f}-{self.end:.1f}s, {len(self.data)}B)>"
+        )
+
+
+def plan_chunks(
+    total_seconds: float,
+    pauses: np.ndarray,
+    chunk_seconds: float = STT_CHUNK_SECONDS,
+    search_seconds: float = STT_CUT_SEARCH_SECONDS,
+) -> List[Tuple[float, float]]:
+    """
+    조각 경계 계획
+
+    목표 길이 직전 search_seconds 안의 충분히 긴 멈춤(가장 긴 멈춤의 절반 이상) 중
+    목표에 가장 가까운 멈춤의 가운데에서 자릅니다.
+    멈춤이 없으면 목표 길이에서 그대로 자릅니다 (겹침 구간이 잘린 단어를 보완).
+    마지막 조각이 너무 짧아지지 않도록 남은 길이가 1.25배 이하면 합칩니다.
+
+    Args:
+        total_seconds: 전체 길이 (초)
+        pauses: 멈춤 구간 배열 [[시작초, 끝초], ...]
+        chunk_seconds: 목표 조각 길이
+        search_seconds: 자를 위치 탐색 범위
+
+    Returns:
+        List[Tuple[float, float]]: 조각별 (keep_start, keep_end)
+    """
+    pauses = np.asarray(pauses, dtype=np.float64).reshape(-1, 2)
+    middles = pauses.mean(axis=1)
+    lengths = pauses[:, 1] - pauses[:, 0]
+
+    cuts = [0.0]
+    while total_seconds - cuts[-1] > chunk_seconds * 1.25:
+        target = cuts[-1] + chunk_seconds
+        candidates = (middles >= target - search_seconds) & (middles <= target)
+        if candidates.any():
+            long_enough = candidates & (lengths >= lengths[candidates].max() / 2)
+            cut = float(middles[long_enough].max())
+        else:
+            cut = target
+        cuts.append(cut)
+    cuts.append(total_seconds)
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+def split_into_chunks(
+    samples: np.ndarray,
+    sample_rate: int = TARGET_SAMPLE_RATE,
+    chunk_seconds: float = STT_CHUNK_SECONDS,
+    overlap_seconds: float = STT_CHUNK_OVERLAP_SECONDS,
+) -> List[AudioChunk]:
+    """
+    무음 경계에서 겹치는 조각으로 분할 후 인코딩
+
+    Args:
+        samples: 모노 int16 PCM (업로드할 오디오)
+        sample_rate: 샘플레이트
+        chunk_seconds: 목표 조각 길이
+        overlap_seconds: 조각 앞뒤로 겹치는 길이
+
+    Returns:
+        List[AudioChunk]: 순서대로 정렬된 조각
+    """
+    total_seconds = len(samples) / sample_rate
+    activity = detect_voice_activity(samples, sample_rate)
+    pauses = activity.pauses() * activity.frame_seconds
+
+    chunks = []
+    for index, (keep_start, keep_end) in enumerate(plan_chunks(total_seconds, pauses, chunk_seconds)):
+        start = max(keep_start - overlap_seconds, 0.0)
+        end = min(keep_end + overlap_seconds, total_seconds)
+        encoded = encode_samples(samples[int(start * sample_rate):int(end * sample_rate)])
+        if encoded is None:
+            raise ValueError("Failed to encode audio chunk")
+        chunks.append(AudioChunk(index, encoded[0], encoded[1], start, end, keep_start, keep_end))
+    return chunks
@@ -0,0 +1,660 @@
+"""
+오디오 길이 프로브 (컨테이너 헤더 파싱)
+
+파일 전체를 디코딩하지 않고 앞/뒤 몇 KB의 헤더만 읽어 정확한 재생 길이를 구합니다.
+Whisper 호출(과금) 전에, 가능하면 다운로드 전에 너무 짧거나 긴 녹음을 거절하기 위해 사용합니다.
+
+## 지원 포맷
+
+| 포맷 | 길이 정보 위치 |
+|------|---------------|
+| WAV | RIFF `fmt ` 청크의 byte rate + `data` 청크 크기 |
+| MP3 | Xing/Info/VBRI 헤더의 프레임 수, 없으면 첫 프레임 비트레이트(CBR) |
+| MP4/M4A | `moov` → `mvhd`의 timescale / duration |
+| WebM/Matroska | Segment Info의 `Duration`, 없으면(MediaRecorder) 마지막 Cluster의 블록 타임코드 |
+| Ogg (Opus/Vorbis) | 첫 페이지 식별 헤더의 샘플레이트 + 마지막 페이지의 granule position |
+| FLAC | STREAMINFO의 총 샘플 수 |
+
+## 원격 프로브
+
+HTTP Range 요청으로 앞부분(`bytes=0-65535`)을 받고, 필요하면 뒷부분(`bytes=-65536`)을 받습니다.
+서버가 Range를 지원하지 않아 전체 본문이 오면 그대로 돌려주어 다시 다운로드하지 않도록 합니다.
+"""
+
+import re
+import struct
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import httpx
+
+from .deadline import CALL_TIMEOUTS, Deadline, remaining_timeout
+from .resilience import call_with_retry, UpstreamHTTPError
+
+
+# 원격 프로브에서 읽는 앞/뒤 크기
+PROBE_HEAD_BYTES = 64 * 1024
+PROBE_TAIL_BYTES = 64 * 1024
+
+
+class AudioProbe:
+    """
+    프로브 결과
+
+    Attributes:
+        format: 감지된 컨테이너 포맷 (wav, mp3, mp4, webm, ogg, flac) 또는 None
+        duration: 재생 길이 (초), 알 수 없으면 None
+        total_size: 전체 파일 크기 (bytes), 알 수 없으면 None
+        bytes_read: 프로브에 사용한 바이트 수
+        content_type: 서버가 알려준 Content-Type (원격 프로브)
+        data: 서버가 Range를 무시하고 전체 본문을 보낸 경우 그 본문
+        elapsed: 프로브 소요 시간 (초)
+    """
+
+    def __init__(
+        self,
+        format: Optional[str] = None,
+        duration: Optional[float] = None,
+        total_size: Optional[int] = None,
+        bytes_read: int = 0,
+        content_type: str = "",
+        data: Optional[bytes] = None,
+        elapsed: float = 0.0,
+    ):
+        self.format = format
+        self.duration = duration
+        self.total_size = total_size
+        self.bytes_read = bytes_read
+        self.content_type = content_type
+        self.data = data
+        self.elapsed = elapsed
+
+    def __repr__(self) -> str:
+        duration = f"{self.duration:.2f}s" if self.duration is not None else "unknown"
+        return (
+            f"<AudioProbe {self.format} {duration} read={self.bytes_read}/{self.total_size}B "
+            f"elapsed={self.elapsed * 1000:.1f}ms>"
+        )
+
+
+# ============================================
+# 포맷 감지
+# ============================================
+
+def _end_bytes(head: bytes, tail: bytes, total_size: Optional[int]) -> bytes:
+    """
+    파일 끝부분 데이터
+
+    마지막 타임코드/granule 기반 포맷은 파일 끝을 읽어야 정확합니다.
+    head가 파일 전체가 아니면 head의 마지막 값은 길이보다 짧으므로 사용하지 않습니다.
+    """
+    if tail:
+        return tail
+    if total_size is not None and len(head) >= total_size:
+        return head
+    return b""
+
+
+def detect_format(head: bytes) -> Optional[str]:
+    """매직 바이트로 컨테이너 포맷 감지"""
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:3] == b"ID3" or _find_mp3_frame(head, 0) is not None:
+        return "mp3"
+    return None
+
+
+# ============================================
+# WAV
+# ============================================
+
+def _wav_duration(head: bytes, tail: bytes, total_size: Optional[int]) -> Optional[float]:
+    offset = 12
+    byte_rate = None
+    while offset + 8 <= len(head):
+        chunk_id = head[offset:offset + 4]
+        chunk_size = struct.unpack_from("<I", head, offset + 4)[0]
+        body = offset + 8
+
+        if chunk_id == b"fmt " and body + 12 <= len(head):
+            byte_rate = struct.unpack_from("<I", head, body + 8)[0]
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            # 스트리밍 녹음은 data 크기가 0 또는 0xFFFFFFFF로 남아 있을 수 있음
+            if total_size is not None and (chunk_size in (0, 0xFFFFFFFF) or body + chunk_size > total_size):
+                chunk_size = total_size - body
+            return chunk_size / byte_rate
+
+        offset = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+# ============================================
+# MP3
+# ============================================
+
+_MP3_BITRATES = {
+    # (MPEG1 여부, layer) → kbps 테이블
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = [44100, 48000, 32000]
+
+
+class _Mp3Frame:
+    def __init__(self, offset: int, mpeg1: bool, layer: int,
+                 bitrate: int, sample_rate: int, mono: bool, length: int):
+        self.offset = offset
+        self.mpeg1 = mpeg1
+        self.layer = layer
+        self.bitrate = bitrate
+        self.sample_rate = sample_rate
+        self.mono = mono
+        self.length = length
+        if layer == 1:
+            self.samples = 384
+        elif layer == 2 or mpeg1:
+            self.samples = 1152
+        else:
+            self.samples = 576
+
+
+def _parse_mp3_header(data: bytes, offset: int) -> Optional[_Mp3Frame]:
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03   # 0: MPEG2.5, 2: MPEG2, 3: MPEG1
+    layer_bits = (b1 >> 1) & 0x03     # 1: L3, 2: L2, 3: L1
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version_bits == 3
+    divisor = {3: 1, 2: 2, 0: 4}[version_bits]
+    layer = 4 - layer_bits
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[rate_index] // divisor
+    padding = (b2 >> 1) & 0x01
+
+    if layer == 1:
+        length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 3 and not mpeg1:
+        length = 72 * bitrate // sample_rate + padding
+    else:
+        length = 144 * bitrate // sample_rate + padding
+
+    mono = (b3 >> 6) == 3
+    return _Mp3Frame(offset, mpeg1, layer, bitrate, sample_rate, mono, length)
+
+
+def _find_mp3_frame(data: bytes, start: int) -> Optional[_Mp3Frame]:
+    """start 이후 첫 프레임 (다음 프레임 헤더까지 확인해 오탐 방지)"""
+    offset = data.find(b"\xff", start)
+    while 0 <= offset < len(data) - 4:
+        frame = _parse_mp3_header(data, offset)
+        if frame is not None:
+            following = offset + frame.length
+            if following + 4 > len(data) or _parse_mp3_header(data, following) is not None:
+                return frame
+        offset = data.find(b"\xff", offset + 1)
+    return None
+
+
+def _mp3_duration(head: bytes, tail: bytes, total_size: Optional[int]) -> Optional[float]:
+    start = 0
+    if head[:3] == b"ID3" and len(head) >= 10:
+        # ID3v2 크기는 syncsafe 정수 (바이트당 7비트)
+        size = 0
+        for b in head[6:10]:
+            size = (size << 7) | (b & 0x7F)
+        start = 10 + size + (10 if head[5] & 0x10 else 0)
+
+    frame = _find_mp3_frame(head, start)
+    if frame is None:
+        return None
+
+    # VBR 헤더 (Xing/Info: side info 뒤, VBRI: 헤더 + 32바이트 뒤)
+    if frame.mpeg1:
+        side_info = 17 if frame.mono else 32
+    else:
+        side_info = 9 if frame.mono else 17
+    xing = frame.offset + 4 + side_info
+    if head[xing:xing + 4] in (b"Xing", b"Info") and xing + 12 <= len(head):
+        flags = struct.unpack_from(">I", head, xing + 4)[0]
+        if flags & 0x01:
+            frames = struct.unpack_from(">I", head, xing + 8)[0]
+            return frames * frame.samples / frame.sample_rate
+
+    vbri = frame.offset + 4 + 32
+    if head[vbri:vbri + 4] == b"VBRI" and vbri + 18 <= len(head):
+        frames = struct.unpack_from(">I", head, vbri + 14)[0]
+        return frames * frame.samples / frame.sample_rate
+
+    # CBR: (오디오 바이트 수) / 비트레이트
+    if total_size is None:
+        return None
+    audio_bytes = total_size - frame.offset
+    if len(tail) >= 128 and tail[-128:-125] == b"TAG":
+        audio_bytes -= 128
+    return audio_bytes * 8 / frame.bitrate
+
+
+# ============================================
+# MP4 / M4A
+# ============================================
+
+def _parse_mvhd(data: bytes, offset: int) -> Optional[float]:
+    """mvhd 박스 본문(버전 바이트 위치)에서 길이 계산"""
+    if offset + 1 > len(data):
+        return None
+    version = data[offset]
+    if version == 1 and offset + 32 <= len(data):
+        timescale, duration = struct.unpack_from(">IQ", data, offset + 20)
+    elif version == 0 and offset + 20 <= len(data):
+        timescale, duration = struct.unpack_from(">II", data, offset + 12)
+    else:
+        return None
+    return duration / timescale if timescale else None
+
+
+def _mp4_duration(head: bytes, tail: bytes, total_size: Optional[int]) -> Optional[float]:
+    # 최상위 박스를 따라가며 moov 위치 확인
+    offset = 0
+    moov = None
+    while offset + 8 <= len(head):
+        size, box_type = struct.unpack_from(">I4s", head, offset)
+        header = 8
+        if size == 1 and offset + 16 <= len(head):
+            size = struct.unpack_from(">Q", head, offset + 8)[0]
+            header = 16
+        elif size == 0:
+            size = (total_size or len(head)) - offset
+        if size < header:
+            break
+        if box_type == b"moov":
+            moov = offset
+            break
+        offset += size
+
+    if moov is not None:
+        mvhd = head.find(b"mvhd", moov)
+        if mvhd >= 0:
+            return _parse_mvhd(head, mvhd + 4)
+
+    # moov가 파일 끝에 있는 경우 (faststart 아님)
+    mvhd = tail.rfind(b"mvhd")
+    if mvhd >= 0:
+        return _parse_mvhd(tail, mvhd + 4)
+    return None
+
+
+# ============================================
+# WebM / Matroska (EBML)
+# ============================================
+
+_EBML_SEGMENT = 0x18538067
+_EBML_INFO = 0x1549A966
+_EBML_CLUSTER = 0x1F43B675
+_EBML_TIMECODE_SCALE = 0x2AD7B1
+_EBML_DURATION = 0x4489
+_EBML_CLUSTER_TIMECODE = 0xE7
+_EBML_SIMPLE_BLOCK = 0xA3
+_EBML_BLOCK_GROUP = 0xA0
+_EBML_BLOCK = 0xA1
+
+# Cluster 안에서 만나면 Cluster가 끝났다는 의미인 상위 요소
+_EBML_TOP_LEVEL = {_EBML_CLUSTER, 0x1C53BB6B, 0x1254C367, 0x114D9B74, 0x1654AE6B, _EBML_INFO}
+
+
+def _read_vint(data: bytes, offset: int, keep_marker: bool) -> Optional[Tuple[int, int]]:
+    """EBML 가변 길이 정수 → (값, 길이). 크기 값이 모두 1이면 -1 (unknown size)"""
+    if offset >= len(data):
+        return None
+    first = data[offset]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        mask >>= 1
+        length += 1
+    if length > 8 or offset + length > len(data):
+        return None
+
+    value = first if keep_marker else first & (mask - 1)
+    for b in data[offset + 1:offset + length]:
+        value = (value << 8) | b
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        return -1, length
+    return value, length
+
+
+def _read_element(data: bytes, offset: int) -> Optional[Tuple[int, int, int]]:
+    """요소 헤더 → (ID, 본문 크기, 본문 시작 위치)"""
+    element_id = _read_vint(data, offset, keep_marker=True)
+    if element_id is None:
+        return None
+    size = _read_vint(data, offset + element_id[1], keep_marker=False)
+    if size is None:
+        return None
+    return element_id[0], size[0], offset + element_id[1] + size[1]
+
+
+def _read_uint(data: bytes, offset: int, size: int) -> int:
+    return int.from_bytes(data[offset:offset + size], "big")
+
+
+def _webm_duration(head: bytes, tail: bytes, total_size: Optional[int]) -> Optional[float]:
+    scale = 1_000_000  # 기본 TimecodeScale (ns 단위 → 1ms)
+
+    # EBML 헤더 건너뛰고 Segment 진입
+    element = _read_element(head, 0)
+    if element is None:
+        return None
+    offset = element[2] + element[1]
+    element = _read_element(head, offset)
+    if element is None or element[0] != _EBML_SEGMENT:
+        return None
+    offset = element[2]
+
+    # Segment 자식 중 Info 찾기
+    while True:
+        element = _read_element(head, offset)
+        if element is None:
+            break
+        element_id, size, body = element
+        if element_id == _EBML_CLUSTER:
+            break
+        if element_id == _EBML_INFO:
+            duration = None
+            child = body
+            end = min(body + size, len(head)) if size >= 0 else len(head)
+            while child < end:
+                sub = _read_element(head, child)
+                if sub is None or sub[1] < 0:
+                    break
+                sub_id, sub_size, sub_body = sub
+                if sub_id == _EBML_TIMECODE_SCALE:
+                    scale = _read_uint(head, sub_body, sub_size)
+                elif sub_id == _EBML_DURATION and sub_body + sub_size <= len(head):
+                    fmt = ">f" if sub_size == 4 else ">d"
+                    duration = struct.unpack_from(fmt, head, sub_body)[0]
+                child = sub_body + sub_size
+            if duration:
+                return duration * scale / 1e9
+            break
+        if size < 0:
+            break
+        offset = body + size
+
+    # Duration이 없는 경우 (MediaRecorder) → 마지막 Cluster의 블록 타임코드
+    end = _end_bytes(head, tail, total_size)
+    last_timecode = _last_block_timecode(end) if end else None
+    if last_timecode is None:
+        return None
+    return last_timecode * scale / 1e9
+
+
+def _last_block_timecode(data: bytes) -> Optional[int]:
+    """버퍼 안 마지막 Cluster의 (Cluster Timecode + 최대 Block 상대 타임코드)"""
+    marker = struct.pack(">I", _EBML_CLUSTER)
+    cluster = data.rfind(marker)
+    while cluster >= 0:
+        result = _scan_cluster(data, cluster)
+        if result is not None:
+            return result
+        cluster = data.rfind(marker, 0, cluster)
+    return None
+
+
+def _scan_cluster(data: bytes, offset: int) -> Optional[int]:
+    element = _read_element(data, offset)
+    if element is None:
+        return None
+    _, size, child = element
+    end = min(child + size, len(data)) if size >= 0 else len(data)
+
+    cluster_timecode = None
+    max_relative = 0
+    while child < end:
+        sub = _read_element(data, child)
+        if sub is None:
+            break
+        sub_id, sub_size, sub_body = sub
+        if sub_id in _EBML_TOP_LEVEL or sub_size < 0:
+            break
+        if sub_id == _EBML_CLUSTER_TIMECODE:
+            cluster_timecode = _read_uint(data, sub_body, sub_size)
+        elif sub_id in (_EBML_SIMPLE_BLOCK, _EBML_BLOCK_GROUP):
+            block = sub_body
+            if sub_id == _EBML_BLOCK_GROUP:
+                inner = _read_element(data, sub_body)
+                if inner is None or inner[0] != _EBML_BLOCK:
+                    child = sub_body + sub_size
+                    continue
+                block = inner[2]
+            track = _read_vint(data, block, keep_marker=False)
+            if track is not None and block + track[1] + 2 <= len(data):
+                relative = struct.unpack_from(">h", data, block + track[1])[0]
+                max_relative = max(max_relative, relative)
+        child = sub_body + sub_size
+
+    if cluster_timecode is None:
+        return None
+    return cluster_timecode + max_relative
+
+
+# ============================================
+# Ogg (Opus / Vorbis)
+# ============================================
+
+def _ogg_duration(head: bytes, tail: bytes, total_size: Optional[int]) -> Optional[float]:
+    if len(head) < 28:
+        return None
+    segments = head[26]
+    packet = head[27 + segments:]
+
+    if packet[:8] == b"OpusHead" and len(packet) >= 12:
+        # Opus granule position은 항상 48kHz 기준
+        sample_rate = 48000
+        pre_skip = struct.unpack_from("<H", packet, 10)[0]
+    elif packet[:7] == b"\x01vorbis" and len(packet) >= 16:
+        sample_rate = struct.unpack_from("<I", packet, 12)[0]
+        pre_skip = 0
+    else:
+        return None
+
+    granule = None
+    end = _end_bytes(head, tail, total_size)
+    page = end.rfind(b"OggS")
+    while page >= 0 and page + 14 <= len(end):
+        value = struct.unpack_from("<q", end, page + 6)[0]
+        if value >= 0:
+            granule = value
+            break
+        page = end.rfind(b"OggS", 0, page)
+
+    if granule is None or not sample_rate:
+        return None
+    return max(granule - pre_skip, 0) / sample_rate
+
+
+# ============================================
+# FLAC
+# ============================================
+
+def _flac_duration(head: bytes, tail: bytes, total_size: Optional[int]) -> Optional[float]:
+    # fLaC + 메타데이터 블록 헤더(4) + STREAMINFO(34)
+    if len(head) < 8 + 18 or head[4] & 0x7F != 0:
+        return None
+    info = head[8:]
+    packed = int.from_bytes(info[10:18], "big")
+    sample_rate = packed >> 44
+    total_samples = packed & 0xFFFFFFFFF
+    if not sample_rate or not total_samples:
+        return None
+    return total_samples / sample_rate
+
+
+_PARSERS: Dict[str, Callable[[bytes, bytes, Optional[int]], Optional[float]]] = {
+    "wav": _wav_duration,
+    "mp3": _mp3_duration,
+    "mp4": _mp4_duration,
+    "webm": _webm_duration,
+    "ogg": _ogg_duration,
+    "flac": _flac_duration,
+}
+
+# 앞부분만으로 길이를 알 수 있는 포맷 (원격 프로브에서 뒷부분 요청 생략)
+_HEAD_ONLY_FORMATS = {"wav", "flac"}
+
+
+# ============================================
+# 공개 API
+# ============================================
+
+def probe_duration(
+    head: bytes,
+    tail: bytes = b"",
+    total_size: Optional[int] = None,
+) -> Tuple[Optional[str], Optional[float]]:
+    """
+    헤더 바이트로 포맷과 길이 계산
+
+    Args:
+        head: 파일 앞부분
+        tail: 파일 뒷부분 (head와 겹쳐도 됨)
+        total_size: 전체 파일 크기 (CBR MP3, 스트리밍 WAV 계산에 필요)
+
+    Returns:
+        Tuple[Optional[str], Optional[float]]: (포맷, 길이 초) - 알 수 없으면 None
+    """
+    audio_format = detect_format(head)
+    if audio_format is None:
+        return None, None
+    try:
+        duration = _PARSERS[audio_format](head, tail, total_size)
+    except (struct.error, IndexError, ValueError, ZeroDivisionError):
+        duration = None
+    if duration is not None and duration < 0:
+        duration = None
+    return audio_format, duration
+
+
+def probe_audio_bytes(data: bytes) -> AudioProbe:
+    """
+    메모리에 있는 오디오의 길이 계산 (다운로드 후 Whisper 호출 전 검증용)
+    """
+    started = time.perf_counter()
+    head = data[:PROBE_HEAD_BYTES]
+    tail = data[-PROBE_TAIL_BYTES:]
+    audio_format, duration = probe_duration(head, tail, len(data))
+    return AudioProbe(
+        format=audio_format,
+        duration=duration,
+        total_size=len(data),
+        bytes_read=len(head) + (len(tail) if len(data) > PROBE_HEAD_BYTES else 0),
+        elapsed=time.perf_counter() - started,
+    )
+
+
+_CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+
+async def probe_audio_url(
+    url: str,
+    deadline: Optional[Deadline] = None,
+    head_bytes: int = PROBE_HEAD_BYTES,
+    tail_bytes: int = PROBE_TAIL_BYTES,
+) -> AudioProbe:
+    """
+    HTTP Range 요청으로 원격 오디오 길이 계산 (다운로드 전 검증용)
+
+    Args:
+        url: 오디오 파일 URL
+        deadline: 요청 데드라인
+        head_bytes: 앞부분 요청 크기
+        tail_bytes: 뒷부분 요청 크기 (앞부분만으로 부족할 때)
+
+    Returns:
+        AudioProbe: 프로브 결과 (서버가 Range를 무시했으면 data에 전체 본문)
+
+    Raises:
+        UpstreamHTTPError: 스토리지 응답 에러 (재시도 후)
+    """
+    started = time.perf_counter()
+
+    async with httpx.AsyncClient() as client:
+
+        async def fetch_range(range_header: str) -> httpx.Response:
+            response = await client.get(
+                url,
+                headers={"Range": range_header},
+                follow_redirects=True,
+                timeout=remaining_timeout(deadline, CALL_TIMEOUTS["download"], "download"),
+            )
+            if response.status_code not in (200, 206):
+                raise UpstreamHTTPError(
+                    f"Failed to probe audio: HTTP {response.status_code}",
+                    status_code=response.status_code,
+                    headers=response.headers,
+                )
+            return response
+
+        response = await call_with_retry(
+            "storage", lambda: fetch_range(f"bytes=0-{head_bytes - 1}"), deadline=deadline
+        )
+        content_type = response.headers.get("content-type", "")
+
+        if response.status_code == 200:
+            # Range 미지원 → 이미 전체를 받았으므로 재사용
+            probe = probe_audio_bytes(response.content)
+            probe.content_type = content_type
+            probe.data = response.content
+            probe.elapsed = time.perf_counter() - started
+            return probe
+
+        head = response.content
+        match = _CONTENT_RANGE.match(response.headers.get("content-range", ""))
+        total_size = int(match.group(3)) if match and match.group(3) != "*" else None
+        bytes_read = len(head)
+
+        if total_size is not None and total_size <= len(head):
+            probe = probe_audio_bytes(head)
+            probe.content_type = content_type
+            probe.data = head
+            probe.elapsed = time.perf_counter() - started
+            return probe
+
+        audio_format, duration = probe_duration(head, b"", total_size)
+        if duration is None and audio_format is not None and audio_format not in _HEAD_ONLY_FORMATS:
+            response = await call_with_retry(
+                "storage", lambda: fetch_range(f"bytes=-{tail_bytes}"), deadline=deadline
+            )
+            tail = response.content
+            bytes_read += len(tail)
+            audio_format, duration = probe_duration(head, tail, total_size)
+
+    return AudioProbe(
+        format=audio_format,
+        duration=duration,
+        total_size=total_size,
+        bytes_read=bytes_read,
+        content_type=content_type,
+        elapsed=time.perf_counter() - started,
+    )
@@ -0,0 +1,125 @@
+"""
+프로세스 내 LRU 캐시
+
+자주 읽고 드물게 바뀌는 작은 조회 결과(사용자 패턴 요약 등)를 DB 왕복 없이 재사용합니다.
+
+## 특징
+
+- 최대 개수를 넘으면 가장 오래 쓰지 않은 항목부터 제거
+- `maxbytes` + `sizeof`를 주면 항목별 크기를 기록하고, 합계가 상한을 넘어도 오래된 항목부터 제거
+  (상한보다 큰 항목은 저장하지 않음)
+- 항목별 TTL (다른 프로세스의 쓰기는 알 수 없으므로 오래된 값은 만료)
+- 쓰기 시점에 `invalidate` / `invalidate_where`로 즉시 무효화
+- 스레드 안전 (asyncio.to_thread 안에서 호출해도 됨)
+
+## 사용 예시
+
+```python
+cache = LRUCache(maxsize=1024, ttl=300)
+value = cache.get(key)
+if value is None:
+    value = load(key)
+    cache.set(key, value)
+```
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCache:
+    """
+    TTL이 있는 LRU 캐시
+
+    Args:
+        maxsize: 최대 항목 수
+        ttl: 항목 유효 시간 (초, None이면 만료 없음)
+        maxbytes: 항목 크기 합계 상한 (None이면 크기 제한 없음)
+        sizeof: 항목 크기 계산 함수 (maxbytes와 함께 사용)
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        maxbytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._items: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """항목 조회 (없거나 만료되면 default)"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+
+            value, expires_at, size = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._items[key]
+                self.bytes -= size
+                self.misses += 1
+                return default
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """항목 저장 (가득 차면 가장 오래 쓰지 않은 항목 제거)"""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        with self._lock:
+            self._pop(key)
+            if self.maxbytes is not None and size > self.maxbytes:
+                return
+            self._items[key] = (value, expires_at, size)
+            self.bytes += size
+            while len(self._items) > self.maxsize or (self.maxbytes is not None and self.bytes > self.maxbytes):
+                _, (_, _, evicted) = self._items.popitem(last=False)
+                self.bytes -= evicted
+
+    def invalidate(self, key: Hashable) -> None:
+        """항목 하나 무효화"""
+        with self._lock:
+            self._pop(key)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        조건에 맞는 키를 모두 무효화
+
+        Returns:
+            int: 제거한 항목 수
+        """
+        with self._lock:
+            keys = [key for key in self._items if predicate(key)]
+            for key in keys:
+                self._pop(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """전체 삭제"""
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+            self.bytes = 0
+
+    def _pop(self, key: Hashable) -> None:
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.bytes -= item[2]
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,185 @@
+"""
+요청 단위 데드라인(Deadline) 유틸리티
+
+하나의 /analyze 또는 /refine 요청 전체에 시간 예산을 부여하고,
+각 노드와 외부 호출이 남은 예산에서 자신의 타임아웃을 계산하도록 합니다.
+
+## 왜 필요한가?
+
+호출마다 고정 타임아웃(다운로드 30초, TTS 60초 등)만 있으면
+STT가 느려졌을 때 뒤 단계들이 남은 시간과 무관하게 각자 전체 타임아웃을 다시 씁니다.
+데드라인을 그래프 config로 전달하면:
+
+1. 모든 호출이 `min(고정 상한, 남은 예산)`으로 타임아웃을 잡고
+2. 예산이 부족하면 선택적 단계(ReAct, Reflection, TTS)를 생략하여
+   사용자는 느리더라도 핵심 결과(분석 + 개선안)는 받을 수 있습니다.
+
+## 사용 예시
+
+```python
+config = {"configurable": {"thread_id": session_id, "deadline": Deadline(180)}}
+await graph.ainvoke(state, config)
+
+# 노드 내부
+deadline = get_deadline(config)
+timeout = remaining_timeout(deadline, 60.0)
+```
+"""
+
+import time
+from typing import Dict, List, Optional
+
+
+# 선택적 단계를 실행하기 위해 필요한 최소 잔여 예산 (초)
+# 남은 시간이 이보다 적으면 해당 단계를 생략합니다.
+DEGRADATION_THRESHOLDS: Dict[str, float] = {
+    "react": 60.0,       # ReAct 분석 (Claude 다회 호출) → 기본 분석으로 대체
+    "reflection": 25.0,  # Reflection 검토 → 1차 개선안 그대로 사용
+    "tts": 15.0,         # TTS 생성 → 텍스트 결과만 반환
+}
+
+# 호출 종류별 고정 타임아웃 상한 (초)
+# 데드라인이 있으면 min(상한, 남은 예산)이 실제 타임아웃이 됩니다.
+CALL_TIMEOUTS: Dict[str, float] = {
+    "download": 30.0,      # 오디오 다운로드
+    "stt": 120.0,          # Whisper 전사
+    "claude": 90.0,        # Claude 메시지 생성
+    "tts": 60.0,           # ElevenLabs TTS
+    "voice_clone": 120.0,  # ElevenLabs Voice Clone 생성
+}
+
+# 이 값보다 짧은 타임아웃으로는 외부 호출을 시도하지 않음 (초)
+MIN_CALL_TIMEOUT = 1.0
+
+
+class DeadlineExceeded(RuntimeError):
+    """요청 전체 시간 예산을 초과한 경우"""
+
+    def __init__(self, step: str):
+        super().__init__(f"Deadline exceeded during {step}")
+        self.step = step
+
+
+class Deadline:
+    """
+    요청 단위 시간 예산
+
+    Args:
+        budget_seconds: 전체 시간 예산 (초)
+
+    Attributes:
+        misses: 예산 부족으로 실패한 단계 목록
+        degradations: 예산 부족으로 생략된 단계 목록
+    """
+
+    def __init__(self, budget_seconds: float):
+        self.budget_seconds = budget_seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget_seconds
+        self.misses: List[str] = []
+        self.degradations: List[str] = []
+
+    @classmethod
+    def from_expiry(cls, expires_at: float, budget_seconds: float) -> "Deadline":
+        """
+        벽시계 만료 시각으로 데드라인 복원
+
+        작업 큐로 다른 프로세스에 넘길 때 사용합니다. 큐 대기 시간과 이전 시도에 쓴 시간도
+        예산에서 빠집니다. (monotonic 시각은 프로세스 사이에 비교할 수 없으므로 time.time 기준)
+
+        Args:
+            expires_at: 만료 시각 (time.time 기준, 등록 시각 + budget_seconds)
+            budget_seconds: 원래 전체 예산 (리포트용)
+        """
+        deadline = cls(budget_seconds)
+        deadline.expires_at = deadline.started_at + (expires_at - time.time())
+        deadline.started_at = deadline.expires_at - budget_seconds
+        return deadline
+
+    def remaining(self) -> float:
+        """남은 예산 (초, 음수가 될 수 있음)"""
+        return self.expires_at - time.monotonic()
+
+    def elapsed(self) -> float:
+        """경과 시간 (초)"""
+        return time.monotonic() - self.started_at
+
+    @property
+    def expired(self) -> bool:
+        """예산 소진 여부"""
+        return self.remaining() <= 0
+
+    def timeout(self, cap: float, step: str = "call") -> float:
+        """
+        외부 호출 타임아웃 계산
+
+        Args:
+            cap: 호출별 고정 상한 (초)
+            step: 예산 부족 시 기록할 단계 이름
+
+        Returns:
+            float: min(cap, 남은 예산)
+
+        Raises:
+            DeadlineExceeded: 남은 예산이 MIN_CALL_TIMEOUT보다 적은 경우
+        """
+        remaining = self.remaining()
+        if remaining < MIN_CALL_TIMEOUT:
+            self.record_miss(step)
+            raise DeadlineExceeded(step)
+        return min(cap, remaining)
+
+    def record_miss(self, step: str) -> None:
+        """예산 초과 단계 기록"""
+        if step not in self.misses:
+            self.misses.append(step)
+
+    def should_degrade(self, step: str) -> bool:
+        """
+        선택적 단계 생략 여부 판단
+
+        남은 예산이 DEGRADATION_THRESHOLDS[step]보다 적으면 True를 반환하고
+        생략 사실을 기록합니다.
+        """
+        threshold = DEGRADATION_THRESHOLDS.get(step, 0.0)
+        if self.remaining() < threshold:
+            if step not in self.degradations:
+                self.degradations.append(step)
+            return True
+        return False
+
+    def report(self) -> dict:
+        """데드라인 리포트 (로그/응답용)"""
+        return {
+            "budget_seconds": self.budget_seconds,
+            "elapsed_seconds": round(self.elapsed(), 2),
+            "remaining_seconds": round(self.remaining(), 2),
+            "misses": list(self.misses),
+            "degradations": list(self.degradations),
+        }
+
+
+def get_deadline(config: Optional[dict]) -> Optional[Deadline]:
+    """그래프 config에서 데드라인 추출 (없으면 None)"""
+    if not config:
+        return None
+    return config.get("configurable", {}).get("deadline")
+
+
+def remaining_timeout(deadline: Optional[Deadline], cap: float, step: str = "call") -> float:
+    """
+    데드라인을 반영한 타임아웃 계산
+
+    데드라인이 없으면 기존처럼 고정 상한을 그대로 사용합니다.
+    """
+    if deadline is None:
+        return cap
+    return deadline.timeout(cap, step)
+
+
+def should_degrade(config: Optional[dict], step: str) -> bool:
+    """config의 데드라인 기준으로 선택적 단계 생략 여부 판단"""
+    deadline = get_deadline(config)
+    if deadline is None:
+        return False
+    return deadline.should_degrade(step)
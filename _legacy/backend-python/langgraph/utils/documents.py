@@ -0,0 +1,240 @@
+"""
+문서 분할 추출 (Map-Reduce) 유틸리티
+
+Deep Mode 문서(이력서, 포트폴리오 등)를 조각(DocumentChunk)으로 나눠 조각별로 동시에 핵심 정보를
+추출(map)한 뒤, 결과를 하나의 JSON으로 합칩니다(reduce).
+앞 10,000자만 잘라 한 번에 보내던 방식과 달리 긴 문서의 뒷부분도 반영되고,
+조각 추출이 동시에 진행되므로 문서 길이만큼 지연 시간이 늘어나지 않습니다.
+
+## 분할 규칙
+1. 문서별로 나눔 (조각이 두 문서에 걸치지 않음)
+2. `DOCUMENT_CHUNK_CHARS` 안에서 문단 → 줄 → 문장 경계 순으로 가장 뒤쪽에서 자름
+   (경계가 조각 뒤쪽 절반 안에 없으면 그 길이에서 바로 자름)
+3. 다음 조각은 `DOCUMENT_CHUNK_OVERLAP_CHARS`만큼 겹쳐 시작 (경계에 걸친 문장 보존)
+
+## 합치기 규칙 (reduce)
+- skills / differentiators: 대소문자·공백 무시 중복 제거, 여러 조각에 나온 항목 우선
+- key_achievements: (프로젝트, 성과) 기준 중복 제거, 수치가 있는 항목 우선
+- expected_questions: 조각별로 번갈아 가며 고름 (한 조각의 질문만 몰리지 않도록)
+
+## 사용 예시
+
+```python
+chunks = split_documents(documents)
+partials = await extract_chunks(chunks, extract_one)
+result = merge_extractions(partials)
+```
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Sequence
+
+
+# 조각 최대 길이 / 겹침 (문자 수)
+DOCUMENT_CHUNK_CHARS = int(os.getenv("DOCUMENT_CHUNK_CHARS", "6000"))
+DOCUMENT_CHUNK_OVERLAP_CHARS = 200
+
+# 합친 결과의 항목 수 상한
+MAX_SKILLS = 20
+MAX_ACHIEVEMENTS = 10
+MAX_DIFFERENTIATORS = 8
+MAX_EXPECTED_QUESTIONS = 5
+
+# 자를 위치로 쓰는 경계 (앞쪽일수록 선호)
+_BOUNDARIES = ("\n\n", "\n", ". ", "? ", "! ")
+
+_JSON_OBJECT = re.compile(r"\{[\s\S]*\}")
+_SPACES = re.compile(r"\s+")
+
+
+class DocumentChunk:
+    """
+    문서 조각
+
+    Attributes:
+        document_type: 원본 문서 타입 (resume, portfolio 등)
+        index: 문서 안에서의 조각 순서 (0부터)
+        total: 문서의 전체 조각 수
+        text: 조각 내용
+    """
+
+    def __init__(self, document_type: str, index: int, total: int, text: str):
+        self.document_type = document_type
+        self.index = index
+        self.total = total
+        self.text = text
+
+    @property
+    def label(self) -> str:
+        """프롬프트에 붙이는 조각 표시 (예: resume 2/3)"""
+        return f"{self.document_type} {self.index + 1}/{self.total}"
+
+    def digest(self, salt: str = "") -> str:
+        """조각 내용 해시 (추출 결과 캐시 키, salt에는 모델/버전)"""
+        return hashlib.sha256(f"{salt}\n{self.document_type}\n{self.text}".encode()).hexdigest()
+
+    def __repr__(self) -> str:
+        return f"<DocumentChunk {self.label} chars={len(self.text)}>"
+
+
+def split_text(
+    text: str,
+    chunk_chars: int = DOCUMENT_CHUNK_CHARS,
+    overlap_chars: int = DOCUMENT_CHUNK_OVERLAP_CHARS,
+) -> List[str]:
+    """
+    텍스트를 경계 기준으로 나눔
+
+    Returns:
+        List[str]: 조각 목록 (빈 텍스트면 빈 리스트)
+    """
+    text = text.strip()
+    if not text:
+        return []
+
+    pieces = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_chars, len(text))
+        if end < len(text):
+            # 조각 뒤쪽 절반 안의 마지막 경계에서 자름
+            floor = start + chunk_chars // 2
+            for boundary in _BOUNDARIES:
+                position = text.rfind(boundary, floor, end)
+                if position != -1:
+                    end = position + len(boundary)
+                    break
+
+        piece = text[start:end].strip()
+        if piece:
+            pieces.append(piece)
+        if end >= len(text):
+            break
+        start = max(end - overlap_chars, start + 1)
+
+    return pieces
+
+
+def split_documents(
+    documents: Sequence[Dict[str, Any]],
+    chunk_chars: int = DOCUMENT_CHUNK_CHARS,
+    overlap_chars: int = DOCUMENT_CHUNK_OVERLAP_CHARS,
+) -> List[DocumentChunk]:
+    """
+    프로젝트 문서를 조각으로 나눔 (문서 순서 유지, 내용 없는 문서는 제외)
+
+    Args:
+        documents: [{"document_type", "extracted_text"}, ...]
+    """
+    chunks = []
+    for document in documents:
+        document_type = document.get("document_type") or "unknown"
+        pieces = split_text(document.get("extracted_text") or "", chunk_chars, overlap_chars)
+        chunks.extend(DocumentChunk(document_type, i, len(pieces), piece) for i, piece in enumerate(pieces))
+    return chunks
+
+
+def parse_extraction(response_text: str) -> Dict[str, Any]:
+    """조각 추출 응답에서 JSON 객체 파싱 (JSON이 없거나 깨졌으면 빈 dict)"""
+    match = _JSON_OBJECT.search(response_text or "")
+    if not match:
+        return {}
+    try:
+        parsed = json.loads(match.group())
+    except json.JSONDecodeError:
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def _key(value: Any) -> str:
+    return _SPACES.sub(" ", str(value)).strip().lower()
+
+
+def _ranked_unique(partials: Sequence[Dict[str, Any]], field: str, limit: int) -> List[str]:
+    """여러 조각에 나온 항목 우선, 같으면 먼저 나온 순"""
+    first_seen: Dict[str, int] = {}
+    counts: Dict[str, int] = {}
+    values: Dict[str, str] = {}
+    for partial in partials:
+        seen_here = set()
+        for value in partial.get(field) or []:
+            if not isinstance(value, str) or not value.strip():
+                continue
+            key = _key(value)
+            if key in seen_here:
+                continue
+            seen_here.add(key)
+            first_seen.setdefault(key, len(first_seen))
+            values.setdefault(key, value.strip())
+            counts[key] = counts.get(key, 0) + 1
+
+    ordered = sorted(first_seen, key=lambda key: (-counts[key], first_seen[key]))
+    return [values[key] for key in ordered[:limit]]
+
+
+def merge_extractions(partials: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    조각별 추출 결과를 하나로 합침 (reduce)
+
+    Returns:
+        dict: {"skills", "key_achievements", "differentiators", "expected_questions"}
+    """
+    achievements = []
+    achievement_keys = set()
+    for partial in partials:
+        for item in partial.get("key_achievements") or []:
+            if not isinstance(item, dict):
+                continue
+            key = (_key(item.get("project", "")), _key(item.get("achievement", "")))
+            if key == ("", "") or key in achievement_keys:
+                continue
+            achievement_keys.add(key)
+            achievements.append(item)
+    # 수치가 있는 성과 우선 (정렬은 안정적이므로 같은 그룹 안에서는 문서 순서 유지)
+    achievements.sort(key=lambda item: not item.get("numbers"))
+
+    questions = []
+    question_keys = set()
+    queues = [list(partial.get("expected_questions") or []) for partial in partials]
+    while len(questions) < MAX_EXPECTED_QUESTIONS and any(queues):
+        for queue in queues:
+            if not queue or len(questions) >= MAX_EXPECTED_QUESTIONS:
+                continue
+            question = queue.pop(0)
+            if isinstance(question, str) and question.strip() and _key(question) not in question_keys:
+                question_keys.add(_key(question))
+                questions.append(question.strip())
+
+    return {
+        "skills": _ranked_unique(partials, "skills", MAX_SKILLS),
+        "key_achievements": achievements[:MAX_ACHIEVEMENTS],
+        "differentiators": _ranked_unique(partials, "differentiators", MAX_DIFFERENTIATORS),
+        "expected_questions": questions,
+    }
+
+
+async def extract_chunks(
+    chunks: Sequence[DocumentChunk],
+    extract: Callable[[DocumentChunk], Awaitable[Dict[str, Any]]],
+) -> List[Dict[str, Any]]:
+    """
+    조각을 동시에 추출 (map)
+
+    동시 호출 수는 extract 안의 provider_slot이 제한합니다.
+    한 조각이라도 실패하면 나머지 호출을 취소하고 예외를 그대로 전파합니다.
+
+    Returns:
+        List[dict]: chunks와 같은 순서의 추출 결과
+    """
+    tasks = [asyncio.ensure_future(extract(chunk)) for chunk in chunks]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
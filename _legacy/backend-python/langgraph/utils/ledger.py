@@ -0,0 +1,307 @@
+"""
+비용 / 사용량 원장 (세션 · 사용자 · 노드 단위)
+
+metrics.py가 기록하는 외부 API 사용량(Claude usage 토큰 - 캐시 읽기 / 쓰기 포함,
+Whisper 오디오 길이, ElevenLabs 문자 수)을 현재 계정(세션 · 사용자 · 모드)과 노드별로
+메모리에 합산하고, 주기적으로 모아 `record_usage` RPC 한 번으로 `usage_ledger` 테이블에 더합니다.
+(supabase/migrations/20261019000004_usage_ledger.sql)
+
+## 계정
+
+워커는 작업마다(api/jobs/worker.py), API 서버는 외부 API를 직접 호출하는 구간
+(재요청 Stage 2 그래프, 직접 업로드 전사)에서 `usage_account`로 계정을 설정합니다.
+계정 밖의 사용량은 메트릭에만 남습니다.
+
+## 저장
+
+- 같은 (세션, 그래프, 노드)는 메모리에서 한 행으로 합치고, DB에서도 누적합니다.
+- `USAGE_FLUSH_SECONDS`마다 또는 행이 `USAGE_BATCH_SIZE`개 쌓이면 저장합니다.
+- 일시적 장애면 다음 flush에 다시 저장하고, 영구적 에러면 로그를 남기고 버립니다.
+- 프로세스 종료 시 `close_usage_ledger`로 남은 행을 저장합니다.
+
+## 비용 / 예산
+
+비용은 기록 시점의 단가(`COST_*` 환경변수, USD)로 계산해 행에 함께 저장합니다.
+`user_month_cost`는 이번 달 DB 합계(사용자별 캐시, `USAGE_TOTALS_TTL_SECONDS`)에
+이 프로세스에서 아직 저장하지 않은 비용을 더한 값이므로, 요청마다 DB를 조회하지 않고 예산을 확인할 수 있습니다.
+(다른 프로세스의 미저장분은 캐시가 만료될 때 반영)
+"""
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from supabase import create_client
+
+# resilience → metrics → ledger 순으로 import되므로 모듈로 참조
+from . import resilience
+
+
+USAGE_FLUSH_SECONDS = float(os.getenv("USAGE_FLUSH_SECONDS", "5"))
+USAGE_BATCH_SIZE = int(os.getenv("USAGE_BATCH_SIZE", "200"))
+USAGE_TOTALS_TTL_SECONDS = float(os.getenv("USAGE_TOTALS_TTL_SECONDS", "60"))
+
+# 사용량 필드 → 단위당 비용 (USD, 기본: Claude Sonnet 4 / Whisper / ElevenLabs Creator 초과 단가)
+UNIT_COSTS = {
+    "input_tokens": float(os.getenv("COST_CLAUDE_INPUT_PER_MTOK", "3.0")) / 1_000_000,
+    "output_tokens": float(os.getenv("COST_CLAUDE_OUTPUT_PER_MTOK", "15.0")) / 1_000_000,
+    "cache_read_tokens": float(os.getenv("COST_CLAUDE_CACHE_READ_PER_MTOK", "0.30")) / 1_000_000,
+    "cache_creation_tokens": float(os.getenv("COST_CLAUDE_CACHE_WRITE_PER_MTOK", "3.75")) / 1_000_000,
+    "audio_seconds": float(os.getenv("COST_WHISPER_PER_MINUTE", "0.006")) / 60,
+    "tts_characters": float(os.getenv("COST_ELEVENLABS_PER_1K_CHARS", "0.30")) / 1000,
+}
+
+
+class Account(NamedTuple):
+    """사용량을 돌릴 계정"""
+    session_id: str
+    user_id: Optional[str]  # 인증 사용자 (Guest는 None)
+    mode: str
+
+
+_ACCOUNT: ContextVar[Optional[Account]] = ContextVar("usage_account", default=None)
+
+
+@contextmanager
+def usage_account(session_id: str, user_id: Optional[str], mode: str) -> Iterator[Account]:
+    """블록 안(과 블록에서 만든 asyncio 작업)의 사용량을 이 계정으로 기록"""
+    account = Account(session_id, user_id, mode)
+    token = _ACCOUNT.set(account)
+    try:
+        yield account
+    finally:
+        _ACCOUNT.reset(token)
+
+
+def usage_cost(amounts: Dict[str, float]) -> float:
+    """사용량 → 비용 (USD)"""
+    return sum(UNIT_COSTS[field] * value for field, value in amounts.items())
+
+
+def month_start(now: Optional[datetime] = None) -> datetime:
+    """이번 달 시작 시각 (UTC)"""
+    now = now or datetime.now(timezone.utc)
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def write_usage(rows: List[dict]) -> int:
+    """사용량 행 배치 누적 저장 (동기, 스레드에서 호출 / 저장된 행 수 반환)"""
+
+    supabase = create_client(
+        os.getenv("SUPABASE_URL"),
+        os.getenv("SUPABASE_SERVICE_KEY")
+    )
+
+    return supabase.rpc("record_usage", {"p_rows": rows}).execute().data or 0
+
+
+def load_user_cost(user_id: str, since: datetime) -> float:
+    """사용자의 since 이후 비용 합계 (동기, 스레드에서 호출)"""
+
+    supabase = create_client(
+        os.getenv("SUPABASE_URL"),
+        os.getenv("SUPABASE_SERVICE_KEY")
+    )
+
+    response = supabase.rpc("user_usage_cost", {
+        "p_user_id": user_id,
+        "p_since": since.isoformat(),
+    }).execute()
+    return float(response.data or 0)
+
+
+class UsageLedger:
+    """
+    프로세스별 사용량 원장
+
+    record는 동기 함수이며 어느 스레드에서 불러도 됩니다. (잠금으로 보호)
+    flush 태스크는 이벤트 루프 안에서 처음 기록할 때 시작합니다.
+
+    Args:
+        write: 배치 저장 함수 (동기, 스레드에서 호출 / 기본: record_usage RPC)
+        load_cost: 사용자 비용 합계 조회 함수 (동기, 스레드에서 호출 / 기본: user_usage_cost RPC)
+        flush_interval: 저장 주기 (초)
+        batch_size: 이만큼 행이 쌓이면 주기를 기다리지 않고 저장
+        totals_ttl: 사용자 비용 합계 캐시 유지 시간 (초)
+    """
+
+    def __init__(
+        self,
+        write: Callable[[List[dict]], Any] = write_usage,
+        load_cost: Callable[[str, datetime], float] = load_user_cost,
+        flush_interval: float = USAGE_FLUSH_SECONDS,
+        batch_size: int = USAGE_BATCH_SIZE,
+        totals_ttl: float = USAGE_TOTALS_TTL_SECONDS,
+    ):
+        self.write = write
+        self.load_cost = load_cost
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.totals_ttl = totals_ttl
+
+        self._lock = threading.Lock()
+        self._rows: Dict[Tuple[str, str, str], dict] = {}
+        # 사용자별 아직 저장하지 않은 비용 / 이번 달 DB 합계 캐시 (조회 시각, 월 시작, 합계)
+        self._unflushed: Dict[str, float] = {}
+        self._totals: Dict[str, Tuple[float, datetime, float]] = {}
+
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.stats = {"recorded": 0, "written": 0, "dropped": 0, "flushes": 0, "retries": 0}
+
+    def record(self, node: Tuple[str, str], **amounts: float) -> None:
+        """
+        현재 계정 / 노드의 사용량 더하기 (계정이 없으면 무시)
+
+        Args:
+            node: (graph, node) - metrics.current_node()
+            amounts: UNIT_COSTS의 필드별 사용량
+        """
+        account = _ACCOUNT.get()
+        if account is None:
+            return
+        cost = usage_cost(amounts)
+        key = (account.session_id, *node)
+
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                row = self._rows[key] = {
+                    "session_id": account.session_id,
+                    "user_id": account.user_id,
+                    "mode": account.mode,
+                    "graph": node[0],
+                    "node": node[1],
+                    **dict.fromkeys(UNIT_COSTS, 0),
+                    "cost_usd": 0.0,
+                }
+            for field, value in amounts.items():
+                row[field] += value
+            row["cost_usd"] += cost
+            if account.user_id:
+                self._unflushed[account.user_id] = self._unflushed.get(account.user_id, 0.0) + cost
+            self.stats["recorded"] += 1
+            full = len(self._rows) >= self.batch_size
+
+        self._ensure_flusher(full)
+
+    async def user_month_cost(self, user_id: str) -> float:
+        """이번 달 사용자 비용 (DB 합계 캐시 + 이 프로세스의 미저장분, USD)"""
+        since = month_start()
+        cached = self._totals.get(user_id)
+        if cached is None or cached[1] != since or time.monotonic() - cached[0] > self.totals_ttl:
+            try:
+                base = await asyncio.to_thread(self.load_cost, user_id, since)
+            except Exception as e:
+                # 조회 실패 시 예산 확인을 막지 않음 (이전 합계 또는 0, 다음 요청에서 다시 조회)
+                print(f"[usage] cost lookup for {user_id} failed: {e}")
+                base = cached[2] if cached and cached[1] == since else 0.0
+            else:
+                self._totals[user_id] = (time.monotonic(), since, base)
+        else:
+            base = cached[2]
+        with self._lock:
+            return base + self._unflushed.get(user_id, 0.0)
+
+    async def flush(self) -> int:
+        """쌓인 행 저장 (저장한 행 수 반환)"""
+        with self._lock:
+            rows, self._rows = list(self._rows.values()), {}
+        if not rows:
+            return 0
+
+        try:
+            await asyncio.to_thread(self.write, [{**row, "cost_usd": round(row["cost_usd"], 6)} for row in rows])
+        except Exception as e:
+            if resilience.classify_error(e) == "retryable":
+                # 다음 flush에 다시 저장 (그동안 들어온 행과 합침)
+                self.stats["retries"] += 1
+                print(f"[usage] write of {len(rows)} rows failed ({e}), retrying on next flush")
+                self._restore(rows)
+                return 0
+            self.stats["dropped"] += len(rows)
+            print(f"[usage] {len(rows)} rows (${sum(row['cost_usd'] for row in rows):.4f}) not saved: {e}")
+            self._settle(rows, saved=False)
+            return 0
+
+        self.stats["flushes"] += 1
+        self.stats["written"] += len(rows)
+        self._settle(rows, saved=True)
+        return len(rows)
+
+    async def close(self) -> None:
+        """flush 태스크를 멈추고 남은 행 저장"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self.flush()
+        print(f"[usage] closed: {self.stats}")
+
+    def _settle(self, rows: List[dict], saved: bool) -> None:
+        """저장한 비용을 미저장분에서 DB 합계 캐시로 옮김 (버린 행은 미저장분에서만 제외)"""
+        since = month_start()
+        with self._lock:
+            for row in rows:
+                user_id = row["user_id"]
+                if not user_id:
+                    continue
+                self._unflushed[user_id] = self._unflushed.get(user_id, 0.0) - row["cost_usd"]
+                if self._unflushed[user_id] <= 1e-9:
+                    del self._unflushed[user_id]
+                cached = self._totals.get(user_id)
+                if saved and cached is not None and cached[1] == since:
+                    self._totals[user_id] = (cached[0], since, cached[2] + row["cost_usd"])
+
+    def _restore(self, rows: List[dict]) -> None:
+        with self._lock:
+            for row in rows:
+                key = (row["session_id"], row["graph"], row["node"])
+                current = self._rows.get(key)
+                if current is None:
+                    self._rows[key] = row
+                    continue
+                for field in (*UNIT_COSTS, "cost_usd"):
+                    current[field] += row[field]
+
+    def _ensure_flusher(self, wake: bool) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 스레드에서 기록 → 이벤트 루프의 flush 태스크가 저장
+            return
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._wake = asyncio.Event()
+            self._task = loop.create_task(self._run(self._wake))
+        if wake:
+            self._wake.set()
+
+    async def _run(self, wake: asyncio.Event) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"[usage] flush failed: {e}")
+
+
+LEDGER = UsageLedger()
+
+
+def record_usage(node: Tuple[str, str], **amounts: float) -> None:
+    """현재 계정 / 노드의 사용량 기록 (metrics.py의 record_* 에서 호출)"""
+    LEDGER.record(node, **amounts)
+
+
+async def close_usage_ledger() -> None:
+    """남은 사용량 저장 (워커 종료 시)"""
+    await LEDGER.close()
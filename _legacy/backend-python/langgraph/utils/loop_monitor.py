@@ -0,0 +1,166 @@
+"""
+이벤트 루프 지연 / 블로킹 호출 감지
+
+노드 안의 동기 호출(supabase `execute()`, 정규식 도구, 임시 파일 쓰기 등)이 이벤트 루프를 막으면
+같은 프로세스의 SSE 스트림과 다른 작업이 함께 멈춥니다. 프로세스마다 루프 지연을 계속 재고,
+임계값 이상 멈추면 루프를 막고 있는 스택과 그때 실행 중인 그래프 노드를 기록합니다.
+
+- 지연 측정: 루프 안의 작업이 LOOP_MONITOR_INTERVAL_MS마다 깨어나 예정보다 늦은 시간을 기록
+- 멈춤 감지: 감시 스레드가 측정 작업의 마지막 실행 시각을 보고, LOOP_BLOCK_THRESHOLD_MS 이상
+  멈춰 있으면 루프 스레드의 현재 스택을 로그로 남김 (멈춤당 한 번). 스택의 instrument_node
+  프레임으로 노드를 식별하고, 멈춤이 끝나면 멈춘 시간을 그 노드에 더함
+- asyncio 느린 콜백 로그: `loop.slow_callback_duration`을 같은 임계값으로 설정.
+  asyncio debug 모드에서만 출력되며 콜백마다 비용이 있어 `LOOP_ASYNCIO_DEBUG=1`일 때만 켭니다.
+
+## 메트릭 (`/metrics`, metrics.py)
+
+- `event_loop_lag_seconds{role}`: 지연 분포
+- `event_loop_stalls_total{role,graph,node}`: 임계값 이상 멈춘 횟수
+- `event_loop_blocked_seconds_total{role,graph,node}`: 멈춘 시간 합계
+
+노드 밖에서 멈추면 graph / node는 none, 감시 스레드가 스택을 보기 전에 끝난 멈춤은 unknown입니다.
+
+## 사용
+
+워커는 프로세스마다 시작합니다. (api/jobs/worker.py)
+API 앱은 lifespan에서 `start_loop_monitor("api")` / `await stop_loop_monitor()`를 호출합니다.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Optional, Tuple
+
+from .metrics import LOOP_BLOCKED_SECONDS, LOOP_LAG, LOOP_STALLS, node_of_frame
+
+
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "1") == "1"
+LOOP_MONITOR_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "100")) / 1000
+LOOP_BLOCK_THRESHOLD = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100")) / 1000
+LOOP_ASYNCIO_DEBUG = os.getenv("LOOP_ASYNCIO_DEBUG", "0") == "1"
+
+# 멈춤 로그에 남기는 스택 깊이 (루프를 막고 있는 가장 안쪽 프레임부터)
+STACK_LIMIT = 25
+
+UNKNOWN = ("unknown", "unknown")
+
+
+class LoopMonitor:
+    """
+    실행 중인 이벤트 루프 하나의 지연 측정 + 멈춤 감시
+
+    Args:
+        role: 프로세스 역할 (메트릭 레이블, api / worker)
+        interval: 지연 측정 주기 (초)
+        threshold: 멈춤으로 보는 지연 (초)
+    """
+
+    def __init__(
+        self,
+        role: str,
+        interval: float = LOOP_MONITOR_INTERVAL,
+        threshold: float = LOOP_BLOCK_THRESHOLD,
+    ):
+        self.role = role
+        self.interval = interval
+        self.threshold = threshold
+        self._beat = time.monotonic()
+        # 감시 스레드가 본 멈춤: (멈추기 전 마지막 측정 시각, (graph, node))
+        self._stall: Optional[Tuple[float, Tuple[str, str]]] = None
+        self._thread_id: Optional[int] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """측정 작업 / 감시 스레드 시작 (루프 안에서 호출)"""
+        loop = asyncio.get_running_loop()
+        loop.slow_callback_duration = self.threshold
+        if LOOP_ASYNCIO_DEBUG:
+            loop.set_debug(True)
+
+        self._thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._probe_task = asyncio.create_task(self._probe(), name=f"loop-monitor-{self.role}")
+        self._watchdog = threading.Thread(target=self._watch, name=f"loop-watchdog-{self.role}", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+
+    async def _probe(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - expected, 0.0)
+
+            previous, self._beat = self._beat, time.monotonic()
+            LOOP_LAG.labels(self.role).observe(lag)
+            if lag >= self.threshold:
+                stall, self._stall = self._stall, None
+                labels = stall[1] if stall is not None and stall[0] == previous else UNKNOWN
+                LOOP_STALLS.labels(self.role, *labels).inc()
+                LOOP_BLOCKED_SECONDS.labels(self.role, *labels).inc(lag)
+
+    def _watch(self) -> None:
+        # 임계값보다 촘촘히 확인해야 짧은 멈춤도 스택을 잡을 수 있음
+        while not self._stopped.wait(self.threshold / 4):
+            beat = self._beat
+            behind = time.monotonic() - beat - self.interval
+            if behind < self.threshold or (self._stall is not None and self._stall[0] == beat):
+                continue
+
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            graph, node = node_of_frame(frame) or ("none", "none")
+            self._stall = (beat, (graph, node))
+            stack = "".join(traceback.format_stack(frame, limit=STACK_LIMIT))
+            del frame
+            print(f"[loop] {self.role} blocked {behind * 1000:.0f}ms+ in {graph}.{node}:\n{stack}", end="")
+
+
+_monitor: Optional[LoopMonitor] = None
+
+
+def start_loop_monitor(role: str, **options) -> Optional[LoopMonitor]:
+    """
+    현재 이벤트 루프 감시 시작 (프로세스당 하나, LOOP_MONITOR_ENABLED=0이면 None)
+
+    Args:
+        role: 프로세스 역할 (api / worker)
+        **options: LoopMonitor 옵션 (interval, threshold)
+    """
+    global _monitor
+
+    if not LOOP_MONITOR_ENABLED:
+        return None
+    if _monitor is None:
+        _monitor = LoopMonitor(role, **options)
+        _monitor.start()
+        print(
+            f"[loop] monitoring {role} loop: every {_monitor.interval * 1000:g}ms, "
+            f"stall ≥ {_monitor.threshold * 1000:g}ms"
+        )
+    return _monitor
+
+
+async def stop_loop_monitor() -> None:
+    """감시 종료 (프로세스 종료 시)"""
+    global _monitor
+
+    if _monitor is not None:
+        monitor, _monitor = _monitor, None
+        await monitor.stop()
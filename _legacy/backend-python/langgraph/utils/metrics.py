@@ -0,0 +1,235 @@
+"""
+노드별 실행 시간 / 사용량 메트릭 (Prometheus)
+
+그래프(`create_speech_coach_graph`, `create_refinement_graph`)에 등록하는 모든 노드를
+`instrument_node`로 감싸 실행 시간을 기록하고, 노드 안에서 일어난 외부 호출의
+재시도 · Claude 토큰 · Whisper 오디오 길이 · ElevenLabs 문자 수를 노드 단위로 집계합니다.
+샘플링된 트레이스 안에서는 노드마다 `node.<이름>` span도 기록하고 (tracing.py),
+프로파일 대상 요청이면 노드 경계마다 메모리 스냅샷을 남깁니다 (profiling.py).
+API 서버의 `GET /metrics`가 Prometheus 텍스트 형식으로 내보냅니다.
+사용량은 세션 · 사용자별 비용 원장에도 함께 기록합니다 (ledger.py).
+
+## 메트릭
+
+| 이름 | 종류 | 레이블 |
+|------|------|--------|
+| `langgraph_node_duration_seconds` | Histogram | graph, node, status (ok / error) |
+| `langgraph_node_retries_total` | Counter | graph, node, provider |
+| `anthropic_tokens_total` | Counter | graph, node, kind (input / output / cache_read / cache_creation) |
+| `whisper_audio_seconds_total` | Counter | graph, node |
+| `elevenlabs_characters_total` | Counter | graph, node |
+| `event_loop_lag_seconds` | Histogram | role (api / worker) |
+| `event_loop_stalls_total` | Counter | role, graph, node |
+| `event_loop_blocked_seconds_total` | Counter | role, graph, node |
+
+이벤트 루프 메트릭은 loop_monitor.py가 기록합니다. (멈춘 동안 실행 중이던 노드, 노드 밖이면 none)
+
+노드 밖(워커 핸들러에서 직접 호출 등)에서 기록된 사용량은 graph / node가 `none`입니다.
+
+## 멀티 프로세스
+
+노드는 워커 프로세스(api/jobs/worker.py)에서 실행되므로, API 서버와 워커를
+같은 `PROMETHEUS_MULTIPROC_DIR`로 실행해야 `/metrics`에 워커의 집계가 포함됩니다.
+(prometheus_client 멀티 프로세스 모드, 배포 시작 시 디렉터리를 비워야 함)
+"""
+
+import functools
+import os
+import time
+from contextvars import ContextVar
+from types import CodeType, FrameType
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from .ledger import record_usage
+from .profiling import current_profile
+from .tracing import span
+
+
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+# 노드 실행 시간 구간 (초): 규칙 기반 노드(수 ms) ~ 긴 녹음 STT / Deep Mode 분석(수십 초)
+NODE_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+# 이벤트 루프 지연 구간 (초): 정상(1ms 미만) ~ 동기 호출로 멈춤(수 초)
+LOOP_LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Anthropic usage 필드 → kind 레이블
+TOKEN_FIELDS = (
+    ("input", "input_tokens"),
+    ("output", "output_tokens"),
+    ("cache_read", "cache_read_input_tokens"),
+    ("cache_creation", "cache_creation_input_tokens"),
+)
+
+NODE_DURATION = Histogram(
+    "langgraph_node_duration_seconds",
+    "그래프 노드 실행 시간 (초)",
+    ["graph", "node", "status"],
+    buckets=NODE_DURATION_BUCKETS,
+)
+NODE_RETRIES = Counter(
+    "langgraph_node_retries",
+    "노드 안에서 재시도한 외부 호출 수",
+    ["graph", "node", "provider"],
+)
+ANTHROPIC_TOKENS = Counter(
+    "anthropic_tokens",
+    "Claude 호출 토큰 수 (usage)",
+    ["graph", "node", "kind"],
+)
+WHISPER_AUDIO_SECONDS = Counter(
+    "whisper_audio_seconds",
+    "Whisper로 전사한 오디오 길이 (초)",
+    ["graph", "node"],
+)
+ELEVENLABS_CHARACTERS = Counter(
+    "elevenlabs_characters",
+    "ElevenLabs로 합성한 문자 수",
+    ["graph", "node"],
+)
+
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "이벤트 루프 지연 (예정보다 늦게 실행된 시간, 초)",
+    ["role"],
+    buckets=LOOP_LAG_BUCKETS,
+)
+LOOP_STALLS = Counter(
+    "event_loop_stalls",
+    "임계값 이상 이벤트 루프가 멈춘 횟수",
+    ["role", "graph", "node"],
+)
+LOOP_BLOCKED_SECONDS = Counter(
+    "event_loop_blocked_seconds",
+    "임계값 이상 멈춘 이벤트 루프 시간 (초)",
+    ["role", "graph", "node"],
+)
+
+_CURRENT_NODE: ContextVar[Tuple[str, str]] = ContextVar("metrics_node", default=("none", "none"))
+
+
+def instrument_node(graph: str, node: str, fn: Callable[..., Awaitable[dict]]) -> Callable[..., Awaitable[dict]]:
+    """
+    노드 함수를 실행 시간 기록 + 사용량 집계 + 트레이스 span / 프로파일 경계 대상으로 감싸기
+
+    시그니처는 그대로 노출되므로(functools.wraps) config 인자를 받는 노드에는
+    LangGraph가 그대로 config를 전달합니다.
+
+    Args:
+        graph: 그래프 이름 (speech_coach / refinement)
+        node: 노드 이름 (add_node에 등록하는 이름)
+        fn: 노드 함수 (async)
+    """
+    # 레이블 조합은 노드마다 고정이므로 미리 만들어 둠 (호출당 labels() 조회 생략)
+    durations = {status: NODE_DURATION.labels(graph, node, status) for status in ("ok", "error")}
+    labels = (graph, node)
+    span_name = f"node.{node}"
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> dict:
+        token = _CURRENT_NODE.set(labels)
+        profile = current_profile()
+        if profile is not None:
+            profile.mark(f"{span_name} start")
+        started = time.perf_counter()
+        status = "error"
+        try:
+            with span(span_name, graph=graph):
+                result = await fn(*args, **kwargs)
+            status = "ok"
+            return result
+        finally:
+            durations[status].observe(time.perf_counter() - started)
+            if profile is not None:
+                profile.mark(f"{span_name} end")
+            _CURRENT_NODE.reset(token)
+
+    return wrapper
+
+
+# instrument_node가 만드는 wrapper의 코드 객체 (모든 노드가 공유, 스택에서 노드 프레임 식별용)
+_WRAPPER_CODE = next(
+    const for const in instrument_node.__code__.co_consts
+    if isinstance(const, CodeType) and const.co_name == "wrapper"
+)
+
+
+def node_of_frame(frame: Optional[FrameType]) -> Optional[Tuple[str, str]]:
+    """
+    스택에서 가장 안쪽 노드 (graph, node) 찾기
+
+    다른 스레드(loop_monitor 감시 스레드)에서 루프 스레드의 스택을 볼 때 사용합니다.
+    ContextVar는 다른 스레드에서 읽을 수 없으므로 wrapper 프레임의 labels를 읽습니다.
+    """
+    while frame is not None:
+        if frame.f_code is _WRAPPER_CODE:
+            return frame.f_locals.get("labels")
+        frame = frame.f_back
+    return None
+
+
+def current_node() -> Tuple[str, str]:
+    """현재 실행 중인 노드 (graph, node), 노드 밖이면 ("none", "none")"""
+    return _CURRENT_NODE.get()
+
+
+def record_retry(provider: str) -> None:
+    """외부 호출 재시도 1회 기록 (call_with_retry에서 호출)"""
+    NODE_RETRIES.labels(*_CURRENT_NODE.get(), provider).inc()
+
+
+def record_anthropic_usage(response: Any) -> None:
+    """Claude 응답의 usage 토큰 기록 (usage가 없는 응답은 무시)"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    graph, node = _CURRENT_NODE.get()
+    tokens = {}
+    for kind, field in TOKEN_FIELDS:
+        value = getattr(usage, field, None)
+        if value:
+            ANTHROPIC_TOKENS.labels(graph, node, kind).inc(value)
+            tokens[f"{kind}_tokens"] = value
+    if tokens:
+        record_usage((graph, node), **tokens)
+
+
+def record_audio_seconds(seconds: Optional[float]) -> None:
+    """Whisper로 전사한 오디오 길이 기록"""
+    if seconds:
+        node = _CURRENT_NODE.get()
+        WHISPER_AUDIO_SECONDS.labels(*node).inc(seconds)
+        record_usage(node, audio_seconds=seconds)
+
+
+def record_tts_characters(characters: int) -> None:
+    """ElevenLabs로 합성한 문자 수 기록"""
+    if characters:
+        node = _CURRENT_NODE.get()
+        ELEVENLABS_CHARACTERS.labels(*node).inc(characters)
+        record_usage(node, tts_characters=characters)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Prometheus 텍스트 형식으로 내보내기 (멀티 프로세스 모드면 파일을 읽으므로 스레드에서 호출)
+
+    Returns:
+        (본문, Content-Type)
+    """
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
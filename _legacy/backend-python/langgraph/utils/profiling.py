@@ -0,0 +1,236 @@
+"""
+요청 단위 프로파일링 (관리자 전용)
+
+재현하기 어려운 느린 요청을 잡기 위해, 관리자 토큰을 붙인 `/analyze` · `/refine`
+실행 하나만 프로파일링합니다. (`X-Profile-Token` 헤더 또는 `?profile=` 쿼리, api/dependencies.py)
+토큰이 없는 요청은 ContextVar 조회 한 번 외에 비용이 없습니다.
+
+- CPU: 통계적 샘플링 (SIGPROF, 기본 10ms CPU 시간마다). 샘플 시점에 실행 중인 코드의
+  컨텍스트가 프로파일 대상 요청일 때만 스택을 기록하므로, 같은 이벤트 루프에서
+  동시에 실행 중인 다른 요청의 스택은 섞이지 않습니다. (요청이 만든 asyncio 작업은 포함)
+- 메모리: 그래프 노드 경계마다 tracemalloc 스냅샷 → 노드별 할당 차이
+
+## 출력 (`PROFILE_DIR/<profile_id>/`)
+
+- `<이름>.folded`: collapsed stack (flamegraph.pl, speedscope, inferno에서 그대로 열림)
+- `<이름>.alloc.txt`: 노드 경계 사이의 할당 차이 (코드 위치별 상위 항목)
+
+이름은 실행 위치입니다. (워커의 `job.analyze`, API 서버의 `refine.stage2` / `analyze.upload` 등)
+
+## 제약
+
+- 프로세스당 동시에 하나만 프로파일링합니다. (이미 실행 중이면 건너뜀)
+- tracemalloc은 프로세스 전역이므로 프로파일 중에는 같은 프로세스의 할당이 조금 느려지고,
+  할당 차이에 동시에 실행 중인 작업의 할당이 섞일 수 있습니다.
+- CPU 샘플링은 이벤트 루프가 메인 스레드에서 실행될 때만 가능합니다. (아니면 메모리만 기록)
+"""
+
+import asyncio
+import contextlib
+import os
+import signal
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from types import CodeType, FrameType
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "data/profiles")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "10")) / 1000
+
+# 노드 경계 구간마다 기록하는 할당 차이 항목 수
+ALLOC_TOP = 15
+
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_PROFILE: ContextVar[Optional["Profile"]] = ContextVar("profile", default=None)
+
+# 프로세스에서 실행 중인 프로파일 (SIGPROF / tracemalloc은 프로세스에 하나뿐)
+_active: Optional["Profile"] = None
+
+
+def new_profile_id() -> str:
+    """프로파일 ID (시간순 정렬되는 디렉터리 이름)"""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+class Profile:
+    """
+    실행 하나의 CPU 샘플 + 노드 경계 메모리 스냅샷
+
+    Args:
+        profile_id: 프로파일 ID (요청마다 발급, 출력 디렉터리 이름)
+        name: 실행 위치 (출력 파일 이름)
+        directory: 출력 루트 디렉터리
+    """
+
+    def __init__(self, profile_id: str, name: str, directory: str = PROFILE_DIR):
+        self.profile_id = profile_id
+        self.name = name
+        self.directory = directory
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.sampling = False
+        self.marks: List[Tuple[str, float, tracemalloc.Snapshot]] = []
+        self._labels: Dict[CodeType, str] = {}
+        self._started = time.perf_counter()
+        self._duration = 0.0
+
+    def sample(self, frame: FrameType) -> None:
+        """현재 스택 하나 기록 (SIGPROF 핸들러에서 호출)"""
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        codes.reverse()
+        self.stacks[tuple(codes[_task_root(codes):])] += 1
+        self.samples += 1
+
+    def mark(self, label: str) -> None:
+        """노드 경계 스냅샷 (tracemalloc이 켜져 있을 때만, 필터 / 비교는 write에서)"""
+        if tracemalloc.is_tracing():
+            self.marks.append((label, time.perf_counter() - self._started, tracemalloc.take_snapshot()))
+
+    def finish(self) -> None:
+        self._duration = time.perf_counter() - self._started
+
+    def write(self) -> str:
+        """collapsed stack / 할당 차이 파일 쓰기 (스냅샷 비교가 무거우므로 스레드에서 호출)"""
+        directory = os.path.join(self.directory, self.profile_id)
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, self.name.replace("/", "_").replace(" ", "_"))
+
+        with open(f"{base}.folded", "w") as file:
+            for codes, count in self.stacks.most_common():
+                file.write(f"{';'.join(self._label(code) for code in codes) or '(root)'} {count}\n")
+
+        with open(f"{base}.alloc.txt", "w") as file:
+            file.write(
+                f"# {self.profile_id} {self.name}: {self._duration:.3f}s, "
+                f"{self.samples} CPU samples ({PROFILE_INTERVAL * 1000:g}ms, "
+                f"{'on' if self.sampling else 'off'})\n"
+            )
+            snapshots = [snapshot.filter_traces(_SNAPSHOT_FILTERS) for _, _, snapshot in self.marks]
+            for index in range(1, len(self.marks)):
+                (before, started, _), (after, ended, _) = self.marks[index - 1], self.marks[index]
+                stats = snapshots[index].compare_to(snapshots[index - 1], "lineno")
+                total = sum(stat.size_diff for stat in stats)
+                file.write(f"\n## {before} → {after} ({ended - started:.3f}s): {total / 1024:+.1f} KiB\n")
+                for stat in sorted(stats, key=lambda stat: abs(stat.size_diff), reverse=True)[:ALLOC_TOP]:
+                    if stat.size_diff:
+                        file.write(
+                            f"{stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+7d} blocks  "
+                            f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}\n"
+                        )
+        return directory
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            path = code.co_filename
+            if path.startswith(os.getcwd()):
+                path = os.path.relpath(path)
+            label = self._labels[code] = f"{code.co_qualname} ({path}:{code.co_firstlineno})"
+        return label
+
+
+def _task_root(codes: List[CodeType]) -> int:
+    """이벤트 루프 프레임(asyncio 내부)을 건너뛴 작업 코드의 시작 위치"""
+    seen_loop = False
+    for index, code in enumerate(codes):
+        in_asyncio = code.co_filename.startswith(_ASYNCIO_DIR)
+        if in_asyncio:
+            seen_loop = True
+        elif seen_loop:
+            return index
+    return 0
+
+
+def _on_sample(signum: int, frame: Optional[FrameType]) -> None:
+    # 핸들러는 메인 스레드에서 실행 중인 코드의 컨텍스트에서 호출됨 (다른 요청이면 None)
+    profile = _PROFILE.get()
+    if profile is not None and profile is _active and frame is not None:
+        profile.sample(frame)
+
+
+def current_profile() -> Optional[Profile]:
+    """현재 컨텍스트의 프로파일 (프로파일 대상 요청이 아니면 None)"""
+    return _PROFILE.get()
+
+
+def _start_sampler() -> Optional[object]:
+    """SIGPROF 샘플러 시작 (메인 스레드가 아니면 None → 메모리만 기록)"""
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        return None
+    previous = signal.signal(signal.SIGPROF, _on_sample)
+    # 샘플 신호가 스레드의 시스템 호출을 EINTR로 끊지 않도록 재시작
+    signal.siginterrupt(signal.SIGPROF, False)
+    signal.setitimer(signal.ITIMER_PROF, PROFILE_INTERVAL, PROFILE_INTERVAL)
+    return previous
+
+
+def _stop_sampler(previous: object) -> None:
+    signal.setitimer(signal.ITIMER_PROF, 0)
+    signal.signal(signal.SIGPROF, previous)
+
+
+@contextlib.asynccontextmanager
+async def profile_run(
+    profile_id: Optional[str],
+    name: str,
+    directory: Optional[str] = None,
+) -> AsyncIterator[Optional[Profile]]:
+    """
+    블록 실행을 프로파일링 (profile_id가 없으면 아무것도 하지 않음)
+
+    블록 안에서 만든 asyncio 작업도 컨텍스트를 물려받아 샘플에 포함됩니다.
+    yield 사이에 걸치지 않도록 await 하나를 감싸는 용도로 사용합니다. (SSE 제너레이터 안 등)
+
+    Args:
+        profile_id: 요청의 프로파일 ID (payload의 "profile" 등)
+        name: 실행 위치 (출력 파일 이름)
+        directory: 출력 루트 디렉터리 (기본: PROFILE_DIR)
+    """
+    global _active
+
+    if not profile_id:
+        yield None
+        return
+    if _active is not None:
+        print(f"[profile] {profile_id} {name} skipped: {_active.profile_id} is running in this process")
+        yield None
+        return
+
+    profile = _active = Profile(profile_id, name, directory or PROFILE_DIR)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    previous = _start_sampler()
+    profile.sampling = previous is not None
+    token = _PROFILE.set(profile)
+    profile.mark("start")
+    try:
+        yield profile
+    finally:
+        profile.mark("end")
+        if previous is not None:
+            _stop_sampler(previous)
+        if started_tracing:
+            tracemalloc.stop()
+        _PROFILE.reset(token)
+        profile.finish()
+        _active = None
+        try:
+            path = await asyncio.to_thread(profile.write)
+            print(f"[profile] {profile_id} {name}: {profile.samples} samples → {path}")
+        except Exception as e:
+            print(f"[profile] {profile_id} {name} write failed: {e}")
@@ -86,6 +86,39 @@ REFLECTION_SYSTEM_PROMPT = """당신은 스피치 코칭 품질 검토자입니
 # 프롬프트 빌더 함수
 # ============================================
 
+def format_time(seconds: float) -> str:
+    """초를 m:ss 형식으로"""
+    seconds = int(seconds)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def format_pace_timeline(pace_timeline: dict = None) -> str:
+    """
+    구간별 말 속도 요약 (analyze_pace_timeline 결과, 없으면 빈 문자열)
+
+    "### 말 속도" 섹션 뒤에 이어 붙이는 형식입니다.
+    """
+    if not pace_timeline:
+        return ""
+
+    def intervals(items: list) -> str:
+        if not items:
+            return "없음"
+        return ", ".join(
+            f"{format_time(i['start'])}-{format_time(i['end'])} ({i['wpm']} WPM)" for i in items
+        )
+
+    long_pauses = ", ".join(
+        f"{format_time(p['start'])} ({p['end'] - p['start']:.1f}초)" for p in pace_timeline.get("long_pauses", [])
+    ) or "없음"
+
+    return f"""
+- 구간별 WPM (10초 윈도우): 하위 10% {pace_timeline.get('wpm_p10')} / 중앙값 {pace_timeline.get('wpm_median')} / 상위 10% {pace_timeline.get('wpm_p90')}
+- 빨라진 구간: {intervals(pace_timeline.get('rush_intervals', []))}
+- 늘어진 구간: {intervals(pace_timeline.get('stall_intervals', []))}
+- 단어 사이 긴 멈춤: {long_pauses}"""
+
+
 def build_analysis_prompt(
     transcript: str,
     pace_data: dict,
@@ -93,11 +126,14 @@ def build_analysis_prompt(
     structure_data: dict = None,
     user_patterns: dict = None,
     previous_sessions: List[dict] = None,
+    pause_data: dict = None,
+    pace_timeline: dict = None,
+    document_passages: List[str] = None,
 ) -> str:
     """
     분석 프롬프트 구성
     
-    도구에서 수집한 객관적 데이터와 Progressive Context를 포함합니다.
+    도구에서 수집한 객관적 데이터와 Progressive Context, (Deep Mode) 관련 문서 구간을 포함합니다.
     """
     
     prompt_parts = []
@@ -114,13 +150,21 @@ def build_analysis_prompt(
 ### 말 속도
 - WPM: {pace_data.get('words_per_minute', 'N/A')}
 - 평가: {pace_data.get('assessment', 'N/A')}
-- 목표 범위: {pace_data.get('target_range', '120-170 WPM')}
+- 목표 범위: {pace_data.get('target_range', '120-170 WPM')}{format_pace_timeline(pace_timeline)}
 
 ### 필러워드
 - 개수: {filler_data.get('filler_count', 0)}개
 - 비율: {filler_data.get('filler_percentage', 0)}%
 - 평가: {filler_data.get('assessment', 'N/A')}""")
     
+    # 멈춤 데이터 (오디오 VAD 결과, 있으면)
+    if pause_data:
+        prompt_parts.append(f"""
+### 멈춤 (무음 구간)
+- 횟수: {pause_data.get('pause_count', 0)}회 (2초 이상 {pause_data.get('long_pause_count', 0)}회)
+- 평균 길이: {pause_data.get('mean_pause_seconds', 0)}초
+- 가장 긴 멈춤: {pause_data.get('longest_pause_seconds', 0)}초""")
+    
     # 3. STAR 구조 데이터 (있으면)
     if structure_data:
         elements = structure_data.get('elements_found', {})
@@ -144,7 +188,14 @@ def build_analysis_prompt(
 이 유저에게는 위 반복 패턴에 대한 진전 여부를 확인하고, 
 격려하거나 추가 조언을 해주세요.""")
     
-    # 5. 분석 요청
+    # 5. 관련 문서 구간 (Deep Mode, 있으면)
+    if document_passages:
+        prompt_parts.append(format_document_passages(document_passages) + """
+
+답변 내용이 위 문서의 경험/성과와 맞는지, 문서에 있는 구체적인 수치나 사례를
+답변에서 더 살릴 수 있는지 content_specificity 평가와 제안에 반영해주세요.""")
+    
+    # 6. 분석 요청
     prompt_parts.append("""
 ## 요청사항
 
@@ -172,6 +223,7 @@ def build_improvement_prompt(
     transcript: str,
     analysis: dict,
     question: Optional[str] = None,
+    document_passages: List[str] = None,
 ) -> str:
     """개선안 생성 프롬프트 구성"""
     
@@ -198,7 +250,13 @@ def build_improvement_prompt(
 
 {suggestion_text}""")
     
-    # 4. 개선 요청
+    # 4. 관련 문서 구간 (Deep Mode, 있으면)
+    if document_passages:
+        prompt_parts.append(format_document_passages(document_passages) + """
+
+문서에 있는 사실(수치, 프로젝트명)만 활용하고, 문서에 없는 경험은 지어내지 마세요.""")
+    
+    # 5. 개선 요청
     prompt_parts.append("""
 ## 요청사항
 
@@ -213,6 +271,17 @@ def build_improvement_prompt(
     return "\n".join(prompt_parts)
 
 
+def format_document_passages(document_passages: List[str]) -> str:
+    """관련 문서 구간 섹션 (BM25 검색 결과, 없으면 빈 문자열)"""
+    if not document_passages:
+        return ""
+    passages = "\n\n".join(f"{i}. {passage}" for i, passage in enumerate(document_passages, 1))
+    return f"""
+## 관련 문서 발췌 (이력서/포트폴리오)
+
+{passages}"""
+
+
 def build_reflection_prompt(
     original: str,
     draft: str,
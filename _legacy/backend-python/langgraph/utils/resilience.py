@@ -0,0 +1,546 @@
+"""
+외부 API 호출 복원력(Resilience) 유틸리티
+
+Claude(`messages.create`), Whisper(`transcriptions.create`), ElevenLabs/Storage(httpx)
+호출에서 공통으로 사용하는 재시도 · 서킷 브레이커 · 헤지 요청 레이어입니다.
+
+## 구성 요소
+
+1. **에러 분류**: 일시적 장애(5xx, 429, 타임아웃, 연결 끊김)만 재시도하고
+   4xx 같은 영구적 에러는 즉시 실패시킵니다.
+2. **지수 백오프 + 지터**: `base * 2^n` 상한 안에서 무작위 대기(Full Jitter).
+   서버가 `retry-after` 헤더를 보내면 그 값을 우선합니다.
+3. **서킷 브레이커**: 제공자(provider)별로 연속 실패를 집계하여,
+   장애 중인 제공자에게는 요청을 보내지 않고 즉시 실패합니다.
+4. **헤지 요청(Hedged Request)**: 일정 시간 안에 응답이 없으면 같은 요청을
+   하나 더 보내고 먼저 도착한 응답을 사용합니다. (Stage 1 프리뷰용, 선택적)
+5. **동시 호출 제한**: 한 요청이 여러 호출을 동시에 보낼 때(분할 전사 등)
+   제공자별 상한(`provider_slot`)을 넘지 않도록 합니다.
+
+재시도 횟수와 Claude 응답의 usage 토큰은 현재 노드 기준으로 메트릭에 기록하고 (metrics.py),
+샘플링된 트레이스 안에서는 시도마다 `upstream.<provider>` span을 남깁니다 (tracing.py).
+
+## 사용 예시
+
+```python
+response = await call_with_retry(
+    "anthropic",
+    lambda: client.messages.create(...),
+)
+```
+
+SDK 클라이언트는 `max_retries=0`으로 만듭니다. (`AsyncAnthropic(max_retries=0)`)
+SDK 자체 재시도(기본 2회)는 서킷 · 재시도 메트릭 · 데드라인에 보이지 않고 이 레이어의 재시도와 곱해집니다.
+"""
+
+import asyncio
+import contextlib
+import email.utils
+import os
+import random
+import time
+import weakref
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Literal, Optional, TypeVar
+
+import httpx
+
+from .deadline import MIN_CALL_TIMEOUT, Deadline, DeadlineExceeded
+from .metrics import record_anthropic_usage, record_retry
+from .tracing import KIND_CLIENT, span
+
+
+T = TypeVar("T")
+
+ErrorClass = Literal["retryable", "fatal"]
+
+# 재시도 대상 HTTP 상태 코드
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+# 백오프 대기 후 최소한 남아 있어야 하는 예산 (초)
+MIN_RETRY_BUDGET = 2.0
+
+
+# ============================================
+# 에러 정의
+# ============================================
+
+class UpstreamHTTPError(ValueError):
+    """
+    httpx로 직접 호출하는 외부 API의 HTTP 에러
+
+    기존 노드들이 ValueError를 발생시키던 동작(에러 메시지 기반 분류)을 유지하면서
+    상태 코드와 응답 헤더를 함께 전달하여 재시도 여부를 판단할 수 있게 합니다.
+    """
+
+    def __init__(self, message: str, status_code: int, headers: Optional[httpx.Headers] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = headers or httpx.Headers()
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷이 열려 있어 호출을 시도하지 않고 즉시 실패한 경우"""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(
+            f"{provider} circuit is open (provider unavailable). Retry in {retry_in:.1f}s"
+        )
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+def raise_for_upstream_status(response: httpx.Response, message: str, ok_status: int = 200) -> None:
+    """
+    응답 상태 코드가 기대값이 아니면 UpstreamHTTPError 발생
+
+    Args:
+        response: httpx 응답
+        message: 에러 메시지 앞부분 (예: "ElevenLabs TTS failed")
+        ok_status: 성공으로 간주할 상태 코드
+    """
+    if response.status_code != ok_status:
+        raise UpstreamHTTPError(
+            f"{message}: {response.status_code} - {response.text}",
+            status_code=response.status_code,
+            headers=response.headers,
+        )
+
+
+# ============================================
+# 에러 분류 & retry-after
+# ============================================
+
+def _status_code_of(error: BaseException) -> Optional[int]:
+    """SDK/httpx 에러에서 HTTP 상태 코드 추출"""
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code
+
+    response = getattr(error, "response", None)
+    status_code = getattr(response, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code
+
+    return None
+
+
+def _headers_of(error: BaseException) -> Optional[httpx.Headers]:
+    """SDK/httpx 에러에서 응답 헤더 추출"""
+    headers = getattr(error, "headers", None)
+    if headers is not None:
+        return headers
+
+    response = getattr(error, "response", None)
+    return getattr(response, "headers", None)
+
+
+def classify_error(error: BaseException) -> ErrorClass:
+    """
+    에러를 재시도 가능 여부로 분류
+
+    anthropic/openai SDK는 에러에 `status_code`와 `response`를 붙여주고,
+    타임아웃/연결 에러는 클래스 이름(APITimeoutError, APIConnectionError)으로 구분됩니다.
+    SDK를 직접 import하지 않고 속성만으로 판단하여 모든 제공자에 공통 적용합니다.
+
+    Returns:
+        "retryable": 일시적 장애 (재시도 대상)
+        "fatal": 영구적 에러 (즉시 실패)
+    """
+    if isinstance(error, (CircuitOpenError, DeadlineExceeded)):
+        return "fatal"
+
+    if isinstance(error, (asyncio.TimeoutError, httpx.TimeoutException, httpx.TransportError)):
+        return "retryable"
+
+    status_code = _status_code_of(error)
+    if status_code is not None:
+        if status_code in RETRYABLE_STATUS_CODES or status_code >= 500:
+            return "retryable"
+        return "fatal"
+
+    error_name = type(error).__name__
+    if "Timeout" in error_name or "Connection" in error_name:
+        return "retryable"
+
+    return "fatal"
+
+
+def parse_retry_after(headers: Optional[Any]) -> Optional[float]:
+    """
+    retry-after 헤더 파싱
+
+    `retry-after-ms`(밀리초), `retry-after`(초 또는 HTTP-date) 순서로 확인합니다.
+
+    Returns:
+        Optional[float]: 대기 시간 (초), 헤더가 없거나 해석 불가 시 None
+    """
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(float(retry_after_ms) / 1000.0, 0.0)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+# ============================================
+# 재시도 정책
+# ============================================
+
+class RetryPolicy:
+    """
+    재시도 정책
+
+    Args:
+        max_attempts: 최대 시도 횟수 (첫 시도 포함)
+        base_delay: 백오프 기본 대기 시간 (초)
+        max_delay: 백오프 최대 대기 시간 (초)
+        max_retry_after: 이보다 긴 retry-after는 기다리지 않고 실패 (초)
+        attempt_timeout: 시도 1회당 타임아웃 (초, None이면 SDK 기본값)
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        max_retry_after: float = 30.0,
+        attempt_timeout: Optional[float] = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.attempt_timeout = attempt_timeout
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        n번째 실패 후 대기 시간 계산
+
+        retry-after가 있으면 그 값을, 없으면 Full Jitter 백오프를 사용합니다.
+
+        Args:
+            attempt: 실패한 시도 번호 (1부터 시작)
+            retry_after: 서버가 지정한 대기 시간 (초)
+        """
+        if retry_after is not None:
+            return retry_after
+
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+# 제공자별 기본 정책
+DEFAULT_POLICIES: Dict[str, RetryPolicy] = {
+    "anthropic": RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=8.0),
+    "openai": RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=8.0),
+    "elevenlabs": RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=8.0),
+    "storage": RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=4.0),
+}
+
+
+def get_retry_policy(provider: str) -> RetryPolicy:
+    """제공자별 재시도 정책 반환 (없으면 기본 정책)"""
+    return DEFAULT_POLICIES.get(provider) or RetryPolicy()
+
+
+# ============================================
+# 서킷 브레이커
+# ============================================
+
+class CircuitBreaker:
+    """
+    제공자별 서킷 브레이커
+
+    ## 상태 전이
+
+    - closed: 정상. 연속 실패가 failure_threshold에 도달하면 open
+    - open: 차단. recovery_timeout 동안 모든 호출을 즉시 실패
+    - half_open: 시험. 한 번의 호출만 허용하고 성공하면 closed, 실패하면 다시 open
+
+    영구적 에러(4xx)는 제공자가 살아있다는 뜻이므로 실패로 집계하지 않습니다.
+    """
+
+    def __init__(self, provider: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self.state: Literal["closed", "open", "half_open"] = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def before_call(self) -> bool:
+        """
+        호출 전 상태 확인
+
+        Returns:
+            bool: half_open 상태의 시험 호출인지 (끝나면 release_trial로 반납)
+
+        Raises:
+            CircuitOpenError: 서킷이 열려 있는 경우
+        """
+        if self.state == "open":
+            elapsed = time.monotonic() - self.opened_at
+            if elapsed < self.recovery_timeout:
+                raise CircuitOpenError(self.provider, self.recovery_timeout - elapsed)
+            self.state = "half_open"
+            self._trial_in_flight = False
+
+        if self.state == "half_open":
+            if self._trial_in_flight:
+                raise CircuitOpenError(self.provider, self.recovery_timeout)
+            self._trial_in_flight = True
+            return True
+
+        return False
+
+    def record_success(self) -> None:
+        """성공 기록 (서킷 닫기)"""
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """일시적 장애 기록"""
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """
+        시험 호출 반납
+
+        취소되거나 상태 코드 없는 영구적 에러로 끝나 성공 / 실패를 기록하지 않은 시험 호출도
+        반납해야 다음 호출이 다시 시험할 수 있습니다. (상태는 half_open 유지)
+        """
+        self._trial_in_flight = False
+
+    def reset(self) -> None:
+        """상태 초기화 (테스트용)"""
+        self.record_success()
+
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """제공자별 서킷 브레이커 반환 (프로세스 전역 공유)"""
+    breaker = _circuit_breakers.get(provider)
+    if breaker is None:
+        breaker = CircuitBreaker(provider)
+        _circuit_breakers[provider] = breaker
+    return breaker
+
+
+def reset_circuit_breakers() -> None:
+    """모든 서킷 브레이커 초기화 (테스트용)"""
+    _circuit_breakers.clear()
+
+
+# ============================================
+# 제공자별 동시 호출 제한
+# ============================================
+
+# 프로세스 안에서 동시에 진행할 수 있는 호출 수 (없는 제공자는 제한 없음)
+PROVIDER_CONCURRENCY: Dict[str, int] = {
+    "openai": int(os.getenv("OPENAI_MAX_CONCURRENCY", "4")),
+    "anthropic": int(os.getenv("ANTHROPIC_MAX_CONCURRENCY", "4")),
+}
+
+# 세마포어는 이벤트 루프에 묶이므로 루프별로 관리
+_provider_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@contextlib.asynccontextmanager
+async def provider_slot(provider: str) -> AsyncIterator[None]:
+    """
+    제공자 동시 호출 슬롯 획득
+
+    ```python
+    async with provider_slot("openai"):
+        await call_with_retry("openai", ...)
+    ```
+    """
+    limit = PROVIDER_CONCURRENCY.get(provider)
+    if not limit:
+        yield
+        return
+
+    semaphores = _provider_semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphore = semaphores.get(provider)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(limit)
+        semaphores[provider] = semaphore
+
+    async with semaphore:
+        yield
+
+
+# ============================================
+# 재시도 실행
+# ============================================
+
+async def call_with_retry(
+    provider: str,
+    operation: Callable[[], Awaitable[T]],
+    policy: Optional[RetryPolicy] = None,
+    deadline: Optional[Deadline] = None,
+) -> T:
+    """
+    재시도 + 서킷 브레이커를 적용하여 외부 호출 실행
+
+    operation은 매 시도마다 새로 호출되므로, 파일 핸들이나 요청 본문을
+    operation 안에서 생성해야 합니다.
+
+    데드라인이 주어지면 각 시도는 남은 예산 안에서만 실행되고,
+    백오프 대기가 예산을 넘는 경우 재시도하지 않습니다.
+
+    Args:
+        provider: 제공자 이름 (anthropic/openai/elevenlabs/storage)
+        operation: 인자 없는 코루틴 함수 (예: lambda: client.messages.create(...))
+        policy: 재시도 정책 (None이면 제공자 기본 정책)
+        deadline: 요청 단위 데드라인 (선택)
+
+    Returns:
+        operation의 결과
+
+    Raises:
+        CircuitOpenError: 서킷이 열려 있는 경우
+        DeadlineExceeded: 데드라인 안에 완료하지 못한 경우
+        Exception: 영구적 에러 또는 재시도 소진 시 마지막 에러
+    """
+    policy = policy or get_retry_policy(provider)
+    breaker = get_circuit_breaker(provider)
+
+    attempt = 0
+    while True:
+        attempt += 1
+        attempt_timeout = policy.attempt_timeout
+        if deadline is not None:
+            attempt_timeout = deadline.timeout(attempt_timeout or float("inf"), provider)
+
+        trial = breaker.before_call()
+
+        try:
+            try:
+                with span(f"upstream.{provider}", KIND_CLIENT, attempt=attempt):
+                    if attempt_timeout:
+                        result = await asyncio.wait_for(operation(), timeout=attempt_timeout)
+                    else:
+                        result = await operation()
+            finally:
+                # 취소 / 데드라인 / 상태 코드 없는 영구 에러로 끝나도 시험 슬롯이 남지 않도록 반납
+                # (성공 / 실패는 아래에서 대기 없이 이어서 기록)
+                if trial:
+                    breaker.release_trial()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if deadline is not None and deadline.remaining() < MIN_CALL_TIMEOUT:
+                # 예산 소진으로 인한 타임아웃은 재시도하지 않음
+                deadline.record_miss(provider)
+                raise DeadlineExceeded(provider) from e
+
+            if classify_error(e) == "fatal":
+                # 4xx는 제공자가 응답했다는 뜻 → 서킷에는 성공으로 기록
+                if _status_code_of(e) is not None:
+                    breaker.record_success()
+                raise
+
+            breaker.record_failure()
+
+            if attempt >= policy.max_attempts:
+                raise
+
+            retry_after = parse_retry_after(_headers_of(e))
+            if retry_after is not None and retry_after > policy.max_retry_after:
+                raise
+
+            delay = policy.backoff_delay(attempt, retry_after)
+            if deadline is not None and deadline.remaining() - delay < MIN_RETRY_BUDGET:
+                # 대기 후 남는 예산으로는 의미 있는 재시도가 불가능
+                deadline.record_miss(provider)
+                raise
+
+            record_retry(provider)
+            await asyncio.sleep(delay)
+            continue
+
+        breaker.record_success()
+        if provider == "anthropic":
+            record_anthropic_usage(result)
+        return result
+
+
+def hedged(
+    operation: Callable[[], Awaitable[T]],
+    hedge_delay: float,
+    max_hedges: int = 1,
+) -> Callable[[], Awaitable[T]]:
+    """
+    헤지 요청으로 감싼 operation 반환
+
+    첫 요청이 hedge_delay 안에 끝나지 않으면 동일한 요청을 추가로 보내고
+    가장 먼저 끝난 요청의 결과를 사용합니다. 나머지 요청은 취소됩니다.
+    먼저 끝난 요청이 실패하면 헤지하지 않고 그 에러를 그대로 올려 재시도 여부를 call_with_retry에 맡깁니다.
+    비용이 최대 (1 + max_hedges)배가 될 수 있으므로 지연에 민감한 짧은 호출에만 사용합니다.
+
+    Args:
+        operation: 인자 없는 코루틴 함수
+        hedge_delay: 추가 요청을 보내기 전 대기 시간 (초)
+        max_hedges: 추가로 보낼 최대 요청 수
+
+    Returns:
+        call_with_retry에 그대로 넘길 수 있는 operation
+    """
+
+    async def _hedged_operation() -> T:
+        pending: set = {asyncio.ensure_future(operation())}
+        hedges_sent = 0
+
+        try:
+            while True:
+                timeout = hedge_delay if hedges_sent < max_hedges else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                # 먼저 끝난 요청의 결과 / 에러를 그대로 반환 (실패는 call_with_retry가 분류:
+                # 4xx를 다시 보내 비용을 두 번 내거나 429의 retry-after를 무시하지 않도록)
+                if done:
+                    finished = next((task for task in done if task.exception() is None), next(iter(done)))
+                    return finished.result()
+
+                # 시간 초과일 때만 헤지 요청 추가
+                pending.add(asyncio.ensure_future(operation()))
+                hedges_sent += 1
+        finally:
+            for task in pending:
+                task.cancel()
+
+    return _hedged_operation
@@ -0,0 +1,316 @@
+"""
+프로젝트 문서 검색 (BM25) 유틸리티
+
+Deep Mode 분석/개선 프롬프트에 문서 전체를 넣는 대신, 연습 질문과 답변(transcript)에
+관련된 문서 구간(passage) 몇 개만 골라 넣기 위한 프로세스 내 어휘 검색입니다.
+외부 검색 엔진이나 임베딩 API 없이 numpy만 사용합니다.
+
+## 토큰화 (한국어)
+- 한글 어절은 음절 바이그램으로 나눔 (조사/어미가 붙어도 어간이 겹치면 일치)
+  예: "캐시를 도입했습니다" → 캐시, 시를, 도입, 입했, 했습, 습니, 니다
+- 한 글자 어절, 영문/숫자 단어는 그대로 (소문자)
+
+## 색인
+- 문서를 `PASSAGE_CHARS` 단위 구간으로 나눔 (split_text, 문서 경계를 넘지 않음)
+- 단어별 (구간 번호, 빈도) 목록을 CSR 배열로 보관 → 질의 단어의 목록만 훑어 점수 계산
+- 프로젝트 문서 내용 해시(corpus_digest)별로 `DOCUMENT_INDEX_DIR`에 저장
+  (`{project_id}-{digest}.npz` + 구간 `.json`, 문서가 바뀌면 이전 파일은 삭제)
+
+## 사용 예시
+
+```python
+index = load_or_build_index(project_id, documents)
+passages = [index.passages[i] for i, _ in index.search(question + transcript, k=4)]
+```
+"""
+
+import glob
+import hashlib
+import json
+import math
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .documents import split_text
+from .tracing import traced
+
+
+# 색인 저장 위치 / 검색 구간 수
+DOCUMENT_INDEX_DIR = os.getenv("DOCUMENT_INDEX_DIR", "data/document_index")
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "4"))
+
+# 검색 구간 길이 / 겹침 (문자 수)
+PASSAGE_CHARS = 600
+PASSAGE_OVERLAP_CHARS = 100
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 토큰화/구간 규칙이 바뀌면 올림 (저장된 색인 무효화)
+INDEX_VERSION = 1
+
+# 한글 바이그램 (겹침, 폭 0 전방 탐색) | 한 글자 한글 어절 | 영문/숫자 단어
+_TOKEN = re.compile(r"(?=([가-힣]{2}))|(?<![가-힣])([가-힣])(?![가-힣])|([a-z0-9]+)")
+_LATIN = re.compile(r"[a-z0-9]+")
+
+# 색인 생성 시 한글 토큰을 정수 키로 표현 (바이그램: 0 ~ N²-1, 한 글자: N² ~ N²+N-1)
+_HANGUL_FIRST = 0xAC00
+_HANGUL_COUNT = 11172
+_SINGLE_OFFSET = _HANGUL_COUNT ** 2
+_LATIN_OFFSET = _SINGLE_OFFSET + _HANGUL_COUNT
+
+
+def tokenize(text: str) -> List[str]:
+    """한글 어절은 음절 바이그램, 영문/숫자는 단어 단위로 토큰화"""
+    return [bigram or single or word for bigram, single, word in _TOKEN.findall((text or "").lower())]
+
+
+def split_passages(documents: Sequence[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    프로젝트 문서를 검색 구간으로 나눔 (문서 순서 유지, 내용 없는 문서는 제외)
+
+    Returns:
+        List[dict]: [{"document_type", "text"}, ...]
+    """
+    passages = []
+    for document in documents:
+        document_type = document.get("document_type") or "unknown"
+        for text in split_text(document.get("extracted_text") or "", PASSAGE_CHARS, PASSAGE_OVERLAP_CHARS):
+            passages.append({"document_type": document_type, "text": text})
+    return passages
+
+
+def corpus_digest(documents: Sequence[Dict[str, Any]]) -> str:
+    """색인 캐시 키 (색인 버전 + 문서 타입/내용의 SHA-256)"""
+    digest = hashlib.sha256(f"{INDEX_VERSION}:{PASSAGE_CHARS}:{PASSAGE_OVERLAP_CHARS}".encode())
+    for document in documents:
+        digest.update(f"\n\0{document.get('document_type')}\n{document.get('extracted_text') or ''}".encode())
+    return digest.hexdigest()
+
+
+class BM25Index:
+    """
+    BM25 역색인
+
+    Attributes:
+        passages: 구간 목록 ([{"document_type", "text"}])
+        terms: 단어 목록 (단어 번호 순)
+        indptr: 단어 i의 목록 위치 [indptr[i], indptr[i + 1])
+        doc_ids: 목록의 구간 번호
+        tfs: 목록의 단어 빈도
+        doc_lengths: 구간별 토큰 수
+    """
+
+    def __init__(
+        self,
+        passages: List[Dict[str, str]],
+        terms: List[str],
+        indptr: np.ndarray,
+        doc_ids: np.ndarray,
+        tfs: np.ndarray,
+        doc_lengths: np.ndarray,
+    ):
+        self.passages = passages
+        self.terms = terms
+        self.vocabulary = {term: i for i, term in enumerate(terms)}
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_lengths = doc_lengths
+
+        average = float(doc_lengths.mean()) if len(doc_lengths) else 1.0
+        # 구간 길이 정규화 항은 질의와 무관하므로 미리 계산
+        self._norms = (BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / max(average, 1.0))).astype(np.float32)
+
+    @classmethod
+    def build(cls, passages: List[Dict[str, str]]) -> "BM25Index":
+        """
+        구간 목록으로 색인 생성
+
+        tokenize와 같은 토큰을 만들되, 한글 바이그램은 문자 코드 배열에서 한 번에 뽑습니다.
+        (구간 수만 개에서 토큰마다 Python 문자열을 만드는 비용을 피함)
+        """
+        count = len(passages)
+        texts = [passage["text"].lower() for passage in passages]
+        keys, owners = _hangul_keys(texts)
+
+        # 영문/숫자 단어는 문자열 그대로 (한국어 문서에서는 소수)
+        latin_ids: Dict[str, int] = {}
+        latin_keys: List[int] = []
+        latin_owners: List[int] = []
+        for doc_id, text in enumerate(texts):
+            for word in _LATIN.findall(text):
+                latin_keys.append(_LATIN_OFFSET + latin_ids.setdefault(word, len(latin_ids)))
+                latin_owners.append(doc_id)
+        keys = np.concatenate([keys, np.asarray(latin_keys, dtype=np.int64)])
+        owners = np.concatenate([owners, np.asarray(latin_owners, dtype=np.int64)])
+
+        # 토큰 키 → 단어 번호, (단어, 구간) 쌍별 빈도 → 단어 순으로 정렬된 CSR 배열
+        unique_keys, term_ids = np.unique(keys, return_inverse=True)
+        latin_words = list(latin_ids)
+        terms = [_key_term(int(key), latin_words) for key in unique_keys]
+
+        width = max(count, 1)
+        pairs, tfs = np.unique(term_ids.astype(np.int64) * width + owners, return_counts=True)
+        indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pairs // width, minlength=len(terms)), out=indptr[1:])
+
+        return cls(
+            passages,
+            terms,
+            indptr,
+            (pairs % width).astype(np.int32),
+            tfs.astype(np.float32),
+            np.bincount(owners, minlength=count).astype(np.int32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    def search(self, query: str, k: int = RETRIEVAL_TOP_K) -> List[Tuple[int, float]]:
+        """
+        질의와 관련 높은 구간 검색
+
+        Returns:
+            List[Tuple[int, float]]: (구간 번호, 점수) 점수 높은 순 (일치하는 단어가 없는 구간은 제외)
+        """
+        count = len(self.passages)
+        if not count or k <= 0:
+            return []
+
+        scores = np.zeros(count, dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            ids = self.doc_ids[start:end]
+            tf = self.tfs[start:end]
+            frequency = end - start
+            idf = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            scores[ids] += idf * tf * (BM25_K1 + 1) / (tf + self._norms[ids])
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(scores[matched], -k)[-k:]]
+        ranked = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(int(i), float(scores[i])) for i in ranked]
+
+    def save(self, path: str) -> None:
+        """`{path}.npz` (색인) + `{path}.json` (구간)으로 저장"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # 쓰는 중에 다른 워커가 읽지 않도록 임시 파일에 쓴 뒤 교체
+        with open(f"{path}.json.tmp", "w", encoding="utf-8") as f:
+            json.dump(self.passages, f, ensure_ascii=False)
+        with open(f"{path}.npz.tmp", "wb") as f:
+            np.savez(
+                f,
+                terms=np.asarray(self.terms, dtype=str),
+                indptr=self.indptr,
+                doc_ids=self.doc_ids,
+                tfs=self.tfs,
+                doc_lengths=self.doc_lengths,
+            )
+        os.replace(f"{path}.json.tmp", f"{path}.json")
+        os.replace(f"{path}.npz.tmp", f"{path}.npz")
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """save로 저장한 색인 읽기"""
+        with open(f"{path}.json", encoding="utf-8") as f:
+            passages = json.load(f)
+        with np.load(f"{path}.npz") as arrays:
+            return cls(
+                passages,
+                arrays["terms"].tolist(),
+                arrays["indptr"],
+                arrays["doc_ids"],
+                arrays["tfs"],
+                arrays["doc_lengths"],
+            )
+
+
+def _hangul_keys(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    한글 바이그램 / 한 글자 어절의 정수 키와 소속 구간 번호
+
+    구간을 줄바꿈으로 이어 붙인 문자 코드 배열에서 연속한 한글 두 글자를 찾습니다.
+    (줄바꿈이 사이에 있으므로 구간 경계를 넘는 바이그램은 생기지 않음)
+    """
+    if not texts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    joined = "\n".join(texts)
+    codes = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32).astype(np.int64) - _HANGUL_FIRST
+    hangul = (codes >= 0) & (codes < _HANGUL_COUNT)
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)) + 1
+    position_owners = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)[:len(codes)]
+
+    before = np.concatenate([[False], hangul[:-1]])
+    after = np.concatenate([hangul[1:], [False]])
+    bigrams = np.flatnonzero(hangul & after)
+    singles = np.flatnonzero(hangul & ~before & ~after)
+
+    keys = np.concatenate([
+        codes[bigrams] * _HANGUL_COUNT + codes[bigrams + 1],
+        _SINGLE_OFFSET + codes[singles],
+    ])
+    owners = np.concatenate([position_owners[bigrams], position_owners[singles]])
+    return keys, owners
+
+
+def _key_term(key: int, latin_words: List[str]) -> str:
+    """정수 토큰 키 → tokenize가 만드는 토큰 문자열"""
+    if key >= _LATIN_OFFSET:
+        return latin_words[key - _LATIN_OFFSET]
+    if key >= _SINGLE_OFFSET:
+        return chr(_HANGUL_FIRST + key - _SINGLE_OFFSET)
+    return chr(_HANGUL_FIRST + key // _HANGUL_COUNT) + chr(_HANGUL_FIRST + key % _HANGUL_COUNT)
+
+
+def index_path(project_id: str, digest: str, directory: Optional[str] = None) -> str:
+    """프로젝트 색인 파일 경로 (확장자 제외)"""
+    return os.path.join(directory or DOCUMENT_INDEX_DIR, f"{project_id}-{digest[:16]}")
+
+
+@traced("index.load_or_build")
+def load_or_build_index(
+    project_id: str,
+    documents: Sequence[Dict[str, Any]],
+    digest: Optional[str] = None,
+    directory: Optional[str] = None,
+) -> Tuple[BM25Index, bool]:
+    """
+    저장된 색인을 읽거나, 없으면 만들어 저장 (동기, 스레드에서 호출)
+
+    저장 실패는 검색을 막지 않습니다. (다음 세션에서 다시 만듦)
+
+    Returns:
+        Tuple[BM25Index, bool]: (색인, 저장된 색인 사용 여부)
+    """
+    path = index_path(project_id, digest or corpus_digest(documents), directory)
+    if os.path.exists(f"{path}.npz") and os.path.exists(f"{path}.json"):
+        try:
+            return BM25Index.load(path), True
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[retrieval] broken index {path}: {e}")
+
+    index = BM25Index.build(split_passages(documents))
+    try:
+        # 같은 프로젝트의 이전 문서 색인 정리
+        for stale in glob.glob(os.path.join(os.path.dirname(path), f"{glob.escape(project_id)}-*")):
+            if not stale.startswith(path):
+                os.remove(stale)
+        index.save(path)
+    except OSError as e:
+        print(f"[retrieval] failed to save index {path}: {e}")
+    return index, False
+
+
+def format_passage(passage: Dict[str, str]) -> str:
+    """프롬프트에 넣는 구간 표시 (예: [resume] ...)"""
+    return f"[{passage.get('document_type') or 'unknown'}] {passage['text']}"
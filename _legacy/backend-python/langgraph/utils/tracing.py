@@ -0,0 +1,476 @@
+"""
+세션 단위 트레이싱 (Chrome trace / OTLP-JSON 파일)
+
+꼬리 지연 조사를 위해 세션 하나를 타임라인으로 봅니다.
+`/analyze`, `/refine` 요청마다 루트 span을 만들고, 그래프 노드 · 외부 호출(시도별) ·
+큐 대기 · DB 조회를 하위 span으로 기록한 뒤 로컬 파일로 내보냅니다. (별도 수집 서비스 없음)
+
+## 컨텍스트 전달
+
+- 같은 프로세스: 현재 span을 ContextVar에 두므로 `asyncio.create_task` / `to_thread`로
+  만든 작업(분할 전사, 헤지 요청 등)에도 그대로 이어집니다.
+- 워커 프로세스: 작업 payload의 `traceparent`(W3C 형식 `00-<trace>-<span>-<flags>`)로 이어 받아
+  워커의 `job.<kind>` span이 API 서버 루트 span의 하위가 됩니다.
+
+## 샘플링
+
+루트 span에서 `TRACE_SAMPLE_RATE` 확률로 결정하고, 하위 span과 워커는 그 결정을 따릅니다.
+(기본 0 = 기록하지 않음. 샘플링되지 않은 요청의 span 호출은 바로 반환)
+
+## 내보내기
+
+프로세스의 루트 span(요청 / 작업)이 끝날 때 모인 span을 한 번에 파일에 추가합니다.
+
+- `traces.json`: Chrome trace 이벤트 배열 (chrome://tracing, https://ui.perfetto.dev 에서 열기)
+  트레이스마다 한 줄(tid)로 표시되고, 프로세스(API 서버 / 워커)별로 묶입니다.
+- `traces.otlp.jsonl`: 한 줄에 OTLP `ExportTraceServiceRequest` JSON 하나 (OTLP 파일 형식)
+
+API 서버와 워커가 같은 파일에 쓰므로 파일 잠금(flock) 안에서 추가하고,
+`TRACE_MAX_BYTES`를 넘으면 `.1` ~ `.{TRACE_BACKUP_COUNT}`로 돌려 씁니다.
+
+직렬화와 파일 쓰기(잠금 대기 포함)는 이벤트 루프를 막지 않도록 프로세스당 하나인
+내보내기 스레드가 큐에서 꺼내 처리합니다. 프로세스 종료 시 `await close_tracing()`으로
+남은 span을 기록합니다. (워커: api/jobs/worker.py, API 앱: lifespan)
+
+## 사용 예시
+
+```python
+trace = start_trace("POST /analyze", session_id=session_id)
+with use_span(trace, end_on_exit=True):
+    with span("db.attempts"):
+        ...
+```
+"""
+
+import asyncio
+import contextlib
+import fcntl
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+TRACE_DIR = os.getenv("TRACE_DIR", "data/traces")
+TRACE_FORMATS = tuple(f.strip() for f in os.getenv("TRACE_FORMATS", "chrome,otlp").split(",") if f.strip())
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(50 * 1024 * 1024)))
+TRACE_BACKUP_COUNT = int(os.getenv("TRACE_BACKUP_COUNT", "5"))
+
+SERVICE_NAME = "sosoo-backend"
+
+# OTLP span kind
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+TRACE_FILES = {
+    "chrome": "traces.json",
+    "otlp": "traces.otlp.jsonl",
+}
+
+_CURRENT_SPAN: ContextVar[Optional["Span"]] = ContextVar("trace_span", default=None)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    """
+    span 한 개 (시간은 epoch 기준 ns)
+
+    프로세스 안의 루트 span(`root`가 자기 자신)은 하위 span을 모아 두었다가
+    끝날 때 한 번에 내보냅니다.
+    """
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "sampled", "kind",
+        "start_ns", "end_ns", "attributes", "error", "root", "_finished", "_tracer",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        sampled: bool,
+        kind: int = KIND_INTERNAL,
+        root: Optional["Span"] = None,
+        tracer: Optional["Tracer"] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = attributes or {}
+        self.error: Optional[str] = None
+        self.root = root or self
+        self._finished: List["Span"] = []
+        self._tracer = tracer
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def child(self, name: str, kind: int = KIND_INTERNAL, **attributes: Any) -> "Span":
+        return Span(name, self.trace_id, self.span_id, self.sampled, kind, self.root, self._tracer, attributes)
+
+    def record(self, name: str, start: float, end: float, **attributes: Any) -> None:
+        """이미 지난 구간을 하위 span으로 기록 (큐 대기 등, 시각은 epoch 초)"""
+        if not self.sampled:
+            return
+        child = self.child(name, **attributes)
+        child.start_ns = int(start * 1e9)
+        child.end(end_ns=int(end * 1e9))
+
+    def end(self, error: Optional[BaseException] = None, end_ns: Optional[int] = None) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = end_ns or time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        if not self.sampled:
+            return
+
+        root = self.root
+        if root is self:
+            self._tracer.export([*self._finished, self])
+            self._finished = []
+        elif root.end_ns is None:
+            root._finished.append(self)
+        else:
+            # 루트가 끝난 뒤에 끝난 span (백그라운드 작업) → 따로 내보냄
+            self._tracer.export([self])
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[tuple]:
+    """traceparent → (trace_id, parent_span_id, sampled), 형식이 잘못되면 None"""
+    if not value:
+        return None
+    parts = value.split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+class TraceExporter:
+    """
+    span 묶음을 로컬 파일에 추가 (Chrome trace / OTLP-JSON, 크기 기준 회전)
+
+    `export`는 큐에 넣고 바로 반환하며, 백그라운드 스레드가 순서대로 파일에 씁니다.
+
+    Args:
+        directory: 저장 위치
+        formats: 내보낼 형식 ("chrome", "otlp")
+        max_bytes: 파일 하나의 최대 크기 (넘으면 회전)
+        backup_count: 보관하는 이전 파일 수
+    """
+
+    def __init__(
+        self,
+        directory: str = TRACE_DIR,
+        formats: tuple = TRACE_FORMATS,
+        max_bytes: int = TRACE_MAX_BYTES,
+        backup_count: int = TRACE_BACKUP_COUNT,
+    ):
+        self.directory = directory
+        self.formats = [f for f in formats if f in TRACE_FILES]
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.exported = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._pending: "queue.Queue[Optional[List[Span]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+    def path(self, format: str) -> str:
+        return os.path.join(self.directory, TRACE_FILES[format])
+
+    def export(self, spans: List[Span]) -> None:
+        """span 묶음을 내보내기 큐에 추가 (쓰기는 백그라운드 스레드, 실패해도 요청에는 영향 없음)"""
+        with self._lock:
+            # fork된 워커 프로세스에는 부모의 스레드가 없으므로 살아 있는지로 확인하고,
+            # 부모 큐의 잠금 / 미완료 수를 물려받지 않도록 큐도 새로 만듦
+            if self._writer is None or not self._writer.is_alive():
+                self._pending = queue.Queue()
+                self._writer = threading.Thread(
+                    target=self._run, args=(self._pending,), name="trace-exporter", daemon=True
+                )
+                self._writer.start()
+            self._pending.put(spans)
+
+    def flush(self) -> None:
+        """큐에 들어간 span을 모두 쓸 때까지 대기 (블로킹, 루프에서는 to_thread로 호출)"""
+        self._pending.join()
+
+    def close(self) -> None:
+        """남은 span을 쓰고 내보내기 스레드 종료 (블로킹)"""
+        writer = self._writer
+        if writer is None or not writer.is_alive():
+            return
+        self._pending.put(None)
+        writer.join()
+
+    def _run(self, pending: "queue.Queue[Optional[List[Span]]]") -> None:
+        while True:
+            spans = pending.get()
+            try:
+                if spans is None:
+                    return
+                self._write(spans)
+            finally:
+                pending.task_done()
+
+    def _write(self, spans: List[Span]) -> None:
+        try:
+            for format in self.formats:
+                if format == "chrome":
+                    self._append(self.path(format), chrome_events(spans), header="[\n")
+                else:
+                    self._append(self.path(format), json.dumps(otlp_request(spans), ensure_ascii=False) + "\n")
+            self.exported += len(spans)
+        except Exception as e:
+            self.failed += len(spans)
+            print(f"[tracing] export failed: {e}")
+
+    def _append(self, path: str, text: str, header: str = "") -> None:
+        # 쓰기는 내보내기 스레드 하나만 하므로 프로세스 간 잠금(flock)만 필요
+        data = text.encode()
+        os.makedirs(self.directory, exist_ok=True)
+        while True:
+            with open(path, "ab") as file:
+                fcntl.flock(file, fcntl.LOCK_EX)
+                # 잠금을 기다리는 사이 다른 프로세스가 회전했으면 새 파일을 다시 엶
+                if not os.path.exists(path) or os.stat(path).st_ino != os.fstat(file.fileno()).st_ino:
+                    continue
+                size = os.fstat(file.fileno()).st_size
+                if size > 0 and size + len(data) > self.max_bytes:
+                    self._rotate(path)
+                    continue
+                if size == 0 and header:
+                    file.write(header.encode())
+                file.write(data)
+                return
+
+    def _rotate(self, path: str) -> None:
+        if self.backup_count <= 0:
+            os.unlink(path)
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            if os.path.exists(f"{path}.{index}"):
+                os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+        os.replace(path, f"{path}.1")
+
+
+def chrome_events(spans: List[Span]) -> str:
+    """Chrome trace 이벤트 (배열 원소, 한 줄에 하나 - 닫는 `]`가 없어도 열림)"""
+    pid = os.getpid()
+    root = spans[-1].root
+    tid = int(root.trace_id[:7], 16)
+    events = [
+        {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"{SERVICE_NAME} {pid}"}},
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+         "args": {"name": f"{root.name} {root.trace_id[:8]}"}},
+    ]
+    for item in spans:
+        args = {
+            **item.attributes,
+            "trace_id": item.trace_id,
+            "span_id": item.span_id,
+            "parent_id": item.parent_id,
+        }
+        if item.error:
+            args["error"] = item.error
+        events.append({
+            "name": item.name,
+            "cat": item.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": item.start_ns / 1000,
+            "dur": ((item.end_ns or item.start_ns) - item.start_ns) / 1000,
+            "pid": pid,
+            "tid": tid,
+            "args": args,
+        })
+    return "".join(json.dumps(event, ensure_ascii=False, default=str) + ",\n" for event in events)
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_request(spans: List[Span]) -> dict:
+    """OTLP/JSON ExportTraceServiceRequest"""
+    items = []
+    for item in spans:
+        span_json = {
+            "traceId": item.trace_id,
+            "spanId": item.span_id,
+            "name": item.name,
+            "kind": item.kind,
+            "startTimeUnixNano": str(item.start_ns),
+            "endTimeUnixNano": str(item.end_ns or item.start_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in item.attributes.items()
+                if value is not None
+            ],
+            "status": {"code": 2, "message": item.error} if item.error else {"code": 1},
+        }
+        if item.parent_id:
+            span_json["parentSpanId"] = item.parent_id
+        items.append(span_json)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": SERVICE_NAME}},
+                {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+            ]},
+            "scopeSpans": [{"scope": {"name": "langgraph.utils.tracing"}, "spans": items}],
+        }]
+    }
+
+
+class Tracer:
+    """
+    루트 span 생성 (샘플링 결정) + 내보내기
+
+    Args:
+        sample_rate: 새 트레이스를 기록할 확률 (0~1)
+        exporter: 파일 내보내기 (None이면 기본 위치)
+    """
+
+    def __init__(self, sample_rate: float = TRACE_SAMPLE_RATE, exporter: Optional[TraceExporter] = None):
+        self.sample_rate = sample_rate
+        self.exporter = exporter or TraceExporter()
+
+    def start_trace(self, name: str, traceparent: Optional[str] = None, **attributes: Any) -> Span:
+        """
+        프로세스의 루트 span 시작 (요청 / 작업 단위, 호출 측이 end 호출)
+
+        traceparent가 있으면 그 트레이스를 이어 받고 샘플링 결정도 따릅니다.
+        """
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+            kind = KIND_INTERNAL
+        else:
+            trace_id, parent_id = _new_id(128), None
+            sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+            kind = KIND_SERVER
+        return Span(name, trace_id, parent_id, sampled, kind, tracer=self, attributes=attributes)
+
+    def export(self, spans: List[Span]) -> None:
+        self.exporter.export(spans)
+
+
+TRACER = Tracer()
+
+
+async def close_tracing() -> None:
+    """남은 span 기록 후 내보내기 스레드 종료 (프로세스 종료 시)"""
+    await asyncio.to_thread(TRACER.exporter.close)
+
+
+def start_trace(name: str, traceparent: Optional[str] = None, **attributes: Any) -> Span:
+    return TRACER.start_trace(name, traceparent, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _CURRENT_SPAN.get()
+
+
+def current_traceparent() -> Optional[str]:
+    """작업 payload에 넣을 traceparent (트레이스 밖이면 None)"""
+    current = _CURRENT_SPAN.get()
+    return current.traceparent() if current is not None else None
+
+
+@contextlib.contextmanager
+def use_span(target: Span, end_on_exit: bool = False, end_on_error: bool = True) -> Iterator[Span]:
+    """
+    span을 현재 span으로 설정
+
+    예외가 나면(end_on_error) 에러로 끝내고, 정상 종료 시에는 end_on_exit일 때만 끝냅니다.
+    (SSE 응답처럼 핸들러 반환 후에도 이어지는 요청은 스트림이 끝날 때 호출 측이 end)
+    """
+    token = _CURRENT_SPAN.set(target)
+    try:
+        yield target
+    except BaseException as e:
+        if end_on_error:
+            target.end(error=e)
+        raise
+    else:
+        if end_on_exit:
+            target.end()
+    finally:
+        _CURRENT_SPAN.reset(token)
+
+
+@contextlib.contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes: Any) -> Iterator[Optional[Span]]:
+    """현재 span의 하위 span (샘플링된 트레이스 안에서만 기록, 아니면 None)"""
+    parent = _CURRENT_SPAN.get()
+    if parent is None or not parent.sampled:
+        yield None
+        return
+
+    child = parent.child(name, kind, **attributes)
+    token = _CURRENT_SPAN.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.end(error=e)
+        raise
+    else:
+        child.end()
+    finally:
+        _CURRENT_SPAN.reset(token)
+
+
+def traced(name: str, kind: int = KIND_INTERNAL) -> Callable:
+    """
+    함수 실행을 하위 span으로 기록하는 데코레이터 (DB 조회 등)
+
+    동기 함수도 `asyncio.to_thread`가 컨텍스트를 복사하므로 호출한 요청의 트레이스에 이어집니다.
+    """
+    def decorator(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name, kind):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
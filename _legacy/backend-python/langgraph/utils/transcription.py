@@ -0,0 +1,187 @@
+"""
+분할 전사 (Chunked STT) 유틸리티
+
+긴 녹음은 Whisper 지연 시간이 길이에 비례해 늘어나므로,
+무음 경계에서 나눈 조각(AudioChunk)을 동시에 전사한 뒤 하나로 이어 붙입니다.
+
+## 이어 붙이기 규칙
+1. 조각별 세그먼트/단어 시간을 조각 시작 시각만큼 옮겨 전체 기준으로 맞춤
+2. 가운데 시각이 조각의 담당 구간(keep_start ~ keep_end)에 있는 항목만 사용
+   (겹침 구간은 양쪽 조각이 모두 전사하므로 한쪽만 남김)
+3. 경계에서 걸친 세그먼트 때문에 같은 단어가 반복되면
+   앞 텍스트의 끝과 뒤 텍스트의 시작에서 가장 길게 겹치는 단어열을 제거
+
+## 사용 예시
+
+```python
+responses = await transcribe_chunks(chunks, transcribe_one)
+result = stitch_transcripts(chunks, responses)
+```
+"""
+
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from .audio import AudioChunk
+
+
+# 경계 중복 제거 시 비교할 최대 단어 수
+MAX_OVERLAP_WORDS = 8
+
+_PUNCTUATION = re.compile(r"[^\w]+")
+
+
+class TranscriptionResult:
+    """
+    이어 붙인 전사 결과
+
+    Attributes:
+        text: 전체 트랜스크립트
+        segments: 전체 기준 시간으로 옮긴 세그먼트 (start, end, text)
+        words: 단어 타임스탬프 (요청한 경우에만)
+        duration: 업로드 오디오 길이 (초)
+    """
+
+    def __init__(
+        self,
+        text: str,
+        segments: List[Dict[str, Any]],
+        words: List[Dict[str, Any]],
+        duration: Optional[float],
+    ):
+        self.text = text
+        self.segments = segments
+        self.words = words
+        self.duration = duration
+
+
+def response_to_dict(response: Any) -> Dict[str, Any]:
+    """Whisper 응답 (SDK 객체 또는 dict)을 dict로 변환"""
+    if isinstance(response, dict):
+        return response
+    if hasattr(response, "model_dump"):
+        return response.model_dump()
+    return {
+        "text": getattr(response, "text", ""),
+        "duration": getattr(response, "duration", None),
+        "segments": getattr(response, "segments", None),
+        "words": getattr(response, "words", None),
+    }
+
+
+def _normalize(word: str) -> str:
+    return _PUNCTUATION.sub("", word).lower()
+
+
+def overlap_word_count(previous: Sequence[str], following: Sequence[str], max_words: int = MAX_OVERLAP_WORDS) -> int:
+    """
+    앞 단어열의 끝과 뒤 단어열의 시작이 겹치는 단어 수
+
+    구두점/대소문자는 무시하고, 가장 긴 일치를 찾습니다.
+    """
+    tail = [_normalize(w) for w in previous[-max_words:]]
+    head = [_normalize(w) for w in following[:max_words]]
+    for n in range(min(len(tail), len(head)), 0, -1):
+        if tail[-n:] == head[:n] and any(tail[-n:]):
+            return n
+    return 0
+
+
+def _shift(items: Optional[List[Any]], chunk: AudioChunk) -> List[Dict[str, Any]]:
+    """조각 기준 시간을 전체 기준으로 옮기고 담당 구간 안의 항목만 반환"""
+    shifted = []
+    for item in items or []:
+        item = dict(item) if isinstance(item, dict) else response_to_dict(item)
+        start = float(item.get("start", 0.0)) + chunk.start
+        end = float(item.get("end", start - chunk.start)) + chunk.start
+        middle = (start + end) / 2
+        if chunk.keep_start <= middle < chunk.keep_end:
+            item["start"] = round(start, 3)
+            item["end"] = round(end, 3)
+            shifted.append(item)
+    return shifted
+
+
+def stitch_transcripts(chunks: Sequence[AudioChunk], responses: Sequence[Any]) -> TranscriptionResult:
+    """
+    조각별 Whisper 응답을 하나의 전사 결과로 합치기
+
+    Args:
+        chunks: 순서대로 정렬된 오디오 조각
+        responses: 조각별 verbose_json 응답 (chunks와 같은 순서)
+
+    Returns:
+        TranscriptionResult: 이어 붙인 결과
+    """
+    words_out: List[str] = []
+    segments: List[Dict[str, Any]] = []
+    word_stamps: List[Dict[str, Any]] = []
+    duration: Optional[float] = None
+
+    for chunk, response in zip(chunks, responses):
+        data = response_to_dict(response)
+
+        if data.get("segments"):
+            kept = _shift(data["segments"], chunk)
+            text = " ".join(str(seg.get("text", "")).strip() for seg in kept)
+        else:
+            # 세그먼트가 없으면 (text 형식 응답) 텍스트 전체 사용
+            kept = []
+            text = str(data.get("text", ""))
+
+        chunk_words = text.split()
+        drop = overlap_word_count(words_out, chunk_words)
+        words_out.extend(chunk_words[drop:])
+        # 빠진 중복 단어를 앞쪽 세그먼트 텍스트에서도 제거
+        while drop and kept:
+            segment_words = str(kept[0].get("text", "")).split()
+            kept[0]["text"] = " ".join(segment_words[drop:])
+            drop = max(drop - len(segment_words), 0)
+            if not kept[0]["text"]:
+                kept = kept[1:]
+        segments.extend(kept)
+
+        stamps = _shift(data.get("words"), chunk)
+        if word_stamps and stamps:
+            stamp_drop = overlap_word_count(
+                [str(w.get("word", "")) for w in word_stamps],
+                [str(w.get("word", "")) for w in stamps],
+            )
+            stamps = stamps[stamp_drop:]
+        word_stamps.extend(stamps)
+
+        if data.get("duration") is not None:
+            duration = chunk.start + float(data["duration"])
+
+    for index, segment in enumerate(segments):
+        segment["id"] = index
+
+    return TranscriptionResult(" ".join(words_out), segments, word_stamps, duration)
+
+
+async def transcribe_chunks(
+    chunks: Sequence[AudioChunk],
+    transcribe: Callable[[AudioChunk], Awaitable[Any]],
+) -> List[Any]:
+    """
+    조각을 동시에 전사
+
+    동시 호출 수는 transcribe 안의 provider_slot이 제한합니다.
+    한 조각이라도 실패하면 나머지 호출을 취소하고 예외를 그대로 전파합니다.
+
+    Args:
+        chunks: 오디오 조각
+        transcribe: 조각 하나를 전사하는 코루틴 함수
+
+    Returns:
+        List[Any]: chunks와 같은 순서의 응답
+    """
+    tasks = [asyncio.ensure_future(transcribe(chunk)) for chunk in chunks]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
@@ -19,13 +19,26 @@
 - Full Cost: Claude + TTS
 - 결과: 최종 개선안 (음성 포함)
 - 이후 재요청 불가
+- Stage 1과 의도가 같으면 Claude를 다시 호출하지 않고 프리뷰 스크립트로 바로 TTS
+  (사용자가 확인한 프리뷰와 최종 결과가 달라지지 않음)
 """
 
 from langgraph.graph import StateGraph, START, END
+from langchain_core.runnables import RunnableConfig
+import os
+from typing import Optional
 
 from ..state import RefinementState
 from ..nodes.improvement import generate_refined_script
 from ..nodes.tts import generate_tts
+from ..utils.deadline import CALL_TIMEOUTS, get_deadline, remaining_timeout
+from ..utils.metrics import instrument_node
+from ..utils.resilience import call_with_retry, hedged
+
+
+# Stage 1 프리뷰 헤지 요청 대기 시간 (초, 0이면 비활성화)
+# 사용자가 화면 앞에서 기다리는 호출이므로 꼬리 지연(p99)을 줄이기 위해 사용합니다.
+REFINE_HEDGE_DELAY_SECONDS = float(os.getenv("REFINE_HEDGE_DELAY_SECONDS", "0"))
 
 
 def create_refinement_graph(include_tts: bool = True) -> StateGraph:
@@ -43,29 +56,62 @@ def create_refinement_graph(include_tts: bool = True) -> StateGraph:
     
     graph = StateGraph(RefinementState)
     
+    def add_node(name: str, fn) -> None:
+        # 모든 노드는 실행 시간 / 사용량 메트릭 기록 (utils/metrics.py)
+        graph.add_node(name, instrument_node("refinement", name, fn))
+    
     # 노드 등록
-    graph.add_node("refine_script", refine_script_node)
+    add_node("refine_script", refine_script_node)
+    add_node("use_preview", use_preview_node)
     
     if include_tts:
-        graph.add_node("tts", tts_for_refinement)
+        add_node("tts", tts_for_refinement)
     
-    # 엣지 연결
-    graph.add_edge(START, "refine_script")
+    # 엣지 연결 (Stage 1 프리뷰를 그대로 쓸 수 있으면 스크립트 생성 생략)
+    graph.add_conditional_edges(START, route_refinement, ["refine_script", "use_preview"])
     
+    next_node = "tts" if include_tts else END
+    graph.add_edge("refine_script", next_node)
+    graph.add_edge("use_preview", next_node)
     if include_tts:
-        graph.add_edge("refine_script", "tts")
         graph.add_edge("tts", END)
-    else:
-        graph.add_edge("refine_script", END)
     
     return graph.compile()
 
 
-async def refine_script_node(state: RefinementState) -> dict:
+def same_intent(a: Optional[str], b: Optional[str]) -> bool:
+    """같은 재요청 의도인지 (공백 / 대소문자 차이는 무시)"""
+    if not a or not b:
+        return False
+    return " ".join(a.split()).casefold() == " ".join(b.split()).casefold()
+
+
+def route_refinement(state: RefinementState) -> str:
+    """Stage 2이고 Stage 1 프리뷰와 의도가 같으면 프리뷰 재사용"""
+    if (
+        state.get("refinement_stage") == 2
+        and state.get("preview_script")
+        and same_intent(state.get("preview_intent"), state.get("user_intent"))
+    ):
+        return "use_preview"
+    return "refine_script"
+
+
+async def use_preview_node(state: RefinementState) -> dict:
+    """Stage 1 프리뷰 스크립트를 최종 스크립트로 사용 (Claude 호출 없음)"""
+    return {
+        "refined_script": state["preview_script"],
+        "changes_summary": state.get("changes_summary", ""),
+        "messages": ["프리뷰 스크립트 사용"]
+    }
+
+
+async def refine_script_node(state: RefinementState, config: Optional[RunnableConfig] = None) -> dict:
     """
     스크립트 재생성 노드
     
     사용자의 의도를 반영하여 개선안을 수정합니다.
+    config에 데드라인이 있으면 남은 예산 안에서만 호출합니다.
     """
     from anthropic import AsyncAnthropic
     
@@ -98,16 +144,25 @@ async def refine_script_node(state: RefinementState) -> dict:
 (전체 스크립트)
 """
     
-    client = AsyncAnthropic()
+    client = AsyncAnthropic(max_retries=0)
+    deadline = get_deadline(config)
     
-    response = await client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=2000,
-        system="당신은 스피치 코치입니다. 사용자의 의도를 반영하여 개선안을 수정합니다.",
-        messages=[
-            {"role": "user", "content": prompt}
-        ]
-    )
+    def request():
+        return client.messages.create(
+            model="claude-sonnet-4-20250514",
+            max_tokens=2000,
+            system="당신은 스피치 코치입니다. 사용자의 의도를 반영하여 개선안을 수정합니다.",
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            timeout=remaining_timeout(deadline, CALL_TIMEOUTS["claude"], "refine"),
+        )
+    
+    # Stage 1 프리뷰는 헤지 요청으로 꼬리 지연 완화 (설정된 경우)
+    if state.get("refinement_stage") == 1 and REFINE_HEDGE_DELAY_SECONDS > 0:
+        request = hedged(request, hedge_delay=REFINE_HEDGE_DELAY_SECONDS)
+    
+    response = await call_with_retry("anthropic", request, deadline=deadline)
     
     response_text = response.content[0].text
     
@@ -121,7 +176,7 @@ async def refine_script_node(state: RefinementState) -> dict:
     }
 
 
-async def tts_for_refinement(state: RefinementState) -> dict:
+async def tts_for_refinement(state: RefinementState, config: Optional[RunnableConfig] = None) -> dict:
     """
     재요청용 TTS 노드
     
@@ -137,11 +192,12 @@ async def tts_for_refinement(state: RefinementState) -> dict:
         "voice_clone_id": state.get("voice_clone_id"),
     }
     
-    result = await generate_tts(tts_state)
+    result = await generate_tts(tts_state, config)
     
     return {
         "refined_audio_url": result.get("improved_audio_url", ""),
-        "messages": ["음성 생성 완료"]
+        "degradations": result.get("degradations", []),
+        "messages": result["messages"] if result.get("degradations") else ["음성 생성 완료"]
     }
 
 
@@ -21,6 +21,11 @@ LangGraph의 StateGraph를 사용하여 각 노드를 연결합니다.
          │
          ▼
 ┌─────────────────┐
+│ Retrieve Docs   │  ← RAG: 문서 구간 검색 (Deep Mode, BM25)
+└────────┬────────┘
+         │
+         ▼
+┌─────────────────┐
 │    Analysis     │  ← ReAct: 도구 사용 분석
 └────────┬────────┘
          │
@@ -51,6 +56,7 @@ from ..state import SpeechCoachState
 from ..nodes import (
     # Context
     load_progressive_context,
+    retrieve_document_passages,
     
     # Core Pipeline
     speech_to_text,
@@ -62,12 +68,14 @@ from ..nodes import (
     # Moderation
     check_moderation,
 )
+from ..utils.metrics import instrument_node
 
 
 def create_speech_coach_graph(
     use_react: bool = False,
     use_reflection: bool = True,
     use_moderation: bool = True,
+    use_documents: bool = True,
 ) -> StateGraph:
     """
     스피치 코칭 워크플로우 그래프 생성
@@ -76,6 +84,7 @@ def create_speech_coach_graph(
         use_react: ReAct 패턴 사용 여부 (기본: False, MVP는 기본 분석)
         use_reflection: Reflection 사용 여부 (기본: True)
         use_moderation: 모더레이션 사용 여부 (기본: True)
+        use_documents: 문서 구간 검색 사용 여부 (기본: True, project_id가 없으면 노드가 바로 통과)
     
     Returns:
         StateGraph: 컴파일된 워크플로우 그래프
@@ -84,34 +93,42 @@ def create_speech_coach_graph(
     # 그래프 생성
     graph = StateGraph(SpeechCoachState)
     
+    def add_node(name: str, fn) -> None:
+        # 모든 노드는 실행 시간 / 사용량 메트릭 기록 (utils/metrics.py)
+        graph.add_node(name, instrument_node("speech_coach", name, fn))
+    
     # ===== 노드 등록 =====
     
     # 1. Progressive Context 로드
-    graph.add_node("load_context", load_progressive_context)
+    add_node("load_context", load_progressive_context)
     
     # 2. STT
-    graph.add_node("stt", speech_to_text)
+    add_node("stt", speech_to_text)
     
     # 3. 모더레이션 (선택적)
     if use_moderation:
-        graph.add_node("moderation", check_moderation)
+        add_node("moderation", check_moderation)
+    
+    # 4. 문서 구간 검색 (선택적)
+    if use_documents:
+        add_node("retrieve_documents", retrieve_document_passages)
     
-    # 4. 분석
+    # 5. 분석
     if use_react:
         from ..nodes import analyze_content_react
-        graph.add_node("analyze", analyze_content_react)
+        add_node("analyze", analyze_content_react)
     else:
-        graph.add_node("analyze", analyze_content)
+        add_node("analyze", analyze_content)
     
-    # 5. 개선안 생성
-    graph.add_node("improve", generate_improved_script)
+    # 6. 개선안 생성
+    add_node("improve", generate_improved_script)
     
-    # 6. Reflection (선택적)
+    # 7. Reflection (선택적)
     if use_reflection:
-        graph.add_node("reflect", reflect_on_improvement)
+        add_node("reflect", reflect_on_improvement)
     
-    # 7. TTS
-    graph.add_node("tts", generate_tts)
+    # 8. TTS
+    add_node("tts", generate_tts)
     
     # ===== 엣지 연결 =====
     
@@ -121,12 +138,15 @@ def create_speech_coach_graph(
     # load_context → stt
     graph.add_edge("load_context", "stt")
     
-    # stt → moderation 또는 analyze
+    # stt → [moderation] → [retrieve_documents] → analyze
+    before_analyze = "stt"
     if use_moderation:
-        graph.add_edge("stt", "moderation")
-        graph.add_edge("moderation", "analyze")
-    else:
-        graph.add_edge("stt", "analyze")
+        graph.add_edge(before_analyze, "moderation")
+        before_analyze = "moderation"
+    if use_documents:
+        graph.add_edge(before_analyze, "retrieve_documents")
+        before_analyze = "retrieve_documents"
+    graph.add_edge(before_analyze, "analyze")
     
     # analyze → improve
     graph.add_edge("analyze", "improve")
@@ -150,12 +170,13 @@ def create_quick_mode_graph() -> StateGraph:
     Quick Mode 워크플로우
     
     최소한의 노드로 빠른 분석을 수행합니다.
-    Reflection과 ReAct를 생략하여 속도를 높입니다.
+    Reflection과 ReAct, 문서 검색을 생략하여 속도를 높입니다.
     """
     return create_speech_coach_graph(
         use_react=False,
         use_reflection=False,
         use_moderation=False,
+        use_documents=False,
     )
 
 
@@ -164,12 +185,13 @@ def create_deep_mode_graph() -> StateGraph:
     Deep Mode 워크플로우
     
     모든 기능을 활성화하여 심층 분석을 수행합니다.
-    ReAct, Reflection, 모더레이션을 모두 사용합니다.
+    ReAct, Reflection, 모더레이션, 문서 검색을 모두 사용합니다.
     """
     return create_speech_coach_graph(
         use_react=True,
         use_reflection=True,
         use_moderation=True,
+        use_documents=True,
     )
 
 
@@ -0,0 +1,13 @@
+"""
+API 테스트 공통 Fixture
+"""
+
+import pytest
+
+from api.jobs import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path) -> JobQueue:
+    """테스트마다 새 SQLite 작업 큐"""
+    return JobQueue(str(tmp_path / "jobs.sqlite3"))
@@ -0,0 +1,432 @@
+"""
+백그라운드 작업 큐 / 워커 테스트
+
+SQLite 큐의 우선순위 · 레인 · lease 만료 재처리, 워커의 완료/실패 이벤트 발행과 lease를 잃은 작업 중단,
+Mock 그래프를 사용한 분석 작업 실행, 요청 트레이스 이어 받기, 작업 계정별 사용량 기록,
+문서 추출 워밍업 작업, 작업 조회 API의 소유자 확인, 패턴 요약 백필 반복, 모드별 비용 리포트를 검증합니다.
+"""
+
+import asyncio
+import json
+import sqlite3
+import time
+from datetime import datetime, timezone
+from functools import partial
+
+import pytest
+from fastapi import HTTPException
+
+from api.dependencies import UserContext
+from api.jobs import JobQueue, ProgressBus, Worker, run_analysis_job, run_document_extraction_job
+from api.jobs import runner
+from api.jobs.backfill import backfill_pattern_summaries
+from api.jobs.usage_report import format_report, usage_report
+from api.routes import jobs as job_routes
+from langgraph.utils import ledger, tracing
+from langgraph.utils.metrics import record_tts_characters
+from langgraph.workflows import create_mock_graph
+
+
+async def echo_job(job, bus):
+    """payload를 그대로 결과로 반환하는 핸들러"""
+    await bus.publish_async(job.id, "progress", {"step": "echo", "progress": 50, "message": "..."})
+    return {"echo": job.payload}
+
+
+async def failing_job(job, bus):
+    raise ValueError("Claude API rate limit")
+
+
+async def run_worker_until_idle(worker: Worker, queue: JobQueue, timeout: float = 5.0) -> None:
+    """큐에 대기/실행 중인 작업이 없어질 때까지 워커 실행"""
+    stop = asyncio.Event()
+    runner = asyncio.create_task(worker.run(stop))
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stats = queue.stats()
+        if not stats.get("queued") and not stats.get("running"):
+            break
+        await asyncio.sleep(0.02)
+    stop.set()
+    await runner
+
+
+class TestJobQueue:
+    """SQLite 작업 큐 테스트"""
+
+    def test_claim_respects_priority_then_fifo(self, queue):
+        low = queue.enqueue("analyze", {"n": 1}, priority=0)
+        high = queue.enqueue("analyze", {"n": 2}, priority=10)
+        low_later = queue.enqueue("analyze", {"n": 3}, priority=0)
+
+        claimed = [queue.claim("w1").id for _ in range(3)]
+
+        assert claimed == [high, low, low_later]
+        assert queue.claim("w1") is None
+
+    def test_claim_filters_by_kind(self, queue):
+        queue.enqueue("analyze", {})
+        warmup = queue.enqueue("warmup", {})
+
+        job = queue.claim("w1", kinds=["warmup"])
+
+        assert job.id == warmup
+        assert queue.claim("w1", kinds=["warmup"]) is None
+
+    def test_expired_lease_is_reclaimed(self, queue):
+        job_id = queue.enqueue("analyze", {})
+        queue.claim("dead-worker", lease_seconds=0.01)
+
+        time.sleep(0.02)
+        job = queue.claim("w2")
+
+        assert job.id == job_id
+        assert job.attempts == 2
+        assert job.lease_owner == "w2"
+
+    def test_active_lease_is_not_reclaimed(self, queue):
+        queue.enqueue("analyze", {})
+        queue.claim("w1", lease_seconds=60)
+
+        assert queue.claim("w2") is None
+
+    def test_job_abandoned_after_max_attempts(self, queue):
+        job_id = queue.enqueue("analyze", {})
+        for _ in range(3):
+            queue.claim("crashing-worker", lease_seconds=0.0)
+            time.sleep(0.001)
+
+        assert queue.claim("w2") is None
+        assert queue.get(job_id).status == "failed"
+        assert queue.events(job_id)[-1].data["code"] == "JOB_ABANDONED"
+
+    def test_release_returns_job_to_queue(self, queue):
+        job_id = queue.enqueue("analyze", {})
+        queue.claim("w1")
+
+        queue.release(job_id, "w1")
+        job = queue.claim("w2")
+
+        assert job.id == job_id
+        assert job.attempts == 1
+
+    def test_events_after_id(self, queue):
+        job_id = queue.enqueue("analyze", {})
+        first = queue.publish(job_id, "progress", {"progress": 0})
+        queue.publish(job_id, "progress", {"progress": 50})
+
+        events = queue.events(job_id, after=first)
+
+        assert [e.data["progress"] for e in events] == [50]
+
+
+class TestLanes:
+    """레인별 claim 테스트"""
+
+    def test_claim_only_from_served_lanes(self, queue):
+        queue.enqueue("analyze", {}, lane="deep", priority=10)
+        quick = queue.enqueue("analyze", {}, lane="quick", priority=20)
+
+        job = queue.claim("quick-worker", lanes=["quick", "preview"])
+
+        assert job.id == quick
+        assert queue.claim("quick-worker", lanes=["quick", "preview"]) is None
+
+    def test_higher_priority_lane_first(self, queue):
+        deep = queue.enqueue("analyze", {}, lane="deep", priority=10)
+        quick = queue.enqueue("analyze", {}, lane="quick", priority=20)
+
+        claimed = [queue.claim("deep-worker", lanes=["deep", "quick"]).id for _ in range(2)]
+
+        assert claimed == [quick, deep]
+
+    def test_lane_cap_is_global(self, queue):
+        for _ in range(3):
+            queue.enqueue("analyze", {}, lane="deep")
+        caps = {"deep": 2}
+
+        assert queue.claim("w1", lanes=["deep"], lane_caps=caps) is not None
+        assert queue.claim("w2", lanes=["deep"], lane_caps=caps) is not None
+        # 다른 워커라도 레인 전체 상한에 걸림
+        assert queue.claim("w3", lanes=["deep"], lane_caps=caps) is None
+        assert queue.claim("w3", lane_caps=caps) is None
+
+    def test_cap_skips_saturated_lane_only(self, queue):
+        queue.enqueue("analyze", {}, lane="deep", priority=10)
+        queue.enqueue("analyze", {}, lane="deep", priority=10)
+        quick = queue.enqueue("analyze", {}, lane="quick", priority=0)
+        caps = {"deep": 1}
+
+        queue.claim("w1", lane_caps=caps)
+        job = queue.claim("w2", lane_caps=caps)
+
+        assert job.id == quick
+
+    def test_migrates_queue_without_lane_column(self, tmp_path):
+        path = str(tmp_path / "old.sqlite3")
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE jobs (id TEXT PRIMARY KEY, kind TEXT NOT NULL, "
+            "priority INTEGER NOT NULL DEFAULT 0, status TEXT NOT NULL DEFAULT 'queued', "
+            "payload TEXT NOT NULL, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+            "lease_owner TEXT, lease_expires_at REAL, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO jobs (id, kind, payload, created_at, updated_at) "
+            "VALUES ('old-job', 'analyze', '{}', 0, 0)"
+        )
+        conn.commit()
+        conn.close()
+
+        job = JobQueue(path).claim("w1")
+
+        assert job.id == "old-job"
+        assert job.lane == "default"
+
+
+@pytest.mark.asyncio
+class TestWorker:
+    """워커 실행 테스트"""
+
+    async def test_completes_job_and_publishes_result(self, queue):
+        job_id = queue.enqueue("echo", {"value": 1})
+        worker = Worker(queue, handlers={"echo": echo_job}, poll_interval=0.01)
+
+        await run_worker_until_idle(worker, queue)
+
+        job = queue.get(job_id)
+        assert job.status == "completed"
+        assert job.result == {"echo": {"value": 1}}
+        assert [e.event for e in queue.events(job_id)] == ["progress", "complete"]
+
+    async def test_job_span_continues_request_trace(self, queue, tmp_path, monkeypatch):
+        exporter = tracing.TraceExporter(str(tmp_path / "traces"), formats=("otlp",))
+        monkeypatch.setattr(tracing, "TRACER", tracing.Tracer(sample_rate=1.0, exporter=exporter))
+        trace = tracing.start_trace("POST /analyze")
+        queue.enqueue("echo", {"value": 1, "traceparent": trace.traceparent()}, lane="quick")
+        worker = Worker(queue, handlers={"echo": echo_job}, poll_interval=0.01)
+
+        await run_worker_until_idle(worker, queue)
+        exporter.flush()
+
+        with open(exporter.path("otlp")) as file:
+            spans = {item["name"]: item for item in json.loads(file.read())["resourceSpans"][0]["scopeSpans"][0]["spans"]}
+        assert spans["job.echo"]["traceId"] == trace.trace_id
+        assert spans["job.echo"]["parentSpanId"] == trace.span_id
+        assert spans["queue.wait"]["parentSpanId"] == spans["job.echo"]["spanId"]
+
+    async def test_usage_is_recorded_to_job_account(self, queue, monkeypatch):
+        written = []
+        monkeypatch.setattr(ledger, "LEDGER", ledger.UsageLedger(write=written.extend, flush_interval=60))
+
+        async def tts_job(job, bus):
+            record_tts_characters(120)
+            return {}
+
+        queue.enqueue("tts", {"session_id": "s1", "user_id": "g1", "is_authenticated": False, "mode": "quick"})
+        warmup_id = queue.enqueue("tts", {"user_id": "u1"})
+        worker = Worker(queue, handlers={"tts": tts_job}, poll_interval=0.01)
+
+        await run_worker_until_idle(worker, queue)
+        await ledger.LEDGER.close()
+
+        accounts = {(row["session_id"], row["user_id"], row["mode"]) for row in written}
+        # Guest는 사용자 없이, 세션이 없는 작업은 작업 ID / 종류로 기록
+        assert accounts == {("s1", None, "quick"), (warmup_id, "u1", "tts")}
+
+    async def test_failure_publishes_categorized_error(self, queue):
+        job_id = queue.enqueue("fail", {})
+        worker = Worker(queue, handlers={"fail": failing_job}, poll_interval=0.01)
+
+        await run_worker_until_idle(worker, queue)
+
+        assert queue.get(job_id).status == "failed"
+        error = queue.events(job_id)[-1]
+        assert error.event == "error"
+        assert error.data["code"] == "RATE_LIMIT_CLAUDE"
+
+    async def test_stop_releases_running_job(self, queue):
+        started = asyncio.Event()
+
+        async def slow_job(job, bus):
+            started.set()
+            await asyncio.sleep(10)
+
+        job_id = queue.enqueue("slow", {})
+        worker = Worker(queue, handlers={"slow": slow_job}, poll_interval=0.01)
+        stop = asyncio.Event()
+        runner = asyncio.create_task(worker.run(stop))
+
+        await asyncio.wait_for(started.wait(), timeout=5)
+        stop.set()
+        await runner
+
+        assert queue.get(job_id).status == "queued"
+
+    async def test_lost_lease_stops_job_without_result(self, queue):
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def slow_job(job, bus):
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {"done": True}
+
+        job_id = queue.enqueue("slow", {})
+        worker = Worker(queue, handlers={"slow": slow_job}, poll_interval=0.01, lease_seconds=0.15)
+        stop = asyncio.Event()
+        runner = asyncio.create_task(worker.run(stop))
+        await asyncio.wait_for(started.wait(), timeout=5)
+
+        # lease 만료 후 다른 워커가 다시 가져간 상황
+        with queue._connect() as conn:
+            conn.execute("UPDATE jobs SET lease_owner = 'w2' WHERE id = ?", (job_id,))
+        await asyncio.wait_for(cancelled.wait(), timeout=2)
+        stop.set()
+        await runner
+
+        job = queue.get(job_id)
+        assert job.status == "running"
+        assert queue.events(job_id) == []
+        assert worker.processed == 0
+
+    async def test_subscribe_ends_on_terminal_event(self, queue):
+        job_id = queue.enqueue("echo", {"value": 2})
+        worker = Worker(queue, handlers={"echo": echo_job}, poll_interval=0.01)
+        bus = ProgressBus(queue, poll_interval=0.01)
+
+        stop = asyncio.Event()
+        runner = asyncio.create_task(worker.run(stop))
+        received = [event.event async for event in bus.subscribe(job_id, timeout=5)]
+        stop.set()
+        await runner
+
+        assert received == ["progress", "complete"]
+
+    async def test_analysis_job_with_mock_graph(self, queue):
+        job_id = queue.enqueue("analyze", {
+            "session_id": "mock-session",
+            "audio_url": "https://example.com/audio.webm",
+        })
+        worker = Worker(
+            queue,
+            handlers={"analyze": partial(run_analysis_job, graph_factory=create_mock_graph)},
+            poll_interval=0.01,
+        )
+
+        await run_worker_until_idle(worker, queue)
+
+        job = queue.get(job_id)
+        assert job.status == "completed"
+        assert job.result["session_id"] == "mock-session"
+        assert job.result["improved_script"] != ""
+
+        steps = [e.data.get("step") for e in queue.events(job_id) if e.event == "progress"]
+        assert steps[0] == "stt"
+        assert "tts" in steps
+
+    async def test_document_extraction_warmup(self, queue, monkeypatch):
+        extracted = []
+
+        async def fake_extract(project_id, documents, deadline=None, record_stats=True):
+            extracted.append((project_id, len(documents), record_stats))
+            return "{}", False
+
+        indexed = []
+
+        async def fake_index(project_id, documents):
+            indexed.append(project_id)
+
+        monkeypatch.setattr(runner, "load_project_documents", lambda project_id: [{"extracted_text": "resume"}])
+        monkeypatch.setattr(runner, "extract_document_context", fake_extract)
+        monkeypatch.setattr(runner, "get_document_index", fake_index)
+        job_id = queue.enqueue("document_extraction", {"project_id": "p1"})
+        worker = Worker(queue, handlers={"document_extraction": run_document_extraction_job}, poll_interval=0.01)
+
+        await run_worker_until_idle(worker, queue)
+
+        job = queue.get(job_id)
+        assert job.status == "completed"
+        assert job.result == {"project_id": "p1", "document_count": 1, "cached": False}
+        # 워밍업은 세션 적중 통계에 포함하지 않음
+        assert extracted == [("p1", 1, False)]
+        # 문서 검색 색인도 미리 생성
+        assert indexed == ["p1"]
+
+
+@pytest.mark.asyncio
+class TestJobRoutes:
+    """작업 조회 API 테스트"""
+
+    async def test_only_owner_can_read_job(self, queue):
+        queue.enqueue("analyze", {"session_id": "s1", "user_id": "guest-1"}, job_id="s1")
+
+        response = await job_routes.get_job_status("s1", UserContext(guest_session="guest-1"), queue)
+        assert response.data["status"] == "queued"
+
+        # 다른 사용자 / 식별 불가 요청은 작업 존재 여부도 알 수 없음
+        for other in (UserContext(user={"user_id": "u2"}), UserContext()):
+            with pytest.raises(HTTPException) as error:
+                await job_routes.get_job_status("s1", other, queue)
+            assert error.value.status_code == 404
+            with pytest.raises(HTTPException) as error:
+                await job_routes.stream_job_events("s1", 0, None, other, None, queue)
+            assert error.value.status_code == 404
+
+
+class TestBackfill:
+    """패턴 요약 백필 테스트"""
+
+    def test_pages_until_no_users_left(self):
+        class FakeSupabase:
+            def __init__(self):
+                self.calls = []
+                self.pages = ["u2", "u4", None]
+
+            def rpc(self, name, params):
+                self.calls.append(params)
+                return self
+
+            def execute(self):
+                return type("Response", (), {"data": self.pages.pop(0)})()
+
+        client = FakeSupabase()
+
+        assert backfill_pattern_summaries(batch_size=2, client=client) == 2
+        assert [call["p_after"] for call in client.calls] == [None, "u2", "u4"]
+        assert all(call["p_batch_size"] == 2 for call in client.calls)
+
+
+class TestUsageReport:
+    """모드별 비용 리포트 테스트"""
+
+    def test_summarizes_cost_per_mode(self):
+        class FakeSupabase:
+            def rpc(self, name, params):
+                self.params = params
+                return self
+
+            def execute(self):
+                return type("Response", (), {"data": [
+                    {"mode": "deep", "sessions": 2, "users": 2, "input_tokens": 40000, "output_tokens": 8000,
+                     "cache_read_tokens": 0, "cache_creation_tokens": 0, "audio_seconds": 240.0,
+                     "tts_characters": 3000, "cost_usd": "1.50"},
+                    {"mode": "quick", "sessions": 4, "users": 3, "input_tokens": 20000, "output_tokens": 4000,
+                     "cache_read_tokens": 10000, "cache_creation_tokens": 0, "audio_seconds": 120.0,
+                     "tts_characters": 0, "cost_usd": "0.40"},
+                ]})()
+
+        client = FakeSupabase()
+        since = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+        rows = usage_report(since, datetime(2026, 11, 1, tzinfo=timezone.utc), client=client)
+        report = format_report(rows)
+
+        assert client.params["p_since"].startswith("2026-10-01")
+        assert rows[0]["cost_per_session"] == 0.75 and rows[1]["audio_minutes"] == 2.0
+        total = report.splitlines()[-1].split()
+        assert total[0] == "total" and total[1] == "6" and total[-2:] == ["1.90", "0.3167"]
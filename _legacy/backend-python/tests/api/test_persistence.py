@@ -0,0 +1,187 @@
+"""
+세션 결과 저장 큐 (Write-behind) 테스트
+
+배치 저장과 같은 시도 합치기, 큐가 가득 찼을 때의 대기(backpressure),
+일시적 장애 재시도, 영구적 에러 행 격리, 종료 시 남은 행 저장과 시간 제한, 분석 결과 → attempts 행 변환을 검증합니다.
+"""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from api.persistence import SessionWriter, attempt_row, merge_rows, session_update_row
+from langgraph.utils.resilience import RetryPolicy
+
+
+FAST_RETRY = RetryPolicy(base_delay=0.001, max_delay=0.001)
+
+
+class RecordingWrite:
+    """호출별 행 목록을 기록하는 저장 함수 (fail_times번 일시적 장애 / poison id는 영구 실패)"""
+
+    def __init__(self, fail_times: int = 0, poison: str = None, gate: threading.Event = None):
+        self.calls = []
+        self.fail_times = fail_times
+        self.poison = poison
+        self.gate = gate
+
+    def __call__(self, rows):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail_times:
+            self.fail_times -= 1
+            raise httpx.ConnectError("connection refused")
+        if any(row["id"] == self.poison for row in rows):
+            raise ValueError("invalid input syntax for type uuid")
+        self.calls.append([dict(row) for row in rows])
+        return len(rows)
+
+    @property
+    def saved(self):
+        return [row for call in self.calls for row in call]
+
+
+class TestRows:
+    """attempts 행 변환 테스트"""
+
+    def test_attempt_row_skips_guests(self):
+        payload = {"user_id": "guest-1", "is_authenticated": False, "audio_url": "https://a"}
+
+        assert attempt_row("s1", payload, {}) is None
+
+    def test_attempt_row_maps_final_state(self):
+        payload = {"user_id": "u1", "is_authenticated": True, "audio_url": "https://a", "question_id": "q1"}
+        final_state = {
+            "transcript": "원본",
+            "audio_duration": 31.5,
+            "analysis_result": {"scores": {"logic_structure": "B"}},
+            "improved_script": "개선",
+            "improved_audio_url": "",
+        }
+
+        assert attempt_row("s1", payload, final_state) == {
+            "id": "s1",
+            "user_id": "u1",
+            "question_id": "q1",
+            "original_text": "원본",
+            "duration_seconds": 31.5,
+            "analysis": {"scores": {"logic_structure": "B"}},
+            "improved_text": "개선",
+            "original_audio_url": "https://a",
+            "improved_audio_url": None,
+            "status": "completed",
+        }
+
+    def test_session_update_maps_columns_and_keeps_null(self):
+        row = session_update_row("s1", {"improved_script": "다시", "pending_refinement": None, "voice_type": "x"})
+
+        assert row == {"id": "s1", "improved_text": "다시", "pending_refinement": None}
+
+    def test_merge_rows_later_values_win(self):
+        rows = [{"id": "a", "x": 1, "y": 1}, {"id": "b", "x": 2}, {"id": "a", "y": 3}]
+
+        assert merge_rows(rows) == [{"id": "a", "x": 1, "y": 3}, {"id": "b", "x": 2}]
+
+
+@pytest.mark.asyncio
+class TestSessionWriter:
+    """저장 큐 테스트"""
+
+    async def test_batches_and_merges_rows(self):
+        write = RecordingWrite()
+        written = []
+        writer = SessionWriter(write, batch_size=10, linger=0.01, policy=FAST_RETRY, on_written=written.extend)
+
+        for i in range(5):
+            await writer.put({"id": f"s{i}", "status": "completed"})
+        await writer.put({"id": "s0", "improved_text": "다시"})
+        await writer.close()
+
+        assert len(write.calls) == 1
+        assert write.calls[0][0] == {"id": "s0", "status": "completed", "improved_text": "다시"}
+        assert [row["id"] for row in written] == ["s0", "s1", "s2", "s3", "s4"]
+        metrics = writer.metrics()
+        assert metrics["enqueued"] == 6 and metrics["written"] == 5 and metrics["batches"] == 1
+        assert metrics["depth"] == 0
+
+    async def test_put_waits_when_queue_is_full(self):
+        gate = threading.Event()
+        write = RecordingWrite(gate=gate)
+        writer = SessionWriter(write, maxsize=2, batch_size=1, linger=0, policy=FAST_RETRY)
+
+        # 첫 행은 저장 중(gate에서 대기), 다음 두 행으로 큐가 가득 참
+        for i in range(3):
+            await writer.put({"id": f"s{i}"})
+            await asyncio.sleep(0.01)
+        blocked = asyncio.create_task(writer.put({"id": "s3"}))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        assert writer.metrics()["depth"] == 2
+
+        gate.set()
+        await asyncio.wait_for(blocked, 2)
+        await writer.close()
+
+        assert [row["id"] for row in write.saved] == ["s0", "s1", "s2", "s3"]
+        assert writer.metrics()["max_depth"] == 2
+
+    async def test_retries_transient_errors(self):
+        write = RecordingWrite(fail_times=3)
+        writer = SessionWriter(write, linger=0, policy=FAST_RETRY)
+
+        await writer.put({"id": "s1"})
+        await writer.close()
+
+        assert write.saved == [{"id": "s1"}]
+        assert writer.metrics()["retries"] == 3
+        assert writer.metrics()["failed"] == 0
+
+    async def test_fatal_error_isolates_bad_row(self):
+        write = RecordingWrite(poison="bad")
+        written = []
+        writer = SessionWriter(write, linger=0.01, policy=FAST_RETRY, on_written=written.extend)
+
+        for row_id in ("s1", "bad", "s2"):
+            await writer.put({"id": row_id})
+        await writer.close()
+
+        assert [row["id"] for row in write.saved] == ["s1", "s2"]
+        assert [row["id"] for row in written] == ["s1", "s2"]
+        assert writer.metrics()["failed"] == 1
+
+    async def test_close_drains_queue_and_rejects_new_rows(self):
+        write = RecordingWrite()
+        writer = SessionWriter(write, batch_size=3, linger=0.5, policy=FAST_RETRY)
+
+        for i in range(7):
+            await writer.put({"id": f"s{i}"})
+        await writer.close()
+
+        assert len(write.saved) == 7
+        assert max(len(call) for call in write.calls) <= 3
+        with pytest.raises(RuntimeError):
+            await writer.put({"id": "late"})
+
+    async def test_close_times_out_on_stuck_write(self):
+        gate = threading.Event()
+        writer = SessionWriter(RecordingWrite(gate=gate), linger=0, policy=FAST_RETRY)
+
+        await writer.put({"id": "s1"})
+        await writer.close(timeout=0.05)
+        gate.set()
+
+        assert writer.metrics()["written"] == 0
+
+    async def test_close_times_out_with_full_queue_while_db_is_down(self):
+        writer = SessionWriter(RecordingWrite(fail_times=10**6), maxsize=2, batch_size=1, linger=0, policy=FAST_RETRY)
+
+        # 첫 행은 재시도 중, 다음 두 행으로 큐가 가득 참 (STOP을 넣을 자리가 없음)
+        for i in range(3):
+            await writer.put({"id": f"s{i}"})
+            await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(writer.close(timeout=0.2), 2)
+
+        assert writer.metrics()["written"] == 0
@@ -0,0 +1,191 @@
+"""
+분석 결과 저장소 테스트
+
+프로세스 캐시 → attempts → 작업 큐 순서의 조회, 소유자 확인, 동시 조회 합치기,
+재요청 결과 반영, GET /analyze/{session_id}의 ETag / 304 응답을 검증합니다.
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from api.dependencies import UserContext
+from api.jobs import JobQueue
+from api.results import ResultStore, StoredResult
+from api.routes import analyze
+
+
+ANALYSIS = {
+    "scores": {
+        "logic_structure": "B",
+        "filler_words": "A",
+        "speaking_pace": "B+",
+        "confidence_tone": "B",
+        "content_specificity": "C+",
+    },
+    "metrics": {
+        "words_per_minute": 140,
+        "filler_count": 2,
+        "filler_percentage": 1.5,
+        "total_words": 130,
+        "duration_seconds": 55.0,
+    },
+    "suggestions": [],
+    "structure_analysis": "STAR",
+}
+
+RESULT = {
+    "session_id": "s1",
+    "transcript": "원본 답변",
+    "analysis": ANALYSIS,
+    "improved_script": "개선안",
+    "improved_audio_url": "https://a/improved.mp3",
+    "original_audio_url": "https://a/original.webm",
+    "refinement_count": 0,
+    "can_refine": True,
+    "degradations": [],
+}
+
+ATTEMPT = {
+    "id": "s1",
+    "user_id": "u1",
+    "original_text": "원본 답변",
+    "analysis": ANALYSIS,
+    "improved_text": "다시 다듬은 개선안",
+    "original_audio_url": "https://a/original.webm",
+    "improved_audio_url": None,
+    "refinement_count": 1,
+    "status": "completed",
+}
+
+
+def complete_job(queue: JobQueue, session_id: str, owner: str) -> None:
+    queue.enqueue("analyze", {"session_id": session_id, "user_id": owner}, job_id=session_id)
+    job = queue.claim("w1")
+    queue.complete(job.id, {**RESULT, "session_id": session_id})
+
+
+class TestStoredResult:
+    """직렬화 / ETag 테스트"""
+
+    def test_body_is_base_response_and_etag_is_stable(self):
+        first = StoredResult(RESULT, "u1")
+
+        assert json.loads(first.body) == {"success": True, "data": RESULT, "error": None}
+        assert first.etag == StoredResult(RESULT, "u1").etag
+        assert first.etag != StoredResult({**RESULT, "improved_script": "x"}, "u1").etag
+
+    def test_matches_if_none_match_list(self):
+        result = StoredResult(RESULT, "u1")
+
+        assert result.matches(f'"other", W/{result.etag}')
+        assert result.matches("*")
+        assert not result.matches('"other"')
+        assert not result.matches(None)
+
+
+@pytest.mark.asyncio
+class TestResultStore:
+    """계층별 조회 테스트"""
+
+    async def test_loads_from_job_queue_once(self, queue):
+        complete_job(queue, "s1", "guest-1")
+        store = ResultStore(load_attempt=lambda *args: None)
+
+        first = await store.get("s1", "guest-1", queue)
+        second = await store.get("s1", "guest-1", queue)
+
+        assert first is second
+        assert json.loads(first.body)["data"]["improved_script"] == "개선안"
+        assert store.loads == {"attempts": 0, "queue": 1}
+
+    async def test_other_owner_gets_nothing(self, queue):
+        complete_job(queue, "s1", "guest-1")
+        store = ResultStore(load_attempt=lambda *args: None)
+
+        assert await store.get("s1", "guest-2", queue) is None
+        assert await store.get("s1", "guest-1", queue) is not None
+
+    async def test_authenticated_prefers_attempt_row(self, queue):
+        complete_job(queue, "s1", "u1")
+        store = ResultStore(load_attempt=lambda session_id, user_id: ATTEMPT if user_id == "u1" else None)
+
+        result = await store.get("s1", "u1", queue, is_authenticated=True)
+
+        data = json.loads(result.body)["data"]
+        assert data["improved_script"] == "다시 다듬은 개선안"
+        assert data["refinement_count"] == 1 and data["can_refine"] is True
+        assert store.loads == {"attempts": 1, "queue": 0}
+
+    async def test_attempt_failure_falls_back_to_job_queue(self, queue):
+        complete_job(queue, "s1", "u1")
+
+        def failing(*args):
+            raise ConnectionError("supabase down")
+
+        store = ResultStore(load_attempt=failing)
+
+        result = await store.get("s1", "u1", queue, is_authenticated=True)
+
+        assert json.loads(result.body)["data"]["improved_script"] == "개선안"
+
+    async def test_concurrent_misses_share_one_lookup(self, queue):
+        gate = threading.Event()
+        calls = []
+
+        def slow_attempt(session_id, user_id):
+            calls.append(session_id)
+            gate.wait(5)
+            return ATTEMPT
+
+        store = ResultStore(load_attempt=slow_attempt)
+        polls = [asyncio.create_task(store.get("s1", "u1", queue, is_authenticated=True)) for _ in range(10)]
+        await asyncio.sleep(0.05)
+        gate.set()
+        results = await asyncio.gather(*polls)
+
+        assert calls == ["s1"]
+        assert len({id(result) for result in results}) == 1
+
+    async def test_update_applies_refinement(self):
+        store = ResultStore()
+        before = store.put("s1", RESULT, "u1")
+
+        store.update("s1", {"improved_script": "재요청 개선안", "refinement_count": 2})
+
+        after = store.cache.get("s1")
+        data = json.loads(after.body)["data"]
+        assert data["improved_script"] == "재요청 개선안"
+        assert data["can_refine"] is False
+        assert after.etag != before.etag
+
+
+@pytest.mark.asyncio
+class TestGetAnalysisResult:
+    """GET /analyze/{session_id} 테스트"""
+
+    async def test_etag_and_not_modified(self, queue, monkeypatch):
+        monkeypatch.setattr(analyze, "RESULT_STORE", ResultStore(load_attempt=lambda *args: None))
+        complete_job(queue, "s1", "guest-1")
+        guest = UserContext(guest_session="guest-1")
+
+        response = await analyze.get_analysis_result("s1", None, guest, queue)
+        assert response.status_code == 200
+        assert json.loads(response.body)["data"]["session_id"] == "s1"
+        etag = response.headers["etag"]
+
+        response = await analyze.get_analysis_result("s1", etag, guest, queue)
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == etag
+
+    async def test_missing_session_is_404(self, queue, monkeypatch):
+        monkeypatch.setattr(analyze, "RESULT_STORE", ResultStore(load_attempt=lambda *args: None))
+
+        with pytest.raises(HTTPException) as error:
+            await analyze.get_analysis_result("missing", None, UserContext(guest_session="guest-1"), queue)
+
+        assert error.value.status_code == 404
@@ -0,0 +1,157 @@
+"""
+재요청 세션 캐시 테스트
+
+분석 완료 결과로 채운 세션 조회, attempts / 작업 큐 조회 후 캐시, 동시 조회 합치기, 소유자 확인,
+재요청 쓰기의 캐시 반영 + 저장 큐 전달, 크기 합계 기준 제거를 검증합니다.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException, Response
+
+from api.dependencies import UserContext
+from api.routes import refine
+from api.schemas import RefineRequest
+from api.sessions import SessionStore, session_from_result, session_size
+
+
+RESULT = {
+    "session_id": "s1",
+    "transcript": "원본 답변",
+    "analysis": {"suggestions": [{"suggestion": "결론을 먼저 말하세요"}]},
+    "improved_script": "개선안",
+    "improved_audio_url": "https://a/improved.mp3",
+    "original_audio_url": "https://a/original.webm",
+    "refinement_count": 0,
+    "can_refine": True,
+    "degradations": [],
+}
+
+ATTEMPT = {
+    "id": "s1",
+    "user_id": "u1",
+    "original_text": "원본 답변",
+    "analysis": {},
+    "improved_text": "첫 개선안",
+    "improved_audio_url": None,
+    "refinement_count": 0,
+    "pending_refinement": {"user_intent": "더 자신감 있게", "preview_script": "프리뷰"},
+    "status": "completed",
+}
+
+
+def no_attempt(*args):
+    return None
+
+
+@pytest.mark.asyncio
+class TestSessionStore:
+    """계층별 조회 / 갱신 테스트"""
+
+    async def test_analysis_result_is_served_from_cache(self, queue):
+        store = SessionStore(load_attempt=no_attempt)
+        store.put_result("s1", RESULT, "u1", "default_female")
+
+        session = await store.get("s1", "u1", queue, is_authenticated=True)
+
+        assert session["improved_script"] == "개선안"
+        assert session["analysis_result"] == RESULT["analysis"]
+        assert session["voice_type"] == "default_female"
+        assert store.loads == {"attempts": 0, "queue": 0}
+        assert await store.get("s1", "u2", queue, is_authenticated=True) is None
+
+    async def test_attempt_row_is_loaded_once(self, queue):
+        calls = []
+
+        def load(session_id, user_id):
+            calls.append(session_id)
+            return ATTEMPT
+
+        store = SessionStore(load_attempt=load)
+
+        first = await store.get("s1", "u1", queue, is_authenticated=True)
+        second = await store.get("s1", "u1", queue, is_authenticated=True)
+
+        assert calls == ["s1"]
+        assert first == second
+        assert first["pending_refinement"]["preview_script"] == "프리뷰"
+
+    async def test_concurrent_misses_share_one_lookup(self, queue):
+        gate = threading.Event()
+        calls = []
+
+        def slow_attempt(session_id, user_id):
+            calls.append(session_id)
+            gate.wait(5)
+            return ATTEMPT
+
+        store = SessionStore(load_attempt=slow_attempt)
+        requests = [asyncio.create_task(store.get("s1", "u1", queue, is_authenticated=True)) for _ in range(10)]
+        await asyncio.sleep(0.05)
+        gate.set()
+        sessions = await asyncio.gather(*requests)
+
+        assert calls == ["s1"]
+        assert all(session == sessions[0] for session in sessions)
+
+    async def test_guest_falls_back_to_job_queue(self, queue):
+        queue.enqueue("analyze", {"session_id": "s1", "user_id": "guest-1", "voice_type": "default_female"}, job_id="s1")
+        queue.complete(queue.claim("w1").id, RESULT)
+        store = SessionStore(load_attempt=no_attempt)
+
+        session = await store.get("s1", "guest-1", queue)
+
+        assert session["owner"] == "guest-1" and session["voice_type"] == "default_female"
+        assert store.loads == {"attempts": 0, "queue": 1}
+
+    async def test_evicts_by_total_size(self, queue):
+        one = session_size(session_from_result(RESULT, "u1"))
+        store = SessionStore(maxbytes=2 * one + 10, load_attempt=no_attempt)
+
+        for session_id in ("s1", "s2", "s3"):
+            store.put_result(session_id, {**RESULT, "session_id": session_id}, "u1")
+
+        assert store.cache.get("s1") is None
+        assert store.cache.get("s3") is not None
+        assert store.cache.bytes == 2 * one
+        assert store.metrics()["entries"] == 2
+
+
+@pytest.mark.asyncio
+class TestRefineSession:
+    """재요청 라우트의 세션 사용 테스트"""
+
+    async def test_update_session_writes_through(self, monkeypatch):
+        store = SessionStore(load_attempt=no_attempt)
+        store.put_result("s1", RESULT, "u1")
+        written = []
+
+        class Writer:
+            async def put(self, row):
+                written.append(row)
+
+        monkeypatch.setattr(refine, "SESSION_STORE", store)
+        monkeypatch.setattr(refine, "get_session_writer", lambda: Writer())
+
+        await refine.update_session("s1", {"pending_refinement": {"user_intent": "짧게", "preview_script": "프리뷰"}})
+
+        assert store.cache.get("s1")["pending_refinement"]["preview_script"] == "프리뷰"
+        assert written == [{"id": "s1", "pending_refinement": {"user_intent": "짧게", "preview_script": "프리뷰"}}]
+
+    async def test_other_users_session_is_not_found(self, queue, monkeypatch):
+        store = SessionStore(load_attempt=no_attempt)
+        store.put_result("s1", RESULT, "u1")
+        monkeypatch.setattr(refine, "SESSION_STORE", store)
+
+        with pytest.raises(HTTPException) as error:
+            await refine.refine_improvement(
+                RefineRequest(session_id="s1", user_intent="좀 더 자신감 있는 톤으로 바꿔주세요.", stage=1),
+                Response(),
+                UserContext(user={"user_id": "u2"}),
+                None,
+                queue,
+            )
+
+        assert error.value.status_code == 404
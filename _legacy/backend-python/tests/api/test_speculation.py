@@ -0,0 +1,180 @@
+"""
+프리뷰 음성 미리 생성 테스트
+
+Stage 1 이후 미리 생성 작업 등록 조건(인증 사용자 / 길이 / 일일 상한 / 중복),
+Stage 2의 적중 · 대기 중 작업 취소 · 실행 중 작업 대기, 낭비 문자 수 집계,
+워커 핸들러, 적중 시 그래프 없이 바로 완료하는 Stage 2 응답을 검증합니다.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from api.config import Settings
+from api.dependencies import UserContext
+from api.jobs import JobQueue, runner
+from api.routes import refine
+from api.schemas import RefineRequest
+from api.speculation import SpeculativeTTS
+from langgraph.nodes import tts
+
+
+SCRIPT = "결론부터 말씀드리면 결제 응답 시간을 40% 줄였습니다."
+INTENT = "좀 더 자신감 있는 톤으로 바꿔주세요."
+
+
+def finish(queue: JobQueue, audio_url: str = "https://a/speculative.mp3") -> None:
+    """워커 대신 미리 생성 작업 완료 처리"""
+    job = queue.claim("w1", lanes=["speculative"])
+    queue.complete(job.id, {"audio_url": audio_url, "chars": job.payload["chars"]})
+    queue.publish(job.id, "complete", {"audio_url": audio_url})
+
+
+@pytest.mark.asyncio
+class TestSchedule:
+    """미리 생성 작업 등록 테스트"""
+
+    async def test_schedules_once_per_script_and_voice(self, queue):
+        speculation = SpeculativeTTS(enabled=True)
+
+        job_id = await speculation.schedule(queue, "s1", SCRIPT, "default_male", None, "u1")
+        again = await speculation.schedule(queue, "s2", SCRIPT, "default_male", None, "u2")
+        other_voice = await speculation.schedule(queue, "s1", SCRIPT, "default_female", None, "u1")
+
+        job = queue.get(job_id)
+        assert job.lane == "speculative" and job.payload["chars"] == len(SCRIPT)
+        assert again is None and other_voice not in (None, job_id)
+        assert speculation.skipped["duplicate"] == 1
+
+    async def test_skips_guest_long_script_and_over_budget(self, queue):
+        speculation = SpeculativeTTS(enabled=True, max_chars=100, daily_chars=len(SCRIPT) + 10)
+
+        assert await speculation.schedule(queue, "s1", SCRIPT, "default_male", None, None) is None
+        assert await speculation.schedule(queue, "s1", "가" * 101, "default_male", None, "u1") is None
+        assert await speculation.schedule(queue, "s1", SCRIPT, "default_male", None, "u1")
+        assert await speculation.schedule(queue, "s2", SCRIPT + " 다시", "default_male", None, "u1") is None
+
+        assert speculation.skipped == {"guest": 1, "too_long": 1, "budget": 1, "duplicate": 0}
+
+    async def test_disabled_does_nothing(self, queue):
+        speculation = SpeculativeTTS(enabled=False)
+
+        assert await speculation.schedule(queue, "s1", SCRIPT, "default_male", None, "u1") is None
+        assert queue.stats() == {}
+
+
+@pytest.mark.asyncio
+class TestClaim:
+    """Stage 2 재사용 테스트"""
+
+    async def test_completed_speculation_is_a_hit(self, queue):
+        speculation = SpeculativeTTS(enabled=True)
+        await speculation.schedule(queue, "s1", SCRIPT, "default_male", None, "u1")
+        finish(queue)
+
+        audio_url = await speculation.claim(queue, SCRIPT, "default_male", None, timeout=1)
+
+        assert audio_url == "https://a/speculative.mp3"
+        metrics = speculation.metrics()
+        assert metrics["hit_rate"] == 1.0 and metrics["wasted_chars"] == 0
+
+    async def test_queued_speculation_is_cancelled(self, queue):
+        speculation = SpeculativeTTS(enabled=True)
+        job_id = await speculation.schedule(queue, "s1", SCRIPT, "default_male", None, "u1")
+
+        assert await speculation.claim(queue, SCRIPT, "default_male", None, timeout=1) is None
+
+        assert queue.get(job_id).status == "failed"
+        assert queue.claim("w1", lanes=["speculative"]) is None
+        assert speculation.metrics()["misses"] == 1 and speculation.metrics()["wasted_chars"] == 0
+
+    async def test_waits_for_running_speculation(self, queue):
+        speculation = SpeculativeTTS(enabled=True)
+        job_id = await speculation.schedule(queue, "s1", SCRIPT, "default_male", None, "u1")
+        job = queue.claim("w1", lanes=["speculative"])
+
+        async def complete_later():
+            await asyncio.sleep(0.3)
+            queue.complete(job.id, {"audio_url": "https://a/late.mp3", "chars": len(SCRIPT)})
+            queue.publish(job.id, "complete", {})
+
+        worker = asyncio.create_task(complete_later())
+        audio_url = await speculation.claim(queue, SCRIPT, "default_male", None, timeout=5)
+        await worker
+
+        assert job.id == job_id and audio_url == "https://a/late.mp3"
+
+    async def test_changed_intent_counts_waste(self, queue):
+        speculation = SpeculativeTTS(enabled=True)
+        await speculation.schedule(queue, "s1", SCRIPT, "default_male", None, "u1")
+        finish(queue)
+
+        await speculation.discard(queue, SCRIPT, "default_male", None)
+
+        assert speculation.metrics()["wasted_chars"] == len(SCRIPT)
+
+
+@pytest.mark.asyncio
+class TestSpeculativeJob:
+    """워커 핸들러 / Stage 2 응답 테스트"""
+
+    async def test_job_uploads_under_speculation_key(self, queue, monkeypatch):
+        calls = []
+
+        async def generate_tts(state, config=None):
+            calls.append(state)
+            return {"improved_audio_url": f"https://a/{state['session_id']}.mp3", "messages": []}
+
+        monkeypatch.setattr(tts, "generate_tts", generate_tts)
+        job_id = await SpeculativeTTS(enabled=True).schedule(queue, "s1", SCRIPT, "default_male", None, "u1")
+
+        result = await runner.run_speculative_tts_job(queue.get(job_id), None)
+
+        key = job_id.removeprefix("tts:")
+        assert calls[0]["improved_script"] == SCRIPT
+        assert result == {"audio_url": f"https://a/speculative_{key}.mp3", "chars": len(SCRIPT)}
+
+    async def test_stage2_hit_skips_graph(self, queue, monkeypatch):
+        speculation = SpeculativeTTS(enabled=True)
+        await speculation.schedule(queue, "s1", SCRIPT, "default_male", None, "u1")
+        finish(queue)
+        monkeypatch.setattr(refine, "SPECULATIVE_TTS", speculation)
+
+        def no_graph(include_tts=True):
+            raise AssertionError("graph should not run")
+
+        async def update_session(session_id, updates):
+            return None
+
+        monkeypatch.setattr(refine, "create_refinement_graph", no_graph)
+        monkeypatch.setattr(refine, "update_session", update_session)
+        session = {
+            "session_id": "s1",
+            "improved_script": "첫 개선안",
+            "refinement_count": 1,
+            "voice_type": "default_male",
+            "pending_refinement": {"user_intent": INTENT, "preview_script": SCRIPT},
+        }
+        settings = Settings(
+            supabase_url="http://localhost",
+            supabase_service_key="test",
+            openai_api_key="test",
+            anthropic_api_key="test",
+            elevenlabs_api_key="test",
+        )
+
+        response = await refine.handle_stage2_final(
+            RefineRequest(session_id="s1", user_intent=INTENT, stage=2),
+            session,
+            UserContext(user={"user_id": "u1"}),
+            settings,
+            queue,
+        )
+        events = [event async for event in response.body_iterator]
+
+        complete = json.loads(events[-1]["data"])
+        assert events[-1]["event"] == "complete"
+        assert complete["improved_script"] == SCRIPT
+        assert complete["improved_audio_url"] == "https://a/speculative.mp3"
+        assert speculation.metrics()["hits"] == 1
@@ -0,0 +1,248 @@
+"""
+직접 업로드 (multipart 스트리밍) 테스트
+
+multipart 본문을 청크 경계와 무관하게 파싱하는지, tee 분기가 같은 데이터를 받으면서
+메모리를 제한하는지, Storage/Whisper 동시 업로드와 Whisper 실패 시 URL 경로 전환,
+Storage 실패 시 Whisper 중단, 크기 제한을 넘은 업로드 중단을 검증합니다.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from api.uploads import (
+    StreamingForm,
+    UploadError,
+    UploadTooLarge,
+    read_head,
+    tee_stream,
+    transcribe_upload,
+)
+from tests.audio_samples import make_wav
+from tests.stand_in_server import StandInRequest, StandInResponse, StandInServer
+
+
+BOUNDARY = "----sosoo-test-boundary"
+
+
+def multipart_body(fields: dict, audio: bytes, filename: str = "answer.wav", content_type: str = "audio/wav") -> bytes:
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    parts.append(
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="audio"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n".encode()
+    )
+    parts.append(audio)
+    parts.append(f"\r\n--{BOUNDARY}--\r\n".encode())
+    return b"".join(parts)
+
+
+async def iterate(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+@pytest.mark.asyncio
+class TestStreamingForm:
+    """multipart 스트리밍 파싱 테스트"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    async def test_parses_across_chunk_boundaries(self, chunk_size):
+        audio = bytes(range(256)) * 40
+        body = multipart_body({"mode": "quick", "question": "자기소개 해주세요"}, audio)
+        form = StreamingForm(f"multipart/form-data; boundary={BOUNDARY}")
+
+        chunks = await form.start(iterate(body, chunk_size))
+
+        assert form.filename == "answer.wav"
+        assert form.file_content_type == "audio/wav"
+        assert form.fields == {"mode": "quick", "question": "자기소개 해주세요"}
+        assert await collect(chunks) == audio
+
+    async def test_missing_file_is_rejected(self):
+        body = f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="mode"\r\n\r\nquick\r\n--{BOUNDARY}--\r\n'
+        form = StreamingForm(f"multipart/form-data; boundary={BOUNDARY}")
+
+        with pytest.raises(UploadError):
+            await form.start(iterate(body.encode(), 64))
+
+    async def test_rejects_non_multipart(self):
+        with pytest.raises(UploadError):
+            StreamingForm("application/json")
+
+
+@pytest.mark.asyncio
+class TestTeeStream:
+    """스트림 복제 테스트"""
+
+    async def test_branches_receive_same_bytes(self):
+        data = bytes(range(256)) * 100
+        first, second = tee_stream(iterate(data, 1000), 2, max_chunks=2)
+
+        results = await asyncio.gather(collect(first), collect(second))
+
+        assert results == [data, data]
+
+    async def test_pump_waits_for_slow_branch(self):
+        produced = 0
+
+        async def source():
+            nonlocal produced
+            for _ in range(100):
+                produced += 1
+                yield b"x" * 10
+
+        fast, slow = tee_stream(source(), 2, max_chunks=3)
+        await collect(_take(fast, 3))
+        await asyncio.sleep(0.01)
+
+        # 느린 분기가 읽지 않는 동안 원본은 큐 크기만큼만 앞서 나감
+        assert produced <= 3 + 2
+        await asyncio.gather(collect(fast), collect(slow))
+        assert produced == 100
+
+    async def test_closed_branch_does_not_block_other(self):
+        data = b"y" * 10_000
+        abandoned, survivor = tee_stream(iterate(data, 100), 2, max_chunks=1)
+
+        await abandoned.aclose()
+
+        assert await asyncio.wait_for(collect(survivor), timeout=2.0) == data
+
+    async def test_source_error_reaches_all_branches(self):
+        async def broken():
+            yield b"a"
+            raise ConnectionError("client disconnected")
+
+        first, second = tee_stream(broken(), 2)
+
+        for branch in (first, second):
+            with pytest.raises(ConnectionError):
+                await collect(branch)
+
+    async def test_read_head_replays_consumed_bytes(self):
+        data = bytes(range(200))
+
+        head, exhausted, stream = await read_head(iterate(data, 30), 64)
+
+        assert len(head) >= 64 and not exhausted
+        assert await collect(stream) == data
+
+
+async def _take(stream, count: int):
+    for _ in range(count):
+        yield await stream.__anext__()
+
+
+def whisper_ok(duration: float):
+    async def handler(request: StandInRequest) -> StandInResponse:
+        body = {
+            "text": "안녕하세요 저는 개발자입니다",
+            "duration": duration,
+            "words": [{"word": "안녕하세요", "start": 0.0, "end": 0.8}],
+            "size": len(request.body),
+        }
+        return StandInResponse(200, body=json.dumps(body).encode(), headers={"content-type": "application/json"})
+
+    return handler
+
+
+def use_upstream(server: StandInServer, monkeypatch) -> None:
+    """Stand-in 서버를 Storage와 Whisper로 사용"""
+    server.script("/storage/v1/object/audio/uploads/s1.wav", [StandInResponse(200, body=b"{}")])
+    monkeypatch.setenv("SUPABASE_URL", server.url(""))
+    monkeypatch.setenv("SUPABASE_SERVICE_KEY", "service")
+    monkeypatch.setenv("OPENAI_BASE_URL", server.url("/v1"))
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+
+
+@pytest.mark.asyncio
+class TestTranscribeUpload:
+    """Storage / Whisper 동시 업로드 테스트"""
+
+    async def test_uploads_to_storage_and_whisper(self, monkeypatch):
+        async with StandInServer() as upstream:
+            use_upstream(upstream, monkeypatch)
+            upstream.handle("/v1/audio/transcriptions", whisper_ok(30.0))
+            audio = make_wav(30.0, 16000, 1)
+
+            result = await transcribe_upload(iterate(audio, 8192), "s1", "answer.wav", "audio/wav")
+
+            assert result.audio_url.endswith("/storage/v1/object/public/audio/uploads/s1.wav")
+            assert result.stt["transcript"] == "안녕하세요 저는 개발자입니다"
+            assert result.stt["audio_duration"] == 30.0
+            assert result.stt["word_timestamps"][0]["word"] == "안녕하세요"
+
+            storage = next(r for r in upstream.requests if r.path.startswith("/storage"))
+            whisper = next(r for r in upstream.requests if r.path == "/v1/audio/transcriptions")
+            assert storage.body == audio
+            assert audio in whisper.body
+            assert b'name="timestamp_granularities[]"' in whisper.body
+
+    async def test_whisper_failure_falls_back_to_url(self, monkeypatch):
+        async with StandInServer() as upstream:
+            use_upstream(upstream, monkeypatch)
+            upstream.script("/v1/audio/transcriptions", [StandInResponse(500)])
+            audio = make_wav(30.0, 16000, 1)
+
+            result = await transcribe_upload(iterate(audio, 8192), "s1", "answer.wav", "audio/wav")
+
+            assert result.stt is None
+            assert "500" in result.stt_error
+            storage = next(r for r in upstream.requests if r.path.startswith("/storage"))
+            assert storage.body == audio
+
+    async def test_short_audio_rejected_from_header(self, monkeypatch):
+        async with StandInServer() as upstream:
+            use_upstream(upstream, monkeypatch)
+            audio = make_wav(2.0, 16000, 1)
+
+            with pytest.raises(ValueError, match="too short"):
+                await transcribe_upload(iterate(audio, 8192), "s1", "answer.wav", "audio/wav")
+
+            assert upstream.requests == []
+
+    async def test_storage_failure_is_raised(self, monkeypatch):
+        async with StandInServer() as upstream:
+            use_upstream(upstream, monkeypatch)
+            upstream.script("/storage/v1/object/audio/uploads/s1.wav", [StandInResponse(500)])
+            upstream.handle("/v1/audio/transcriptions", whisper_ok(30.0))
+
+            with pytest.raises(Exception, match="upload"):
+                await transcribe_upload(iterate(make_wav(30.0, 16000, 1), 8192), "s1", "answer.wav", "audio/wav")
+
+    async def test_storage_failure_cancels_whisper(self, monkeypatch):
+        async with StandInServer() as upstream:
+            use_upstream(upstream, monkeypatch)
+            upstream.script("/storage/v1/object/audio/uploads/s1.wav", [StandInResponse(500)])
+            upstream.script("/v1/audio/transcriptions", [StandInResponse(200, body=b"{}", delay=5.0)])
+
+            started = asyncio.get_running_loop().time()
+            with pytest.raises(Exception, match="upload"):
+                await transcribe_upload(iterate(make_wav(30.0, 16000, 1), 8192), "s1", "answer.wav", "audio/wav")
+
+            # 전사 응답을 기다리지 않고 바로 실패
+            assert asyncio.get_running_loop().time() - started < 2.0
+
+    async def test_oversized_upload_aborts_both_branches(self, monkeypatch):
+        async with StandInServer() as upstream:
+            use_upstream(upstream, monkeypatch)
+            upstream.handle("/v1/audio/transcriptions", whisper_ok(30.0))
+            # MediaRecorder WebM: 헤더에 길이가 없어 앞부분 검증을 통과
+            audio = b"\x1a\x45\xdf\xa3" + bytes(400 * 1024)
+
+            with pytest.raises(UploadTooLarge):
+                await transcribe_upload(
+                    iterate(audio, 8192), "s1", "answer.webm", "audio/webm", max_bytes=200 * 1024
+                )
+
+            # 제한까지 보낸 뒤 중단 (완성된 업로드 없음)
+            assert all(len(request.body) < 210 * 1024 for request in upstream.requests)
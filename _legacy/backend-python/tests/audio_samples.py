@@ -0,0 +1,132 @@
+"""
+테스트/벤치마크용 합성 오디오 컨테이너
+
+실제 코덱 데이터 대신 0으로 채운 페이로드에 올바른 컨테이너 헤더만 씌운 파일을 만듭니다.
+헤더 파싱(audio_probe) 검증과 프로브 벤치마크에 사용합니다.
+"""
+
+import struct
+from typing import Optional
+
+
+def make_wav(seconds: float, sample_rate: int = 48000, channels: int = 2) -> bytes:
+    """16bit PCM WAV (무음)"""
+    byte_rate = sample_rate * channels * 2
+    data_size = int(seconds * byte_rate)
+    header = b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVE"
+    header += b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, byte_rate, channels * 2, 16)
+    header += b"data" + struct.pack("<I", data_size)
+    return header + bytes(data_size)
+
+
+def make_mp3(seconds: float, bitrate_kbps: int = 128, xing: bool = False, id3: bool = True) -> bytes:
+    """MPEG1 Layer III 44.1kHz 스테레오 (CBR, xing=True면 Xing 헤더 포함)"""
+    bitrate_index = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320].index(bitrate_kbps)
+    header = bytes([0xFF, 0xFB, (bitrate_index << 4) | 0x00, 0x00])
+    frame_length = 144 * bitrate_kbps * 1000 // 44100
+    frame_count = int(seconds * 44100 / 1152)
+
+    frame = header + bytes(frame_length - 4)
+    body = bytearray()
+    if xing:
+        info = bytearray(frame)
+        offset = 4 + 32
+        info[offset:offset + 12] = b"Xing" + struct.pack(">II", 0x01, frame_count)
+        body += info
+    body += frame * frame_count
+
+    prefix = b""
+    if id3:
+        tag = bytes(100)
+        size = len(tag)
+        syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+        prefix = b"ID3\x03\x00\x00" + syncsafe + tag
+    return prefix + bytes(body)
+
+
+def _box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", 8 + len(payload)) + box_type + payload
+
+
+def make_mp4(seconds: float, moov_at_end: bool = True, payload_bytes: int = 200_000) -> bytes:
+    """M4A (ftyp + mdat + moov/mvhd, 기본은 faststart 아님)"""
+    timescale = 44100
+    mvhd = _box(b"mvhd", bytes(4) + struct.pack(">IIII", 0, 0, timescale, int(seconds * timescale)) + bytes(80))
+    moov = _box(b"moov", mvhd)
+    ftyp = _box(b"ftyp", b"M4A " + bytes(4) + b"isomM4A ")
+    mdat = _box(b"mdat", bytes(payload_bytes))
+    return ftyp + (mdat + moov if moov_at_end else moov + mdat)
+
+
+def _ebml_size(size: Optional[int]) -> bytes:
+    if size is None:
+        return b"\x01\xff\xff\xff\xff\xff\xff\xff"  # unknown size
+    if size < 0x3FFF:
+        return struct.pack(">H", 0x4000 | size)
+    return (0x10000000 | size).to_bytes(4, "big")
+
+
+def _ebml(element_id: int, payload: bytes, size: Optional[int] = -1) -> bytes:
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, "big")
+    return id_bytes + _ebml_size(len(payload) if size == -1 else size) + payload
+
+
+def make_webm(seconds: float, with_duration: bool = True, frame_bytes: int = 160) -> bytes:
+    """WebM (Opus 20ms 프레임, with_duration=False면 MediaRecorder처럼 Duration 없음)"""
+    header = _ebml(0x1A45DFA3, _ebml(0x4282, b"webm"))
+
+    info_children = _ebml(0x2AD7B1, (1_000_000).to_bytes(3, "big"))
+    if with_duration:
+        info_children += _ebml(0x4489, struct.pack(">d", seconds * 1000))
+    info = _ebml(0x1549A966, info_children)
+    tracks = _ebml(0x1654AE6B, _ebml(0xAE, _ebml(0xD7, b"\x01")))
+
+    clusters = b""
+    total_ms = int(seconds * 1000)
+    for cluster_start in range(0, total_ms, 5000):
+        blocks = b""
+        for relative in range(0, min(5000, total_ms - cluster_start), 20):
+            block = b"\x81" + struct.pack(">hB", relative, 0x80) + bytes(frame_bytes)
+            blocks += _ebml(0xA3, block)
+        timecode = _ebml(0xE7, cluster_start.to_bytes(4, "big"))
+        clusters += _ebml(0x1F43B675, timecode + blocks, size=None)
+
+    segment = _ebml(0x18538067, info + tracks + clusters, size=None)
+    return header + segment
+
+
+def _ogg_page(granule: int, sequence: int, packet: bytes, header_type: int = 0) -> bytes:
+    segments = []
+    remaining = len(packet)
+    while remaining >= 255:
+        segments.append(255)
+        remaining -= 255
+    segments.append(remaining)
+    return (
+        b"OggS" + struct.pack("<BBqIIIB", 0, header_type, granule, 1, sequence, 0, len(segments))
+        + bytes(segments) + packet
+    )
+
+
+def make_ogg_opus(seconds: float, pre_skip: int = 312, page_packets: int = 50) -> bytes:
+    """Ogg Opus (페이지당 20ms 패킷 page_packets개)"""
+    head = b"OpusHead" + struct.pack("<BBHIhB", 1, 1, pre_skip, 48000, 0, 0)
+    tags = b"OpusTags" + struct.pack("<I", 4) + b"test" + struct.pack("<I", 0)
+    pages = [_ogg_page(0, 0, head, header_type=0x02), _ogg_page(0, 1, tags)]
+
+    total = int(seconds * 48000) + pre_skip
+    granule = 0
+    sequence = 2
+    while granule < total:
+        granule = min(granule + 960 * page_packets, total)
+        pages.append(_ogg_page(granule, sequence, bytes(80 * page_packets)))
+        sequence += 1
+    return b"".join(pages)
+
+
+def make_flac(seconds: float, sample_rate: int = 44100) -> bytes:
+    """FLAC (STREAMINFO만)"""
+    total_samples = int(seconds * sample_rate)
+    packed = (sample_rate << 44) | (0 << 41) | (15 << 36) | total_samples
+    streaminfo = struct.pack(">HH", 4096, 4096) + bytes(6) + packed.to_bytes(8, "big") + bytes(16)
+    return b"fLaC" + bytes([0x80]) + len(streaminfo).to_bytes(3, "big") + streaminfo + bytes(1000)
@@ -8,6 +8,8 @@ import pytest
 import asyncio
 from typing import Generator, AsyncGenerator
 
+from langgraph.utils.resilience import reset_circuit_breakers
+
 
 # ============================================
 # Async 설정
@@ -21,6 +23,18 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
     loop.close()
 
 
+# ============================================
+# 서킷 브레이커
+# ============================================
+
+@pytest.fixture(autouse=True)
+def clean_breakers():
+    """테스트 간 서킷 상태 공유 방지"""
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
 # ============================================
 # 환경 변수 Mock
 # ============================================
@@ -139,6 +153,9 @@ def mock_openai_client(monkeypatch):
     
     class MockAsyncOpenAI:
         audio = MockAudio()
+
+        def __init__(self, **kwargs):
+            pass
     
     monkeypatch.setattr("openai.AsyncOpenAI", MockAsyncOpenAI)
 
@@ -160,6 +177,9 @@ def mock_anthropic_client(monkeypatch):
     
     class MockAsyncAnthropic:
         messages = MockMessages()
+
+        def __init__(self, **kwargs):
+            pass
     
     monkeypatch.setattr("anthropic.AsyncAnthropic", MockAsyncAnthropic)
 
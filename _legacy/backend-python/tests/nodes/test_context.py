@@ -0,0 +1,341 @@
+"""
+Progressive Context 노드 테스트
+
+사용자 요약(`user_pattern_summaries`) 조회와 캐시/무효화, 요약이 없을 때
+`get_progressive_context` RPC로 대신하는지, DB 조회 실패 시 신규 유저로 진행하는지,
+문서가 그대로면 저장된 문서 추출 결과를 재사용하는지, Deep Mode에서 질문/답변과 관련된
+문서 구간만 골라 오는지 검증합니다.
+"""
+
+import json
+
+import pytest
+
+from langgraph.nodes import context
+from langgraph.nodes.context import (
+    CHUNK_CACHE,
+    EXTRACTION_STATS,
+    INDEX_CACHE,
+    PATTERN_CACHE,
+    analyze_uploaded_context,
+    build_progressive_context_prompt,
+    context_from_summary,
+    extract_user_patterns,
+    invalidate_user_patterns,
+    load_progressive_context,
+    patterns_from_context,
+    retrieve_document_passages,
+)
+
+
+RPC_RESULT = {
+    "sessions": [
+        {
+            "session_id": "a2",
+            "scores": {"speaking_pace": "B+", "filler_words": "A"},
+            "suggestion_categories": ["pace", "structure"],
+            "created_at": "2026-10-18T10:00:00+00:00",
+        },
+        {
+            "session_id": "a1",
+            "scores": {"speaking_pace": "C", "filler_words": "C+"},
+            "suggestion_categories": ["pace"],
+            "created_at": "2026-10-17T10:00:00+00:00",
+        },
+    ],
+    "session_count": 2,
+    "recurring_issues": ["pace"],
+    "improvement_trend": "improving",
+    "last_session_date": "2026-10-18T10:00:00+00:00",
+}
+
+
+SUMMARY_ROW = {
+    "session_count": 12,
+    "category_weights": {"pace": 2.15, "filler": 1.5, "structure": 0.8},
+    "latest_grade": 3.5,
+    "grade_ewma": 2.6,
+    "graded_count": 12,
+    "last_attempt_id": "a12",
+    "last_scores": {"speaking_pace": "B+"},
+    "last_categories": ["structure"],
+    "last_session_at": "2026-10-18T10:00:00+00:00",
+}
+
+
+class FakeSupabase:
+    """요약 테이블 조회와 rpc 호출을 기록하는 Supabase 클라이언트 대역"""
+
+    def __init__(self, rows=None, rpc_data=None, error: Exception = None, tables=None):
+        self.rows = rows or []
+        self.rpc_data = rpc_data
+        self.error = error
+        self.tables = tables or {}
+        self.calls = []
+        self._data = None
+
+    def table(self, name):
+        self.calls.append(("table", name))
+        self._data = self.tables.get(name, self.rows)
+        return self
+
+    def order(self, column):
+        return self
+
+    def upsert(self, row, on_conflict=None):
+        self.calls.append(("upsert", row))
+        self._data = [row]
+        return self
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.calls.append(("eq", column, value))
+        return self
+
+    def is_(self, column, value):
+        self.calls.append(("is", column, value))
+        return self
+
+    def limit(self, count):
+        return self
+
+    def rpc(self, name, params):
+        self.calls.append((name, params))
+        self._data = self.rpc_data
+        return self
+
+    def execute(self):
+        if self.error:
+            raise self.error
+        return type("Response", (), {"data": self._data})()
+
+
+@pytest.fixture(autouse=True)
+def clean_pattern_cache():
+    PATTERN_CACHE.clear()
+    yield
+    PATTERN_CACHE.clear()
+
+
+@pytest.mark.asyncio
+class TestLoadProgressiveContext:
+    """Progressive Context 로드 테스트"""
+
+    async def test_reads_summary_row(self, monkeypatch):
+        client = FakeSupabase(rows=[SUMMARY_ROW])
+        monkeypatch.setattr(context, "create_client", lambda *args: client)
+
+        result = await load_progressive_context({"user_id": "u1", "project_id": "p1"})
+
+        assert ("eq", "project_id", "p1") in client.calls
+        assert not any(call[0] == "get_progressive_context" for call in client.calls)
+        assert result["user_patterns"]["session_count"] == 12
+        assert result["user_patterns"]["recurring_issues"] == ["pace", "filler"]
+        assert result["user_patterns"]["improvement_trend"] == "improving"
+        assert result["previous_sessions"][0]["scores"] == {"speaking_pace": "B+"}
+
+    async def test_cached_until_invalidated(self, monkeypatch):
+        client = FakeSupabase(rows=[SUMMARY_ROW])
+        monkeypatch.setattr(context, "create_client", lambda *args: client)
+        state = {"user_id": "u1", "project_id": None}
+
+        await load_progressive_context(state)
+        await load_progressive_context(state)
+        assert client.calls.count(("table", "user_pattern_summaries")) == 1
+        assert ("is", "project_id", "null") in client.calls
+
+        invalidate_user_patterns("u1")
+        await load_progressive_context(state)
+        assert client.calls.count(("table", "user_pattern_summaries")) == 2
+
+    async def test_falls_back_to_rpc_without_summary(self, monkeypatch):
+        client = FakeSupabase(rows=[], rpc_data=RPC_RESULT)
+        monkeypatch.setattr(context, "create_client", lambda *args: client)
+
+        result = await load_progressive_context({"user_id": "u1", "project_id": "p1"})
+
+        assert ("get_progressive_context", {"p_user_id": "u1", "p_project_id": "p1", "p_limit": 5}) in client.calls
+        assert result["previous_sessions"] == RPC_RESULT["sessions"]
+        assert result["user_patterns"] == {
+            "is_new_user": False,
+            "session_count": 2,
+            "recurring_issues": ["pace"],
+            "improvement_trend": "improving",
+            "last_session_date": "2026-10-18T10:00:00+00:00",
+        }
+
+    async def test_db_failure_continues_as_new_user(self, monkeypatch):
+        monkeypatch.setattr(context, "create_client", lambda *args: FakeSupabase(error=RuntimeError("timeout")))
+
+        result = await load_progressive_context({"user_id": "u1"})
+
+        assert result["previous_sessions"] == []
+        assert result["user_patterns"]["is_new_user"] is True
+        # 실패는 캐시하지 않음
+        assert len(PATTERN_CACHE) == 0
+
+
+class FakeAnthropic:
+    """messages.create 호출 수를 세는 Anthropic 클라이언트 대역"""
+
+    calls = 0
+    prompts = []
+
+    def __init__(self, **kwargs):
+        self.messages = self
+
+    async def create(self, **kwargs):
+        FakeAnthropic.calls += 1
+        FakeAnthropic.prompts.append(kwargs["messages"][0]["content"])
+        content = type("Content", (), {"text": '{"skills": ["Redis"]}'})()
+        return type("Response", (), {"content": [content]})()
+
+
+DOCUMENTS = [{"document_type": "resume", "extracted_text": "Redis 캐시 도입으로 응답 시간 40% 단축"}]
+
+
+@pytest.mark.asyncio
+class TestDocumentExtraction:
+    """문서 추출 결과 재사용 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def fake_anthropic(self, monkeypatch):
+        FakeAnthropic.calls = 0
+        FakeAnthropic.prompts = []
+        CHUNK_CACHE.clear()
+        monkeypatch.setattr("anthropic.AsyncAnthropic", FakeAnthropic)
+        monkeypatch.setitem(EXTRACTION_STATS, "hits", 0)
+        monkeypatch.setitem(EXTRACTION_STATS, "misses", 0)
+
+    async def test_extracts_and_saves_on_miss(self, monkeypatch):
+        client = FakeSupabase(tables={"project_documents": DOCUMENTS, "project_context_extractions": []})
+        monkeypatch.setattr(context, "create_client", lambda *args: client)
+
+        result = await analyze_uploaded_context({"project_id": "p1"})
+
+        assert FakeAnthropic.calls == 1
+        assert json.loads(result["context_analysis"]) == {
+            "skills": ["Redis"],
+            "key_achievements": [],
+            "differentiators": [],
+            "expected_questions": [],
+        }
+        saved = next(call[1] for call in client.calls if call[0] == "upsert")
+        assert saved["project_id"] == "p1"
+        assert saved["document_count"] == 1
+        assert saved["documents_hash"] == context.documents_hash(context.combine_documents(DOCUMENTS))
+        assert EXTRACTION_STATS["misses"] == 1
+
+    async def test_reuses_stored_result_for_same_documents(self, monkeypatch):
+        stored = [{"extraction": "저장된 결과", "extraction_ms": 12000}]
+        client = FakeSupabase(tables={"project_documents": DOCUMENTS, "project_context_extractions": stored})
+        monkeypatch.setattr(context, "create_client", lambda *args: client)
+
+        result = await analyze_uploaded_context({"project_id": "p1"})
+
+        assert FakeAnthropic.calls == 0
+        assert result["context_analysis"] == "저장된 결과"
+        digest = context.documents_hash(context.combine_documents(DOCUMENTS))
+        assert ("eq", "documents_hash", digest) in client.calls
+        assert EXTRACTION_STATS["hits"] == 1
+
+    async def test_long_document_extracted_per_chunk(self, monkeypatch):
+        paragraphs = [f"프로젝트 {i}: 주문 처리량을 {i}배 늘렸습니다." + " 세부 내용." * 200 for i in range(12)]
+        documents = [{"document_type": "portfolio", "extracted_text": "\n\n".join(paragraphs)}]
+        client = FakeSupabase(tables={"project_documents": documents, "project_context_extractions": []})
+        monkeypatch.setattr(context, "create_client", lambda *args: client)
+
+        await analyze_uploaded_context({"project_id": "p1"})
+        chunk_calls = FakeAnthropic.calls
+
+        # 앞 10,000자 뒤의 내용도 추출 프롬프트에 포함됨
+        assert chunk_calls > 1
+        assert any("프로젝트 11:" in prompt for prompt in FakeAnthropic.prompts)
+
+        # 마지막 문단만 바뀌면 바뀐 조각만 다시 추출
+        documents[0]["extracted_text"] += "\n\n추가 경력: 사내 교육 진행"
+        await analyze_uploaded_context({"project_id": "p1"})
+
+        assert FakeAnthropic.calls == chunk_calls + 1
+
+
+@pytest.mark.asyncio
+class TestRetrieveDocumentPassages:
+    """문서 구간 검색 노드 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def index_dir(self, tmp_path, monkeypatch):
+        INDEX_CACHE.clear()
+        monkeypatch.setattr("langgraph.utils.retrieval.DOCUMENT_INDEX_DIR", str(tmp_path))
+        yield tmp_path
+        INDEX_CACHE.clear()
+
+    async def test_returns_passages_relevant_to_question(self, monkeypatch):
+        paragraphs = [f"프로젝트 {i}: 사내 도구 유지보수를 담당했습니다." + " 세부 내용." * 60 for i in range(10)]
+        paragraphs[7] = "결제 서버에 Redis 캐시를 도입해 응답 시간을 40% 줄였습니다."
+        documents = [{"document_type": "portfolio", "extracted_text": "\n\n".join(paragraphs)}]
+        client = FakeSupabase(tables={"project_documents": documents})
+        monkeypatch.setattr(context, "create_client", lambda *args: client)
+        state = {
+            "mode": "deep",
+            "project_id": "p1",
+            "question": "성능을 개선한 경험을 말해주세요",
+            "transcript": "캐시를 도입해서 응답 시간을 줄인 경험이 있습니다.",
+        }
+
+        result = await retrieve_document_passages(state)
+
+        assert result["document_passages"][0].startswith("[portfolio] ")
+        assert paragraphs[7] in result["document_passages"][0]
+        assert len(result["document_passages"]) <= context.RETRIEVAL_TOP_K
+
+        # 같은 문서면 프로세스 캐시의 색인 재사용
+        await retrieve_document_passages(state)
+        assert len(INDEX_CACHE) == 1
+
+    async def test_skipped_outside_deep_mode(self, monkeypatch):
+        monkeypatch.setattr(context, "create_client", lambda *args: pytest.fail("DB 조회 없어야 함"))
+
+        result = await retrieve_document_passages({"mode": "quick", "project_id": "p1", "transcript": "답변"})
+
+        assert result == {"document_passages": None}
+
+    async def test_failure_continues_without_passages(self, monkeypatch):
+        monkeypatch.setattr(context, "create_client", lambda *args: FakeSupabase(error=RuntimeError("timeout")))
+
+        result = await retrieve_document_passages({"mode": "deep", "project_id": "p1", "transcript": "답변"})
+
+        assert result["document_passages"] is None
+        assert result["messages"] == ["문서 검색 실패"]
+
+
+class TestDocumentsHash:
+    """문서 추출 캐시 키 테스트"""
+
+    def test_hash_changes_with_documents(self):
+        changed = [{**DOCUMENTS[0], "extracted_text": DOCUMENTS[0]["extracted_text"] + " (수정)"}]
+
+        assert context.documents_hash(context.combine_documents(DOCUMENTS)) != \
+            context.documents_hash(context.combine_documents(changed))
+
+
+class TestProgressivePatterns:
+    """패턴 변환 / 프롬프트 테스트"""
+
+    def test_empty_context_is_new_user(self):
+        assert patterns_from_context({"sessions": [], "session_count": 0}) == extract_user_patterns([])
+
+    def test_summary_trend_needs_two_graded_sessions(self):
+        summary = {**SUMMARY_ROW, "grade_ewma": None, "graded_count": 1}
+
+        assert context_from_summary(summary)["improvement_trend"] == "unknown"
+        assert context_from_summary({**SUMMARY_ROW, "latest_grade": 2.4})["improvement_trend"] == "stable"
+
+    def test_prompt_uses_projected_scores(self):
+        prompt = build_progressive_context_prompt(patterns_from_context(RPC_RESULT), RPC_RESULT["sessions"])
+
+        assert "2회 연습" in prompt
+        assert "반복적인 개선점: pace" in prompt
+        assert "지난 세션 점수: speaking_pace: B+, filler_words: A" in prompt
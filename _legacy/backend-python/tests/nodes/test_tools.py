@@ -4,9 +4,14 @@
 pace_analysis, filler_analysis, structure_analysis 도구를 테스트합니다.
 """
 
+import time
+
 import pytest
+from langgraph.nodes.analysis import parse_analysis_response
 from langgraph.tools import (
     analyze_pace,
+    analyze_pace_timeline,
+    words_from_segments,
     analyze_fillers,
     analyze_star_structure,
     get_pace_score,
@@ -65,6 +70,92 @@ class TestPaceAnalysis:
         assert get_pace_score(80) == "D"       # 매우 느림
 
 
+def timed_words(pattern, start: float = 0.0) -> list:
+    """(WPM, 초) 목록으로 일정한 간격의 단어 타임스탬프 생성 (WPM 0은 멈춤)"""
+    words = []
+    position = start
+    for wpm, seconds in pattern:
+        if wpm == 0:
+            position += seconds
+            continue
+        interval = 60.0 / wpm
+        for _ in range(int(seconds * wpm / 60)):
+            words.append({"word": "단어", "start": position, "end": position + interval * 0.8})
+            position += interval
+    return words
+
+
+class TestPaceTimeline:
+    """구간별 말 속도 분석 테스트"""
+    
+    def test_steady_pace_has_no_events(self):
+        """일정한 속도는 빠른/느린 구간 없음"""
+        result = analyze_pace_timeline(timed_words([(150, 60)]), 60.0)
+        
+        assert result["wpm_median"] == pytest.approx(150, abs=6)
+        assert result["rush_count"] == 0
+        assert result["stall_count"] == 0
+        assert result["pauses"]["pause_count"] == 0
+    
+    def test_detects_rush_then_stall(self):
+        """평균은 적정이어도 빨라진 구간과 늘어진 구간을 찾음"""
+        words = timed_words([(240, 30), (60, 30)])
+        
+        result = analyze_pace_timeline(words, 60.0)
+        
+        assert 120 <= analyze_pace(" ".join(w["word"] for w in words), 60.0)["words_per_minute"] <= 170
+        assert result["rush_count"] == 1
+        assert result["rush_intervals"][0]["start"] == 0.0
+        assert result["rush_intervals"][0]["end"] <= 35.0
+        assert result["stall_count"] == 1
+        assert result["stall_intervals"][0]["end"] == 60.0
+        assert result["pace_variability"] > 50
+    
+    def test_long_pauses_between_words(self):
+        """단어 사이 긴 멈춤"""
+        words = timed_words([(150, 20), (0, 3.0), (150, 20)])
+        
+        result = analyze_pace_timeline(words, 43.0)
+        
+        assert result["pauses"]["long_pause_count"] == 1
+        assert result["pauses"]["longest_pause_seconds"] == pytest.approx(3.1, abs=0.1)
+        assert result["long_pauses"][0]["start"] == pytest.approx(19.9, abs=0.1)
+    
+    def test_words_from_segments(self):
+        """세그먼트만 있으면 글자 수 비율로 단어 시각 근사"""
+        words = words_from_segments([{"start": 1.0, "end": 4.0, "text": " 가나 다 라마바"}])
+        
+        assert [w["word"] for w in words] == ["가나", "다", "라마바"]
+        assert words[0]["start"] == 1.0
+        assert words[1]["start"] == 2.0
+        assert words[-1]["end"] == 4.0
+    
+    def test_no_words(self):
+        """타임스탬프 없으면 빈 결과"""
+        assert analyze_pace_timeline([], 30.0) == {}
+    
+    def test_hour_long_transcript_is_fast(self):
+        """1시간 분량 (약 9천 단어)도 수십 밀리초 안에 처리"""
+        words = timed_words([(150, 600), (230, 120), (0, 5), (70, 120)] * 4)
+        
+        started = time.perf_counter()
+        result = analyze_pace_timeline(words)
+        elapsed = time.perf_counter() - started
+        
+        assert elapsed < 0.1
+        assert result["rush_count"] == 4
+        assert result["stall_count"] == 4
+    
+    def test_metrics_reach_analysis_result(self):
+        """구간별 지표가 AnalysisMetrics에 포함됨"""
+        timeline = analyze_pace_timeline(timed_words([(240, 30), (60, 30)]), 60.0)
+        
+        result = parse_analysis_response("{}", {"words_per_minute": 150}, {}, None, timeline)
+        
+        assert result["metrics"]["rush_count"] == 1
+        assert result["metrics"]["stall_seconds"] > 0
+
+
 class TestFillerAnalysis:
     """필러워드 분석 테스트"""
     
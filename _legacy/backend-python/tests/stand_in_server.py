@@ -0,0 +1,202 @@
+"""
+테스트/벤치마크용 로컬 Stand-in HTTP 서버
+
+외부 API(Claude, Whisper, ElevenLabs, Storage)를 흉내 내는 최소한의 HTTP/1.1 서버입니다.
+응답 시나리오(상태 코드, 헤더, 지연)를 미리 지정하여 장애 상황을 재현(fault injection)합니다.
+
+## 사용 예시
+
+```python
+async with StandInServer() as server:
+    server.script("/v1/tts", [
+        StandInResponse(503),
+        StandInResponse(200, body=b"ok"),
+    ])
+    response = await httpx.AsyncClient().post(server.url("/v1/tts"))
+```
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+class StandInResponse:
+    """
+    Stand-in 서버가 반환할 응답 정의
+
+    Args:
+        status: HTTP 상태 코드
+        body: 응답 본문
+        headers: 응답 헤더
+        delay: 응답 전 대기 시간 (초)
+    """
+
+    def __init__(
+        self,
+        status: int = 200,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+        delay: float = 0.0,
+    ):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.delay = delay
+
+
+class StandInRequest:
+    """서버가 수신한 요청 기록"""
+
+    def __init__(self, method: str, path: str, headers: Dict[str, str], body: bytes):
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+
+Handler = Callable[[StandInRequest], Awaitable[StandInResponse]]
+
+
+class StandInServer:
+    """
+    asyncio 기반 로컬 HTTP 서버
+
+    경로별로 응답 시나리오(리스트) 또는 핸들러 함수를 등록할 수 있습니다.
+    시나리오가 소진되면 마지막 응답을 반복합니다.
+    """
+
+    def __init__(self, host: str = "127.0.0.1"):
+        self.host = host
+        self.port = 0
+        self.requests: List[StandInRequest] = []
+        self._scripts: Dict[str, List[StandInResponse]] = {}
+        self._handlers: Dict[str, Handler] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set = set()
+
+    async def __aenter__(self) -> "StandInServer":
+        self._server = await asyncio.start_server(self._handle, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._server:
+            self._server.close()
+            # 지연 응답 중인 연결(클라이언트가 이미 포기한 요청)까지 정리
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+
+    def url(self, path: str = "/") -> str:
+        """경로에 대한 전체 URL"""
+        return f"http://{self.host}:{self.port}{path}"
+
+    def script(self, path: str, responses: List[StandInResponse]) -> None:
+        """경로별 응답 시나리오 등록"""
+        self._scripts[path] = list(responses)
+
+    def handle(self, path: str, handler: Handler) -> None:
+        """경로별 핸들러 함수 등록 (요청 내용에 따라 응답을 만들 때)"""
+        self._handlers[path] = handler
+
+    def serve_bytes(self, path: str, data: bytes, ranges: bool = True, headers: Optional[Dict[str, str]] = None) -> None:
+        """
+        정적 파일 제공 (Storage 흉내)
+
+        ranges=True면 `Range: bytes=a-b` / `bytes=-n` 요청에 206 Partial Content로 응답합니다.
+        """
+
+        async def handler(request: StandInRequest) -> StandInResponse:
+            range_header = request.headers.get("range", "")
+            if not ranges or not range_header.startswith("bytes="):
+                return StandInResponse(200, body=data, headers=dict(headers or {}))
+
+            first, _, last = range_header[len("bytes="):].partition("-")
+            if first == "":
+                start = max(len(data) - int(last), 0)
+                end = len(data) - 1
+            else:
+                start = int(first)
+                end = min(int(last), len(data) - 1) if last else len(data) - 1
+            return StandInResponse(206, body=data[start:end + 1], headers={
+                **(headers or {}),
+                "content-range": f"bytes {start}-{end}/{len(data)}",
+            })
+
+        self.handle(path, handler)
+
+    def hits(self, path: str) -> int:
+        """경로별 수신 요청 수"""
+        return sum(1 for r in self.requests if r.path == path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+
+                self.requests.append(request)
+                response = await self._respond(request)
+
+                if response.delay:
+                    await asyncio.sleep(response.delay)
+
+                head = [f"HTTP/1.1 {response.status} Stand-in"]
+                headers = {"content-length": str(len(response.body)), **response.headers}
+                head.extend(f"{k}: {v}" for k, v in headers.items())
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + response.body)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[StandInRequest]:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+
+        method, target, _ = request_line.decode().split(" ", 2)
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode().partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        body = b""
+        if "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding") == "chunked":
+            body = await self._read_chunked(reader)
+
+        path = target.split("?", 1)[0]
+        return StandInRequest(method, path, headers, body)
+
+    async def _read_chunked(self, reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+        while True:
+            size = int((await reader.readline()).strip() or b"0", 16)
+            if size == 0:
+                await reader.readline()
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+
+    async def _respond(self, request: StandInRequest) -> StandInResponse:
+        handler = self._handlers.get(request.path)
+        if handler:
+            return await handler(request)
+
+        scripted = self._scripts.get(request.path)
+        if not scripted:
+            return StandInResponse(404, body=b"not found")
+        if len(scripted) > 1:
+            return scripted.pop(0)
+        return scripted[0]
@@ -0,0 +1,270 @@
+"""
+오디오 전처리 테스트
+
+스테레오 48kHz 녹음이 모노 16kHz로 줄어드는지,
+변환할 수 없거나 이득이 없으면 원본을 그대로 쓰는지,
+음성 구간 검출(VAD)이 앞/뒤 무음을 자르고 멈춤을 세는지,
+길이 검증이 무음을 자르기 전 녹음 길이를 쓰는지, 인코딩이 한도 안의 첫 압축 포맷에서 멈추는지 검증합니다.
+(ffmpeg가 없는 환경에서도 WAV → WAV 변환은 동작)
+"""
+
+import io
+import math
+import struct
+import wave
+
+import numpy as np
+import pytest
+
+from langgraph.nodes.analysis import parse_analysis_response
+from langgraph.nodes.stt import build_stt_result
+from langgraph.utils import audio
+from langgraph.utils.audio import (
+    TARGET_SAMPLE_RATE,
+    PreprocessedAudio,
+    apply_voice_activity,
+    detect_voice_activity,
+    encode_samples,
+    preprocess_audio,
+    preprocess_audio_sync,
+    shutdown_preprocess_executor,
+)
+
+
+def make_wav(seconds: float, sample_rate: int = 48000, channels: int = 2) -> bytes:
+    """440Hz 사인파 WAV 생성"""
+    period = [
+        int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate))
+        for i in range(sample_rate // 440 * 10)
+    ]
+    frames = []
+    total = int(seconds * sample_rate)
+    for i in range(total):
+        frames.append(period[i % len(period)])
+    samples = struct.pack(f"<{total}h", *frames)
+    if channels == 2:
+        samples = b"".join(samples[i:i + 2] * 2 for i in range(0, len(samples), 2))
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples)
+    return buffer.getvalue()
+
+
+def make_speech(pattern, sample_rate: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """
+    (종류, 초) 목록으로 모의 녹음 생성
+
+    "speech"는 음절 단위로 진폭이 변하는 톤, "silence"는 약한 배경 잡음입니다.
+    """
+    rng = np.random.default_rng(0)
+    parts = []
+    for kind, seconds in pattern:
+        count = int(seconds * sample_rate)
+        if kind == "speech":
+            t = np.arange(count) / sample_rate
+            envelope = 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 3 * t))
+            parts.append(8000 * envelope * np.sin(2 * np.pi * 200 * t))
+        else:
+            parts.append(rng.normal(0, 30, count))
+    return np.concatenate(parts).astype("<i2")
+
+
+def to_wav(samples: np.ndarray, sample_rate: int = TARGET_SAMPLE_RATE) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def preprocess_pool():
+    """테스트마다 전처리 프로세스 풀 정리"""
+    yield
+    shutdown_preprocess_executor()
+
+
+PATTERN = [
+    ("silence", 2.0), ("speech", 3.0), ("silence", 0.15), ("speech", 2.0),
+    ("silence", 1.0), ("speech", 2.0), ("silence", 3.0), ("speech", 1.0), ("silence", 1.5),
+]
+
+
+class TestVoiceActivity:
+    """음성 구간 검출 테스트"""
+
+    def test_pause_stats_ignore_short_gaps_and_edges(self):
+        activity = detect_voice_activity(make_speech(PATTERN), TARGET_SAMPLE_RATE)
+
+        stats = activity.pause_stats()
+
+        # 0.15초 끊김은 멈춤이 아니고, 앞/뒤 무음도 멈춤이 아님
+        assert stats["pause_count"] == 2
+        assert stats["long_pause_count"] == 1
+        assert stats["longest_pause_seconds"] == pytest.approx(3.0, abs=0.1)
+        assert stats["total_pause_seconds"] == pytest.approx(4.0, abs=0.15)
+
+    def test_trims_leading_and_trailing_silence(self):
+        samples = make_speech(PATTERN)
+        activity = detect_voice_activity(samples, TARGET_SAMPLE_RATE)
+
+        trimmed, trimmed_seconds, collapsed_seconds = apply_voice_activity(samples, activity)
+
+        # 앞 2초 + 뒤 1.5초에서 경계 여유 0.2초씩 남김
+        assert trimmed_seconds == pytest.approx(3.1, abs=0.1)
+        assert collapsed_seconds == 0.0
+        assert len(trimmed) / TARGET_SAMPLE_RATE == pytest.approx(len(samples) / TARGET_SAMPLE_RATE - 3.1, abs=0.1)
+
+    def test_collapses_long_internal_silence(self):
+        samples = make_speech(PATTERN)
+        activity = detect_voice_activity(samples, TARGET_SAMPLE_RATE)
+
+        collapsed, _, collapsed_seconds = apply_voice_activity(samples, activity, trim=False, collapse_over=1.0)
+
+        assert collapsed_seconds == pytest.approx(2.0, abs=0.1)
+        assert len(samples) - len(collapsed) == pytest.approx(collapsed_seconds * TARGET_SAMPLE_RATE, abs=1)
+
+    def test_silence_only_is_left_untouched(self):
+        samples = make_speech([("silence", 3.0)])
+        activity = detect_voice_activity(samples, TARGET_SAMPLE_RATE)
+
+        result, trimmed_seconds, _ = apply_voice_activity(samples, activity)
+
+        assert activity.pause_stats()["pause_count"] == 0
+        assert trimmed_seconds == 0.0
+        assert len(result) == len(samples)
+
+    def test_pause_stats_reach_analysis_metrics(self):
+        activity = detect_voice_activity(make_speech(PATTERN), TARGET_SAMPLE_RATE)
+
+        result = parse_analysis_response("{}", {}, {}, activity.pause_stats())
+
+        assert result["metrics"]["pause_count"] == 2
+        assert result["metrics"]["long_pause_count"] == 1
+
+
+class TestPreprocessAudioSync:
+    """동기 변환 테스트"""
+
+    def test_stereo_48k_wav_is_downmixed_and_resampled(self):
+        original = make_wav(2.0)
+
+        result = preprocess_audio_sync(original, ".wav")
+
+        assert result.applied
+        assert result.size < result.original_size / 5
+        if result.extension == ".wav":
+            with wave.open(io.BytesIO(result.data)) as wav:
+                assert wav.getnchannels() == 1
+                assert wav.getframerate() == TARGET_SAMPLE_RATE
+
+    def test_already_small_audio_keeps_original(self):
+        original = make_wav(1.0, sample_rate=8000, channels=1)
+
+        result = preprocess_audio_sync(original, ".wav")
+
+        assert not result.applied
+        assert result.data == original
+
+    def test_undecodable_audio_keeps_original(self):
+        original = b"not really audio" * 100
+
+        result = preprocess_audio_sync(original, ".wav")
+
+        assert not result.applied
+        assert result.data == original
+        assert "decode failed" in result.reason
+        assert result.voice_activity is None
+
+    def test_trims_silence_and_reports_pauses(self):
+        original = to_wav(make_speech(PATTERN))
+
+        result = preprocess_audio_sync(original, ".wav")
+
+        assert result.applied
+        assert result.trimmed_seconds == pytest.approx(3.1, abs=0.1)
+        assert result.voice_activity["pause_count"] == 2
+
+    def test_length_rule_uses_recording_length_before_trimming(self):
+        # 말한 구간은 4초지만 녹음은 앞/뒤 무음을 포함해 7초 → 최소 길이(5초) 통과
+        processed = PreprocessedAudio(b"", ".wav", 0, applied=True, trimmed_seconds=2.5, collapsed_seconds=0.5)
+
+        result = build_stt_result("안녕하세요", 4.0, processed)
+
+        assert result["audio_duration"] == 4.5
+        with pytest.raises(ValueError, match="too short"):
+            build_stt_result("안녕하세요", 4.0, None)
+
+
+class TestEncodeSamples:
+    """인코딩 후보 선택 테스트"""
+
+    def fake_export(self, monkeypatch, sizes):
+        from pydub import AudioSegment
+
+        exported = []
+
+        def export(segment, buffer, format, codec=None, bitrate=None):
+            exported.append(format)
+            if sizes.get(format) is None:
+                raise RuntimeError("ffmpeg not found")
+            buffer.write(b"x" * sizes[format])
+
+        monkeypatch.setattr(AudioSegment, "export", export)
+        return exported
+
+    def test_first_compressed_fit_skips_other_candidates(self, monkeypatch):
+        exported = self.fake_export(monkeypatch, {"webm": 100, "mp3": 50, "wav": 1000})
+
+        assert encode_samples(np.zeros(16000, dtype=np.int16)) == (b"x" * 100, ".webm")
+        assert exported == ["webm"]
+
+    def test_wav_only_when_no_compressed_encoding(self, monkeypatch):
+        exported = self.fake_export(monkeypatch, {"wav": 1000})
+
+        assert encode_samples(np.zeros(16000, dtype=np.int16))[1] == ".wav"
+        assert exported == ["webm", "mp3", "wav"]
+
+    def test_oversized_compressed_returns_smallest_without_wav(self, monkeypatch):
+        monkeypatch.setattr(audio, "WHISPER_MAX_BYTES", 10)
+        exported = self.fake_export(monkeypatch, {"webm": 30, "mp3": 20, "wav": 1000})
+
+        assert encode_samples(np.zeros(16000, dtype=np.int16))[1] == ".mp3"
+        assert exported == ["webm", "mp3"]
+
+
+@pytest.mark.asyncio
+class TestPreprocessAudio:
+    """프로세스 풀 경유 변환 테스트"""
+
+    async def test_runs_in_process_pool(self):
+        original = make_wav(2.0)
+
+        result = await preprocess_audio(original, ".wav", min_bytes=0)
+
+        assert result.applied
+        assert result.size < len(original)
+
+    async def test_small_file_is_skipped(self):
+        original = make_wav(0.5)
+
+        result = await preprocess_audio(original, ".wav", min_bytes=len(original) + 1)
+
+        assert not result.applied
+        assert result.reason == "small file"
+        # 재인코딩은 생략해도 멈춤 통계는 계산
+        assert result.voice_activity is not None
+
+    async def test_disabled_by_env(self, monkeypatch):
+        monkeypatch.setenv("AUDIO_PREPROCESS", "0")
+
+        result = await preprocess_audio(make_wav(0.5), ".wav", min_bytes=0)
+
+        assert not result.applied
+        assert result.reason == "disabled"
@@ -0,0 +1,125 @@
+"""
+오디오 길이 프로브 테스트
+
+컨테이너별 헤더 파싱, HTTP Range 프로브의 읽기량,
+STT 노드의 다운로드 전 길이 거절을 검증합니다.
+"""
+
+import pytest
+
+from langgraph.nodes.stt import speech_to_text
+from langgraph.utils.audio import get_audio_duration_estimate
+from langgraph.utils.audio_probe import (
+    PROBE_HEAD_BYTES,
+    PROBE_TAIL_BYTES,
+    probe_audio_bytes,
+    probe_audio_url,
+    probe_duration,
+)
+from tests.audio_samples import (
+    make_flac,
+    make_mp3,
+    make_mp4,
+    make_ogg_opus,
+    make_wav,
+    make_webm,
+)
+from tests.stand_in_server import StandInServer
+
+
+class TestProbeDuration:
+    """컨테이너별 헤더 파싱 테스트"""
+
+    @pytest.mark.parametrize("audio_format,data,expected", [
+        ("wav", make_wav(12.5), 12.5),
+        ("mp3", make_mp3(30.0), 30.0),
+        ("mp3", make_mp3(30.0, xing=True), 30.0),
+        ("mp4", make_mp4(42.3), 42.3),
+        ("mp4", make_mp4(42.3, moov_at_end=False), 42.3),
+        ("webm", make_webm(61.2), 61.2),
+        ("webm", make_webm(61.2, with_duration=False), 61.2),
+        ("ogg", make_ogg_opus(17.3), 17.3),
+        ("flac", make_flac(8.25), 8.25),
+    ])
+    def test_exact_duration(self, audio_format, data, expected):
+        probe = probe_audio_bytes(data)
+
+        assert probe.format == audio_format
+        assert probe.duration == pytest.approx(expected, abs=0.1)
+
+    def test_end_based_format_needs_tail(self):
+        data = make_ogg_opus(30.0)
+        head = data[:PROBE_HEAD_BYTES]
+
+        # 앞부분만 있으면 마지막 granule이 아니므로 길이를 모른다고 답해야 함
+        assert probe_duration(head, b"", len(data)) == ("ogg", None)
+        assert probe_duration(head, data[-PROBE_TAIL_BYTES:], len(data))[1] == pytest.approx(30.0)
+
+    def test_unknown_data(self):
+        assert probe_duration(b"hello world" * 100) == (None, None)
+
+    def test_duration_estimate_prefers_header(self):
+        # 비트레이트 표(128kbps) 추정이면 훨씬 짧게 계산되는 64kbps MP3
+        data = make_mp3(20.0, bitrate_kbps=64)
+
+        assert get_audio_duration_estimate(data, ".mp3") == pytest.approx(20.0, abs=0.2)
+
+
+@pytest.mark.asyncio
+class TestProbeAudioUrl:
+    """HTTP Range 프로브 테스트"""
+
+    async def test_reads_only_head_and_tail(self):
+        data = make_webm(240.0, with_duration=False)
+        async with StandInServer() as server:
+            server.serve_bytes("/audio.webm", data)
+
+            probe = await probe_audio_url(server.url("/audio.webm"))
+
+        assert probe.duration == pytest.approx(240.0, abs=0.1)
+        assert probe.total_size == len(data)
+        assert probe.bytes_read <= PROBE_HEAD_BYTES + PROBE_TAIL_BYTES
+        assert probe.data is None
+
+    async def test_head_only_format_skips_tail_request(self):
+        async with StandInServer() as server:
+            server.serve_bytes("/audio.wav", make_wav(60.0))
+
+            probe = await probe_audio_url(server.url("/audio.wav"))
+
+            assert probe.duration == pytest.approx(60.0)
+            assert server.hits("/audio.wav") == 1
+
+    async def test_server_without_range_returns_body(self):
+        data = make_mp3(10.0)
+        async with StandInServer() as server:
+            server.serve_bytes("/audio.mp3", data, ranges=False)
+
+            probe = await probe_audio_url(server.url("/audio.mp3"))
+
+        assert probe.duration == pytest.approx(10.0, abs=0.1)
+        assert probe.data == data
+
+
+@pytest.mark.asyncio
+class TestSpeechToTextEarlyReject:
+    """STT 노드 다운로드 전 거절 테스트 (Whisper 호출 없음)"""
+
+    async def test_too_short_rejected_before_download(self):
+        data = make_webm(3.0, with_duration=False)
+        async with StandInServer() as server:
+            server.serve_bytes("/short.webm", data)
+
+            with pytest.raises(ValueError, match="too short"):
+                await speech_to_text({"audio_file_path": server.url("/short.webm")})
+
+            assert all("range" in r.headers for r in server.requests)
+
+    async def test_too_long_rejected_before_download(self):
+        async with StandInServer() as server:
+            server.serve_bytes("/long.mp3", make_mp3(400.0, xing=True))
+
+            with pytest.raises(ValueError, match="too long"):
+                await speech_to_text({"audio_file_path": server.url("/long.mp3")})
+
+            assert all("range" in r.headers for r in server.requests)
@@ -0,0 +1,65 @@
+"""
+프로세스 내 LRU 캐시 테스트
+"""
+
+import time
+
+from langgraph.utils.cache import LRUCache
+
+
+class TestLRUCache:
+    """LRU 제거 / TTL / 무효화 테스트"""
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_expires_after_ttl(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        cache = LRUCache(ttl=10)
+        cache.set("a", 1)
+
+        now[0] = 109.0
+        assert cache.get("a") == 1
+        now[0] = 111.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_invalidate_where(self):
+        cache = LRUCache()
+        cache.set(("u1", None), 1)
+        cache.set(("u1", "p1"), 2)
+        cache.set(("u2", None), 3)
+
+        removed = cache.invalidate_where(lambda key: key[0] == "u1")
+
+        assert removed == 2
+        assert cache.get(("u2", None)) == 3
+        assert cache.hits == 1
+
+    def test_evicts_by_total_size(self):
+        cache = LRUCache(maxbytes=10, sizeof=len)
+        cache.set("a", "xxxx")
+        cache.set("b", "xxxx")
+        cache.set("a", "xx")
+
+        cache.set("c", "xxxxx")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "xx" and cache.get("c") == "xxxxx"
+        assert cache.bytes == 7
+
+        cache.set("huge", "x" * 11)
+        assert cache.get("huge") is None and cache.bytes == 7
+
+        cache.invalidate("a")
+        assert cache.bytes == 5
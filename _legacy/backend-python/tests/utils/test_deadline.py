@@ -0,0 +1,167 @@
+"""
+요청 단위 데드라인 테스트
+
+남은 예산에 따른 타임아웃 계산, 작업 큐로 넘긴 만료 시각 복원, 재시도 중단, 선택적 단계 생략을 검증합니다.
+"""
+
+import time
+
+import httpx
+import pytest
+
+from api.jobs.runner import job_deadline
+from langgraph.graph import END, START, StateGraph
+from langgraph.nodes.improvement import reflect_on_improvement
+from langgraph.nodes.tts import generate_tts
+from langgraph.state import SpeechCoachState
+from langgraph.utils.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    MIN_CALL_TIMEOUT,
+    remaining_timeout,
+    should_degrade,
+)
+from langgraph.utils.metrics import instrument_node
+from langgraph.utils.resilience import (
+    RetryPolicy,
+    call_with_retry,
+    raise_for_upstream_status,
+)
+from tests.stand_in_server import StandInResponse, StandInServer
+
+
+class TestDeadline:
+    """Deadline 기본 동작 테스트"""
+
+    def test_timeout_is_capped_by_remaining_budget(self):
+        deadline = Deadline(5.0)
+
+        assert remaining_timeout(deadline, 60.0) <= 5.0
+        assert remaining_timeout(deadline, 2.0) == 2.0
+
+    def test_no_deadline_keeps_fixed_cap(self):
+        assert remaining_timeout(None, 30.0) == 30.0
+
+    def test_exhausted_budget_raises_and_records_miss(self):
+        deadline = Deadline(MIN_CALL_TIMEOUT / 2)
+
+        with pytest.raises(DeadlineExceeded):
+            deadline.timeout(30.0, "tts")
+
+        assert deadline.report()["misses"] == ["tts"]
+
+    def test_should_degrade_records_step(self):
+        config = {"configurable": {"deadline": Deadline(10.0)}}
+
+        assert should_degrade(config, "reflection")
+        assert not should_degrade(config, "unknown_step")
+        assert config["configurable"]["deadline"].degradations == ["reflection"]
+
+    def test_job_deadline_counts_time_since_enqueue(self):
+        # 큐에서 150초 기다린 180초 예산 작업은 30초만 남음 (재실행도 같은 만료 시각)
+        payload = {"deadline_seconds": 180.0, "deadline_at": time.time() + 30.0}
+
+        deadline = job_deadline(payload, 180.0)
+
+        assert 29.0 < deadline.remaining() <= 30.0
+        assert deadline.elapsed() >= 149.0
+        # 만료 시각이 없는 이전 작업은 받은 시점부터 전체 예산
+        assert job_deadline({"deadline_seconds": 60.0}, 180.0).remaining() > 59.0
+
+    def test_should_degrade_without_deadline(self):
+        assert not should_degrade(None, "react")
+        assert not should_degrade({"configurable": {}}, "react")
+
+
+@pytest.mark.asyncio
+class TestDeadlineRetry:
+    """데드라인이 재시도 레이어에 미치는 영향 테스트"""
+
+    async def test_slow_call_is_cut_at_deadline(self):
+        deadline = Deadline(MIN_CALL_TIMEOUT + 0.3)
+
+        async with StandInServer() as server:
+            server.script("/slow", [StandInResponse(200, body=b"late", delay=5.0)])
+
+            async def operation() -> httpx.Response:
+                async with httpx.AsyncClient() as client:
+                    response = await client.post(server.url("/slow"))
+                raise_for_upstream_status(response, "Stand-in call failed")
+                return response
+
+            started = time.monotonic()
+            with pytest.raises(DeadlineExceeded):
+                await call_with_retry("test", operation, RetryPolicy(max_attempts=3), deadline)
+            elapsed = time.monotonic() - started
+
+            # 고정 타임아웃(5초)이 아니라 남은 예산만큼만 기다려야 함
+            assert elapsed < 2.0
+            assert server.hits("/slow") == 1
+            assert deadline.misses == ["test"]
+
+    async def test_retry_skipped_when_budget_too_small(self):
+        deadline = Deadline(2.5)
+        policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=1.0)
+
+        async with StandInServer() as server:
+            server.script("/down", [StandInResponse(503, headers={"retry-after": "1"})])
+
+            async def operation() -> httpx.Response:
+                async with httpx.AsyncClient() as client:
+                    response = await client.post(server.url("/down"))
+                raise_for_upstream_status(response, "Stand-in call failed")
+                return response
+
+            with pytest.raises(Exception):
+                await call_with_retry("test", operation, policy, deadline)
+
+            assert server.hits("/down") == 1
+            assert deadline.misses == ["test"]
+
+
+@pytest.mark.asyncio
+class TestGracefulDegradation:
+    """예산 부족 시 선택적 단계 생략 테스트"""
+
+    async def test_reflection_is_skipped(self):
+        config = {"configurable": {"deadline": Deadline(5.0)}}
+        state = {
+            "transcript": "원본",
+            "improved_script_draft": "1차 개선안",
+            "analysis_result": {},
+        }
+
+        result = await reflect_on_improvement(state, config)
+
+        assert result["improved_script"] == "1차 개선안"
+        assert result["degradations"] == ["skip_reflection"]
+
+    async def test_tts_is_skipped(self):
+        config = {"configurable": {"deadline": Deadline(5.0)}}
+        state = {"improved_script": "개선안", "session_id": "s1"}
+
+        result = await generate_tts(state, config)
+
+        assert result["improved_audio_url"] == ""
+        assert result["degradations"] == ["skip_tts"]
+
+    async def test_compiled_graph_passes_deadline_to_nodes(self):
+        # 노드를 직접 부르지 않고 그래프 config로 전달되는지 확인 (config 타입이 맞아야 주입됨)
+        graph = StateGraph(SpeechCoachState)
+        graph.add_node("reflect", instrument_node("speech_coach", "reflect", reflect_on_improvement))
+        graph.add_node("tts", instrument_node("speech_coach", "tts", generate_tts))
+        graph.add_edge(START, "reflect")
+        graph.add_edge("reflect", "tts")
+        graph.add_edge("tts", END)
+        state = {
+            "session_id": "s1",
+            "transcript": "원본",
+            "improved_script_draft": "1차 개선안",
+            "analysis_result": {},
+        }
+
+        result = await graph.compile().ainvoke(state, {"configurable": {"deadline": Deadline(5.0)}})
+
+        assert result["improved_script"] == "1차 개선안"
+        assert result["improved_audio_url"] == ""
+        assert result["degradations"] == ["skip_reflection", "skip_tts"]
@@ -0,0 +1,135 @@
+"""
+문서 분할 추출 (Map-Reduce) 테스트
+
+경계 기준 분할과 겹침, 조각별 동시 추출의 실패 전파, 추출 결과 합치기 규칙을 검증합니다.
+"""
+
+import asyncio
+
+import pytest
+
+from langgraph.utils.documents import (
+    MAX_EXPECTED_QUESTIONS,
+    extract_chunks,
+    merge_extractions,
+    parse_extraction,
+    split_documents,
+    split_text,
+)
+
+
+class TestSplit:
+    """문서 분할 테스트"""
+
+    def test_short_text_is_single_chunk(self):
+        assert split_text("짧은 이력서", chunk_chars=100) == ["짧은 이력서"]
+        assert split_text("   ", chunk_chars=100) == []
+
+    def test_cuts_at_paragraph_and_covers_everything(self):
+        paragraphs = [f"문단 {i} " + "가" * 70 for i in range(20)]
+        text = "\n\n".join(paragraphs)
+
+        pieces = split_text(text, chunk_chars=400, overlap_chars=0)
+
+        assert len(pieces) > 1
+        assert all(len(piece) <= 400 for piece in pieces)
+        # 문단 경계에서 잘리므로 모든 문단이 온전히 한 조각에 들어감
+        assert all(any(p in piece for piece in pieces) for p in paragraphs)
+
+    def test_overlap_repeats_boundary_text(self):
+        text = "가" * 1000
+
+        pieces = split_text(text, chunk_chars=400, overlap_chars=50)
+
+        assert pieces[0][-50:] == pieces[1][:50]
+        assert sum(len(piece) for piece in pieces) - 50 * (len(pieces) - 1) == 1000
+
+    def test_chunks_do_not_span_documents(self):
+        chunks = split_documents([
+            {"document_type": "resume", "extracted_text": "가" * 250},
+            {"document_type": "portfolio", "extracted_text": ""},
+            {"document_type": "portfolio", "extracted_text": "나" * 50},
+        ], chunk_chars=100, overlap_chars=0)
+
+        assert [c.label for c in chunks] == ["resume 1/3", "resume 2/3", "resume 3/3", "portfolio 1/1"]
+        assert chunks[0].digest("v1") != chunks[0].digest("v2")
+
+
+class TestMerge:
+    """추출 결과 합치기 테스트"""
+
+    def test_parse_extraction_ignores_broken_json(self):
+        assert parse_extraction('결과:\n```json\n{"skills": ["Go"]}\n```') == {"skills": ["Go"]}
+        assert parse_extraction("{broken") == {}
+
+    def test_merges_and_deduplicates(self):
+        merged = merge_extractions([
+            {
+                "skills": ["Python", "Redis"],
+                "key_achievements": [{"project": "검색", "achievement": "색인 개편", "numbers": ""}],
+                "expected_questions": ["Redis를 선택한 이유는?", "가장 어려웠던 점은?"],
+            },
+            {
+                "skills": ["redis ", "Kafka"],
+                "key_achievements": [
+                    {"project": "결제", "achievement": "응답 시간 단축", "numbers": "40%"},
+                    {"project": "검색", "achievement": "색인 개편"},
+                ],
+                "differentiators": ["오픈소스 기여"],
+                "expected_questions": ["결제 장애 대응 경험은?"],
+            },
+        ])
+
+        # 두 조각에 나온 Redis가 먼저
+        assert merged["skills"] == ["Redis", "Python", "Kafka"]
+        # 수치가 있는 성과 먼저, 중복 제거
+        assert [a["project"] for a in merged["key_achievements"]] == ["결제", "검색"]
+        assert merged["differentiators"] == ["오픈소스 기여"]
+        # 조각별로 번갈아 선택
+        assert merged["expected_questions"] == ["Redis를 선택한 이유는?", "결제 장애 대응 경험은?", "가장 어려웠던 점은?"]
+
+    def test_caps_expected_questions(self):
+        partials = [{"expected_questions": [f"질문 {i}-{j}" for j in range(5)]} for i in range(3)]
+
+        assert len(merge_extractions(partials)["expected_questions"]) == MAX_EXPECTED_QUESTIONS
+
+
+@pytest.mark.asyncio
+class TestExtractChunks:
+    """조각별 동시 추출 테스트"""
+
+    async def test_runs_concurrently_in_order(self):
+        chunks = split_documents([{"document_type": "resume", "extracted_text": "가" * 300}], chunk_chars=100, overlap_chars=0)
+        running = 0
+        peak = 0
+
+        async def extract(chunk):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01 * (chunk.total - chunk.index))
+            running -= 1
+            return {"skills": [chunk.label]}
+
+        partials = await extract_chunks(chunks, extract)
+
+        assert [p["skills"][0] for p in partials] == [c.label for c in chunks]
+        assert peak == len(chunks)
+
+    async def test_failure_cancels_remaining(self):
+        chunks = split_documents([{"document_type": "resume", "extracted_text": "가" * 300}], chunk_chars=100, overlap_chars=0)
+        cancelled = []
+
+        async def extract(chunk):
+            if chunk.index == 0:
+                raise RuntimeError("Claude API rate limit")
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(chunk.index)
+                raise
+
+        with pytest.raises(RuntimeError):
+            await extract_chunks(chunks, extract)
+
+        assert sorted(cancelled) == [1, 2]
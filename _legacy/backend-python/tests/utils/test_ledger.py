@@ -0,0 +1,151 @@
+"""
+비용 원장 테스트
+
+노드 안의 Claude 토큰 · Whisper 길이 · ElevenLabs 문자 수가 계정 / 노드별로 합쳐져 저장되는지,
+저장 실패 시 처리, 사용자 월 비용(DB 합계 캐시 + 미저장분)과 예산 확인을 검증합니다.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+
+from api import dependencies
+from api.config import Settings
+from api.dependencies import UserContext, check_usage_budget
+from langgraph.utils import ledger
+from langgraph.utils.ledger import UNIT_COSTS, UsageLedger, usage_account
+from langgraph.utils.metrics import (
+    instrument_node,
+    record_anthropic_usage,
+    record_audio_seconds,
+    record_tts_characters,
+)
+
+
+USAGE = SimpleNamespace(input_tokens=1000, output_tokens=200, cache_read_input_tokens=5000)
+
+
+class FakeDatabase:
+    def __init__(self, base: float = 0.0):
+        self.written = []
+        self.lookups = 0
+        self.base = base
+        self.error = None
+
+    def write(self, rows):
+        if self.error:
+            raise self.error
+        self.written.extend(rows)
+        self.base += sum(row["cost_usd"] for row in rows if row["user_id"] == "u1")
+        return len(rows)
+
+    def load_cost(self, user_id, since):
+        self.lookups += 1
+        return self.base
+
+
+@pytest_asyncio.fixture
+async def database(monkeypatch) -> FakeDatabase:
+    database = FakeDatabase(base=1.0)
+    usage = UsageLedger(write=database.write, load_cost=database.load_cost, flush_interval=60)
+    monkeypatch.setattr(ledger, "LEDGER", usage)
+    monkeypatch.setattr(dependencies, "LEDGER", usage)
+    database.ledger = usage
+    yield database
+    await usage.close()
+
+
+async def analyze(state):
+    record_anthropic_usage(SimpleNamespace(usage=USAGE))
+    record_anthropic_usage(SimpleNamespace(usage=USAGE))
+    return {}
+
+
+async def tts(state):
+    record_tts_characters(400)
+    return {}
+
+
+@pytest.mark.asyncio
+class TestUsageLedger:
+    """원장 합산 / 저장 테스트"""
+
+    async def test_aggregates_per_session_and_node(self, database):
+        with usage_account("s1", "u1", "quick"):
+            record_audio_seconds(90.0)
+            await instrument_node("speech_coach", "analysis", analyze)({})
+            await instrument_node("speech_coach", "tts", tts)({})
+        # 계정 밖 사용량은 원장에 남기지 않음
+        await instrument_node("speech_coach", "tts", tts)({})
+
+        assert await database.ledger.flush() == 3
+        rows = {row["node"]: row for row in database.written}
+
+        assert rows["analysis"]["input_tokens"] == 2000
+        assert rows["analysis"]["cache_read_tokens"] == 10000
+        assert rows["analysis"]["cost_usd"] == pytest.approx(
+            2000 * UNIT_COSTS["input_tokens"] + 400 * UNIT_COSTS["output_tokens"]
+            + 10000 * UNIT_COSTS["cache_read_tokens"]
+        )
+        assert rows["none"]["audio_seconds"] == 90.0
+        assert rows["tts"]["tts_characters"] == 400
+        assert {(row["session_id"], row["user_id"], row["mode"]) for row in database.written} == {("s1", "u1", "quick")}
+
+    async def test_flushes_from_background_task(self, database):
+        database.ledger.flush_interval = 0.01
+
+        with usage_account("s1", None, "quick"):
+            await instrument_node("speech_coach", "tts", tts)({})
+        await asyncio.sleep(0.05)
+
+        assert [row["tts_characters"] for row in database.written] == [400]
+
+    async def test_retryable_failure_keeps_rows(self, database):
+        database.error = httpx.ConnectError("reset")
+        with usage_account("s1", "u1", "deep"):
+            await instrument_node("speech_coach", "tts", tts)({})
+        assert await database.ledger.flush() == 0
+
+        database.error = None
+        with usage_account("s1", "u1", "deep"):
+            await instrument_node("speech_coach", "tts", tts)({})
+        assert await database.ledger.flush() == 1
+
+        assert database.written[0]["tts_characters"] == 800
+
+
+@pytest.mark.asyncio
+class TestUserBudget:
+    """사용자 월 비용 / 예산 테스트"""
+
+    async def test_month_cost_adds_unflushed_without_double_counting(self, database):
+        tts_cost = 400 * UNIT_COSTS["tts_characters"]
+
+        assert await database.ledger.user_month_cost("u1") == 1.0
+        with usage_account("s1", "u1", "quick"):
+            await instrument_node("speech_coach", "tts", tts)({})
+        assert await database.ledger.user_month_cost("u1") == pytest.approx(1.0 + tts_cost)
+
+        await database.ledger.flush()
+
+        assert await database.ledger.user_month_cost("u1") == pytest.approx(1.0 + tts_cost)
+        # 캐시 유지 시간 안에서는 DB를 다시 조회하지 않음
+        assert database.lookups == 1
+
+    async def test_budget_dependency_rejects_over_budget_user(self, database):
+        settings = Settings.model_construct(user_monthly_budget_usd=1.0)
+        user = UserContext(user={"user_id": "u1"})
+
+        with pytest.raises(HTTPException) as error:
+            await check_usage_budget(user, settings)
+        assert error.value.status_code == 429
+        assert error.value.detail["code"] == "BUDGET_EXCEEDED"
+
+        # Guest / 예산 미설정은 확인하지 않음
+        await check_usage_budget(UserContext(guest_session="g1"), settings)
+        await check_usage_budget(user, Settings.model_construct(user_monthly_budget_usd=0.0))
+        assert database.lookups == 1
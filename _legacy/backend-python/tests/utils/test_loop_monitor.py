@@ -0,0 +1,60 @@
+"""
+이벤트 루프 감시 테스트
+
+노드 안의 동기 호출이 루프를 막으면 멈춤이 그 노드로 집계되고 막고 있는 스택이 로그에 남는지,
+정상 실행 중에는 지연만 기록되는지 검증합니다.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from langgraph.utils.loop_monitor import LoopMonitor
+from langgraph.utils.metrics import LOOP_BLOCKED_SECONDS, LOOP_LAG, LOOP_STALLS, instrument_node
+
+
+def sample(metric, name: str, **labels) -> float:
+    for family in metric.collect():
+        for item in family.samples:
+            if item.name == name and item.labels == labels:
+                return item.value
+    return 0.0
+
+
+async def blocking_lookup(state):
+    time.sleep(0.2)
+    return {}
+
+
+@pytest.mark.asyncio
+class TestLoopMonitor:
+    """루프 지연 / 멈춤 감지 테스트"""
+
+    async def test_stall_is_attributed_to_blocking_node(self, capsys):
+        monitor = LoopMonitor("test_block", interval=0.01, threshold=0.05)
+        monitor.start()
+        await asyncio.sleep(0.03)
+
+        await instrument_node("test_loop", "lookup", blocking_lookup)({})
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+        labels = {"role": "test_block", "graph": "test_loop", "node": "lookup"}
+        assert sample(LOOP_STALLS, "event_loop_stalls_total", **labels) == 1
+        assert sample(LOOP_BLOCKED_SECONDS, "event_loop_blocked_seconds_total", **labels) >= 0.15
+
+        output = capsys.readouterr().out
+        assert "[loop] test_block blocked" in output
+        assert "in test_loop.lookup" in output
+        assert "time.sleep(0.2)" in output
+
+    async def test_idle_loop_records_lag_without_stalls(self, capsys):
+        monitor = LoopMonitor("test_idle", interval=0.01, threshold=0.5)
+        monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+        assert sample(LOOP_LAG, "event_loop_lag_seconds_count", role="test_idle") >= 5
+        assert "[loop]" not in capsys.readouterr().out
+        assert asyncio.get_running_loop().slow_callback_duration == 0.5
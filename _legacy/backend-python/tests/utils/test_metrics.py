@@ -0,0 +1,120 @@
+"""
+노드 메트릭 테스트
+
+instrument_node로 감싼 노드의 실행 시간 기록, 시그니처 유지, 노드 안에서 일어난
+재시도 · Claude 토큰 · Whisper 길이 · ElevenLabs 문자 수의 노드 단위 집계와 /metrics 응답을 검증합니다.
+"""
+
+import inspect
+from types import SimpleNamespace
+from typing import Optional, TypedDict
+
+import httpx
+import pytest
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END, START, StateGraph
+from prometheus_client import REGISTRY
+
+from api.routes import health
+from langgraph.utils.metrics import (
+    instrument_node,
+    record_anthropic_usage,
+    record_audio_seconds,
+    record_tts_characters,
+)
+from langgraph.utils.resilience import RetryPolicy, call_with_retry
+
+
+FAST_POLICY = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.002)
+
+
+class CounterState(TypedDict):
+    value: int
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+class TestInstrumentNode:
+    """노드 래퍼 테스트"""
+
+    async def test_records_duration_and_keeps_signature(self):
+        async def step(state: CounterState, config: Optional[RunnableConfig] = None) -> dict:
+            return {"value": state["value"] + config["configurable"]["step"]}
+
+        node = instrument_node("test_graph", "step", step)
+        graph = StateGraph(CounterState)
+        graph.add_node("step", node)
+        graph.add_edge(START, "step")
+        graph.add_edge("step", END)
+
+        result = await graph.compile().ainvoke({"value": 1}, {"configurable": {"step": 1}})
+
+        # LangGraph는 시그니처로 config 전달 여부를 결정
+        assert inspect.signature(node) == inspect.signature(step)
+        assert result["value"] == 2
+        labels = {"graph": "test_graph", "node": "step", "status": "ok"}
+        assert sample("langgraph_node_duration_seconds_count", **labels) == 1
+
+    async def test_failed_node_is_recorded_as_error(self):
+        async def broken(state):
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await instrument_node("test_error", "broken", broken)({})
+
+        labels = {"graph": "test_error", "node": "broken", "status": "error"}
+        assert sample("langgraph_node_duration_seconds_count", **labels) == 1
+
+    async def test_provider_usage_is_attributed_to_node(self):
+        attempts = []
+
+        async def create():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise httpx.ConnectError("reset")
+            usage = SimpleNamespace(input_tokens=120, output_tokens=30, cache_read_input_tokens=1000)
+            return SimpleNamespace(usage=usage)
+
+        async def analyze(state):
+            await call_with_retry("anthropic", create, policy=FAST_POLICY)
+            record_audio_seconds(42.5)
+            record_tts_characters(300)
+            return {}
+
+        await instrument_node("test_usage", "analyze", analyze)({})
+
+        node = {"graph": "test_usage", "node": "analyze"}
+        assert sample("langgraph_node_retries_total", provider="anthropic", **node) == 1
+        assert sample("anthropic_tokens_total", kind="input", **node) == 120
+        assert sample("anthropic_tokens_total", kind="output", **node) == 30
+        assert sample("anthropic_tokens_total", kind="cache_read", **node) == 1000
+        assert sample("anthropic_tokens_total", kind="cache_creation", **node) == 0
+        assert sample("whisper_audio_seconds_total", **node) == 42.5
+        assert sample("elevenlabs_characters_total", **node) == 300
+
+    async def test_usage_outside_node_is_labelled_none(self):
+        before = sample("elevenlabs_characters_total", graph="none", node="none")
+
+        record_tts_characters(10)
+        record_anthropic_usage(SimpleNamespace())
+
+        assert sample("elevenlabs_characters_total", graph="none", node="none") == before + 10
+
+
+@pytest.mark.asyncio
+class TestMetricsRoute:
+    """GET /metrics 테스트"""
+
+    async def test_exports_prometheus_text(self):
+        async def step(state):
+            return {}
+
+        await instrument_node("test_route", "step", step)({})
+
+        response = await health.metrics()
+
+        assert response.media_type.startswith("text/plain")
+        assert b'langgraph_node_duration_seconds_bucket{graph="test_route"' in response.body
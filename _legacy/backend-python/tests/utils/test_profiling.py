@@ -0,0 +1,113 @@
+"""
+요청 단위 프로파일링 테스트
+
+같은 이벤트 루프에서 동시에 실행 중인 다른 작업의 스택이 섞이지 않는지,
+노드 경계마다 할당 차이가 기록되는지, 관리자 토큰 확인을 검증합니다.
+"""
+
+import asyncio
+import os
+import time
+import tracemalloc
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from api.config import Settings
+from api.dependencies import get_profile_id
+from langgraph.utils import profiling
+from langgraph.utils.metrics import instrument_node
+from langgraph.utils.profiling import current_profile, profile_run
+
+
+def burn(seconds: float) -> None:
+    started = time.process_time()
+    while time.process_time() - started < seconds:
+        sum(range(1000))
+
+
+async def profiled_work(rounds: int) -> None:
+    for _ in range(rounds):
+        burn(0.01)
+        await asyncio.sleep(0)
+
+
+async def other_work(rounds: int) -> None:
+    for _ in range(rounds):
+        burn(0.01)
+        await asyncio.sleep(0)
+
+
+def read(path: str) -> str:
+    with open(path) as file:
+        return file.read()
+
+
+@pytest.fixture(autouse=True)
+def fast_sampling(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_INTERVAL", 0.002)
+
+
+@pytest.mark.asyncio
+class TestProfileRun:
+    """profile_run 테스트"""
+
+    async def test_samples_only_profiled_request(self, tmp_path):
+        async def analyze(state):
+            # 노드 안에서 만든 작업도 프로파일 대상
+            await asyncio.gather(profiled_work(10), profiled_work(10))
+            return {"buffer": [bytearray(4096) for _ in range(100)]}
+
+        other = asyncio.create_task(other_work(40))
+        async with profile_run("p1", "job.analyze", directory=str(tmp_path)) as profile:
+            await instrument_node("test_profile", "analyze", analyze)({})
+        await other
+
+        folded = read(tmp_path / "p1" / "job.analyze.folded")
+        allocations = read(tmp_path / "p1" / "job.analyze.alloc.txt")
+
+        assert profile.sampling and profile.samples > 0
+        assert "profiled_work" in folded and "other_work" not in folded
+        # 이벤트 루프 프레임은 잘라냄
+        assert "run_until_complete" not in folded
+        assert "## start → node.analyze start" in allocations
+        assert "## node.analyze start → node.analyze end" in allocations
+        assert not tracemalloc.is_tracing()
+
+    async def test_without_profile_id_does_nothing(self, tmp_path):
+        async with profile_run(None, "job.analyze", directory=str(tmp_path)) as profile:
+            assert profile is None and current_profile() is None
+
+        assert os.listdir(tmp_path) == []
+
+    async def test_one_profile_per_process(self, tmp_path):
+        async with profile_run("p1", "job.analyze", directory=str(tmp_path)) as first:
+            async with profile_run("p2", "job.analyze", directory=str(tmp_path)) as second:
+                assert second is None and current_profile() is first
+
+        assert os.listdir(tmp_path) == ["p1"]
+
+
+@pytest.mark.asyncio
+class TestProfileToken:
+    """관리자 토큰 확인 테스트"""
+
+    @staticmethod
+    def request(query: str = "") -> Request:
+        return Request({"type": "http", "query_string": query.encode(), "headers": []})
+
+    async def test_matching_token_issues_profile_id(self):
+        settings = Settings.model_construct(profile_token="secret")
+
+        assert await get_profile_id(self.request(), None, settings) is None
+        assert await get_profile_id(self.request(), "secret", settings)
+        assert await get_profile_id(self.request("profile=secret"), None, settings)
+
+    async def test_wrong_or_unconfigured_token_is_forbidden(self):
+        for configured in ("secret", ""):
+            with pytest.raises(HTTPException) as error:
+                await get_profile_id(
+                    self.request("profile=guess"), None, Settings.model_construct(profile_token=configured)
+                )
+            assert error.value.status_code == 403
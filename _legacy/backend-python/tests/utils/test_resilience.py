@@ -0,0 +1,279 @@
+"""
+외부 호출 복원력 레이어 테스트
+
+로컬 Stand-in 서버로 5xx, 429(retry-after), 지연 응답을 주입하여
+재시도 · 서킷 브레이커 · 헤지 요청 동작을 검증합니다.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from langgraph.utils.resilience import (
+    CircuitOpenError,
+    RetryPolicy,
+    UpstreamHTTPError,
+    call_with_retry,
+    classify_error,
+    get_circuit_breaker,
+    hedged,
+    parse_retry_after,
+    raise_for_upstream_status,
+)
+from tests.stand_in_server import StandInResponse, StandInServer
+
+
+FAST_POLICY = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.02)
+
+
+def make_operation(server: StandInServer, path: str):
+    """Stand-in 서버에 POST하는 operation 생성"""
+
+    async def operation() -> httpx.Response:
+        async with httpx.AsyncClient() as client:
+            response = await client.post(server.url(path), timeout=5.0)
+        raise_for_upstream_status(response, "Stand-in call failed")
+        return response
+
+    return operation
+
+
+class TestErrorClassification:
+    """에러 분류 테스트"""
+
+    def test_retryable_status_codes(self):
+        for status in (429, 500, 502, 503, 529):
+            assert classify_error(UpstreamHTTPError("x", status_code=status)) == "retryable"
+
+    def test_fatal_status_codes(self):
+        for status in (400, 401, 403, 404, 422):
+            assert classify_error(UpstreamHTTPError("x", status_code=status)) == "fatal"
+
+    def test_timeouts_are_retryable(self):
+        assert classify_error(httpx.ReadTimeout("slow")) == "retryable"
+
+        class APITimeoutError(Exception):
+            pass
+
+        assert classify_error(APITimeoutError()) == "retryable"
+
+    def test_unknown_errors_are_fatal(self):
+        assert classify_error(ValueError("bad input")) == "fatal"
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after(httpx.Headers({"retry-after": "2"})) == 2.0
+        assert parse_retry_after(httpx.Headers({"retry-after-ms": "250"})) == 0.25
+        assert parse_retry_after(httpx.Headers({})) is None
+        assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+class TestRetry:
+    """재시도 + 백오프 테스트"""
+
+    async def test_recovers_from_transient_5xx(self):
+        async with StandInServer() as server:
+            server.script("/flaky", [
+                StandInResponse(503),
+                StandInResponse(502),
+                StandInResponse(200, body=b"ok"),
+            ])
+
+            response = await call_with_retry("test", make_operation(server, "/flaky"), FAST_POLICY)
+
+            assert response.content == b"ok"
+            assert server.hits("/flaky") == 3
+
+    async def test_fatal_error_is_not_retried(self):
+        async with StandInServer() as server:
+            server.script("/bad", [StandInResponse(400, body=b"invalid")])
+
+            with pytest.raises(UpstreamHTTPError) as exc_info:
+                await call_with_retry("test", make_operation(server, "/bad"), FAST_POLICY)
+
+            assert exc_info.value.status_code == 400
+            assert server.hits("/bad") == 1
+
+    async def test_gives_up_after_max_attempts(self):
+        async with StandInServer() as server:
+            server.script("/down", [StandInResponse(500)])
+
+            with pytest.raises(UpstreamHTTPError):
+                await call_with_retry("test", make_operation(server, "/down"), FAST_POLICY)
+
+            assert server.hits("/down") == FAST_POLICY.max_attempts
+
+    async def test_honours_retry_after(self):
+        async with StandInServer() as server:
+            server.script("/limited", [
+                StandInResponse(429, headers={"retry-after-ms": "200"}),
+                StandInResponse(200, body=b"ok"),
+            ])
+
+            started = time.monotonic()
+            await call_with_retry("test", make_operation(server, "/limited"), FAST_POLICY)
+            elapsed = time.monotonic() - started
+
+            # 지터 백오프(최대 0.02초)가 아니라 retry-after(0.2초)만큼 기다려야 함
+            assert elapsed >= 0.2
+
+    async def test_retry_after_beyond_limit_fails_fast(self):
+        policy = RetryPolicy(max_attempts=3, base_delay=0.01, max_retry_after=1.0)
+
+        async with StandInServer() as server:
+            server.script("/limited", [StandInResponse(429, headers={"retry-after": "120"})])
+
+            with pytest.raises(UpstreamHTTPError):
+                await call_with_retry("test", make_operation(server, "/limited"), policy)
+
+            assert server.hits("/limited") == 1
+
+    async def test_attempt_timeout_is_retried(self):
+        policy = RetryPolicy(max_attempts=2, base_delay=0.01, attempt_timeout=0.1)
+
+        async with StandInServer() as server:
+            server.script("/slow", [
+                StandInResponse(200, body=b"late", delay=1.0),
+                StandInResponse(200, body=b"fast"),
+            ])
+
+            response = await call_with_retry("test", make_operation(server, "/slow"), policy)
+
+            assert response.content == b"fast"
+
+
+@pytest.mark.asyncio
+class TestCircuitBreaker:
+    """서킷 브레이커 테스트"""
+
+    async def test_opens_after_consecutive_failures(self):
+        single_attempt = RetryPolicy(max_attempts=1)
+        breaker = get_circuit_breaker("test")
+        breaker.failure_threshold = 3
+
+        async with StandInServer() as server:
+            server.script("/down", [StandInResponse(503)])
+            operation = make_operation(server, "/down")
+
+            for _ in range(3):
+                with pytest.raises(UpstreamHTTPError):
+                    await call_with_retry("test", operation, single_attempt)
+
+            # 서킷이 열리면 서버에 요청을 보내지 않고 즉시 실패
+            with pytest.raises(CircuitOpenError):
+                await call_with_retry("test", operation, single_attempt)
+
+            assert server.hits("/down") == 3
+            assert breaker.state == "open"
+
+    async def test_half_open_trial_closes_circuit(self):
+        breaker = get_circuit_breaker("test")
+        breaker.failure_threshold = 1
+        breaker.recovery_timeout = 0.05
+
+        async with StandInServer() as server:
+            server.script("/recovering", [
+                StandInResponse(503),
+                StandInResponse(200, body=b"ok"),
+            ])
+            operation = make_operation(server, "/recovering")
+
+            with pytest.raises(UpstreamHTTPError):
+                await call_with_retry("test", operation, RetryPolicy(max_attempts=1))
+            assert breaker.state == "open"
+
+            time.sleep(0.06)
+            await call_with_retry("test", operation, RetryPolicy(max_attempts=1))
+
+            assert breaker.state == "closed"
+
+    async def test_unsettled_trial_is_released(self):
+        breaker = get_circuit_breaker("test")
+        breaker.state = "open"
+        breaker.recovery_timeout = 0.0
+
+        # 시험 호출이 취소되어도 다음 호출이 다시 시험
+        trial = asyncio.create_task(call_with_retry("test", lambda: asyncio.sleep(10), FAST_POLICY))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        # 상태 코드 없는 영구적 에러도 슬롯을 반납
+        async def broken():
+            raise TypeError("bad request body")
+
+        with pytest.raises(TypeError):
+            await call_with_retry("test", broken, FAST_POLICY)
+        assert breaker.state == "half_open"
+
+        await call_with_retry("test", lambda: asyncio.sleep(0), FAST_POLICY)
+        assert breaker.state == "closed"
+
+    async def test_client_errors_do_not_trip_circuit(self):
+        breaker = get_circuit_breaker("test")
+        breaker.failure_threshold = 1
+
+        async with StandInServer() as server:
+            server.script("/bad", [StandInResponse(400, body=b"invalid")])
+
+            # 요청 자체의 문제(4xx)는 업스트림 장애가 아니므로 서킷을 열지 않음
+            for _ in range(2):
+                with pytest.raises(UpstreamHTTPError):
+                    await call_with_retry("test", make_operation(server, "/bad"), FAST_POLICY)
+
+            assert breaker.state == "closed"
+            assert server.hits("/bad") == 2
+
+
+@pytest.mark.asyncio
+class TestHedgedRequests:
+    """헤지 요청 테스트"""
+
+    async def test_hedge_beats_slow_primary(self):
+        async with StandInServer() as server:
+            server.script("/refine", [
+                StandInResponse(200, body=b"slow", delay=1.0),
+                StandInResponse(200, body=b"hedge"),
+            ])
+
+            started = time.monotonic()
+            response = await call_with_retry(
+                "test",
+                hedged(make_operation(server, "/refine"), hedge_delay=0.05),
+                FAST_POLICY,
+            )
+            elapsed = time.monotonic() - started
+
+            assert response.content == b"hedge"
+            assert elapsed < 0.5
+            assert server.hits("/refine") == 2
+
+    async def test_no_hedge_when_primary_is_fast(self):
+        async with StandInServer() as server:
+            server.script("/refine", [StandInResponse(200, body=b"fast")])
+
+            response = await call_with_retry(
+                "test",
+                hedged(make_operation(server, "/refine"), hedge_delay=0.5),
+                FAST_POLICY,
+            )
+
+            assert response.content == b"fast"
+            assert server.hits("/refine") == 1
+
+    async def test_fast_client_error_is_not_hedged(self):
+        async with StandInServer() as server:
+            server.script("/refine", [StandInResponse(400, body=b"invalid")])
+
+            with pytest.raises(UpstreamHTTPError):
+                await call_with_retry(
+                    "test",
+                    hedged(make_operation(server, "/refine"), hedge_delay=0.5),
+                    FAST_POLICY,
+                )
+
+            # 4xx는 헤지도 재시도도 하지 않음 (비용 한 번)
+            assert server.hits("/refine") == 1
@@ -0,0 +1,102 @@
+"""
+문서 구간 검색 (BM25) 테스트
+
+한국어 토큰화, 질의와 관련된 구간 순위, 색인 저장/재사용과 이전 색인 정리를 검증합니다.
+"""
+
+import os
+from collections import Counter
+
+from langgraph.utils.retrieval import (
+    BM25Index,
+    corpus_digest,
+    load_or_build_index,
+    split_passages,
+    tokenize,
+)
+
+
+PASSAGES = [
+    {"document_type": "resume", "text": "결제 서버에 Redis 캐시를 도입해 응답 시간을 40% 줄였습니다."},
+    {"document_type": "resume", "text": "Kafka 기반 정산 파이프라인을 설계하고 장애 대응 체계를 정비했습니다."},
+    {"document_type": "portfolio", "text": "사내 기술 세미나에서 테스트 자동화 사례를 발표했습니다."},
+    {"document_type": "portfolio", "text": "검색 색인을 개편해 검색 품질과 색인 속도를 개선했습니다."},
+]
+
+
+class TestTokenize:
+    """한국어 토큰화 테스트"""
+
+    def test_hangul_bigrams_and_latin_words(self):
+        assert tokenize("캐시를 Redis 40% 줄") == ["캐시", "시를", "redis", "40", "줄"]
+
+    def test_particles_share_stem_bigram(self):
+        # 조사가 달라도 어간 바이그램이 겹침
+        assert "캐시" in tokenize("캐시는") and "캐시" in tokenize("캐시를")
+
+
+class TestBM25Index:
+    """BM25 검색 테스트"""
+
+    def test_build_uses_same_tokens_as_tokenize(self):
+        passages = PASSAGES + [{"document_type": "resume", "text": "API v2 설계, 줄 단위 로그 분석 (Go/gRPC)"}]
+        index = BM25Index.build(passages)
+
+        for doc_id, passage in enumerate(passages):
+            expected = Counter(tokenize(passage["text"]))
+            indexed = {}
+            for term, term_id in index.vocabulary.items():
+                start, end = index.indptr[term_id], index.indptr[term_id + 1]
+                for posting, tf in zip(index.doc_ids[start:end], index.tfs[start:end]):
+                    if posting == doc_id:
+                        indexed[term] = int(tf)
+            assert indexed == dict(expected)
+            assert index.doc_lengths[doc_id] == sum(expected.values())
+
+    def test_ranks_relevant_passage_first(self):
+        index = BM25Index.build(PASSAGES)
+
+        hits = index.search("Redis 캐시 도입 후 응답 시간과 장애 대응은 어떻게 바뀌었나요?", k=2)
+
+        assert [i for i, _ in hits] == [0, 1]
+        assert hits[0][1] > hits[1][1] > 0
+
+    def test_unmatched_passages_are_excluded(self):
+        index = BM25Index.build(PASSAGES)
+
+        assert [i for i, _ in index.search("세미나 발표", k=4)] == [2]
+        assert index.search("zzz", k=4) == []
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        index = BM25Index.build(PASSAGES)
+        path = str(tmp_path / "p1-abc")
+
+        index.save(path)
+        loaded = BM25Index.load(path)
+
+        query = "정산 파이프라인 장애"
+        assert loaded.search(query) == index.search(query)
+        assert loaded.passages == PASSAGES
+
+
+class TestLoadOrBuildIndex:
+    """프로젝트 색인 저장/재사용 테스트"""
+
+    def test_reuses_saved_index_and_drops_stale(self, tmp_path):
+        documents = [{"document_type": "resume", "extracted_text": "\n\n".join(p["text"] for p in PASSAGES)}]
+
+        index, stored = load_or_build_index("p1", documents, directory=str(tmp_path))
+        assert not stored
+        assert len(index) == len(split_passages(documents))
+
+        _, stored = load_or_build_index("p1", documents, directory=str(tmp_path))
+        assert stored
+
+        # 문서가 바뀌면 새로 만들고 이전 색인 파일은 삭제
+        changed = [{**documents[0], "extracted_text": documents[0]["extracted_text"] + "\n\n추가 경력"}]
+        _, stored = load_or_build_index("p1", changed, directory=str(tmp_path))
+        assert not stored
+        assert sorted(os.listdir(tmp_path)) == [
+            f"p1-{corpus_digest(changed)[:16]}.json",
+            f"p1-{corpus_digest(changed)[:16]}.npz",
+        ]
@@ -0,0 +1,174 @@
+"""
+세션 트레이싱 테스트
+
+노드 / 외부 호출(시도별) span의 부모 관계, asyncio 작업 간 컨텍스트 전달,
+traceparent로 이어 받기와 샘플링 결정, Chrome trace / OTLP-JSON 파일 내보내기와 회전,
+내보내기가 이벤트 루프 밖(내보내기 스레드)에서 실행되는지 검증합니다.
+"""
+
+import asyncio
+import json
+import os
+import threading
+
+import httpx
+import pytest
+
+from langgraph.utils import tracing
+from langgraph.utils.metrics import instrument_node
+from langgraph.utils.resilience import RetryPolicy, call_with_retry
+from langgraph.utils.tracing import TraceExporter, Tracer, span, start_trace, use_span
+
+
+FAST_POLICY = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.002)
+
+
+@pytest.fixture
+def exporter(tmp_path, monkeypatch) -> TraceExporter:
+    exporter = TraceExporter(str(tmp_path))
+    monkeypatch.setattr(tracing, "TRACER", Tracer(sample_rate=1.0, exporter=exporter))
+    yield exporter
+    exporter.close()
+
+
+def read_chrome(path: str) -> list:
+    """닫는 `]` 없이 쓰는 Chrome trace 배열 읽기"""
+    with open(path) as file:
+        return json.loads(file.read().rstrip().rstrip(",") + "]")
+
+
+def read_otlp(path: str) -> list:
+    with open(path) as file:
+        return [
+            item
+            for line in file
+            for item in json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        ]
+
+
+@pytest.mark.asyncio
+class TestSpans:
+    """span 생성 / 부모 관계 테스트"""
+
+    async def test_node_and_upstream_attempts_are_children(self, exporter):
+        failures = []
+
+        async def whisper(index: int):
+            async def call():
+                if index == 0 and not failures:
+                    failures.append(index)
+                    raise httpx.ConnectError("reset")
+                return index
+            return await call_with_retry("openai", call, policy=FAST_POLICY)
+
+        async def stt(state):
+            # 분할 전사처럼 동시에 호출 (asyncio 작업에도 현재 span이 이어져야 함)
+            await asyncio.gather(whisper(0), whisper(1))
+            return {}
+
+        trace = start_trace("POST /analyze", session_id="s1")
+        with use_span(trace, end_on_exit=True):
+            await instrument_node("speech_coach", "stt", stt)({})
+        exporter.flush()
+
+        spans = {item["name"]: item for item in read_otlp(exporter.path("otlp"))}
+        attempts = [item for item in read_otlp(exporter.path("otlp")) if item["name"] == "upstream.openai"]
+        root, node = spans["POST /analyze"], spans["node.stt"]
+
+        assert "parentSpanId" not in root and root["kind"] == tracing.KIND_SERVER
+        assert node["parentSpanId"] == root["spanId"]
+        assert len(attempts) == 3
+        assert all(item["parentSpanId"] == node["spanId"] for item in attempts)
+        assert [item["status"]["code"] for item in attempts].count(2) == 1
+        assert {item["traceId"] for item in spans.values()} == {trace.trace_id}
+
+    async def test_continues_trace_from_traceparent(self, exporter):
+        trace = start_trace("POST /refine")
+
+        job = start_trace("job.refine_preview", traceparent=trace.traceparent(), job_id="j1")
+        job.record("queue.wait", job.start_ns / 1e9 - 0.5, job.start_ns / 1e9)
+        job.end()
+        exporter.flush()
+
+        spans = {item["name"]: item for item in read_otlp(exporter.path("otlp"))}
+        assert spans["job.refine_preview"]["traceId"] == trace.trace_id
+        assert spans["job.refine_preview"]["parentSpanId"] == trace.span_id
+        assert spans["queue.wait"]["parentSpanId"] == spans["job.refine_preview"]["spanId"]
+        assert int(spans["queue.wait"]["endTimeUnixNano"]) - int(spans["queue.wait"]["startTimeUnixNano"]) == 500_000_000
+
+    async def test_unsampled_trace_records_nothing(self, exporter, monkeypatch):
+        monkeypatch.setattr(tracing.TRACER, "sample_rate", 0.0)
+
+        trace = start_trace("POST /analyze")
+        with use_span(trace, end_on_exit=True):
+            with span("db.attempts") as child:
+                assert child is None
+        job = start_trace("job.analyze", traceparent=trace.traceparent())
+        job.end()
+        exporter.flush()
+
+        assert trace.traceparent().endswith("-00") and not job.sampled
+        assert not os.path.exists(exporter.path("chrome"))
+
+    async def test_error_ends_root_with_status(self, exporter):
+        trace = start_trace("POST /refine")
+
+        with pytest.raises(ValueError):
+            with use_span(trace):
+                raise ValueError("session not found")
+        exporter.flush()
+
+        (root,) = read_otlp(exporter.path("otlp"))
+        assert root["status"] == {"code": 2, "message": "ValueError: session not found"}
+
+    async def test_export_runs_off_the_event_loop(self, exporter, monkeypatch):
+        writers = []
+        append = exporter._append
+
+        def recording_append(*args, **kwargs):
+            writers.append(threading.current_thread().name)
+            append(*args, **kwargs)
+
+        monkeypatch.setattr(exporter, "_append", recording_append)
+
+        start_trace("POST /analyze").end()
+        exporter.close()
+
+        # 파일 쓰기(잠금 대기 포함)는 루프 스레드가 아닌 내보내기 스레드에서
+        assert writers == ["trace-exporter", "trace-exporter"]
+        assert len(read_otlp(exporter.path("otlp"))) == 1
+
+
+class TestExport:
+    """파일 형식 / 회전 테스트"""
+
+    def test_chrome_trace_events(self, exporter):
+        trace = start_trace("POST /analyze", session_id="s1")
+        with use_span(trace, end_on_exit=True):
+            with span("db.attempts"):
+                pass
+        exporter.flush()
+
+        events = read_chrome(exporter.path("chrome"))
+        complete = {event["name"]: event for event in events if event["ph"] == "X"}
+
+        assert {"process_name", "thread_name"} <= {event["name"] for event in events if event["ph"] == "M"}
+        assert complete["db.attempts"]["tid"] == complete["POST /analyze"]["tid"]
+        assert complete["db.attempts"]["args"]["parent_id"] == trace.span_id
+        assert complete["POST /analyze"]["args"]["session_id"] == "s1"
+        assert complete["db.attempts"]["ts"] >= complete["POST /analyze"]["ts"]
+
+    def test_rotates_by_size(self, tmp_path, monkeypatch):
+        exporter = TraceExporter(str(tmp_path), max_bytes=4000, backup_count=2)
+        monkeypatch.setattr(tracing, "TRACER", Tracer(sample_rate=1.0, exporter=exporter))
+
+        for index in range(40):
+            start_trace("POST /analyze", session_id=f"s{index}").end()
+        exporter.flush()
+
+        path = exporter.path("chrome")
+        assert os.path.exists(f"{path}.1") and os.path.exists(f"{path}.2")
+        assert not os.path.exists(f"{path}.3")
+        for name in (path, f"{path}.1", f"{path}.2"):
+            assert os.path.getsize(name) <= 4000
+            assert read_chrome(name)
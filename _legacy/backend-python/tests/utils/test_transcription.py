@@ -0,0 +1,173 @@
+"""
+분할 전사 테스트
+
+긴 녹음을 무음 경계에서 나누는지, 조각 전사 결과를 겹침 중복 없이 이어 붙이는지,
+조각 전사가 제공자 동시 호출 상한을 지키는지 검증합니다.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from langgraph.utils import audio, resilience
+from langgraph.utils.audio import (
+    AudioChunk,
+    plan_chunks,
+    preprocess_audio_sync,
+    split_into_chunks,
+)
+from langgraph.utils.resilience import provider_slot
+from langgraph.utils.transcription import (
+    overlap_word_count,
+    stitch_transcripts,
+    transcribe_chunks,
+)
+from tests.utils.test_audio import make_speech, to_wav
+
+
+def chunk(index: int, start: float, end: float, keep_start: float, keep_end: float) -> AudioChunk:
+    return AudioChunk(index, b"", ".wav", start, end, keep_start, keep_end)
+
+
+class TestPlanChunks:
+    """조각 경계 계획 테스트"""
+
+    def test_cuts_at_long_pause_before_target(self):
+        pauses = np.array([[52.0, 52.4], [55.0, 57.0], [58.0, 58.3], [110.0, 111.0]])
+
+        plan = plan_chunks(150.0, pauses, chunk_seconds=60, search_seconds=10)
+
+        assert plan[0] == (0.0, 56.0)
+        assert plan[1] == (56.0, 110.5)
+        assert plan[-1][1] == 150.0
+
+    def test_cuts_at_target_without_pause(self):
+        plan = plan_chunks(190.0, np.empty((0, 2)), chunk_seconds=60)
+
+        assert plan == [(0.0, 60.0), (60.0, 120.0), (120.0, 190.0)]
+
+    def test_short_recording_is_single_chunk(self):
+        assert plan_chunks(70.0, np.empty((0, 2)), chunk_seconds=60) == [(0.0, 70.0)]
+
+
+class TestSplitIntoChunks:
+    """PCM 분할 테스트"""
+
+    def test_chunks_overlap_and_cut_in_silence(self):
+        pattern = []
+        for _ in range(6):
+            pattern += [("speech", 8.0), ("silence", 1.5)]
+        samples = make_speech(pattern)
+
+        chunks = split_into_chunks(samples, chunk_seconds=20, overlap_seconds=1.0)
+
+        assert len(chunks) == 3
+        for previous, following in zip(chunks, chunks[1:]):
+            assert previous.keep_end == following.keep_start
+            assert previous.end - following.start == pytest.approx(2.0, abs=0.01)
+            # 자른 위치는 멈춤 구간 안 (말하는 도중이 아님)
+            assert 8.0 < previous.keep_end % 9.5 < 9.5
+        assert chunks[0].extension == ".wav"
+
+    def test_long_audio_is_chunked_in_preprocess(self, monkeypatch):
+        monkeypatch.setattr(audio, "STT_CHUNK_THRESHOLD_SECONDS", 30.0)
+        monkeypatch.setattr(audio, "STT_CHUNK_SECONDS", 20.0)
+        samples = make_speech([("speech", 19.0), ("silence", 1.0)] * 3)
+
+        result = preprocess_audio_sync(to_wav(samples), ".wav")
+
+        assert result.applied
+        assert len(result.chunks) >= 2
+        assert result.size == sum(len(c.data) for c in result.chunks)
+
+
+class TestStitchTranscripts:
+    """조각 전사 결과 이어 붙이기 테스트"""
+
+    def test_keeps_overlap_once_and_shifts_timings(self):
+        chunks = [chunk(0, 0.0, 11.0, 0.0, 10.0), chunk(1, 9.0, 20.0, 10.0, 20.0)]
+        responses = [
+            {
+                "text": "첫 번째 문장입니다. 경계에 걸친 문장",
+                "duration": 11.0,
+                "segments": [
+                    {"start": 0.0, "end": 4.0, "text": " 첫 번째 문장입니다."},
+                    {"start": 8.5, "end": 11.0, "text": " 경계에 걸친 문장"},
+                ],
+            },
+            {
+                "text": "경계에 걸친 문장 두 번째 문장입니다.",
+                "duration": 11.0,
+                "segments": [
+                    {"start": 0.0, "end": 2.0, "text": " 경계에 걸친 문장"},
+                    {"start": 2.5, "end": 9.0, "text": " 두 번째 문장입니다."},
+                ],
+            },
+        ]
+
+        result = stitch_transcripts(chunks, responses)
+
+        assert result.text == "첫 번째 문장입니다. 경계에 걸친 문장 두 번째 문장입니다."
+        assert [s["start"] for s in result.segments] == [0.0, 8.5, 11.5]
+        assert [s["id"] for s in result.segments] == [0, 1, 2]
+        assert result.duration == 20.0
+
+    def test_removes_duplicate_words_at_boundary(self):
+        chunks = [chunk(0, 0.0, 11.0, 0.0, 10.0), chunk(1, 9.0, 20.0, 10.0, 20.0)]
+        responses = [
+            {"segments": [{"start": 5.0, "end": 9.6, "text": "그래서 저는 팀을 리드했고"}], "duration": 11.0},
+            {"segments": [{"start": 0.2, "end": 4.0, "text": "리드했고, 결과적으로 성공했습니다"}], "duration": 11.0},
+        ]
+
+        result = stitch_transcripts(chunks, responses)
+
+        assert result.text == "그래서 저는 팀을 리드했고 결과적으로 성공했습니다"
+        assert result.segments[1]["text"] == "결과적으로 성공했습니다"
+
+    def test_overlap_word_count_ignores_punctuation(self):
+        assert overlap_word_count(["a", "b", "c."], ["B", "c", "d"]) == 2
+        assert overlap_word_count(["a", "b"], ["c", "d"]) == 0
+
+
+@pytest.mark.asyncio
+class TestTranscribeChunks:
+    """조각 동시 전사 테스트"""
+
+    async def test_respects_provider_concurrency(self, monkeypatch):
+        monkeypatch.setitem(resilience.PROVIDER_CONCURRENCY, "openai", 2)
+        monkeypatch.setattr(resilience, "_provider_semaphores", type(resilience._provider_semaphores)())
+        active = peak = 0
+
+        async def transcribe(c):
+            nonlocal active, peak
+            async with provider_slot("openai"):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.02)
+                active -= 1
+            return c.index
+
+        chunks = [chunk(i, i * 10.0, i * 10.0 + 10, i * 10.0, i * 10.0 + 10) for i in range(6)]
+        results = await transcribe_chunks(chunks, transcribe)
+
+        assert results == list(range(6))
+        assert peak == 2
+
+    async def test_failure_cancels_other_chunks(self):
+        cancelled = []
+
+        async def transcribe(c):
+            if c.index == 0:
+                raise ValueError("Whisper API error")
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(c.index)
+                raise
+
+        chunks = [chunk(i, 0.0, 1.0, 0.0, 1.0) for i in range(3)]
+        with pytest.raises(ValueError):
+            await transcribe_chunks(chunks, transcribe)
+
+        assert sorted(cancelled) == [1, 2]
@@ -0,0 +1,89 @@
+"""
+재요청 워크플로우 테스트
+
+Stage 2에서 Stage 1 프리뷰와 의도가 같으면 스크립트를 다시 생성하지 않고
+프리뷰로 바로 TTS를 실행하는지, 의도가 바뀌면 다시 생성하는지 검증합니다.
+"""
+
+import pytest
+
+from langgraph.nodes import tts
+from langgraph.workflows import refinement
+from langgraph.workflows.refinement import route_refinement, same_intent
+
+
+INTENT = "좀 더 자신감 있는 톤으로 바꿔주세요."
+
+STATE = {
+    "session_id": "s1",
+    "original_transcript": "원본 답변",
+    "original_analysis": {},
+    "current_script": "첫 개선안",
+    "user_intent": INTENT,
+    "refinement_stage": 2,
+    "preview_script": "프리뷰 개선안",
+    "preview_intent": INTENT,
+    "voice_type": "default_male",
+}
+
+
+@pytest.fixture
+def fake_nodes(monkeypatch):
+    """Claude / ElevenLabs 대신 호출을 기록하는 노드"""
+    calls = {"refine": 0, "tts": []}
+
+    async def refine_script_node(state, config=None):
+        calls["refine"] += 1
+        return {"refined_script": "새로 생성한 개선안", "changes_summary": "톤 변경", "messages": ["스크립트 수정 완료"]}
+
+    async def generate_tts(state, config=None):
+        calls["tts"].append(state["improved_script"])
+        return {"improved_audio_url": "https://a/refined.mp3", "messages": ["음성 생성 완료"]}
+
+    monkeypatch.setattr(refinement, "refine_script_node", refine_script_node)
+    monkeypatch.setattr(tts, "generate_tts", generate_tts)
+    return calls
+
+
+class TestRouteRefinement:
+    """프리뷰 재사용 판단 테스트"""
+
+    def test_same_intent_ignores_whitespace_and_case(self):
+        assert same_intent("  Make it   SHORTER please ", "make it shorter please")
+        assert not same_intent("짧게 해주세요", "길게 해주세요")
+        assert not same_intent(None, INTENT)
+
+    def test_routes(self):
+        assert route_refinement(STATE) == "use_preview"
+        assert route_refinement({**STATE, "user_intent": "숫자를 더 강조해 주세요."}) == "refine_script"
+        assert route_refinement({**STATE, "preview_script": None}) == "refine_script"
+        assert route_refinement({**STATE, "refinement_stage": 1}) == "refine_script"
+
+
+@pytest.mark.asyncio
+class TestRefinementGraph:
+    """Stage 2 그래프 테스트"""
+
+    async def test_unchanged_intent_reuses_preview(self, fake_nodes):
+        result = await refinement.create_final_graph().ainvoke(STATE)
+
+        assert fake_nodes["refine"] == 0
+        assert fake_nodes["tts"] == ["프리뷰 개선안"]
+        assert result["refined_script"] == "프리뷰 개선안"
+        assert result["refined_audio_url"] == "https://a/refined.mp3"
+
+    async def test_changed_intent_regenerates(self, fake_nodes):
+        state = {**STATE, "user_intent": "숫자를 더 강조해 주세요."}
+
+        result = await refinement.create_final_graph().ainvoke(state)
+
+        assert fake_nodes["refine"] == 1
+        assert fake_nodes["tts"] == ["새로 생성한 개선안"]
+        assert result["refined_script"] == "새로 생성한 개선안"
+
+    async def test_preview_graph_always_generates(self, fake_nodes):
+        result = await refinement.create_preview_graph().ainvoke({**STATE, "refinement_stage": 1})
+
+        assert fake_nodes["refine"] == 1
+        assert fake_nodes["tts"] == []
+        assert result["refined_script"] == "새로 생성한 개선안"
@@ -0,0 +1,123 @@
+-- ============================================
+-- Progressive Context RPC
+-- ============================================
+-- 분석 노드가 한 번의 호출로 최근 시도 요약 + 패턴(반복 개선점, 개선 추세)을 받도록
+-- 집계를 DB에서 수행합니다.
+--
+-- 기존에는 최근 5개 세션의 analysis JSON 전체를 받아 Python에서 다시 계산했습니다.
+-- 이 함수는 필요한 필드(점수 등급, 개선 제안 카테고리, 시각)만 반환합니다.
+-- (idx_attempts_user_created 인덱스 사용)
+-- ============================================
+
+create or replace function public.get_progressive_context(
+    p_user_id uuid,
+    p_project_id uuid default null,
+    p_limit int default 5
+)
+returns jsonb as $$
+declare
+    result jsonb;
+begin
+    with recent as (
+        select
+            a.id,
+            a.analysis->'scores' as scores,
+            a.analysis->'suggestions' as suggestions,
+            a.created_at,
+            row_number() over (order by a.created_at desc) as rn
+        from public.attempts a
+        join public.questions q on a.question_id = q.id
+        where a.user_id = p_user_id
+        and a.status = 'completed'
+        and (p_project_id is null or q.project_id = p_project_id)
+        order by a.created_at desc
+        limit p_limit
+    ),
+    -- 개선 제안 카테고리 ({"category": ...} 또는 문자열)
+    categories as (
+        select
+            r.rn,
+            s.ord,
+            row_number() over (order by r.rn, s.ord) as seq,
+            case jsonb_typeof(s.value)
+                when 'object' then coalesce(s.value->>'category', 'unknown')
+                when 'string' then s.value #>> '{}'
+            end as category
+        from recent r
+        cross join lateral jsonb_array_elements(
+            case when jsonb_typeof(r.suggestions) = 'array' then r.suggestions else '[]'::jsonb end
+        ) with ordinality as s(value, ord)
+    ),
+    -- 반복 개선점: 2회 이상 등장, 많은 순 (같으면 최근 세션에 먼저 나온 순) 최대 5개
+    recurring as (
+        select category, count(*) as cnt, min(seq) as first_seen
+        from categories
+        where category is not null
+        group by category
+        having count(*) >= 2
+        order by cnt desc, first_seen
+        limit 5
+    ),
+    -- 세션별 평균 등급 (A=4.0 ... D=1.0, 알 수 없는 등급은 2.5)
+    averages as (
+        select
+            r.rn,
+            avg(case g.value #>> '{}'
+                when 'A' then 4.0
+                when 'B+' then 3.5
+                when 'B' then 3.0
+                when 'C+' then 2.5
+                when 'C' then 2.0
+                when 'D' then 1.0
+                else 2.5
+            end::float8) as average
+        from recent r
+        cross join lateral jsonb_each(
+            case when jsonb_typeof(r.scores) = 'object' then r.scores else '{}'::jsonb end
+        ) as g(key, value)
+        where jsonb_typeof(g.value) = 'string'
+        group by r.rn
+    ),
+    ranked as (
+        select average, row_number() over (order by rn) as position
+        from averages
+    ),
+    -- 개선 추세: 최신 세션 평균 - 이전 세션 평균 (±0.3 기준)
+    trend as (
+        select case
+            when count(*) < 2 then 'unknown'
+            when max(average) filter (where position = 1)
+                - avg(average) filter (where position > 1) > 0.3 then 'improving'
+            when max(average) filter (where position = 1)
+                - avg(average) filter (where position > 1) < -0.3 then 'declining'
+            else 'stable'
+        end as improvement_trend
+        from ranked
+    )
+    select jsonb_build_object(
+        'sessions', coalesce((
+            select jsonb_agg(jsonb_build_object(
+                'session_id', r.id,
+                'scores', r.scores,
+                'suggestion_categories', coalesce((
+                    select jsonb_agg(c.category order by c.ord)
+                    from categories c
+                    where c.rn = r.rn and c.category is not null
+                ), '[]'::jsonb),
+                'created_at', r.created_at
+            ) order by r.rn)
+            from recent r
+        ), '[]'::jsonb),
+        'session_count', (select count(*) from recent),
+        'recurring_issues', coalesce((
+            select jsonb_agg(category order by cnt desc, first_seen) from recurring
+        ), '[]'::jsonb),
+        'improvement_trend', (select improvement_trend from trend),
+        'last_session_date', (select created_at from recent where rn = 1)
+    ) into result;
+
+    return result;
+end;
+$$ language plpgsql security definer stable;
+
+comment on function public.get_progressive_context is 'Progressive Context 요약 (최근 시도 점수/개선 카테고리 + 반복 개선점 + 개선 추세)';
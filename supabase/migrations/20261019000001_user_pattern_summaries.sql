@@ -0,0 +1,228 @@
+-- ============================================
+-- User Pattern Summaries
+-- ============================================
+-- 사용자별(전체 + 프로젝트별) Progressive Context 요약을 시도 완료 시점에 갱신합니다.
+-- 분석 노드는 최근 시도를 다시 집계하지 않고 요약 한 행만 읽습니다.
+--
+-- 요약 내용:
+--   - category_weights: 개선 제안 카테고리별 감쇠 횟수 (시도마다 기존 값 × 0.8 + 이번 횟수)
+--   - latest_grade / grade_ewma: 최신 시도 평균 등급 / 그 이전 시도들의 지수 가중 평균 (α = 0.4)
+--   - last_*: 최신 시도의 점수 등급, 개선 제안 카테고리, 시각
+--
+-- 기존 시도는 backfill_pattern_summaries로 채웁니다.
+-- (python -m api.jobs.backfill)
+-- ============================================
+
+create table public.user_pattern_summaries (
+    id uuid primary key default gen_random_uuid(),
+    user_id uuid not null references public.users(id) on delete cascade,
+    project_id uuid references public.projects(id) on delete cascade,  -- null이면 전체 프로젝트
+
+    session_count int not null default 0,
+    category_weights jsonb not null default '{}'::jsonb,
+
+    latest_grade float8,            -- 최신 시도 평균 등급 (A=4.0 ... D=1.0)
+    grade_ewma float8,              -- 최신 이전 시도들의 지수 가중 평균
+    graded_count int not null default 0,
+
+    last_attempt_id uuid,
+    last_scores jsonb,
+    last_categories jsonb not null default '[]'::jsonb,
+    last_session_at timestamptz,
+
+    created_at timestamptz default now(),
+    updated_at timestamptz default now(),
+
+    unique nulls not distinct (user_id, project_id)
+);
+
+comment on table public.user_pattern_summaries is '사용자별 Progressive Context 요약 (시도 완료 시 갱신)';
+
+create trigger user_pattern_summaries_updated_at
+    before update on public.user_pattern_summaries
+    for each row execute function update_updated_at_column();
+
+alter table public.user_pattern_summaries enable row level security;
+
+create policy "Users can view own pattern summaries"
+    on public.user_pattern_summaries for select
+    using (auth.uid() = user_id);
+
+
+-- ============================================
+-- 요약 갱신
+-- ============================================
+
+-- 완료된 시도 하나를 요약에 반영
+create or replace function public.apply_attempt_to_pattern_summary(
+    p_user_id uuid,
+    p_project_id uuid,
+    p_attempt_id uuid,
+    p_analysis jsonb,
+    p_created_at timestamptz
+)
+returns void as $$
+declare
+    v_categories jsonb;
+    v_category_counts jsonb;
+    v_grade float8;
+begin
+    -- 이번 시도의 개선 제안 카테고리 ({"category": ...} 또는 문자열)
+    select
+        coalesce(jsonb_agg(category order by ord), '[]'::jsonb)
+    into v_categories
+    from (
+        select
+            case jsonb_typeof(s.value)
+                when 'object' then coalesce(s.value->>'category', 'unknown')
+                else s.value #>> '{}'
+            end as category,
+            s.ord
+        from jsonb_array_elements(
+            case when jsonb_typeof(p_analysis->'suggestions') = 'array' then p_analysis->'suggestions' else '[]'::jsonb end
+        ) with ordinality as s(value, ord)
+        where jsonb_typeof(s.value) in ('object', 'string')
+    ) c;
+
+    select coalesce(jsonb_object_agg(category, cnt), '{}'::jsonb)
+    into v_category_counts
+    from (
+        select value #>> '{}' as category, count(*) as cnt
+        from jsonb_array_elements(v_categories)
+        group by 1
+    ) c;
+
+    -- 이번 시도의 평균 등급 (등급이 없으면 null)
+    select avg(case g.value #>> '{}'
+        when 'A' then 4.0
+        when 'B+' then 3.5
+        when 'B' then 3.0
+        when 'C+' then 2.5
+        when 'C' then 2.0
+        when 'D' then 1.0
+        else 2.5
+    end::float8)
+    into v_grade
+    from jsonb_each(
+        case when jsonb_typeof(p_analysis->'scores') = 'object' then p_analysis->'scores' else '{}'::jsonb end
+    ) as g(key, value)
+    where jsonb_typeof(g.value) = 'string';
+
+    insert into public.user_pattern_summaries as s (
+        user_id, project_id, session_count, category_weights,
+        latest_grade, grade_ewma, graded_count,
+        last_attempt_id, last_scores, last_categories, last_session_at
+    )
+    values (
+        p_user_id, p_project_id, 1, v_category_counts,
+        v_grade, null, case when v_grade is null then 0 else 1 end,
+        p_attempt_id, p_analysis->'scores', v_categories, p_created_at
+    )
+    on conflict (user_id, project_id) do update set
+        session_count = s.session_count + 1,
+        -- 기존 횟수는 0.8배로 줄이고 이번 횟수를 더함 (0.05 미만은 삭제)
+        category_weights = (
+            select coalesce(jsonb_object_agg(key, weight), '{}'::jsonb)
+            from (
+                select
+                    k.key,
+                    round(
+                        coalesce((s.category_weights->>k.key)::numeric, 0) * 0.8
+                        + coalesce((excluded.category_weights->>k.key)::numeric, 0),
+                        3
+                    ) as weight
+                from (
+                    select jsonb_object_keys(s.category_weights)
+                    union
+                    select jsonb_object_keys(excluded.category_weights)
+                ) as k(key)
+            ) w
+            where weight >= 0.05
+        ),
+        -- 직전 최신 등급을 이전 시도 평균에 반영한 뒤 이번 등급을 최신으로
+        grade_ewma = case
+            when excluded.latest_grade is null or s.latest_grade is null then s.grade_ewma
+            when s.grade_ewma is null then s.latest_grade
+            else 0.4 * s.latest_grade + 0.6 * s.grade_ewma
+        end,
+        latest_grade = coalesce(excluded.latest_grade, s.latest_grade),
+        graded_count = s.graded_count + excluded.graded_count,
+        last_attempt_id = case when s.last_session_at > excluded.last_session_at then s.last_attempt_id else excluded.last_attempt_id end,
+        last_scores = case when s.last_session_at > excluded.last_session_at then s.last_scores else excluded.last_scores end,
+        last_categories = case when s.last_session_at > excluded.last_session_at then s.last_categories else excluded.last_categories end,
+        last_session_at = greatest(s.last_session_at, excluded.last_session_at);
+end;
+$$ language plpgsql security definer;
+
+comment on function public.apply_attempt_to_pattern_summary is '완료된 시도 하나를 사용자 요약(전체 또는 프로젝트)에 반영';
+
+
+-- 시도가 완료되면 전체 요약과 프로젝트 요약을 갱신
+create or replace function public.handle_attempt_completed()
+returns trigger as $$
+declare
+    v_project_id uuid;
+begin
+    if new.status <> 'completed' or (tg_op = 'UPDATE' and old.status = 'completed') then
+        return new;
+    end if;
+
+    select project_id into v_project_id from public.questions where id = new.question_id;
+
+    perform public.apply_attempt_to_pattern_summary(new.user_id, null, new.id, new.analysis, new.created_at);
+    perform public.apply_attempt_to_pattern_summary(new.user_id, v_project_id, new.id, new.analysis, new.created_at);
+    return new;
+end;
+$$ language plpgsql security definer;
+
+create trigger attempts_pattern_summary
+    after insert or update of status on public.attempts
+    for each row execute function public.handle_attempt_completed();
+
+
+-- ============================================
+-- 백필
+-- ============================================
+
+-- 사용자 ID 순으로 p_batch_size명씩 요약을 다시 만듦
+-- 반환값: 이번 배치의 마지막 사용자 ID (다음 호출의 p_after, 더 없으면 null)
+create or replace function public.backfill_pattern_summaries(
+    p_after uuid default null,
+    p_batch_size int default 100
+)
+returns uuid as $$
+declare
+    v_users uuid[];
+    v_attempt record;
+begin
+    select array_agg(id order by id) into v_users
+    from (
+        select id from public.users
+        where p_after is null or id > p_after
+        order by id
+        limit p_batch_size
+    ) u;
+
+    if v_users is null then
+        return null;
+    end if;
+
+    delete from public.user_pattern_summaries where user_id = any(v_users);
+
+    for v_attempt in
+        select a.id, a.user_id, q.project_id, a.analysis, a.created_at
+        from public.attempts a
+        join public.questions q on a.question_id = q.id
+        where a.user_id = any(v_users)
+        and a.status = 'completed'
+        order by a.user_id, a.created_at
+    loop
+        perform public.apply_attempt_to_pattern_summary(v_attempt.user_id, null, v_attempt.id, v_attempt.analysis, v_attempt.created_at);
+        perform public.apply_attempt_to_pattern_summary(v_attempt.user_id, v_attempt.project_id, v_attempt.id, v_attempt.analysis, v_attempt.created_at);
+    end loop;
+
+    return v_users[array_length(v_users, 1)];
+end;
+$$ language plpgsql security definer;
+
+comment on function public.backfill_pattern_summaries is '기존 완료 시도로 사용자 요약 재생성 (사용자 ID 순 배치)';
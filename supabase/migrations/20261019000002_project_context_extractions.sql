@@ -0,0 +1,43 @@
+-- ============================================
+-- Project Context Extractions
+-- ============================================
+-- Deep Mode 문서 분석(이력서/포트폴리오 핵심 정보 추출) 결과를 프로젝트별로 보관합니다.
+-- 같은 프로젝트의 다음 세션은 Claude 추출을 다시 실행하지 않고 이 결과를 재사용합니다.
+--
+-- documents_hash: 추출 모델/버전 + 프로젝트 문서의 extracted_text를 결합한 내용의 SHA-256
+--   문서가 추가/수정/삭제되면 해시가 달라지므로 이전 결과는 자동으로 사용되지 않고,
+--   다음 추출 결과로 덮어씁니다.
+-- extraction_ms: 추출에 걸린 시간 (캐시 적중 시 절약한 시간 추정용)
+--
+-- 문서 업로드 직후 워밍업 작업(document_extraction)이 미리 채웁니다.
+-- ============================================
+
+create table public.project_context_extractions (
+    project_id uuid primary key references public.projects(id) on delete cascade,
+
+    documents_hash text not null,
+    document_count int not null default 0,
+    extraction text not null,
+    extraction_ms int,
+
+    created_at timestamptz default now(),
+    updated_at timestamptz default now()
+);
+
+comment on table public.project_context_extractions is '프로젝트 문서 핵심 정보 추출 결과 (문서 해시 기준 캐시)';
+
+create trigger project_context_extractions_updated_at
+    before update on public.project_context_extractions
+    for each row execute function update_updated_at_column();
+
+alter table public.project_context_extractions enable row level security;
+
+create policy "Users can view own project extractions"
+    on public.project_context_extractions for select
+    using (
+        exists (
+            select 1 from public.projects
+            where projects.id = project_id
+            and projects.user_id = auth.uid()
+        )
+    );
@@ -0,0 +1,74 @@
+-- ============================================
+-- Write Attempts (배치 저장)
+-- ============================================
+-- 백엔드의 세션 저장 큐(api/persistence.py)가 모아 둔 시도 결과를 한 번의 호출로 저장합니다.
+--
+-- p_rows: [{"id": "...", "status": "completed", "analysis": {...}, ...}, ...]
+--   - 이미 있는 시도는 행에 들어 있는 키만 갱신 (재요청 결과처럼 일부 필드만 보내도 됨)
+--   - 없는 시도는 question_id / user_id가 있으면 새로 만들고, 없으면 건너뜀
+--   - 같은 id는 한 번만 포함 (호출 전에 합침)
+--
+-- 상태가 completed로 바뀌면 attempts_pattern_summary 트리거가 사용자 요약을 갱신합니다.
+-- security invoker: 서비스 키(RLS 우회)로 호출하며, 일반 사용자가 호출하면 attempts RLS가 적용됩니다.
+-- ============================================
+
+alter table public.attempts add column pending_refinement jsonb;
+
+comment on column public.attempts.pending_refinement is '재요청 Stage 1 프리뷰 (user_intent, preview_script), Stage 2 완료 시 null';
+
+
+create or replace function public.write_attempts(p_rows jsonb)
+returns int as $$
+declare
+    v_updated int;
+    v_inserted int;
+begin
+    -- 1. 이미 있는 시도: 보낸 키만 갱신
+    update public.attempts a set
+        original_text = case when r ? 'original_text' then r->>'original_text' else a.original_text end,
+        duration_seconds = case when r ? 'duration_seconds' then (r->>'duration_seconds')::float else a.duration_seconds end,
+        analysis = case when r ? 'analysis' then nullif(r->'analysis', 'null'::jsonb) else a.analysis end,
+        improved_text = case when r ? 'improved_text' then r->>'improved_text' else a.improved_text end,
+        score = case when r ? 'score' then (r->>'score')::int else a.score end,
+        original_audio_url = case when r ? 'original_audio_url' then r->>'original_audio_url' else a.original_audio_url end,
+        improved_audio_url = case when r ? 'improved_audio_url' then r->>'improved_audio_url' else a.improved_audio_url end,
+        refinement_count = case when r ? 'refinement_count' then (r->>'refinement_count')::int else a.refinement_count end,
+        pending_refinement = case when r ? 'pending_refinement' then nullif(r->'pending_refinement', 'null'::jsonb) else a.pending_refinement end,
+        status = case when r ? 'status' then (r->>'status')::attempt_status else a.status end,
+        error_message = case when r ? 'error_message' then r->>'error_message' else a.error_message end
+    from jsonb_array_elements(p_rows) r
+    where a.id = (r->>'id')::uuid;
+    get diagnostics v_updated = row_count;
+
+    -- 2. 없는 시도: 필수 키가 있으면 새로 만듦
+    insert into public.attempts (
+        id, question_id, user_id, original_text, duration_seconds, analysis, improved_text, score,
+        original_audio_url, improved_audio_url, refinement_count, pending_refinement, status, error_message
+    )
+    select
+        (r->>'id')::uuid,
+        (r->>'question_id')::uuid,
+        (r->>'user_id')::uuid,
+        r->>'original_text',
+        (r->>'duration_seconds')::float,
+        nullif(r->'analysis', 'null'::jsonb),
+        r->>'improved_text',
+        (r->>'score')::int,
+        r->>'original_audio_url',
+        r->>'improved_audio_url',
+        coalesce((r->>'refinement_count')::int, 0),
+        nullif(r->'pending_refinement', 'null'::jsonb),
+        coalesce((r->>'status')::attempt_status, 'completed'),
+        r->>'error_message'
+    from jsonb_array_elements(p_rows) r
+    where r->>'question_id' is not null
+    and r->>'user_id' is not null
+    and not exists (select 1 from public.attempts a where a.id = (r->>'id')::uuid)
+    on conflict (id) do nothing;
+    get diagnostics v_inserted = row_count;
+
+    return v_updated + v_inserted;
+end;
+$$ language plpgsql;
+
+comment on function public.write_attempts is '시도 결과 배치 저장 (있으면 보낸 키만 갱신, 없으면 생성), 저장된 행 수 반환';
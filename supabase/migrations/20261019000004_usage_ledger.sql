@@ -0,0 +1,157 @@
+-- ============================================
+-- Usage Ledger (세션 · 노드별 실제 사용량 / 비용)
+-- ============================================
+-- admin_cost_estimate는 완료된 시도 수로 비용을 추정합니다.
+-- 백엔드의 비용 원장(langgraph/utils/ledger.py)이 Claude usage 토큰(캐시 읽기 / 쓰기 포함),
+-- Whisper 오디오 길이, ElevenLabs 문자 수와 그 비용을 세션 · 노드별로 모아 주기적으로 저장합니다.
+--
+-- record_usage(p_rows): [{"session_id": "...", "graph": "speech_coach", "node": "analysis", "input_tokens": 1200, ...}, ...]
+--   - 같은 (session_id, graph, node) 행은 값을 더함 (프로세스마다 나눠서 저장해도 됨)
+--
+-- 월별 / 모드별 요약: admin_usage_cost 뷰, usage_report 함수 (python -m api.jobs.usage_report)
+-- ============================================
+
+create table public.usage_ledger (
+    id uuid primary key default gen_random_uuid(),
+    session_id text not null,           -- 분석 세션 ID (세션이 없는 작업은 작업 ID)
+    user_id uuid,                       -- 인증 사용자 (Guest는 null)
+    mode text not null,                 -- quick / deep / refine / refine_preview / speculative_tts / document_extraction
+    graph text not null,                -- speech_coach / refinement (노드 밖 호출은 none)
+    node text not null,
+
+    input_tokens bigint not null default 0,
+    output_tokens bigint not null default 0,
+    cache_read_tokens bigint not null default 0,
+    cache_creation_tokens bigint not null default 0,
+    audio_seconds float8 not null default 0,
+    tts_characters bigint not null default 0,
+    cost_usd numeric(12, 6) not null default 0,
+
+    created_at timestamptz default now(),
+    updated_at timestamptz default now(),
+
+    unique (session_id, graph, node)
+);
+
+comment on table public.usage_ledger is '세션 · 노드별 외부 API 사용량과 비용 (백엔드 비용 원장이 배치로 누적)';
+
+create index usage_ledger_user_created_idx on public.usage_ledger (user_id, created_at);
+create index usage_ledger_created_idx on public.usage_ledger (created_at);
+
+create trigger usage_ledger_updated_at
+    before update on public.usage_ledger
+    for each row execute function update_updated_at_column();
+
+alter table public.usage_ledger enable row level security;
+
+create policy "Users can view own usage"
+    on public.usage_ledger for select
+    using (auth.uid() = user_id);
+
+
+-- 배치 누적 저장 (저장된 행 수 반환)
+create or replace function public.record_usage(p_rows jsonb)
+returns int as $$
+declare
+    v_count int;
+begin
+    insert into public.usage_ledger as l (
+        session_id, user_id, mode, graph, node,
+        input_tokens, output_tokens, cache_read_tokens, cache_creation_tokens,
+        audio_seconds, tts_characters, cost_usd
+    )
+    select
+        r->>'session_id',
+        (r->>'user_id')::uuid,
+        r->>'mode',
+        r->>'graph',
+        r->>'node',
+        coalesce((r->>'input_tokens')::bigint, 0),
+        coalesce((r->>'output_tokens')::bigint, 0),
+        coalesce((r->>'cache_read_tokens')::bigint, 0),
+        coalesce((r->>'cache_creation_tokens')::bigint, 0),
+        coalesce((r->>'audio_seconds')::float8, 0),
+        coalesce((r->>'tts_characters')::bigint, 0),
+        coalesce((r->>'cost_usd')::numeric, 0)
+    from jsonb_array_elements(p_rows) r
+    on conflict (session_id, graph, node) do update set
+        user_id = coalesce(l.user_id, excluded.user_id),
+        input_tokens = l.input_tokens + excluded.input_tokens,
+        output_tokens = l.output_tokens + excluded.output_tokens,
+        cache_read_tokens = l.cache_read_tokens + excluded.cache_read_tokens,
+        cache_creation_tokens = l.cache_creation_tokens + excluded.cache_creation_tokens,
+        audio_seconds = l.audio_seconds + excluded.audio_seconds,
+        tts_characters = l.tts_characters + excluded.tts_characters,
+        cost_usd = l.cost_usd + excluded.cost_usd;
+    get diagnostics v_count = row_count;
+
+    return v_count;
+end;
+$$ language plpgsql;
+
+comment on function public.record_usage is '사용량 배치 누적 저장 (같은 세션 · 노드는 합산), 저장된 행 수 반환';
+
+
+-- 사용자 비용 합계 (예산 확인용, 백엔드가 캐시)
+create or replace function public.user_usage_cost(p_user_id uuid, p_since timestamptz)
+returns numeric as $$
+    select coalesce(sum(cost_usd), 0)
+    from public.usage_ledger
+    where user_id = p_user_id
+    and created_at >= p_since;
+$$ language sql stable;
+
+comment on function public.user_usage_cost is '사용자의 p_since 이후 비용 합계 (USD)';
+
+
+-- 모드별 비용 요약 (오프라인 리포트)
+create or replace function public.usage_report(p_since timestamptz, p_until timestamptz default now())
+returns table (
+    mode text,
+    sessions bigint,
+    users bigint,
+    input_tokens numeric,
+    output_tokens numeric,
+    cache_read_tokens numeric,
+    cache_creation_tokens numeric,
+    audio_seconds float8,
+    tts_characters numeric,
+    cost_usd numeric
+) as $$
+    select
+        l.mode,
+        count(distinct l.session_id),
+        count(distinct l.user_id),
+        sum(l.input_tokens),
+        sum(l.output_tokens),
+        sum(l.cache_read_tokens),
+        sum(l.cache_creation_tokens),
+        sum(l.audio_seconds),
+        sum(l.tts_characters),
+        sum(l.cost_usd)
+    from public.usage_ledger l
+    where l.created_at >= p_since
+    and l.created_at < p_until
+    group by l.mode
+    order by sum(l.cost_usd) desc;
+$$ language sql stable;
+
+comment on function public.usage_report is '기간 내 모드별 사용량 / 비용 요약';
+
+
+-- 월별 / 모드별 실제 비용 (admin_cost_estimate의 추정 대신)
+create or replace view public.admin_usage_cost as
+select
+    date_trunc('month', created_at)::date as month,
+    mode,
+    count(distinct session_id) as sessions,
+    sum(input_tokens + output_tokens + cache_read_tokens + cache_creation_tokens) as claude_tokens,
+    round(sum(audio_seconds)::numeric / 60, 1) as whisper_minutes,
+    sum(tts_characters) as tts_characters,
+    round(sum(cost_usd), 2) as cost_usd,
+    round(sum(cost_usd) / nullif(count(distinct session_id), 0), 4) as cost_per_session_usd
+from public.usage_ledger
+group by date_trunc('month', created_at), mode
+order by month desc, cost_usd desc;
+
+comment on view public.admin_usage_cost is '월별 / 모드별 실제 API 비용 (service_role 전용)';